@@ -6,6 +6,7 @@ import contextlib
 import functools
 import logging
 import pathlib
+import queue
 import threading
 import time
 import warnings
@@ -194,6 +195,153 @@ class DirectoryLogger(CommLogger):
                 self.handleError(record)
 
 
+class _ArchiveWriter:
+    """Appends messages to an archive file, rotates the archive by size and age.
+
+    For every archive file "archive-<start time>-<sequence>.log" an index file with extension ".idx" is written.
+    Each line of the index contains offset, length and the file name that DirectoryLogger would have used,
+    separated by tabs.
+    """
+
+    def __init__(self, log_folder: pathlib.Path, max_size: int, max_age: float):
+        self._log_folder = log_folder
+        self._max_size = max_size
+        self._max_age = max_age
+        self._data_file = None
+        self._index_file = None
+        self._opened = 0.0
+        self._size = 0
+        self._sequence = 0
+
+    def write(self, file_name: str, msg: bytes) -> None:
+        """Append msg to archive."""
+        if self._data_file is None or self._size >= self._max_size or time.monotonic() - self._opened > self._max_age:
+            self._rotate()
+        self._data_file.write(msg)
+        self._index_file.write(f'{self._size}\t{len(msg)}\t{file_name}\n')
+        self._size += len(msg)
+
+    def flush(self) -> None:
+        """Flush archive and index file."""
+        if self._data_file is not None:
+            self._data_file.flush()
+            self._index_file.flush()
+
+    def close(self) -> None:
+        """Close archive and index file."""
+        if self._data_file is not None:
+            self._data_file.close()
+            self._index_file.close()
+            self._data_file = None
+            self._index_file = None
+
+    def _rotate(self) -> None:
+        self.close()
+        self._sequence += 1
+        name = f'archive-{time.strftime("%Y%m%d-%H%M%S")}-{self._sequence:04d}'
+        self._data_file = self._log_folder.joinpath(f'{name}.log').open('ab')
+        self._index_file = self._log_folder.joinpath(f'{name}.idx').open('a', encoding='utf-8')
+        self._opened = time.monotonic()
+        self._size = 0
+
+
+class AsyncDirectoryLogger(DirectoryLogger):
+    """Logger writing communication logs into a directory in a background thread.
+
+    Logging a message only puts it into a bounded queue, the thread that logs it does not wait for file io.
+    If the queue is full, the message is dropped and counted in dropped_count.
+    The writer thread writes the messages in batches, either one file per message like DirectoryLogger,
+    or appended to a rotating archive (see _ArchiveWriter).
+    """
+
+    _STOP = object()
+
+    def __init__(  # noqa: PLR0913
+        self,
+        log_folder: str | pathlib.Path,
+        log_out: bool = False,
+        log_in: bool = False,
+        broadcast_ip_filter: str | None = None,
+        max_queue_size: int = 10000,
+        batch_size: int = 100,
+        archive: bool = False,
+        max_archive_size: int = 100 * 1024 * 1024,
+        max_archive_age: float = 3600.0,
+    ):
+        """Construct an AsyncDirectoryLogger.
+
+        :param log_folder: folder for files
+        :param log_out: log outgoing messages
+        :param log_in: log incoming messages
+        :param broadcast_ip_filter: only log discovery messages of this ip address
+        :param max_queue_size: max. number of messages that wait for the writer thread
+        :param batch_size: max. number of messages that the writer thread handles at once
+        :param archive: if True, messages are appended to a rotating archive instead of single files
+        :param max_archive_size: an archive file is rotated after it reached this size in bytes
+        :param max_archive_age: an archive file is rotated after this time in seconds
+        """
+        super().__init__(log_folder, log_out, log_in, broadcast_ip_filter)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._batch_size = batch_size
+        self._archive = _ArchiveWriter(self._log_folder, max_archive_size, max_archive_age) if archive else None
+        self._dropped_count = 0
+        self._dropped_lock = threading.Lock()
+        self._writer_thread: threading.Thread | None = None
+
+    @property
+    def dropped_count(self) -> int:
+        """Return the number of messages that were dropped because the queue was full."""
+        return self._dropped_count
+
+    def start(self) -> None:
+        """Start writer thread and logger."""
+        self._log_folder.mkdir(parents=True, exist_ok=True)
+        self._writer_thread = threading.Thread(target=self._write_batches, name='AsyncDirectoryLogger', daemon=True)
+        self._writer_thread.start()
+        CommLogger.start(self)
+
+    def stop(self) -> None:
+        """Stop logger, write all queued messages and stop writer thread."""
+        CommLogger.stop(self)
+        if self._writer_thread is not None:
+            self._queue.put(self._STOP)
+            self._writer_thread.join()
+            self._writer_thread = None
+
+    def _write_log(self, ttype: str, direction: str, msg: bytes, *infos: str) -> None:
+        try:
+            self._queue.put_nowait((self._mk_filename(ttype, direction, *infos), msg))
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped_count += 1
+
+    def _write_batches(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            with contextlib.suppress(queue.Empty):
+                while len(batch) < self._batch_size:
+                    batch.append(self._queue.get_nowait())
+            stop = any(entry is self._STOP for entry in batch)
+            self._write_batch([entry for entry in batch if entry is not self._STOP])
+            if stop:
+                if self._archive is not None:
+                    self._archive.close()
+                return
+
+    def _write_batch(self, batch: list[tuple[str, bytes]]) -> None:
+        for file_name, msg in batch:
+            try:
+                if self._archive is None:
+                    self._log_folder.joinpath(file_name).write_bytes(msg)
+                else:
+                    self._archive.write(file_name, msg)
+            except Exception:
+                # keep thread alive, same as logging.Handler.handleError
+                logging.getLogger('sdc.commlog').exception('writing %s failed', file_name)
+        if self._archive is not None:
+            self._archive.flush()
+
+
 class StreamLogger(CommLogger):
     """Set a stream handler for each comm logger."""
 
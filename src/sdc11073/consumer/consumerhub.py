@@ -0,0 +1,238 @@
+"""The module implements a hub that connects many SdcConsumer instances to providers on shared infrastructure.
+
+Each SdcConsumer that runs alone has its own http server for notifications (with a thread per connection),
+a subscription manager thread that renews subscriptions and a worker thread that handles notifications.
+A gateway that is connected to many providers needs hundreds of threads that way. All consumers of a SdcConsumerHub
+share
+- one http server on an asyncio event loop, the notifications are routed to the consumers by the path of the url,
+- one bounded pool of worker threads that parses the notifications and updates the mdibs,
+  notifications of the same consumer are handled in order of reception,
+- one scheduler thread that checks all subscriptions for renewal,
+- the event loop that sends the renew requests with async soap clients.
+Requests that the application sends with the blocking methods (get_mdib, set_numeric_value, ...) are sent by the
+blocking soap clients of the consumers in the thread of the caller. The async methods of the service clients
+(async_get_mdib, async_set_numeric_value, ...) must be awaited in the event loop of the hub; an application that is
+itself based on asyncio can pass its own event loop to the hub for that purpose.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from sdc11073 import loghelper
+from sdc11073.consumer.consumerimpl import SdcConsumer, default_components_factory
+from sdc11073.consumer.subscription import ConsumerSubscriptionManagerAsync
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.dispatch import RequestDispatcher
+from sdc11073.exceptions import ApiUsageError
+from sdc11073.httpserver import compression
+from sdc11073.httpserver.httpserver_async import AsyncHttpServer
+from sdc11073.mdib.consumermdib import ConsumerMdib
+from sdc11073.provider.scheduler import Scheduler
+from sdc11073.provider.subscriptionmgr_async import AsyncioEventLoopThread
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable
+
+    from sdc11073.certloader import SSLContextContainer
+    from sdc11073.consumer.consumerimpl import SdcConsumerComponents
+    from sdc11073.definitions_base import BaseDefinitions
+
+
+def consumer_hub_components_factory() -> SdcConsumerComponents:
+    """Return the default components for consumers of a SdcConsumerHub.
+
+    Notifications are handled synchronously by the worker pool of the hub, the subscriptions are renewed
+    with async soap clients.
+    """
+    return dataclasses.replace(
+        default_components_factory(),
+        action_dispatcher_class=RequestDispatcher,
+        subscription_manager_class=ConsumerSubscriptionManagerAsync,
+    )
+
+
+class SdcConsumerHub:
+    """Run many SdcConsumer instances with one event loop, http server, worker pool and scheduler.
+
+    The number of threads does not depend on the number of consumers.
+    """
+
+    def __init__(
+        self,
+        my_ipaddress: str,
+        ssl_context_container: SSLContextContainer | None = None,
+        worker_count: int = 4,
+        log_prefix: str = '',
+        async_loop: asyncio.AbstractEventLoop | None = None,
+        max_concurrent_requests: int = 100,
+    ):
+        """Construct a SdcConsumerHub.
+
+        :param my_ipaddress: the ip address of the http server that receives the notifications
+        :param ssl_context_container: if not None, the contexts are used for the http server and for the connections
+                                      to the providers
+        :param worker_count: max. number of threads that handle notifications
+        :param log_prefix: a string
+        :param async_loop: a running event loop that the hub shall use, if None the hub starts its own loop thread.
+                           start_all, stop_all, add_consumer and remove_consumer block, they must not be called
+                           in the thread of this loop.
+        :param max_concurrent_requests: max. number of concurrent requests of the async methods of the service
+                                        clients of all consumers
+        """
+        self._my_ipaddress = my_ipaddress
+        self._ssl_context_container = ssl_context_container
+        self._worker_count = worker_count
+        self._log_prefix = log_prefix
+        self._logger = loghelper.get_logger_adapter('sdc.client.hub', log_prefix)
+        self._consumers: list[SdcConsumer] = []
+        self._lock = threading.Lock()
+        self._external_loop = async_loop
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+        self._async_loop_thread: AsyncioEventLoopThread | None = None
+        self._request_limiter = asyncio.Semaphore(max_concurrent_requests)
+        self._executor: ThreadPoolExecutor | None = None
+        self._http_server: AsyncHttpServer | None = None
+        self.scheduler = Scheduler(name='sdc_consumer_hub_scheduler', log_prefix=log_prefix)
+
+    @property
+    def consumers(self) -> list[SdcConsumer]:
+        """Return a list of the consumers of this hub."""
+        with self._lock:
+            return self._consumers[:]
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if start_all was called and stop_all was not called yet."""
+        return self._http_server is not None
+
+    @property
+    def base_url(self) -> str:
+        """Return the base url of the shared http server."""
+        return self._http_server.base_url if self._http_server is not None else ''
+
+    def start_all(self, http_server_start_timeout: float = 60.0):
+        """Start the event loop, the worker pool, the scheduler and the shared http server.
+
+        :param http_server_start_timeout: time to wait for http server to start
+        """
+        if self.is_running:
+            raise ApiUsageError('consumer hub is already running')
+        if self._external_loop is not None:
+            self._async_loop = self._external_loop
+        else:
+            self._async_loop_thread = AsyncioEventLoopThread(
+                name='async_loop_consumer_hub',
+                logger=loghelper.get_logger_adapter('sdc.client.hub.loop', self._log_prefix),
+            )
+            self._async_loop_thread.start()
+            for _i in range(100):
+                if self._async_loop_thread.running:
+                    break
+                time.sleep(0.01)
+            else:
+                raise RuntimeError('could not start AsyncioEventLoopThread')
+            self._async_loop = self._async_loop_thread.loop
+        self._executor = ThreadPoolExecutor(self._worker_count, thread_name_prefix='sdc_consumer_hub_worker')
+        self.scheduler.start()
+        http_server = AsyncHttpServer(
+            self._async_loop,
+            self._my_ipaddress,
+            self._ssl_context_container.server_context if self._ssl_context_container else None,
+            compression.CompressionHandler.available_encodings[:],
+            loghelper.get_logger_adapter('sdc.client.httpsrv', self._log_prefix),
+            executor=self._executor,
+        )
+        http_server.start(timeout=http_server_start_timeout)
+        self._http_server = http_server
+        self._logger.info('consumer hub serving event sink on {}', http_server.base_url)  # noqa: PLE1205
+
+    def stop_all(self, unsubscribe: bool = True):
+        """Stop all consumers and the shared infrastructure."""
+        for consumer in self.consumers:
+            self.remove_consumer(consumer, unsubscribe)
+        if not self.is_running:
+            return
+        self._http_server.stop()
+        self._http_server = None
+        self.scheduler.stop()
+        self._executor.shutdown()
+        self._executor = None
+        if self._async_loop_thread is not None:
+            self._async_loop_thread.stop()
+            self._async_loop_thread = None
+        self._async_loop = None
+
+    def add_consumer(  # noqa: PLR0913
+        self,
+        provider_address: str,
+        sdc_definitions: type[BaseDefinitions] = SdcV1Definitions,
+        epr: str | uuid.UUID | None = None,
+        validate: bool = True,
+        log_prefix: str = '',
+        components: SdcConsumerComponents | None = None,
+        socket_timeout: int = 5,
+        not_subscribed_actions: Iterable[str] | None = None,
+        fixed_renew_interval: float | None = None,
+        init_mdib: bool = True,
+    ) -> SdcConsumer:
+        """Create a SdcConsumer that uses the shared infrastructure, connect it and subscribe.
+
+        :param provider_address: network-resolvable transport address of the SDC Provider
+        :param sdc_definitions: a class derived from BaseDefinitions
+        :param epr: the path of this consumer in the shared http server
+        :param validate: bool
+        :param log_prefix: a string
+        :param components: a SdcConsumerComponents instance, the subscription manager must be async
+        :param socket_timeout: timeout for connections to provider
+        :param not_subscribed_actions: see SdcConsumer.start_all
+        :param fixed_renew_interval: see SdcConsumer.start_all
+        :param init_mdib: if True, a ConsumerMdib is created and initialized
+        :return: the started consumer
+        """
+        if not self.is_running:
+            raise ApiUsageError('consumer hub is not running, call start_all first')
+        components = components or consumer_hub_components_factory()
+        if not issubclass(components.subscription_manager_class, ConsumerSubscriptionManagerAsync):
+            msg = (f'subscription manager must be async to share the event loop, '
+                   f'got {components.subscription_manager_class.__name__}')
+            raise ApiUsageError(msg)
+        consumer = SdcConsumer(
+            provider_address,
+            sdc_definitions,
+            self._ssl_context_container,
+            epr=epr,
+            validate=validate,
+            log_prefix=log_prefix,
+            components=components,
+            socket_timeout=socket_timeout,
+            scheduler=self.scheduler,
+            async_loop=self._async_loop,
+            async_request_limiter=self._request_limiter,
+        )
+        try:
+            consumer.start_all(
+                not_subscribed_actions=not_subscribed_actions,
+                fixed_renew_interval=fixed_renew_interval,
+                shared_http_server=self._http_server,
+            )
+            if init_mdib:
+                ConsumerMdib(consumer).init_mdib()
+        except Exception:
+            consumer.stop_all(unsubscribe=False)
+            raise
+        with self._lock:
+            self._consumers.append(consumer)
+        return consumer
+
+    def remove_consumer(self, consumer: SdcConsumer, unsubscribe: bool = True):
+        """Stop the consumer and remove it from the hub."""
+        with self._lock:
+            self._consumers.remove(consumer)
+        consumer.stop_all(unsubscribe)
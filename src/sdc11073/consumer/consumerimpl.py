@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import copy
 import dataclasses
 import functools
@@ -29,7 +30,7 @@ from sdc11073.consumer import (
 )
 from sdc11073.consumer.operations import OperationsManager, OperationsManagerProtocol
 from sdc11073.consumer.request_handler_deferred import DispatchKeyRegistryDeferred, EmptyResponse
-from sdc11073.consumer.subscription import ConsumerSubscriptionManager
+from sdc11073.consumer.subscription import ConsumerSubscriptionManager, ConsumerSubscriptionManagerAsync
 from sdc11073.definitions_base import ProtocolsRegistry
 from sdc11073.dispatch import DispatchKey, MessageConverterMiddleware
 from sdc11073.exceptions import ApiUsageError
@@ -39,6 +40,7 @@ from sdc11073.namespaces import EventingActions
 from sdc11073.pysoap.msgfactory import MessageFactory
 from sdc11073.pysoap.msgreader import MessageReader
 from sdc11073.pysoap.soapclient import SoapClient
+from sdc11073.pysoap.soapclient_async import SoapClientAsync
 from sdc11073.xml_types import eventing_types, mex_types
 from sdc11073.xml_types.addressing_types import HeaderInformationBlock
 from sdc11073.xml_types.dpws_types import DeviceEventingFilterDialectURI
@@ -57,6 +59,7 @@ if TYPE_CHECKING:
     from sdc11073.dispatch.request import RequestData
     from sdc11073.mdib.consumermdib import ConsumerMdib
     from sdc11073.namespaces import PrefixNamespace
+    from sdc11073.provider.scheduler import Scheduler
     from sdc11073.pysoap import msgreader
     from sdc11073.pysoap.msgreader import ReceivedMessage
     from sdc11073.pysoap.soapclient import SoapClientProtocol
@@ -262,6 +265,9 @@ class SdcConsumer:
         socket_timeout: int = 5,
         force_ssl_connect: bool = False,
         alternative_hostname: str | None = None,
+        scheduler: Scheduler | None = None,
+        async_loop: asyncio.AbstractEventLoop | None = None,
+        async_request_limiter: asyncio.Semaphore | None = None,
     ):
         """Construct a SdcConsumer.
 
@@ -281,6 +287,13 @@ class SdcConsumer:
                                          it tries an unencrypted connection
         :param alternative_hostname: if supplied this hostname is used in xaddr, default is to use numerical
                                      ipv4 address (can be used to use full qualified hostname)
+        :param scheduler: if provided, it is passed to the subscription manager that renews subscriptions with a job
+                          of the scheduler instead of an own thread
+        :param async_loop: if provided, the async soap clients run on this (already running) event loop. They are
+                           used by the async methods of the service clients (async_get_mdib, async_activate, ...)
+                           and by an async subscription manager.
+        :param async_request_limiter: if provided, it limits the number of concurrent requests of the async methods
+                                      of the service clients. It can be shared by many consumers on the same loop.
         """
         if not provider_address.startswith('http'):
             msg = f'Invalid provider address, it must be match http(s)://<netloc> syntax - got {provider_address}'
@@ -334,6 +347,10 @@ class SdcConsumer:
         self._service_clients = {}
         self._mdib = None
         self._soap_clients = {}  # all http connections that this client holds
+        self._async_soap_clients: dict[tuple[bool, str], SoapClientAsync] = {}
+        self._scheduler = scheduler
+        self._async_loop = async_loop
+        self.async_request_limiter = async_request_limiter
         self.peer_certificate = None
         self.binary_peer_certificate = None
         self.all_subscribed = False
@@ -385,6 +402,16 @@ class SdcConsumer:
         """Return associated mdib."""
         return self._mdib
 
+    def pending_mdib_versions(self) -> set[int]:
+        """Return the MdibVersions of received notifications that are not yet processed.
+
+        Only a deferred action dispatcher can overtake notifications, all other dispatchers return an empty set.
+        """
+        pending_mdib_versions = getattr(self._services_dispatcher, 'pending_mdib_versions', None)
+        if pending_mdib_versions is None:
+            return set()
+        return pending_mdib_versions()
+
     @property
     def _epr_urn(self) -> str:
         """Return end point reference, e.g 'urn:uuid:8c26f673-fdbf-4380-b5ad-9e2454a65b6b'."""
@@ -471,6 +498,28 @@ class SdcConsumer:
         subscription.subscribe(expire_seconds, any_elements, any_attributes)
         return subscription
 
+    async def async_do_subscribe(  # noqa: PLR0913
+        self,
+        dpws_hosted: HostedServiceType,
+        filter_type: eventing_types.FilterType,
+        actions: Iterable[DispatchKey],
+        expire_seconds: int = 60,
+        any_elements: list[xml_utils.LxmlElement] | None = None,
+        any_attributes: dict | None = None,
+    ) -> ConsumerSubscription:
+        """Send subscribe request to provider with the async soap client, see do_subscribe.
+
+        The subscription is renewed by the subscription manager like the subscriptions of do_subscribe.
+        """
+        subscription = self.mk_subscription(dpws_hosted, filter_type, actions)
+        properties.bind(subscription, notification_data=self._on_notification)
+        await subscription.async_subscribe(self.get_async_soap_client, expire_seconds, any_elements, any_attributes)
+        return subscription
+
+    async def async_unsubscribe_all(self) -> bool:
+        """Send Unsubscribe messages for all subscriptions concurrently with the async soap clients."""
+        return await self._subscription_mgr.async_unsubscribe_all(self.get_async_soap_client)
+
     def client(self, port_type_name: str) -> HostedServiceClient | None:
         """Return the client for the given port type name.
 
@@ -583,6 +632,14 @@ class SdcConsumer:
         self._start_event_sink(shared_http_server, http_server_start_timeout)
 
         # start subscription manager
+        subscription_manager_kwargs = {}
+        if self._scheduler is not None:
+            subscription_manager_kwargs['scheduler'] = self._scheduler
+        if self._async_loop is not None and issubclass(
+            self._components.subscription_manager_class, ConsumerSubscriptionManagerAsync,
+        ):
+            subscription_manager_kwargs['async_loop'] = self._async_loop
+            subscription_manager_kwargs['get_async_soap_client_func'] = self.get_async_soap_client
         self._subscription_mgr = self._components.subscription_manager_class(
             self.msg_reader,
             self.msg_factory,
@@ -591,6 +648,7 @@ class SdcConsumer:
             self.base_url,
             log_prefix=self.log_prefix,
             fixed_renew_interval=fixed_renew_interval,
+            **subscription_manager_kwargs,
         )
         self._subscription_mgr.start()
 
@@ -662,6 +720,9 @@ class SdcConsumer:
         for client in self._soap_clients.values():
             client.close()
         self._soap_clients = {}
+        for async_client in self._async_soap_clients.values():
+            asyncio.run_coroutine_threadsafe(async_client.async_close(), self._async_loop).result()
+        self._async_soap_clients = {}
         self._stop_event_sink()
 
     def restart(self):
@@ -743,6 +804,28 @@ class SdcConsumer:
             self._soap_clients[key] = soap_client
         return soap_client
 
+    def get_async_soap_client(self, address: str) -> SoapClientAsync:
+        """Return the async soap client for address, it can only be used in the event loop of the consumer."""
+        if self._async_loop is None:
+            raise ApiUsageError('SdcConsumer has no event loop for async soap clients')
+        _url = urlparse(address)
+        use_ssl = self.is_ssl_connection is not False
+        key = (use_ssl, _url.netloc)
+        soap_client = self._async_soap_clients.get(key)
+        if soap_client is None:
+            soap_client = SoapClientAsync(
+                _url.netloc,
+                self._socket_timeout,
+                loghelper.get_logger_adapter('sdc.client.soap', self.log_prefix),
+                ssl_context=self._ssl_context_container.client_context if use_ssl else None,
+                sdc_definitions=self.sdc_definitions,
+                msg_reader=self.msg_reader,
+                supported_encodings=self._compression_methods,
+                chunk_size=self.request_chunk_size,
+            )
+            self._async_soap_clients[key] = soap_client
+        return soap_client
+
     def _forget_soap_client(self, soap_client: SoapClientProtocol):
         for key, value in self._soap_clients.items():
             if value is soap_client:
@@ -820,8 +903,14 @@ class SdcConsumer:
         self._http_server.dispatcher.register_instance(self.path_prefix, self._msg_converter)
 
     def _stop_event_sink(self):
-        if self._is_internal_http_server and self._http_server is not None:
+        if self._http_server is None:
+            return
+        if self._is_internal_http_server:
             self._http_server.stop()
+        else:
+            # a shared http server keeps running, free the path for a restart of this consumer
+            self._http_server.dispatcher.unregister_instance(self.path_prefix)
+            self._http_server = None
 
     def _on_notification(self, message_data: ReceivedMessage):
         self.state_event_report = message_data  # update observable
@@ -43,6 +43,12 @@ class OperationsManagerProtocol(Protocol):
         The Future object has a result as soon as a final transaction state is received.
         """
 
+    def handle_set_response(self, message_data: ReceivedMessage) -> Future:
+        """Return a Future for the operation that was called with a message that got this response.
+
+        This is used if the request was not sent by call_operation, e.g. by an async soap client.
+        """
+
     def on_operation_invoked_report(self, message_data: ReceivedMessage):
         """Check operation state and set future result if it is a final state."""
 
@@ -103,12 +109,16 @@ class OperationsManager(OperationsManagerProtocol):  # inheriting from protocol
         request_manipulator: RequestManipulatorProtocol | None = None,
     ) -> Future:
         """Call an operation."""
-        future_object = Future()
         message_data = hosted_service_client.post_message(
             message,
             msg='call Operation',
             request_manipulator=request_manipulator,
         )
+        return self.handle_set_response(message_data)
+
+    def handle_set_response(self, message_data: ReceivedMessage) -> Future:
+        """Return a Future for the operation that was called with a message that got this response."""
+        future_object = Future()
         with self._transactions_lock:
             msg_types = self._msg_reader.msg_types
             abstract_set_response = msg_types.AbstractSetResponse.from_node(message_data.p_msg.msg_node)
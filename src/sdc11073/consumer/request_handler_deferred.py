@@ -1,16 +1,24 @@
 from __future__ import annotations
 
-import queue
+import dataclasses
+import enum
 import threading
+import time
 import traceback
+from collections import Counter, defaultdict, deque
 from typing import TYPE_CHECKING
 
 from sdc11073.dispatch import RequestData, RequestDispatcher
 from sdc11073.exceptions import InvalidActionError
 from sdc11073.pysoap.msgfactory import CreatedMessage
 from sdc11073.pysoap.soapenvelope import Fault, faultcodeEnum
+from sdc11073.xml_types.actions import Actions
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable
+
+    from sdc11073.dispatch.dispatchkey import OnPostHandler
+
     from .manipulator import RequestManipulatorProtocol
 
 
@@ -27,19 +35,174 @@ class EmptyResponse(CreatedMessage):
         return b''
 
 
+def lane_per_mdib_version_domain(request_data: RequestData) -> Hashable:  # noqa: ARG001
+    """Put all requests into the same lane.
+
+    All notifications of a provider share the same MdibVersion sequence, therefore they are all processed in the
+    order of reception. This is the default.
+    """
+    return None
+
+
+def lane_per_action(request_data: RequestData) -> Hashable:
+    """Put requests into one lane per action.
+
+    Notifications with different actions are processed in parallel,
+    notifications with the same action keep the order of reception.
+    """
+    return request_data.message_data.action
+
+
+class NotificationPriority(enum.IntEnum):
+    """Priority classes of notifications, lanes with lower values are processed first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+NOTIFICATION_PRIORITIES: dict[str, NotificationPriority] = {
+    Actions.EpisodicAlertReport: NotificationPriority.HIGH,
+    Actions.OperationInvokedReport: NotificationPriority.HIGH,
+    Actions.DescriptionModificationReport: NotificationPriority.HIGH,
+    Actions.Waveform: NotificationPriority.LOW,
+    Actions.PeriodicMetricReport: NotificationPriority.LOW,
+    Actions.PeriodicAlertReport: NotificationPriority.LOW,
+    Actions.PeriodicComponentReport: NotificationPriority.LOW,
+    Actions.PeriodicContextReport: NotificationPriority.LOW,
+    Actions.PeriodicOperationalStateReport: NotificationPriority.LOW,
+}
+
+
+def priority_by_action(request_data: RequestData) -> NotificationPriority:
+    """Return the priority of the request according to NOTIFICATION_PRIORITIES, default is NORMAL."""
+    return NOTIFICATION_PRIORITIES.get(request_data.message_data.action, NotificationPriority.NORMAL)
+
+
+def lane_per_priority(request_data: RequestData) -> Hashable:
+    """Put requests into one lane per priority class.
+
+    Notifications of the same priority class keep the order of reception.
+    """
+    return priority_by_action(request_data)
+
+
+class OverloadPolicy(enum.Enum):
+    """Determines what happens if a new request is received while the queue is full."""
+
+    BLOCK = enum.auto()  # block the caller (the http request handler) until there is space in the queue
+    DROP_OLDEST_DROPPABLE = enum.auto()  # drop the oldest queued request with a droppable action, otherwise block
+
+
+@dataclasses.dataclass
+class LaneStatistics:
+    """Statistics of a single lane of DispatchKeyRegistryDeferred."""
+
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    processed: int = 0
+    dropped: int = 0
+    latency_sum: float = 0.0  # time from reception until handler returned
+    latency_max: float = 0.0
+
+    @property
+    def latency_avg(self) -> float | None:
+        """Return the average processing latency in seconds."""
+        if self.processed == 0:
+            return None
+        return self.latency_sum / self.processed
+
+
+@dataclasses.dataclass
+class _QueueEntry:
+    func: OnPostHandler
+    request_data: RequestData
+    action: str
+    received: float
+    mdib_version: int | None
+
+
+class _Lane:
+    """A lane keeps its entries in order, only one worker at a time processes entries of a lane."""
+
+    def __init__(self, key: Hashable, priority: int):
+        self.key = key
+        self.priority = priority
+        self.entries: deque[_QueueEntry] = deque()
+        self.busy = False  # a worker is processing an entry of this lane
+        self.scheduled = False  # lane is in the list of ready lanes
+        self.statistics = LaneStatistics()
+
+
 class DispatchKeyRegistryDeferred(RequestDispatcher):
     """A middleware that splits request processing into two parts.
 
-    It writes the request to a queue and returns immediately. A worker thread is responsible for the further handling.
+    It writes the request to a queue and returns immediately. Worker threads are responsible for the further handling.
     This allows a faster response.
+    Requests are sorted into lanes by the lane_key function. Requests of the same lane are processed one after
+    the other in order of reception, different lanes are processed in parallel if worker_count > 1.
+    If a priority function is given, a free worker always takes the next request from the ready lane with the
+    highest priority (the lowest value). The priority of a lane is the priority of the request that created it.
+    With more than one lane, requests can overtake requests with an older MdibVersion. pending_mdib_versions tells
+    a ConsumerMdib which of the older MdibVersions are still to come, so that it applies them instead of
+    ignoring them as too old.
+    The class is instantiated by the consumer with the log_prefix as only argument, use functools.partial or a
+    derived class to configure the other parameters.
     """
 
-    def __init__(self, log_prefix: str):
+    def __init__(self,  # noqa: PLR0913
+                 log_prefix: str,
+                 worker_count: int = 1,
+                 max_queue_size: int = 1000,
+                 lane_key: Callable[[RequestData], Hashable] = lane_per_mdib_version_domain,
+                 overload_policy: OverloadPolicy = OverloadPolicy.BLOCK,
+                 droppable_actions: Iterable[str] = (Actions.Waveform,),
+                 priority: Callable[[RequestData], int] | None = None):
+        """Construct a DispatchKeyRegistryDeferred.
+
+        :param log_prefix: prefix for logging
+        :param worker_count: number of worker threads
+        :param max_queue_size: max. number of queued requests (all lanes)
+        :param lane_key: a function that determines the lane of a request
+        :param overload_policy: determines what happens if queue is full
+        :param droppable_actions: actions that can be dropped with OverloadPolicy.DROP_OLDEST_DROPPABLE
+        :param priority: a function that determines the priority of a lane, None means all lanes are equal
+        """
         super().__init__(log_prefix)
-        self._queue = queue.Queue(1000)
-        self._worker = threading.Thread(target=self._read_queue)
-        self._worker.daemon = True
-        self._worker.start()
+        self._max_queue_size = max_queue_size
+        self._lane_key = lane_key
+        self._overload_policy = overload_policy
+        self._droppable_actions = frozenset(droppable_actions)
+        self._priority = priority
+        self._lanes: dict[Hashable, _Lane] = {}
+        self._ready_lanes: dict[int, deque[_Lane]] = defaultdict(deque)  # key is priority
+        self._ready_lanes_count = 0
+        self._queue_depth = 0
+        self._pending_mdib_versions = Counter()  # MdibVersions of queued requests and of requests in process
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._space_available = threading.Condition(self._lock)
+        self._workers = []
+        for i in range(worker_count):
+            worker = threading.Thread(target=self._read_queue, name=f'{self.__class__.__name__}_{i}')
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of currently queued requests."""
+        return self._queue_depth
+
+    def get_statistics(self) -> dict[Hashable, LaneStatistics]:
+        """Return a copy of the statistics of all lanes."""
+        with self._lock:
+            return {key: dataclasses.replace(lane.statistics) for key, lane in self._lanes.items()}
+
+    def pending_mdib_versions(self) -> set[int]:
+        """Return the MdibVersions of the queued requests and of the requests that are currently processed."""
+        with self._lock:
+            return set(self._pending_mdib_versions)
 
     def on_post(self, request_data: RequestData) -> CreatedMessage:
         """See documentation in RequestHandlerProtocol."""
@@ -51,15 +214,131 @@ class DispatchKeyRegistryDeferred(RequestDispatcher):
             fault.add_reason_text(f'invalid action {action}')
 
             raise InvalidActionError(fault)
-        self._queue.put((func, request_data, action))
+        mdib_version_group = getattr(request_data.message_data, 'mdib_version_group', None)
+        mdib_version = None if mdib_version_group is None else mdib_version_group.mdib_version
+        self._enqueue(_QueueEntry(func, request_data, action, time.monotonic(), mdib_version),
+                      self._lane_key(request_data))
         return EmptyResponse()
 
+    def _enqueue(self, entry: _QueueEntry, key: Hashable):
+        priority = 0 if self._priority is None else self._priority(entry.request_data)
+        with self._lock:
+            while self._queue_depth >= self._max_queue_size:
+                if self._overload_policy == OverloadPolicy.DROP_OLDEST_DROPPABLE and self._drop_oldest_droppable():
+                    break
+                self._space_available.wait()
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = _Lane(key, priority)
+                self._lanes[key] = lane
+            lane.entries.append(entry)
+            self._queue_depth += 1
+            if entry.mdib_version is not None:
+                self._pending_mdib_versions[entry.mdib_version] += 1
+            lane.statistics.queue_depth = len(lane.entries)
+            lane.statistics.max_queue_depth = max(lane.statistics.max_queue_depth, lane.statistics.queue_depth)
+            self._schedule_lane(lane)
+
+    def _schedule_lane(self, lane: _Lane):
+        """Add lane to ready lanes if it has entries and no worker is processing it. Call only with lock acquired."""
+        if lane.entries and not lane.busy and not lane.scheduled:
+            lane.scheduled = True
+            self._ready_lanes[lane.priority].append(lane)
+            self._ready_lanes_count += 1
+            self._work_available.notify()
+
+    def _next_ready_lane(self) -> _Lane:
+        """Return the next lane to process. Call only with lock acquired and ready lanes available."""
+        for priority in sorted(self._ready_lanes):
+            ready_lanes = self._ready_lanes[priority]
+            if ready_lanes:
+                self._ready_lanes_count -= 1
+                return ready_lanes.popleft()
+        raise RuntimeError('no ready lane')
+
+    def _has_ready_lanes(self) -> bool:
+        return self._ready_lanes_count > 0
+
+    def _release_mdib_version(self, entry: _QueueEntry):
+        """Remove the MdibVersion of a dropped or processed entry from the pending versions. Call with lock acquired."""
+        if entry.mdib_version is None:
+            return
+        self._pending_mdib_versions[entry.mdib_version] -= 1
+        if self._pending_mdib_versions[entry.mdib_version] <= 0:
+            del self._pending_mdib_versions[entry.mdib_version]
+
+    def _drop_oldest_droppable(self) -> bool:
+        """Remove the oldest queued entry with a droppable action. Call only with lock acquired.
+
+        :return: True if an entry was dropped.
+        """
+        oldest: tuple[_Lane, int, _QueueEntry] | None = None
+        for lane in self._lanes.values():
+            for index, entry in enumerate(lane.entries):
+                if entry.action in self._droppable_actions:
+                    if oldest is None or entry.received < oldest[2].received:
+                        oldest = (lane, index, entry)
+                    break  # entries of a lane are sorted by reception time
+        if oldest is None:
+            return False
+        lane, index, entry = oldest
+        del lane.entries[index]
+        self._queue_depth -= 1
+        lane.statistics.queue_depth = len(lane.entries)
+        lane.statistics.dropped += 1
+        self._release_mdib_version(entry)
+        self._logger.warning('queue full, dropped request for action "{}"', entry.action)  # noqa: PLE1205
+        return True
+
     def _read_queue(self):
         while True:
-            func, request, action = self._queue.get()
+            with self._lock:
+                while not self._has_ready_lanes():
+                    self._work_available.wait()
+                lane = self._next_ready_lane()
+                lane.scheduled = False
+                if not lane.entries:  # all entries were dropped
+                    continue
+                lane.busy = True
+                entry = lane.entries.popleft()
+                self._queue_depth -= 1
+                lane.statistics.queue_depth = len(lane.entries)
+                self._space_available.notify()
             try:
-                func(request)
+                entry.func(entry.request_data)
             except Exception:  # noqa: BLE001
                 # catch all to keep thread alive
                 self._logger.error('method {} for action "{}" failed:{}',  # noqa: PLE1205
-                                   func.__name__, action, traceback.format_exc())
+                                   entry.func.__name__, entry.action, traceback.format_exc())
+            latency = time.monotonic() - entry.received
+            with self._lock:
+                lane.busy = False
+                self._release_mdib_version(entry)
+                lane.statistics.processed += 1
+                lane.statistics.latency_sum += latency
+                lane.statistics.latency_max = max(lane.statistics.latency_max, latency)
+                self._schedule_lane(lane)
+
+
+class PriorityDispatchKeyRegistryDeferred(DispatchKeyRegistryDeferred):
+    """A DispatchKeyRegistryDeferred that processes notifications according to NOTIFICATION_PRIORITIES.
+
+    Alert, operation invoked and description modification reports go ahead of all other notifications,
+    waveforms and periodic reports are processed after all other notifications.
+    Use it as action_dispatcher_class in SdcConsumerComponents.
+    If the queue is full, the oldest waveform is dropped.
+    Notifications that are overtaken by a notification of higher priority have an older MdibVersion when they are
+    processed. A ConsumerMdib still applies them (states with an older StateVersion are ignored), it only reports
+    a gap in the MdibVersions for notifications that were dropped.
+    """
+
+    def __init__(self,  # noqa: PLR0913
+                 log_prefix: str,
+                 worker_count: int = 1,
+                 max_queue_size: int = 1000,
+                 lane_key: Callable[[RequestData], Hashable] = lane_per_priority,
+                 overload_policy: OverloadPolicy = OverloadPolicy.DROP_OLDEST_DROPPABLE,
+                 droppable_actions: Iterable[str] = (Actions.Waveform,),
+                 priority: Callable[[RequestData], int] | None = priority_by_action):
+        super().__init__(log_prefix, worker_count, max_queue_size, lane_key, overload_policy, droppable_actions,
+                         priority)
@@ -18,7 +18,10 @@ if TYPE_CHECKING:
     from lxml import etree
 
     from sdc11073.consumer.manipulator import RequestManipulatorProtocol
+    from sdc11073.consumer.operations import OperationResult
     from sdc11073.mdib.statecontainers import AbstractMultiStateProtocol
+    from sdc11073.pysoap.msgfactory import CreatedMessage
+    from sdc11073.pysoap.msgreader import ReceivedMessage
     from sdc11073.xml_types.pm_types import InstanceIdentifier
 
 
@@ -70,6 +73,20 @@ class ContextServiceClient(HostedServiceClient):
         :param request_manipulator: see documentation of RequestManipulatorProtocol
         :return: a concurrent.futures.Future object
         """
+        message = self._mk_set_context_state_message(operation_handle, proposed_context_states)
+        return self._call_operation(message, request_manipulator=request_manipulator)
+
+    async def async_set_context_state(
+        self,
+        operation_handle: str,
+        proposed_context_states: list,
+        request_manipulator: RequestManipulatorProtocol | None = None,
+    ) -> OperationResult:
+        """Send a SetContextState request with the async soap client and wait for the final result."""
+        message = self._mk_set_context_state_message(operation_handle, proposed_context_states)
+        return await self._async_call_operation(message, request_manipulator=request_manipulator)
+
+    def _mk_set_context_state_message(self, operation_handle: str, proposed_context_states: list) -> CreatedMessage:
         data_model = self._sdc_definitions.data_model
         tmp = ', '.join(
             [
@@ -82,8 +99,7 @@ class ContextServiceClient(HostedServiceClient):
         request.OperationHandleRef = operation_handle
         request.ProposedContextState.extend(proposed_context_states)
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        return self._call_operation(message, request_manipulator=request_manipulator)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
 
     def get_context_states(
         self,
@@ -96,13 +112,28 @@ class ContextServiceClient(HostedServiceClient):
         :param request_manipulator: see documentation of RequestManipulatorProtocol
         :return: result of the call
         """
-        data_model = self._sdc_definitions.data_model
-        request = data_model.msg_types.GetContextStates()
+        message = self._mk_get_context_states_message(handles)
+        received_message_data = self.post_message(message, request_manipulator=request_manipulator)
+        return self._mk_get_context_states_result(received_message_data)
+
+    async def async_get_context_states(
+        self,
+        handles: list[str] | None = None,
+        request_manipulator: RequestManipulatorProtocol | None = None,
+    ) -> GetRequestResult:
+        """Send a GetContextStates request with the async soap client, see get_context_states."""
+        message = self._mk_get_context_states_message(handles)
+        received_message_data = await self.async_post_message(message, request_manipulator=request_manipulator)
+        return self._mk_get_context_states_result(received_message_data)
+
+    def _mk_get_context_states_message(self, handles: list[str] | None) -> CreatedMessage:
+        request = self._sdc_definitions.data_model.msg_types.GetContextStates()
         if handles is not None:
             request.HandleRef.extend(handles)
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        received_message_data = self.post_message(message, request_manipulator=request_manipulator)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
+
+    def _mk_get_context_states_result(self, received_message_data: ReceivedMessage) -> GetRequestResult:
         cls = received_message_data.msg_reader.msg_types.GetContextStatesResponse
         report = cls.from_node(received_message_data.p_msg.msg_node)
         return GetRequestResult(received_message_data, report)
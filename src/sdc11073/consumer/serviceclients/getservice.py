@@ -9,20 +9,35 @@ from .serviceclientbase import GetRequestResult, HostedServiceClient
 
 if TYPE_CHECKING:
     from sdc11073.consumer.manipulator import RequestManipulatorProtocol
+    from sdc11073.pysoap.msgfactory import CreatedMessage
+    from sdc11073.pysoap.msgreader import ReceivedMessage
 
 
 class GetServiceClient(HostedServiceClient):
-    """Client for GetService."""
+    """Client for GetService.
+
+    Every request has a blocking variant and an async variant (async_ prefix) that uses the async soap client.
+    """
 
     port_type_name = PrefixesEnum.SDC.tag('GetService')
 
     def get_mdib(self, request_manipulator: RequestManipulatorProtocol | None = None) -> GetRequestResult:
         """Send a GetMdib request."""
-        data_model = self._sdc_definitions.data_model
-        request = data_model.msg_types.GetMdib()
+        received_message_data = self.post_message(self._mk_get_mdib_message(), request_manipulator=request_manipulator)
+        return self._mk_get_mdib_result(received_message_data)
+
+    async def async_get_mdib(self, request_manipulator: RequestManipulatorProtocol | None = None) -> GetRequestResult:
+        """Send a GetMdib request with the async soap client."""
+        received_message_data = await self.async_post_message(self._mk_get_mdib_message(),
+                                                              request_manipulator=request_manipulator)
+        return self._mk_get_mdib_result(received_message_data)
+
+    def _mk_get_mdib_message(self) -> CreatedMessage:
+        request = self._sdc_definitions.data_model.msg_types.GetMdib()
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        received_message_data = self.post_message(message, request_manipulator=request_manipulator)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
+
+    def _mk_get_mdib_result(self, received_message_data: ReceivedMessage) -> GetRequestResult:
         result = received_message_data.msg_reader.read_get_mdib_response(received_message_data)
         return GetRequestResult(received_message_data, result)
 
@@ -33,16 +48,28 @@ class GetServiceClient(HostedServiceClient):
         :param requested_handles: None if all states shall be requested, otherwise a list of handles
         :param request_manipulator: see documentation of RequestManipulatorProtocol
         """
-        data_model = self._sdc_definitions.data_model
-        request = data_model.msg_types.GetMdDescription()
+        message = self._mk_get_md_description_message(requested_handles)
+        received_message_data = self.post_message(message, request_manipulator=request_manipulator)
+        return self._mk_get_md_description_result(received_message_data)
+
+    async def async_get_md_description(self, requested_handles: list[str] | None = None,
+                                       request_manipulator: RequestManipulatorProtocol | None = None,
+                                       ) -> GetRequestResult:
+        """Send a GetMdDescription request with the async soap client, see get_md_description."""
+        message = self._mk_get_md_description_message(requested_handles)
+        received_message_data = await self.async_post_message(message, request_manipulator=request_manipulator)
+        return self._mk_get_md_description_result(received_message_data)
+
+    def _mk_get_md_description_message(self, requested_handles: list[str] | None) -> CreatedMessage:
+        request = self._sdc_definitions.data_model.msg_types.GetMdDescription()
         if requested_handles is not None:
             request.HandleRef.extend(requested_handles)
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        received_message_data = self.post_message(message, request_manipulator=request_manipulator)
-        cls = data_model.msg_types.GetMdDescriptionResponse
-        report = cls.from_node(received_message_data.p_msg.msg_node)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
 
+    def _mk_get_md_description_result(self, received_message_data: ReceivedMessage) -> GetRequestResult:
+        cls = self._sdc_definitions.data_model.msg_types.GetMdDescriptionResponse
+        report = cls.from_node(received_message_data.p_msg.msg_node)
         return GetRequestResult(received_message_data, report)
 
     def get_md_state(self, requested_handles: list[str] | None = None,
@@ -52,13 +79,25 @@ class GetServiceClient(HostedServiceClient):
         :param requested_handles: None if all states shall be requested, otherwise a list of handles
         :param request_manipulator: see documentation of RequestManipulatorProtocol
         """
-        data_model = self._sdc_definitions.data_model
-        request = data_model.msg_types.GetMdState()
+        message = self._mk_get_md_state_message(requested_handles)
+        received_message_data = self.post_message(message, request_manipulator=request_manipulator)
+        return self._mk_get_md_state_result(received_message_data)
+
+    async def async_get_md_state(self, requested_handles: list[str] | None = None,
+                                 request_manipulator: RequestManipulatorProtocol | None = None) -> GetRequestResult:
+        """Send a GetMdState request with the async soap client, see get_md_state."""
+        message = self._mk_get_md_state_message(requested_handles)
+        received_message_data = await self.async_post_message(message, request_manipulator=request_manipulator)
+        return self._mk_get_md_state_result(received_message_data)
+
+    def _mk_get_md_state_message(self, requested_handles: list[str] | None) -> CreatedMessage:
+        request = self._sdc_definitions.data_model.msg_types.GetMdState()
         if requested_handles is not None:
             request.HandleRef.extend(requested_handles)
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        received_message_data = self.post_message(message, request_manipulator=request_manipulator)
-        cls = data_model.msg_types.GetMdStateResponse
+        return self._msg_factory.mk_soap_message(inf, payload=request)
+
+    def _mk_get_md_state_result(self, received_message_data: ReceivedMessage) -> GetRequestResult:
+        cls = self._sdc_definitions.data_model.msg_types.GetMdStateResponse
         report = cls.from_node(received_message_data.p_msg.msg_node)
         return GetRequestResult(received_message_data, report)
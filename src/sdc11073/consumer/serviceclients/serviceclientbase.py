@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import weakref
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
@@ -16,7 +17,7 @@ if TYPE_CHECKING:
 
     from sdc11073.consumer.consumerimpl import SdcConsumer
     from sdc11073.consumer.manipulator import RequestManipulatorProtocol
-    from sdc11073.consumer.operations import OperationsManagerProtocol
+    from sdc11073.consumer.operations import OperationResult, OperationsManagerProtocol
     from sdc11073.dispatch import DispatchKey
     from sdc11073.mdib.consumermdib import ConsumerMdib
     from sdc11073.namespaces import PrefixNamespace
@@ -125,6 +126,13 @@ class HostedServiceClient:
     ) -> Future:
         return self._operations_manager.call_operation(self, message, request_manipulator)
 
+    async def _async_call_operation(
+        self, message: CreatedMessage, request_manipulator: RequestManipulatorProtocol | None = None,
+    ) -> OperationResult:
+        received_message_data = await self.async_post_message(message, request_manipulator=request_manipulator)
+        future = self._operations_manager.handle_set_response(received_message_data)
+        return await asyncio.wrap_future(future)
+
     def get_available_subscriptions(self) -> tuple[DispatchKey]:
         """Return the notifications that a service offers.
 
@@ -151,3 +159,26 @@ class HostedServiceClient:
         if response is None:
             raise ValueError('expect a response, got None')
         return response
+
+    async def async_post_message(
+        self,
+        created_message: CreatedMessage,
+        request_manipulator: RequestManipulatorProtocol | None = None,
+    ) -> ReceivedMessage:
+        """Post the created message to provider with the async soap client of the consumer.
+
+        The method must be called in the event loop of the consumer. If the consumer has an async request limiter,
+        the number of concurrent requests of all consumers that share the limiter is bounded.
+        """
+        soap_client = self._sdc_client.get_async_soap_client(self.endpoint_reference.Address)
+        limiter = self._sdc_client.async_request_limiter
+        if limiter is None:
+            response = await soap_client.async_post_message_to(self._url.path, created_message, request_manipulator)
+        else:
+            async with limiter:
+                response = await soap_client.async_post_message_to(
+                    self._url.path, created_message, request_manipulator,
+                )
+        if response is None:
+            raise ValueError('expect a response, got None')
+        return response
@@ -15,12 +15,18 @@ if TYPE_CHECKING:
     from concurrent.futures import Future
 
     from sdc11073.consumer.manipulator import RequestManipulatorProtocol
+    from sdc11073.consumer.operations import OperationResult
     from sdc11073.mdib.statecontainers import AbstractStateProtocol
+    from sdc11073.pysoap.msgfactory import CreatedMessage
     from sdc11073.xml_types.msg_types import Argument
 
 
 class SetServiceClient(HostedServiceClient):
-    """Client for SetService."""
+    """Client for SetService.
+
+    Every operation has a blocking variant that returns a concurrent.futures.Future and an async variant
+    (async_ prefix) that sends the request with the async soap client and returns the final OperationResult.
+    """
 
     port_type_name = PrefixesEnum.SDC.tag('SetService')
     notifications = (DispatchKey(Actions.OperationInvokedReport, msg_qnames.OperationInvokedReport),)
@@ -35,6 +41,19 @@ class SetServiceClient(HostedServiceClient):
         :param request_manipulator:
         :return: a Future object
         """
+        message = self._mk_set_numeric_value_message(operation_handle, requested_numeric_value)
+        return self._call_operation(message, request_manipulator=request_manipulator)
+
+    async def async_set_numeric_value(self, operation_handle: str,
+                                      requested_numeric_value: Decimal | float | int | str,
+                                      request_manipulator: RequestManipulatorProtocol | None = None,
+                                      ) -> OperationResult:
+        """Send a SetValue request with the async soap client and wait for the final result."""
+        message = self._mk_set_numeric_value_message(operation_handle, requested_numeric_value)
+        return await self._async_call_operation(message, request_manipulator=request_manipulator)
+
+    def _mk_set_numeric_value_message(self, operation_handle: str,
+                                      requested_numeric_value: Decimal | float | int | str) -> CreatedMessage:
         data_model = self._sdc_definitions.data_model
         self._logger.info('set_numeric_value operation_handle={} requested_numeric_value={}',  # noqa: PLE1205
                           operation_handle, requested_numeric_value)
@@ -46,8 +65,7 @@ class SetServiceClient(HostedServiceClient):
         else:
             request.RequestedNumericValue = Decimal(requested_numeric_value)
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        return self._call_operation(message, request_manipulator=request_manipulator)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
 
     def set_string(self, operation_handle: str,
                    requested_string: str,
@@ -59,6 +77,17 @@ class SetServiceClient(HostedServiceClient):
         :param request_manipulator:
         :return: a Future object
         """
+        message = self._mk_set_string_message(operation_handle, requested_string)
+        return self._call_operation(message, request_manipulator=request_manipulator)
+
+    async def async_set_string(self, operation_handle: str,
+                               requested_string: str,
+                               request_manipulator: RequestManipulatorProtocol | None = None) -> OperationResult:
+        """Send a SetString request with the async soap client and wait for the final result."""
+        message = self._mk_set_string_message(operation_handle, requested_string)
+        return await self._async_call_operation(message, request_manipulator=request_manipulator)
+
+    def _mk_set_string_message(self, operation_handle: str, requested_string: str) -> CreatedMessage:
         data_model = self._sdc_definitions.data_model
         self._logger.info('set_string operation_handle={} requested_string={}',  # noqa: PLE1205
                           operation_handle, requested_string)
@@ -66,8 +95,7 @@ class SetServiceClient(HostedServiceClient):
         request.OperationHandleRef = operation_handle
         request.RequestedStringValue = requested_string
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        return self._call_operation(message, request_manipulator=request_manipulator)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
 
     def set_alert_state(self, operation_handle: str,
                         proposed_alert_state: AbstractStateProtocol,
@@ -79,6 +107,19 @@ class SetServiceClient(HostedServiceClient):
         :param request_manipulator:
         :return: a Future object
         """
+        message = self._mk_set_alert_state_message(operation_handle, proposed_alert_state)
+        return self._call_operation(message, request_manipulator=request_manipulator)
+
+    async def async_set_alert_state(self, operation_handle: str,
+                                    proposed_alert_state: AbstractStateProtocol,
+                                    request_manipulator: RequestManipulatorProtocol | None = None,
+                                    ) -> OperationResult:
+        """Send a SetAlertState request with the async soap client and wait for the final result."""
+        message = self._mk_set_alert_state_message(operation_handle, proposed_alert_state)
+        return await self._async_call_operation(message, request_manipulator=request_manipulator)
+
+    def _mk_set_alert_state_message(self, operation_handle: str,
+                                    proposed_alert_state: AbstractStateProtocol) -> CreatedMessage:
         data_model = self._sdc_definitions.data_model
         self._logger.info('set_alert_state operation_handle={} requestedAlertState={}',  # noqa: PLE1205
                           operation_handle, proposed_alert_state)
@@ -86,8 +127,7 @@ class SetServiceClient(HostedServiceClient):
         request.OperationHandleRef = operation_handle
         request.ProposedAlertState = proposed_alert_state
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        return self._call_operation(message, request_manipulator=request_manipulator)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
 
     def set_metric_state(self, operation_handle: str,
                          proposed_metric_states: list[AbstractStateProtocol],
@@ -99,6 +139,19 @@ class SetServiceClient(HostedServiceClient):
         :param request_manipulator:
         :return: a Future object
         """
+        message = self._mk_set_metric_state_message(operation_handle, proposed_metric_states)
+        return self._call_operation(message, request_manipulator=request_manipulator)
+
+    async def async_set_metric_state(self, operation_handle: str,
+                                     proposed_metric_states: list[AbstractStateProtocol],
+                                     request_manipulator: RequestManipulatorProtocol | None = None,
+                                     ) -> OperationResult:
+        """Send a SetMetricState request with the async soap client and wait for the final result."""
+        message = self._mk_set_metric_state_message(operation_handle, proposed_metric_states)
+        return await self._async_call_operation(message, request_manipulator=request_manipulator)
+
+    def _mk_set_metric_state_message(self, operation_handle: str,
+                                     proposed_metric_states: list[AbstractStateProtocol]) -> CreatedMessage:
         data_model = self._sdc_definitions.data_model
         self._logger.info('set_metric_state operation_handle={} requestedMetricState={}',  # noqa: PLE1205
                           operation_handle, proposed_metric_states)
@@ -106,8 +159,7 @@ class SetServiceClient(HostedServiceClient):
         request.OperationHandleRef = operation_handle
         request.ProposedMetricState.extend(proposed_metric_states)
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        return self._call_operation(message, request_manipulator=request_manipulator)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
 
     def activate(self, operation_handle: str,
                  arguments: list[Argument] | None = None,
@@ -119,6 +171,17 @@ class SetServiceClient(HostedServiceClient):
         :param request_manipulator:
         :return: a concurrent.futures.Future object
         """
+        message = self._mk_activate_message(operation_handle, arguments)
+        return self._call_operation(message, request_manipulator=request_manipulator)
+
+    async def async_activate(self, operation_handle: str,
+                             arguments: list[Argument] | None = None,
+                             request_manipulator: RequestManipulatorProtocol | None = None) -> OperationResult:
+        """Send an Activate request with the async soap client and wait for the final result."""
+        message = self._mk_activate_message(operation_handle, arguments)
+        return await self._async_call_operation(message, request_manipulator=request_manipulator)
+
+    def _mk_activate_message(self, operation_handle: str, arguments: list[Argument] | None) -> CreatedMessage:
         data_model = self._sdc_definitions.data_model
         self._logger.info('activate handle={} arguments={}', operation_handle, arguments)  # noqa: PLE1205
         request = data_model.msg_types.Activate()
@@ -127,8 +190,7 @@ class SetServiceClient(HostedServiceClient):
             for arg_value in arguments:
                 request.add_argument(arg_value)
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
-        message = self._msg_factory.mk_soap_message(inf, payload=request)
-        return self._call_operation(message, request_manipulator=request_manipulator)
+        return self._msg_factory.mk_soap_message(inf, payload=request)
 
     def set_component_state(self, operation_handle: str,
                             proposed_component_states: list[AbstractStateProtocol],
@@ -138,6 +200,19 @@ class SetServiceClient(HostedServiceClient):
         The set_component_state method corresponds to the SetComponentStateOperation objects in the MDIB
         and allows to insert or modify context states.
         """
+        message = self._mk_set_component_state_message(operation_handle, proposed_component_states)
+        return self._call_operation(message, request_manipulator=request_manipulator)
+
+    async def async_set_component_state(self, operation_handle: str,
+                                        proposed_component_states: list[AbstractStateProtocol],
+                                        request_manipulator: RequestManipulatorProtocol | None = None,
+                                        ) -> OperationResult:
+        """Send a SetComponentState request with the async soap client and wait for the final result."""
+        message = self._mk_set_component_state_message(operation_handle, proposed_component_states)
+        return await self._async_call_operation(message, request_manipulator=request_manipulator)
+
+    def _mk_set_component_state_message(self, operation_handle: str,
+                                        proposed_component_states: list[AbstractStateProtocol]) -> CreatedMessage:
         data_model = self._sdc_definitions.data_model
         tmp = ', '.join([f'{st.__class__.__name__} (DescriptorHandle={st.DescriptorHandle})'
                          for st in proposed_component_states])
@@ -148,4 +223,4 @@ class SetServiceClient(HostedServiceClient):
         inf = HeaderInformationBlock(action=request.action, addr_to=self.endpoint_reference.Address)
         message = self._msg_factory.mk_soap_message(inf, payload=request)
         self._logger.debug('set_component_state sends {}', lambda: message.serialize(pretty=True))  # noqa: PLE1205
-        return self._call_operation(message, request_manipulator=request_manipulator)
+        return message
@@ -0,0 +1,459 @@
+"""The module implements a gateway that distributes the consumers of many providers over several processes.
+
+The consumers of one process share the GIL; a SdcConsumerHub reduces the number of threads, but parsing of the
+notifications still uses only one core. The ShardedConsumerGateway starts one worker process (shard) per core, each
+of them runs a SdcConsumerHub with the consumers of a part of the providers.
+The workers export the latest metric values, alert states and waveform samples of their mdibs into shared memory
+(see sharedstate module), the front-end process reads them without pickling and without any messages between the
+processes. Only the commands to connect and disconnect devices and the results of these commands are sent via queues.
+
+New devices are assigned to the shard with the lowest number of devices. When devices leave, devices are moved from
+the shard with the most devices to the one with the fewest, until the numbers differ by at most one.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import traceback
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any
+
+from sdc11073 import loghelper, observableproperties
+from sdc11073.consumer.consumerhub import SdcConsumerHub
+from sdc11073.consumer.sharedstate import SharedStateReader, SharedStateWriter, shared_state_size
+from sdc11073.definitions_base import ProtocolsRegistry
+from sdc11073.exceptions import ApiUsageError
+from sdc11073.xml_types import pm_qnames as pm
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sdc11073.consumer.consumerimpl import SdcConsumer
+    from sdc11073.consumer.sharedstate import AlertSample, MetricSample, WaveformSample
+    from sdc11073.definitions_base import BaseDefinitions
+    from sdc11073.mdib.consumermdib import ConsumerMdib
+    from sdc11073.wsdiscovery import WSDiscovery
+    from sdc11073.wsdiscovery.service import Service
+    from sdc11073.xml_types import wsd_types
+
+CONNECTION_CHECK_INTERVAL = 1.0  # seconds between checks of the connections in a worker process
+
+
+class _MdibExporter:
+    """Writes the states of a consumer mdib into the shared state buffer of the worker."""
+
+    def __init__(self, writer: SharedStateWriter, device_key: str, mdib: ConsumerMdib):
+        self._writer = writer
+        self._device_key = device_key
+        self._mdib = mdib
+        observableproperties.bind(mdib, metrics_by_handle=self._on_states, alert_by_handle=self._on_states,
+                                  waveform_by_handle=self._on_states)
+        states = mdib.states.NODETYPE
+        self._write_states(states.get(pm.NumericMetricState, []))
+        self._write_states(states.get(pm.AlertConditionState, []) + states.get(pm.LimitAlertConditionState, []))
+        self._write_states(states.get(pm.AlertSignalState, []))
+
+    def unbind(self):
+        observableproperties.unbind(self._mdib, metrics_by_handle=self._on_states, alert_by_handle=self._on_states,
+                                    waveform_by_handle=self._on_states)
+
+    def _on_states(self, states_by_handle: dict[str, Any] | None):
+        if states_by_handle:
+            self._write_states(states_by_handle.values())
+
+    def _write_states(self, states: Iterable[Any]):
+        mdib_version = self._mdib.mdib_version
+        for state in states:
+            if state.NODETYPE == pm.NumericMetricState:
+                value = None
+                if state.MetricValue is not None and state.MetricValue.Value is not None:
+                    value = float(state.MetricValue.Value)
+                self._writer.write_metric(self._device_key, state.DescriptorHandle, value, mdib_version)
+            elif state.NODETYPE in (pm.AlertConditionState, pm.LimitAlertConditionState):
+                self._writer.write_alert_condition(self._device_key, state.DescriptorHandle, state.Presence,
+                                                   state.ActivationState, mdib_version)
+            elif state.NODETYPE == pm.AlertSignalState:
+                self._writer.write_alert_signal(self._device_key, state.DescriptorHandle, state.Presence,
+                                                state.ActivationState, mdib_version)
+            elif state.NODETYPE == pm.RealTimeSampleArrayMetricState:
+                if state.MetricValue is not None and state.MetricValue.Samples:
+                    samples = [float(sample) for sample in state.MetricValue.Samples]
+                    self._writer.append_waveform(self._device_key, state.DescriptorHandle, samples, mdib_version)
+
+
+def _run_shard(  # noqa: PLR0913, C901
+    shard_index: int,
+    shm_name: str,
+    layout: tuple[int, int, int],
+    my_ipaddress: str,
+    validate: bool,
+    log_prefix: str,
+    commands: multiprocessing.Queue,
+    events: multiprocessing.Queue,
+):
+    """Run a worker process.
+
+    Commands are ('add', device_key, x_addr, sdc_definitions), ('remove', device_key) and ('stop',).
+    Events are ('started' | 'added' | 'removed' | 'lost', shard_index, device_key) and
+    ('failed', shard_index, device_key, error_text).
+    """
+    logger = loghelper.get_logger_adapter('sdc.client.gateway', f'{log_prefix}shard {shard_index}: ')
+    shm = shared_memory.SharedMemory(name=shm_name)
+    writer = SharedStateWriter(shm.buf, *layout)
+    hub = SdcConsumerHub(my_ipaddress, log_prefix=f'{log_prefix}shard {shard_index}: ')
+    consumers: dict[str, tuple[SdcConsumer, _MdibExporter]] = {}
+
+    def _remove(device_key: str, unsubscribe: bool) -> bool:
+        entry = consumers.pop(device_key, None)
+        if entry is None:
+            return False
+        consumer, exporter = entry
+        exporter.unbind()
+        try:
+            hub.remove_consumer(consumer, unsubscribe)
+        except Exception:  # noqa: BLE001
+            logger.warning('error removing consumer of {}: {}', device_key, traceback.format_exc())  # noqa: PLE1205
+        writer.remove_device(device_key)
+        return True
+
+    try:
+        hub.start_all()
+        events.put(('started', shard_index, None))
+        while True:
+            try:
+                command = commands.get(timeout=CONNECTION_CHECK_INTERVAL)
+            except queue.Empty:
+                for device_key in [k for k, (c, _) in consumers.items() if not c.is_connected]:
+                    logger.info('lost connection to {}', device_key)  # noqa: PLE1205
+                    _remove(device_key, unsubscribe=False)
+                    events.put(('lost', shard_index, device_key))
+                continue
+            if command[0] == 'stop':
+                break
+            if command[0] == 'add':
+                _, device_key, x_addr, sdc_definitions = command
+                try:
+                    consumer = hub.add_consumer(x_addr, sdc_definitions, validate=validate,
+                                                log_prefix=f'{log_prefix}shard {shard_index} {device_key}: ')
+                    consumers[device_key] = (consumer, _MdibExporter(writer, device_key, consumer.mdib))
+                except Exception as ex:  # noqa: BLE001
+                    logger.warning('could not connect {} at {}: {}', device_key, x_addr, ex)  # noqa: PLE1205
+                    events.put(('failed', shard_index, device_key, repr(ex)))
+                else:
+                    events.put(('added', shard_index, device_key))
+            elif command[0] == 'remove':
+                _remove(command[1], unsubscribe=True)
+                events.put(('removed', shard_index, command[1]))
+    finally:
+        for device_key in list(consumers):
+            _remove(device_key, unsubscribe=True)
+        hub.stop_all()
+        writer.release()
+        shm.close()
+
+
+@dataclasses.dataclass
+class GatewayDevice:
+    """A device of the gateway."""
+
+    epr: str
+    x_addr: str
+    sdc_definitions: type[BaseDefinitions]
+    shard: int
+    connected: bool = False
+
+
+@dataclasses.dataclass
+class _Shard:
+    process: multiprocessing.Process
+    shm: shared_memory.SharedMemory
+    reader: SharedStateReader
+    commands: multiprocessing.Queue
+
+
+class ShardedConsumerGateway:
+    """Connect to many providers with consumers in several worker processes.
+
+    The values of the devices are read with read_metric, read_alert and read_waveform. Devices are added by
+    search, by hello messages of the discovery (see auto_discovery) or explicitly with add_device.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        ws_discovery: WSDiscovery,
+        shard_count: int | None = None,
+        slot_count: int = 10000,
+        waveform_buffer_count: int = 1000,
+        waveform_capacity: int = 1000,
+        validate: bool = True,
+        auto_discovery: bool = False,
+        log_prefix: str = '',
+    ):
+        """Construct a ShardedConsumerGateway.
+
+        :param ws_discovery: a started WSDiscovery instance, its address is also used for the event sinks
+        :param shard_count: number of worker processes, None means one per cpu
+        :param slot_count: max. number of metrics and alerts plus waveforms per shard
+        :param waveform_buffer_count: max. number of waveforms per shard
+        :param waveform_capacity: number of latest samples that are kept per waveform
+        :param validate: bool
+        :param auto_discovery: if True, devices are added on hello and removed on bye messages.
+                               The gateway then sets the hello and bye callbacks of ws_discovery while it is running.
+        :param log_prefix: a string
+        """
+        self._ws_discovery = ws_discovery
+        self._auto_discovery = auto_discovery
+        self._shard_count = shard_count or os.cpu_count() or 1
+        self._layout = (slot_count, waveform_buffer_count, waveform_capacity)
+        self._validate = validate
+        self._log_prefix = log_prefix
+        self._logger = loghelper.get_logger_adapter('sdc.client.gateway', log_prefix)
+        self._mp_context = multiprocessing.get_context('spawn')  # fork is not safe in a process with threads
+        self._shards: list[_Shard] = []
+        self._events: multiprocessing.Queue | None = None
+        self._event_thread: threading.Thread | None = None
+        self._devices: dict[str, GatewayDevice] = {}
+        self._lock = threading.Lock()
+        self._devices_changed = threading.Condition(self._lock)
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if start was called and stop was not called yet."""
+        return len(self._shards) > 0
+
+    @property
+    def devices(self) -> dict[str, GatewayDevice]:
+        """Return a copy of the devices by epr."""
+        with self._lock:
+            return {epr: dataclasses.replace(device) for epr, device in self._devices.items()}
+
+    @property
+    def shard_loads(self) -> list[int]:
+        """Return the number of devices per shard."""
+        with self._lock:
+            return self._shard_loads()
+
+    def start(self, timeout: float = 60.0):
+        """Start the worker processes and wait until they are ready."""
+        if self.is_running:
+            raise ApiUsageError('gateway is already running')
+        self._events = self._mp_context.Queue()
+        started = set()
+        try:
+            for shard_index in range(self._shard_count):
+                shm = shared_memory.SharedMemory(create=True, size=shared_state_size(*self._layout))
+                try:
+                    commands = self._mp_context.Queue()
+                    process = self._mp_context.Process(
+                        target=_run_shard,
+                        args=(shard_index, shm.name, self._layout, self._ws_discovery.active_address,
+                              self._validate, self._log_prefix, commands, self._events),
+                        name=f'sdc_gateway_shard_{shard_index}',
+                        daemon=True,
+                    )
+                    process.start()
+                except Exception:
+                    shm.close()
+                    shm.unlink()
+                    raise
+                self._shards.append(_Shard(process, shm, SharedStateReader(shm.buf), commands))
+            end = time.monotonic() + timeout
+            while len(started) < self._shard_count:
+                event = self._events.get(timeout=max(end - time.monotonic(), 0.01))
+                if event[0] == 'started':
+                    started.add(event[1])
+        except Exception:  # e.g. queue.Empty if a shard did not start in time
+            self._logger.error('starting shards failed, {} of {} shards started',  # noqa: PLE1205
+                               len(started), self._shard_count)
+            for shard in self._shards:
+                shard.process.terminate()
+                shard.process.join()
+            self._release_shards()
+            raise
+        self._event_thread = threading.Thread(target=self._handle_events, name='sdc_gateway_events', daemon=True)
+        self._event_thread.start()
+        if self._auto_discovery:
+            self._ws_discovery.set_remote_service_hello_callback(self._on_hello)
+            self._ws_discovery.set_remote_service_bye_callback(self._on_bye)
+        self._logger.info('started {} shards', self._shard_count)  # noqa: PLE1205
+
+    def stop(self, timeout: float = 30.0):
+        """Disconnect all devices and stop the worker processes."""
+        if not self.is_running:
+            return
+        if self._auto_discovery:
+            self._ws_discovery.set_remote_service_hello_callback(None)
+            self._ws_discovery.set_remote_service_bye_callback(None)
+        for shard in self._shards:
+            shard.commands.put(('stop',))
+        for shard in self._shards:
+            shard.process.join(timeout)
+            if shard.process.is_alive():
+                self._logger.warning('shard process {} did not stop, terminating it', shard.process.name)  # noqa: PLE1205
+                shard.process.terminate()
+        self._events.put(None)  # ends event thread
+        self._event_thread.join()
+        self._release_shards()
+        with self._lock:
+            self._devices.clear()
+
+    def _release_shards(self):
+        """Release the shared memory of all shards, the processes must already be stopped."""
+        for shard in self._shards:
+            shard.reader.release()
+            shard.shm.close()
+            shard.shm.unlink()
+        self._shards = []
+        self._events.close()
+
+    def search(self, scopes: wsd_types.ScopesType | None = None, timeout: float = 5) -> list[str]:
+        """Search for sdc services and add the ones that are not known yet. Returns the eprs of the new devices."""
+        services = self._ws_discovery.search_sdc_services(scopes=scopes, timeout=timeout)
+        return [service.epr for service in services if self.add_device(service)]
+
+    def add_device(self, service: Service) -> bool:
+        """Connect to the device in the shard with the fewest devices.
+
+        :return: False if the device is already known or no definitions match its types.
+        """
+        if not self.is_running:
+            raise ApiUsageError('gateway is not running, call start first')
+        sdc_definitions = self._find_definitions(service)
+        if sdc_definitions is None or not service.x_addrs:
+            self._logger.info('ignoring {}, no matching sdc definitions or no xaddrs', service.epr)  # noqa: PLE1205
+            return False
+        with self._lock:
+            if service.epr in self._devices:
+                return False
+            loads = self._shard_loads()
+            device = GatewayDevice(service.epr, service.x_addrs[0], sdc_definitions, loads.index(min(loads)))
+            self._devices[service.epr] = device
+            self._send_add(device)
+        return True
+
+    def remove_device(self, epr: str) -> bool:
+        """Disconnect from the device and rebalance the shards.
+
+        :return: False if the device is not known.
+        """
+        with self._lock:
+            device = self._devices.pop(epr, None)
+            if device is None:
+                return False
+            self._shards[device.shard].commands.put(('remove', epr))
+            self._rebalance()
+        return True
+
+    def update_devices(self, services: Iterable[Service]):
+        """Make the services the devices of the gateway: connect new ones, disconnect the ones that are missing."""
+        services = {service.epr: service for service in services}
+        for epr in set(self.devices) - set(services):
+            self.remove_device(epr)
+        for service in services.values():
+            self.add_device(service)
+
+    def wait_connected(self, eprs: Iterable[str], timeout: float = 30.0) -> bool:
+        """Wait until the devices are connected, return False if a device failed or the timeout expired."""
+        eprs = set(eprs)
+        end = time.monotonic() + timeout
+        with self._devices_changed:
+            while True:
+                devices = [self._devices.get(epr) for epr in eprs]
+                if any(device is None for device in devices):
+                    return False
+                if all(device.connected for device in devices):
+                    return True
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._devices_changed.wait(remaining)
+
+    def read_metric(self, epr: str, handle: str) -> MetricSample | None:
+        """Return the latest value of a numeric metric of a device."""
+        reader = self._get_reader(epr)
+        return None if reader is None else reader.read_metric(epr, handle)
+
+    def read_alert(self, epr: str, handle: str) -> AlertSample | None:
+        """Return the latest state of an alert condition or alert signal of a device."""
+        reader = self._get_reader(epr)
+        return None if reader is None else reader.read_alert(epr, handle)
+
+    def read_waveform(self, epr: str, handle: str, max_samples: int | None = None) -> WaveformSample | None:
+        """Return the latest samples of a waveform of a device."""
+        reader = self._get_reader(epr)
+        return None if reader is None else reader.read_waveform(epr, handle, max_samples)
+
+    def handles(self, epr: str) -> list[str]:
+        """Return the handles of all exported values of a device."""
+        reader = self._get_reader(epr)
+        return [] if reader is None else reader.handles(epr)
+
+    def _get_reader(self, epr: str) -> SharedStateReader | None:
+        with self._lock:
+            device = self._devices.get(epr)
+            if device is None or not device.connected:
+                return None
+            return self._shards[device.shard].reader
+
+    def _find_definitions(self, service: Service) -> type[BaseDefinitions] | None:
+        for definitions in ProtocolsRegistry.protocols:
+            if service.types and definitions.types_match(service.types):
+                return definitions
+        return None
+
+    def _shard_loads(self) -> list[int]:
+        """Return the number of devices per shard. Call only with lock acquired."""
+        loads = [0] * len(self._shards)
+        for device in self._devices.values():
+            loads[device.shard] += 1
+        return loads
+
+    def _send_add(self, device: GatewayDevice):
+        self._shards[device.shard].commands.put(('add', device.epr, device.x_addr, device.sdc_definitions))
+
+    def _rebalance(self):
+        """Move devices until the number of devices per shard differs by at most one. Call only with lock acquired."""
+        loads = self._shard_loads()
+        while max(loads) - min(loads) > 1:
+            source = loads.index(max(loads))
+            target = loads.index(min(loads))
+            device = next(d for d in reversed(self._devices.values()) if d.shard == source)
+            self._logger.info('moving {} from shard {} to shard {}', device.epr, source, target)  # noqa: PLE1205
+            self._shards[source].commands.put(('remove', device.epr))
+            device.shard = target
+            device.connected = False
+            self._send_add(device)  # commands of a shard are executed in order, remove is done before
+            loads[source] -= 1
+            loads[target] += 1
+
+    def _handle_events(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            kind, shard_index, epr = event[:3]
+            with self._devices_changed:
+                device = self._devices.get(epr)
+                if device is None or device.shard != shard_index:
+                    continue  # event of a removed or moved device
+                if kind == 'added':
+                    device.connected = True
+                elif kind in ('failed', 'lost'):
+                    self._logger.warning('device {} {}: {}', epr, kind, event[3:])  # noqa: PLE1205
+                    del self._devices[epr]
+                    self._rebalance()
+                self._devices_changed.notify_all()
+
+    def _on_hello(self, addr: str, service: Service):  # noqa: ARG002
+        try:
+            self.add_device(service)
+        except Exception:  # noqa: BLE001
+            self._logger.error('could not add device {}: {}', service.epr, traceback.format_exc())  # noqa: PLE1205
+
+    def _on_bye(self, addr: str, epr: str):  # noqa: ARG002
+        self.remove_device(epr)
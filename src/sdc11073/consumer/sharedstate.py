@@ -0,0 +1,405 @@
+"""Export of the latest metric values, alert states and waveforms of consumer mdibs into shared memory.
+
+A SharedStateWriter in one process writes into a buffer (typically the buf of a multiprocessing.shared_memory
+SharedMemory instance), SharedStateReader instances in other processes read from it without pickling and without
+locks. The buffer has a fixed layout:
+- a header with the layout parameters and a generation counter that changes whenever a slot is allocated or freed,
+- slot_count slots of fixed size, each slot holds one value of one device and handle,
+- waveform_buffer_count ring buffers of waveform_capacity float64 samples, used by waveform slots.
+Every slot has a sequence counter (seqlock): it is odd while the writer changes the slot. A reader repeats reading
+until it got the same even counter before and after reading the slot.
+The readers build an index (device key, handle) -> slot from the keys in the slots, the index is rebuilt only if
+the generation counter changed.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import enum
+import math
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from sdc11073.xml_types.pm_types import AlertActivation, AlertSignalPresence
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+MAGIC = b'SDCS'
+LAYOUT_VERSION = 1
+KEY_SIZE = 128  # max. length of utf-8 encoded device key and handle
+HEADER_SIZE = 64
+_HEADER = struct.Struct('<4sIIII')  # magic, layout version, slot_count, waveform_buffer_count, waveform_capacity
+_GENERATION = struct.Struct('<Q')
+_GENERATION_OFFSET = 24
+_SEQ = struct.Struct('<I')
+# kind, key, value, update time, mdib version, state code, waveform buffer index, waveform write count
+_FIELDS = struct.Struct(f'<B3x{KEY_SIZE}sddQiiQ')
+_SLOT_SIZE = _SEQ.size + _FIELDS.size
+_SAMPLE_SIZE = 8
+_MAX_READ_ATTEMPTS = 1000
+
+_ACTIVATION_STATES = list(AlertActivation)
+_SIGNAL_PRESENCES = list(AlertSignalPresence)
+
+
+class SlotKind(enum.IntEnum):
+    """Content of a slot."""
+
+    FREE = 0
+    METRIC = 1
+    ALERT_CONDITION = 2
+    ALERT_SIGNAL = 3
+    WAVEFORM = 4
+
+
+@dataclasses.dataclass(frozen=True)
+class MetricSample:
+    """Latest value of a numeric metric, value is nan if the metric has no value."""
+
+    value: float
+    update_time: float  # time.time() when the writer received the value
+    mdib_version: int
+
+
+@dataclasses.dataclass(frozen=True)
+class AlertSample:
+    """Latest state of an alert condition (presence is a bool) or alert signal (presence is AlertSignalPresence)."""
+
+    presence: bool | AlertSignalPresence
+    activation_state: AlertActivation
+    update_time: float
+    mdib_version: int
+
+
+@dataclasses.dataclass(frozen=True)
+class WaveformSample:
+    """The latest samples of a waveform, write_count is the number of all samples written so far."""
+
+    samples: list[float]
+    write_count: int
+    update_time: float
+    mdib_version: int
+
+
+@dataclasses.dataclass(frozen=True)
+class _SlotData:
+    kind: SlotKind
+    key: bytes
+    value: float
+    update_time: float
+    mdib_version: int
+    state_code: int
+    buffer_index: int
+    write_count: int
+
+
+def shared_state_size(slot_count: int, waveform_buffer_count: int, waveform_capacity: int) -> int:
+    """Return the size in bytes of a buffer with the given layout parameters."""
+    return HEADER_SIZE + slot_count * _SLOT_SIZE + waveform_buffer_count * waveform_capacity * _SAMPLE_SIZE
+
+
+def _mk_key(device_key: str, handle: str) -> bytes:
+    key = f'{device_key}\x00{handle}'.encode()
+    if len(key) > KEY_SIZE:
+        msg = f'device key and handle are too long ({len(key)} bytes, max. {KEY_SIZE}): {device_key} {handle}'
+        raise ValueError(msg)
+    return key
+
+
+class _SharedStateLayout:
+    def __init__(self, buf: memoryview, slot_count: int, waveform_buffer_count: int, waveform_capacity: int):
+        self._buf = buf
+        self.slot_count = slot_count
+        self.waveform_buffer_count = waveform_buffer_count
+        self.waveform_capacity = waveform_capacity
+        self._samples_offset = HEADER_SIZE + slot_count * _SLOT_SIZE
+        samples_end = self._samples_offset + waveform_buffer_count * waveform_capacity * _SAMPLE_SIZE
+        self._samples = buf[self._samples_offset:samples_end].cast('d')
+
+    def release(self):
+        """Release the views of the buffer, must be called before the shared memory is closed."""
+        self._samples.release()
+
+    @property
+    def generation(self) -> int:
+        return _GENERATION.unpack_from(self._buf, _GENERATION_OFFSET)[0]
+
+    def slot_offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * _SLOT_SIZE
+
+    def read_seq(self, slot: int) -> int:
+        return _SEQ.unpack_from(self._buf, self.slot_offset(slot))[0]
+
+    def read_fields(self, slot: int) -> _SlotData:
+        kind, key, value, update_time, mdib_version, state_code, buffer_index, write_count = _FIELDS.unpack_from(
+            self._buf, self.slot_offset(slot) + _SEQ.size)
+        return _SlotData(SlotKind(kind), key.rstrip(b'\x00'), value, update_time, mdib_version, state_code,
+                         buffer_index, write_count)
+
+    def samples(self, buffer_index: int) -> memoryview:
+        start = buffer_index * self.waveform_capacity
+        return self._samples[start:start + self.waveform_capacity]
+
+
+class SharedStateWriter:
+    """Writes values into a shared state buffer. There must be only one writer per buffer.
+
+    The methods are thread safe. If all slots or waveform buffers are in use, new values are dropped and counted
+    in dropped_values.
+    """
+
+    def __init__(self, buf: memoryview, slot_count: int, waveform_buffer_count: int, waveform_capacity: int):
+        """Construct a SharedStateWriter and initialize the buffer.
+
+        :param buf: a writable buffer of at least shared_state_size(...) bytes
+        :param slot_count: number of slots
+        :param waveform_buffer_count: number of waveform ring buffers
+        :param waveform_capacity: number of samples per waveform ring buffer
+        """
+        self._layout = _SharedStateLayout(buf, slot_count, waveform_buffer_count, waveform_capacity)
+        self._buf = buf
+        self._lock = threading.Lock()
+        self._slots: dict[bytes, int] = {}
+        self._free_slots = list(range(slot_count - 1, -1, -1))  # pop() returns the lowest free slot
+        self._free_buffers = list(range(waveform_buffer_count - 1, -1, -1))
+        self._generation = 0
+        self.dropped_values = 0
+        buf[:shared_state_size(slot_count, waveform_buffer_count, waveform_capacity)] = bytes(
+            shared_state_size(slot_count, waveform_buffer_count, waveform_capacity))
+        _HEADER.pack_into(buf, 0, MAGIC, LAYOUT_VERSION, slot_count, waveform_buffer_count, waveform_capacity)
+
+    def release(self):
+        """Release the views of the buffer, must be called before the shared memory is closed."""
+        self._layout.release()
+
+    def write_metric(self, device_key: str, handle: str, value: float | None, mdib_version: int) -> bool:
+        """Write the latest value of a metric, None is written as nan."""
+        value = math.nan if value is None else value
+        return self._write(device_key, handle, SlotKind.METRIC, value, mdib_version)
+
+    def write_alert_condition(self, device_key: str, handle: str, presence: bool,
+                              activation_state: AlertActivation, mdib_version: int) -> bool:
+        """Write the latest state of an alert condition."""
+        return self._write(device_key, handle, SlotKind.ALERT_CONDITION, float(bool(presence)), mdib_version,
+                           _ACTIVATION_STATES.index(activation_state))
+
+    def write_alert_signal(self, device_key: str, handle: str, presence: AlertSignalPresence,
+                           activation_state: AlertActivation, mdib_version: int) -> bool:
+        """Write the latest state of an alert signal."""
+        presence_code = -1 if presence is None else _SIGNAL_PRESENCES.index(presence)
+        return self._write(device_key, handle, SlotKind.ALERT_SIGNAL, float(presence_code), mdib_version,
+                           _ACTIVATION_STATES.index(activation_state))
+
+    def append_waveform(self, device_key: str, handle: str, samples: Sequence[float], mdib_version: int) -> bool:
+        """Append samples to the ring buffer of a waveform."""
+        key = _mk_key(device_key, handle)
+        with self._lock:
+            slot = self._get_slot(key, SlotKind.WAVEFORM)
+            if slot is None:
+                return False
+            data = self._layout.read_fields(slot)
+            ring = self._layout.samples(data.buffer_index)
+            capacity = self._layout.waveform_capacity
+            offset = self._layout.slot_offset(slot)
+            seq = self._begin_write(offset)
+            written = samples[-capacity:]
+            # the samples that do not fit into the ring are skipped, the reader expects the last sample at
+            # position (write_count + len(samples) - 1) % capacity
+            position = (data.write_count + len(samples) - len(written)) % capacity
+            for sample in written:
+                ring[position] = sample
+                position = (position + 1) % capacity
+            ring.release()
+            _FIELDS.pack_into(self._buf, offset + _SEQ.size, SlotKind.WAVEFORM, key, math.nan, time.time(),
+                              mdib_version, 0, data.buffer_index, data.write_count + len(samples))
+            _SEQ.pack_into(self._buf, offset, seq + 2)
+        return True
+
+    def remove_device(self, device_key: str):
+        """Free all slots of a device."""
+        prefix = f'{device_key}\x00'.encode()
+        with self._lock:
+            for key in [k for k in self._slots if k.startswith(prefix)]:
+                slot = self._slots.pop(key)
+                offset = self._layout.slot_offset(slot)
+                data = self._layout.read_fields(slot)
+                seq = self._begin_write(offset)
+                _FIELDS.pack_into(self._buf, offset + _SEQ.size, SlotKind.FREE, b'', math.nan, 0.0, 0, 0, 0, 0)
+                _SEQ.pack_into(self._buf, offset, seq + 2)
+                if data.kind == SlotKind.WAVEFORM:
+                    self._free_buffers.append(data.buffer_index)
+                self._free_slots.append(slot)
+            self._free_slots.sort(reverse=True)
+            self._increment_generation()
+
+    def _write(self, device_key: str, handle: str, kind: SlotKind, value: float, mdib_version: int,
+               state_code: int = 0) -> bool:
+        key = _mk_key(device_key, handle)
+        with self._lock:
+            slot = self._get_slot(key, kind)
+            if slot is None:
+                return False
+            offset = self._layout.slot_offset(slot)
+            seq = self._begin_write(offset)
+            _FIELDS.pack_into(self._buf, offset + _SEQ.size, kind, key, value, time.time(), mdib_version, state_code,
+                              0, 0)
+            _SEQ.pack_into(self._buf, offset, seq + 2)
+        return True
+
+    def _begin_write(self, offset: int) -> int:
+        seq = _SEQ.unpack_from(self._buf, offset)[0]
+        _SEQ.pack_into(self._buf, offset, seq + 1)  # odd: readers retry
+        return seq
+
+    def _get_slot(self, key: bytes, kind: SlotKind) -> int | None:
+        """Return the slot of the key, allocate a new slot if needed. Call only with lock acquired."""
+        slot = self._slots.get(key)
+        if slot is not None:
+            return slot
+        if not self._free_slots or (kind == SlotKind.WAVEFORM and not self._free_buffers):
+            self.dropped_values += 1
+            return None
+        slot = self._free_slots.pop()
+        buffer_index = self._free_buffers.pop() if kind == SlotKind.WAVEFORM else 0
+        offset = self._layout.slot_offset(slot)
+        seq = self._begin_write(offset)
+        _FIELDS.pack_into(self._buf, offset + _SEQ.size, kind, key, math.nan, time.time(), 0, 0, buffer_index, 0)
+        _SEQ.pack_into(self._buf, offset, seq + 2)
+        self._slots[key] = slot
+        self._increment_generation()
+        return slot
+
+    def _increment_generation(self):
+        self._generation += 1
+        _GENERATION.pack_into(self._buf, _GENERATION_OFFSET, self._generation)
+
+
+class SharedStateReader:
+    """Reads values from a shared state buffer that is written by a SharedStateWriter in another process.
+
+    The layout parameters are read from the header. Until the writer has initialized the buffer, all read methods
+    return None.
+    """
+
+    def __init__(self, buf: memoryview):
+        self._buf = buf
+        self._layout: _SharedStateLayout | None = None
+        self._index: dict[bytes, int] = {}
+        self._index_generation = -1
+
+    def release(self):
+        """Release the views of the buffer, must be called before the shared memory is closed."""
+        if self._layout is not None:
+            self._layout.release()
+
+    def read_metric(self, device_key: str, handle: str) -> MetricSample | None:
+        """Return the latest value of a metric or None if it is unknown."""
+        data = self._read(_mk_key(device_key, handle), (SlotKind.METRIC,))
+        if data is None:
+            return None
+        return MetricSample(data.value, data.update_time, data.mdib_version)
+
+    def read_alert(self, device_key: str, handle: str) -> AlertSample | None:
+        """Return the latest state of an alert condition or alert signal or None if it is unknown."""
+        data = self._read(_mk_key(device_key, handle), (SlotKind.ALERT_CONDITION, SlotKind.ALERT_SIGNAL))
+        if data is None:
+            return None
+        if data.kind == SlotKind.ALERT_CONDITION:
+            presence = bool(data.value)
+        else:
+            presence = None if data.value < 0 else _SIGNAL_PRESENCES[int(data.value)]
+        return AlertSample(presence, _ACTIVATION_STATES[data.state_code], data.update_time, data.mdib_version)
+
+    def read_waveform(self, device_key: str, handle: str, max_samples: int | None = None) -> WaveformSample | None:
+        """Return the latest samples of a waveform (at most waveform_capacity) or None if it is unknown."""
+        key = _mk_key(device_key, handle)
+        result = self._read(key, (SlotKind.WAVEFORM,), max_samples)
+        if result is None:
+            return None
+        data, samples = result
+        return WaveformSample(samples, data.write_count, data.update_time, data.mdib_version)
+
+    def handles(self, device_key: str) -> list[str]:
+        """Return the handles of all values of a device."""
+        if not self._refresh_index():
+            return []
+        prefix = f'{device_key}\x00'.encode()
+        return sorted(key[len(prefix):].decode() for key in self._index if key.startswith(prefix))
+
+    def device_keys(self) -> set[str]:
+        """Return the keys of all devices that have values in the buffer."""
+        if not self._refresh_index():
+            return set()
+        return {key.split(b'\x00', 1)[0].decode() for key in self._index}
+
+    def _read(self, key: bytes, kinds: Iterable[SlotKind], max_samples: int | None = None):  # noqa: ANN202
+        if not self._refresh_index():
+            return None
+        for _ in range(2):  # the slot might have been reused since the index was built
+            slot = self._index.get(key)
+            if slot is None:
+                return None
+            data, samples = self._read_slot(slot, max_samples)
+            if data.key == key:
+                if data.kind not in kinds:
+                    return None
+                return data if data.kind != SlotKind.WAVEFORM else (data, samples)
+            self._index_generation = -1
+            self._refresh_index()
+        return None
+
+    def _read_slot(self, slot: int, max_samples: int | None) -> tuple[_SlotData, list[float] | None]:
+        layout = self._layout
+        for _ in range(_MAX_READ_ATTEMPTS):
+            seq = layout.read_seq(slot)
+            if seq % 2:
+                time.sleep(0)  # writer is active, give it a chance
+                continue
+            data = layout.read_fields(slot)
+            samples = None
+            if data.kind == SlotKind.WAVEFORM:
+                samples = self._copy_samples(data, max_samples)
+            if layout.read_seq(slot) == seq:
+                return data, samples
+        msg = f'could not read consistent data from slot {slot}'
+        raise RuntimeError(msg)
+
+    def _copy_samples(self, data: _SlotData, max_samples: int | None) -> list[float]:
+        capacity = self._layout.waveform_capacity
+        count = min(data.write_count, capacity)
+        if max_samples is not None:
+            count = min(count, max_samples)
+        ring = self._layout.samples(data.buffer_index)
+        try:
+            end = data.write_count % capacity
+            start = end - count
+            if start >= 0:
+                return ring[start:end].tolist()
+            return ring[start + capacity:].tolist() + ring[:end].tolist()
+        finally:
+            ring.release()
+
+    def _refresh_index(self) -> bool:
+        """Rebuild the index if the generation changed. Return False if the buffer is not initialized yet."""
+        if self._layout is None:
+            magic, version, slot_count, waveform_buffer_count, waveform_capacity = _HEADER.unpack_from(self._buf, 0)
+            if magic != MAGIC:
+                return False
+            if version != LAYOUT_VERSION:
+                msg = f'unsupported layout version {version}, expected {LAYOUT_VERSION}'
+                raise ValueError(msg)
+            self._layout = _SharedStateLayout(self._buf, slot_count, waveform_buffer_count, waveform_capacity)
+        generation = self._layout.generation
+        while generation != self._index_generation:
+            index = {}
+            for slot in range(self._layout.slot_count):
+                data, _ = self._read_slot(slot, 0)
+                if data.kind != SlotKind.FREE:
+                    index[data.key] = slot
+            self._index = index
+            self._index_generation = generation
+            generation = self._layout.generation
+        return True
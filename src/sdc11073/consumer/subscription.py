@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import http.client
 import threading
 import time
@@ -9,10 +10,12 @@ import uuid
 from typing import TYPE_CHECKING, Callable, Protocol
 from urllib.parse import urlparse
 
+import aiohttp
 from lxml import etree
 
 from sdc11073 import loghelper
 from sdc11073 import observableproperties as properties
+from sdc11073.exceptions import ApiUsageError
 from sdc11073.namespaces import EventingActions
 from sdc11073.pysoap.soapclient import HTTPReturnCodeError
 from sdc11073.pysoap.soapenvelope import SoapResponseError
@@ -25,9 +28,11 @@ if TYPE_CHECKING:
     from sdc11073 import xml_utils
     from sdc11073.definitions_base import AbstractDataModel
     from sdc11073.dispatch import RequestData
+    from sdc11073.provider.scheduler import ScheduledJob, Scheduler
     from sdc11073.pysoap.msgfactory import CreatedMessage, MessageFactory
-    from sdc11073.pysoap.msgreader import MessageReader
+    from sdc11073.pysoap.msgreader import MessageReader, ReceivedMessage
     from sdc11073.pysoap.soapclient import SoapClientProtocol
+    from sdc11073.pysoap.soapclient_async import SoapClientAsync
     from sdc11073.xml_types.eventing_types import FilterType
     from sdc11073.xml_types.mex_types import HostedServiceType
 
@@ -116,6 +121,37 @@ class ConsumerSubscription:
         self, expires: float = 3600, any_elements: list | None = None, any_attributes: dict | None = None,
     ) -> None:
         """Send a subscribe request to the provider and handle the response."""
+        message = self._mk_subscribe_message(expires, any_elements, any_attributes)
+        msg = f'subscribe {self.short_filter_string}'
+        try:
+            soap_client = self._get_soap_client_func(self._hosted_service_address)
+            message_data = soap_client.post_message_to(self._hosted_service_path, message, msg=msg)
+            self._handle_subscribe_response(message_data)
+        except HTTPReturnCodeError as ex:
+            self._logger.error('could not subscribe: %r', ex)  # noqa: TRY400
+
+    async def async_subscribe(
+        self,
+        get_soap_client_func: Callable[[str], SoapClientAsync],
+        expires: float = 3600,
+        any_elements: list | None = None,
+        any_attributes: dict | None = None,
+    ) -> None:
+        """Send a subscribe request with an async soap client and handle the response, see subscribe.
+
+        :param get_soap_client_func: returns the async soap client for an address
+        """
+        message = self._mk_subscribe_message(expires, any_elements, any_attributes)
+        try:
+            soap_client = get_soap_client_func(self._hosted_service_address)
+            message_data = await soap_client.async_post_message_to(self._hosted_service_path, message)
+            self._handle_subscribe_response(message_data)
+        except HTTPReturnCodeError as ex:
+            self._logger.error('could not subscribe: %r', ex)  # noqa: TRY400
+
+    def _mk_subscribe_message(
+        self, expires: float, any_elements: list | None, any_attributes: dict | None,
+    ) -> CreatedMessage:
         self._logger.info('start subscription "{}"', self.short_filter_string)  # noqa: PLE1205
         self.event_counter = 0
         self.requested_expires = expires  # saved for later renewal, we will use the same interval
@@ -144,36 +180,32 @@ class ConsumerSubscription:
             for name, value in any_attributes.items():
                 body_node.set(name, value)
         inf = HeaderInformationBlock(action=EventingActions.Subscribe, addr_to=self._hosted_service_address)
-        message = self._msg_factory.mk_soap_message_etree_payload(inf, body_node)
-        msg = f'subscribe {self.short_filter_string}'
+        return self._msg_factory.mk_soap_message_etree_payload(inf, body_node)
+
+    def _handle_subscribe_response(self, message_data: ReceivedMessage):
+        # Get time of subscription before sending the request instead of after receiving the response.
+        # Otherwise, there might be a small time window where the subscription is expired on the provider but not
+        #   on the consumer.
+        time_before_subscription = time.time()
         try:
-            soap_client = self._get_soap_client_func(self._hosted_service_address)
-            message_data = soap_client.post_message_to(self._hosted_service_path, message, msg=msg)
-            # Get time of subscription before sending the request instead of after receiving the response.
-            # Otherwise, there might be a small time window where the subscription is expired on the provider but not
-            #   on the consumer.
-            time_before_subscription = time.time()
-            try:
-                self.subscribe_response = evt_types.SubscribeResponse.from_node(message_data.p_msg.msg_node)
-                self.is_subscribed = True
-                subscription_manager_address = self.subscribe_response.SubscriptionManager.Address
-                self._subscription_manager_path = urlparse(subscription_manager_address).path
-                self.granted_expires = self.subscribe_response.Expires
-                self.expires_at = time_before_subscription + self.granted_expires
-                self._logger.info(  # noqa: PLE1205
-                    'Subscribe was successful: expires at {}, address="{}"',
-                    self.expires_at,
-                    self.subscribe_response.SubscriptionManager.Address,
-                )
-            except AttributeError as ex:
-                self._logger.error(  # noqa: PLE1205, TRY400
-                    'Subscribe response has unexpected content: {}',
-                    message_data.p_msg.raw_data,
-                )
-                self.is_subscribed = False
-                raise SoapResponseError(message_data.p_msg) from ex
-        except HTTPReturnCodeError as ex:
-            self._logger.error('could not subscribe: %r', ex)  # noqa: TRY400
+            self.subscribe_response = evt_types.SubscribeResponse.from_node(message_data.p_msg.msg_node)
+            self.is_subscribed = True
+            subscription_manager_address = self.subscribe_response.SubscriptionManager.Address
+            self._subscription_manager_path = urlparse(subscription_manager_address).path
+            self.granted_expires = self.subscribe_response.Expires
+            self.expires_at = time_before_subscription + self.granted_expires
+            self._logger.info(  # noqa: PLE1205
+                'Subscribe was successful: expires at {}, address="{}"',
+                self.expires_at,
+                self.subscribe_response.SubscriptionManager.Address,
+            )
+        except AttributeError as ex:
+            self._logger.error(  # noqa: PLE1205, TRY400
+                'Subscribe response has unexpected content: {}',
+                message_data.p_msg.raw_data,
+            )
+            self.is_subscribed = False
+            raise SoapResponseError(message_data.p_msg) from ex
 
     def renew(self, expires: int = 3600) -> float:
         """Send a Renew request to the provider and handle the response.
@@ -183,70 +215,130 @@ class ConsumerSubscription:
         with self._is_subscribed_lock:
             if not self.is_subscribed:
                 return 0.0
-            renew = evt_types.Renew()
-            renew.Expires = expires
-            dev_reference_param = self.subscribe_response.SubscriptionManager.ReferenceParameters
-            subscription_manager_address = self.subscribe_response.SubscriptionManager.Address
-            inf = HeaderInformationBlock(
-                action=renew.action, addr_to=subscription_manager_address, reference_parameters=dev_reference_param,
-            )
-            message = self._msg_factory.mk_soap_message(inf, payload=renew)
-            try:
-                soap_client = self._get_soap_client_func(subscription_manager_address)
-                message_data = soap_client.post_message_to(self._subscription_manager_path, message, msg='renew')
-                self._logger.debug('{}', message_data.p_msg.raw_data)  # noqa: PLE1205
-            except HTTPReturnCodeError as ex:
-                self.is_subscribed = False
-                self._logger.error('could not renew: {}', ex)  # noqa: PLE1205, TRY400
-            except (http.client.HTTPException, ConnectionError) as ex:
-                self._logger.warning('renew failed: {}', ex)  # noqa: PLE1205
-                self.is_subscribed = False
-            except Exception as ex:  # noqa: BLE001
-                # log any other exception as error and consider subscription to be broken
-                self._logger.error('Exception in renew: {}', ex)  # noqa: PLE1205, TRY400
-                self.is_subscribed = False
-            else:
-                renew_response = evt_types.RenewResponse.from_node(message_data.p_msg.msg_node)
-                self.granted_expires: float | int = renew_response.Expires
-                if self.granted_expires is not None:
-                    self.expires_at = time.time() + self.granted_expires
-                    return self.granted_expires
-                self.is_subscribed = False
-                self._logger.warning(  # noqa: PLE1205
-                    'renew failed: {}',
-                    etree.tostring(message_data.p_msg.body_node, pretty_print=True),
-                )
+            subscription_manager_address, message = self._mk_renew_message(expires)
+        try:
+            soap_client = self._get_soap_client_func(subscription_manager_address)
+            message_data = soap_client.post_message_to(self._subscription_manager_path, message, msg='renew')
+            self._logger.debug('{}', message_data.p_msg.raw_data)  # noqa: PLE1205
+        except HTTPReturnCodeError as ex:
+            self._logger.error('could not renew: {}', ex)  # noqa: PLE1205, TRY400
+        except (http.client.HTTPException, ConnectionError) as ex:
+            self._logger.warning('renew failed: {}', ex)  # noqa: PLE1205
+        except Exception as ex:  # noqa: BLE001
+            # log any other exception as error and consider subscription to be broken
+            self._logger.error('Exception in renew: {}', ex)  # noqa: PLE1205, TRY400
+        else:
+            with self._is_subscribed_lock:
+                if self.is_subscribed:  # not unsubscribed while the request was running
+                    return self._handle_renew_response(message_data)
             return 0.0
+        with self._is_subscribed_lock:
+            self.is_subscribed = False
+        return 0.0
+
+    async def async_renew(self, get_soap_client_func: Callable[[str], SoapClientAsync], expires: int = 3600) -> float:
+        """Send a Renew request with an async soap client and handle the response.
+
+        The method does not acquire the threading lock of the subscription, so that the event loop is never
+        blocked by a request that another thread is running.
+        :param get_soap_client_func: returns the async soap client for an address
+        :param expires: requested duration
+        :return: the remaining time of the subscription or 0.0, if the request was not successful
+        """
+        if not self.is_subscribed:
+            return 0.0
+        subscription_manager_address, message = self._mk_renew_message(expires)
+        try:
+            soap_client = get_soap_client_func(subscription_manager_address)
+            message_data = await soap_client.async_post_message_to(self._subscription_manager_path, message)
+        except HTTPReturnCodeError as ex:
+            self._logger.error('could not renew: {}', ex)  # noqa: PLE1205, TRY400
+        except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as ex:
+            self._logger.warning('renew failed: {}', ex)  # noqa: PLE1205
+        except Exception as ex:  # noqa: BLE001
+            # log any other exception as error and consider subscription to be broken
+            self._logger.error('Exception in renew: {}', ex)  # noqa: PLE1205, TRY400
+        else:
+            if self.is_subscribed:  # not unsubscribed while the request was running
+                return self._handle_renew_response(message_data)
+            return 0.0
+        self.is_subscribed = False
+        return 0.0
+
+    def _mk_renew_message(self, expires: int) -> tuple[str, CreatedMessage]:
+        renew = evt_types.Renew()
+        renew.Expires = expires
+        dev_reference_param = self.subscribe_response.SubscriptionManager.ReferenceParameters
+        subscription_manager_address = self.subscribe_response.SubscriptionManager.Address
+        inf = HeaderInformationBlock(
+            action=renew.action, addr_to=subscription_manager_address, reference_parameters=dev_reference_param,
+        )
+        return subscription_manager_address, self._msg_factory.mk_soap_message(inf, payload=renew)
+
+    def _handle_renew_response(self, message_data: ReceivedMessage) -> float:
+        """Update expiration time from the response."""
+        renew_response = evt_types.RenewResponse.from_node(message_data.p_msg.msg_node)
+        self.granted_expires: float | int = renew_response.Expires
+        if self.granted_expires is not None:
+            self.expires_at = time.time() + self.granted_expires
+            return self.granted_expires
+        self.is_subscribed = False
+        self._logger.warning(  # noqa: PLE1205
+            'renew failed: {}',
+            etree.tostring(message_data.p_msg.body_node, pretty_print=True),
+        )
+        return 0.0
 
     def unsubscribe(self):
         """Send an unsubscribe request to the provider and handle the response."""
         with self._is_subscribed_lock:
             if not self.is_subscribed:
                 return
-            request = evt_types.Unsubscribe()
-            dev_reference_param = self.subscribe_response.SubscriptionManager.ReferenceParameters
-            subscription_manager_address = self.subscribe_response.SubscriptionManager.Address
-            inf = HeaderInformationBlock(
-                action=request.action, addr_to=subscription_manager_address, reference_parameters=dev_reference_param,
+            subscription_manager_address, message = self._mk_unsubscribe_message()
+        soap_client = self._get_soap_client_func(subscription_manager_address)
+        received_message_data = soap_client.post_message_to(
+            self._subscription_manager_path, message, msg='unsubscribe',
+        )
+        with self._is_subscribed_lock:
+            self._handle_unsubscribe_response(received_message_data)
+
+    async def async_unsubscribe(self, get_soap_client_func: Callable[[str], SoapClientAsync]):
+        """Send an unsubscribe request with an async soap client and handle the response, see unsubscribe.
+
+        The method does not acquire the threading lock of the subscription, see async_renew.
+        :param get_soap_client_func: returns the async soap client for an address
+        """
+        if not self.is_subscribed:
+            return
+        subscription_manager_address, message = self._mk_unsubscribe_message()
+        soap_client = get_soap_client_func(subscription_manager_address)
+        received_message_data = await soap_client.async_post_message_to(self._subscription_manager_path, message)
+        self._handle_unsubscribe_response(received_message_data)
+
+    def _mk_unsubscribe_message(self) -> tuple[str, CreatedMessage]:
+        request = evt_types.Unsubscribe()
+        dev_reference_param = self.subscribe_response.SubscriptionManager.ReferenceParameters
+        subscription_manager_address = self.subscribe_response.SubscriptionManager.Address
+        inf = HeaderInformationBlock(
+            action=request.action, addr_to=subscription_manager_address, reference_parameters=dev_reference_param,
+        )
+        return subscription_manager_address, self._msg_factory.mk_soap_message(inf, payload=request)
+
+    def _handle_unsubscribe_response(self, received_message_data: ReceivedMessage):
+        """Check the response."""
+        response_action = received_message_data.action
+        # check response: response does not contain explicit status. If action== UnsubscribeResponse all is fine.
+        if response_action == EventingActions.UnsubscribeResponse:
+            self._logger.info(  # noqa: PLE1205
+                'unsubscribe: end of subscription {} was confirmed.', self.notification_url,
             )
-            message = self._msg_factory.mk_soap_message(inf, payload=request)
-            soap_client = self._get_soap_client_func(subscription_manager_address)
-            received_message_data = soap_client.post_message_to(
-                self._subscription_manager_path, message, msg='unsubscribe',
+            self.is_subscribed = False
+        else:
+            self._logger.error(  # noqa: PLE1205
+                'unsubscribe: unexpected response action: {}', received_message_data.p_msg.raw_data,
             )
-            response_action = received_message_data.action
-            # check response: response does not contain explicit status. If action== UnsubscribeResponse all is fine.
-            if response_action == EventingActions.UnsubscribeResponse:
-                self._logger.info(  # noqa: PLE1205
-                    'unsubscribe: end of subscription {} was confirmed.', self.notification_url,
-                )
-                self.is_subscribed = False
-            else:
-                self._logger.error(  # noqa: PLE1205
-                    'unsubscribe: unexpected response action: {}', received_message_data.p_msg.raw_data,
-                )
-                msg = f'unsubscribe: unexpected response action: {received_message_data.p_msg.raw_data}'
-                raise ValueError(msg)
+            msg = f'unsubscribe: unexpected response action: {received_message_data.p_msg.raw_data}'
+            raise ValueError(msg)
 
     def get_status(self) -> float:
         """Send a GetStatus Request to the device.
@@ -356,7 +448,7 @@ class ConsumerSubscriptionManagerProtocol(Protocol):
         """
 
     def start(self):
-        """Start the subscription manager (typically starts a thread)."""
+        """Start the subscription manager (typically starts a thread or adds a job to a scheduler)."""
 
     def stop(self):
         """Stop the subscription manager."""
@@ -379,12 +471,15 @@ class ConsumerSubscriptionManager(
     The thread periodically renews subscriptions. This tells the provider to keep the connection alive.
     Background info: providers can close a socket after a certain time without traffic.
     Periodic requests avoid the timeout
+    If a scheduler is given, the thread is not started, the renewals are done by a job of the scheduler.
 
     This Implementation uses unique paths for notifications and SubscriptionEnd messages for each subscription.
     When the provider sends one of these messages, the unique url is enough to identify the corresponding
     subscription instance of the consumer. Reference parameters are not used.
     """
 
+    RENEW_CHECK_INTERVAL = 1.0  # seconds between checks of remaining subscription time
+
     def __init__(  # noqa: PLR0913
         self,
         msg_reader: MessageReader,
@@ -395,6 +490,7 @@ class ConsumerSubscriptionManager(
         end_to_url: str | None = None,
         fixed_renew_interval: int | None = None,
         log_prefix: str = '',
+        scheduler: Scheduler | None = None,
     ):
         """Construct a ConsumerSubscriptionManager.
 
@@ -404,6 +500,7 @@ class ConsumerSubscriptionManager(
         :param fixed_renew_interval: if set, renew is sent in this interval.
                                      if None, renew is sent when remaining time <= 50% of granted time
         :param log_prefix:
+        :param scheduler: if provided, renewals are done by a job of the scheduler instead of an own thread
         """
         super().__init__(name=f'SubscriptionClient{log_prefix}')
         self.daemon = True
@@ -421,11 +518,28 @@ class ConsumerSubscriptionManager(
         self._logger = loghelper.get_logger_adapter('sdc.client.subscrMgr', log_prefix)
         self.log_prefix = log_prefix
         self._counter = 1  # used to generate unique path for each subscription
+        self._scheduler = scheduler
+        self._renew_job: ScheduledJob | None = None
+
+    def start(self):
+        """Start the thread, or add the renew job to the scheduler."""
+        if self._scheduler is None:
+            super().start()
+            return
+        self._run = True
+        period = self.RENEW_CHECK_INTERVAL if self._renew_interval is None else self._renew_interval
+        self._renew_job = self._scheduler.add_job(
+            self._renew_step, period, name=f'renew subscriptions {self.log_prefix}',
+        )
 
     def stop(self):
-        """Stop the thread."""
+        """Stop the thread or the renew job."""
         self._run = False
-        self.join(timeout=2)
+        if self._renew_job is not None:
+            self._renew_job.cancel()
+            self._renew_job = None
+        elif self.is_alive():
+            self.join(timeout=2)
         with self._subscriptions_lock:
             self.subscriptions.clear()
 
@@ -448,13 +562,7 @@ class ConsumerSubscriptionManager(
                     time.sleep(1)
                     if not self._run:
                         return
-                with self._subscriptions_lock:
-                    # copy list of subscriptions in order to release lock early
-                    subscriptions = list(self.subscriptions.values())
-                for subscription in subscriptions:
-                    subscription.renew()
-                for subscription in subscriptions:
-                    self._logger.debug('{}', subscription)  # noqa: PLE1205
+                self._renew_step()
             except Exception:  # noqa: PERF203
                 # catch all in order to keep thread running.
                 self._logger.exception('##### check loop')
@@ -463,22 +571,30 @@ class ConsumerSubscriptionManager(
         """Renew subscriptions when remaining time <= 50% of granted time."""
         while self._run:
             try:
-                time.sleep(1)
+                time.sleep(self.RENEW_CHECK_INTERVAL)
                 if not self._run:
                     return
-                with self._subscriptions_lock:
-                    # copy list of subscriptions in order to release lock early
-                    subscriptions = list(self.subscriptions.values())
-                for subscription in subscriptions:
-                    # renew if remaining time is 50% of granted time or less.
-                    if subscription.remaining_subscription_seconds <= subscription.granted_expires / 2:
-                        subscription.renew()
-                for subscription in subscriptions:
-                    self._logger.debug('{}', subscription)  # noqa: PLE1205
+                self._renew_step()
             except Exception:  # noqa: PERF203
                 # catch all in order to keep thread running.
                 self._logger.exception('##### check loop')
 
+    def _renew_step(self):
+        """Renew all subscriptions (fixed interval) or those with remaining time <= 50% of granted time."""
+        with self._subscriptions_lock:
+            # copy list of subscriptions in order to release lock early
+            subscriptions = list(self.subscriptions.values())
+        if self._renew_interval is None:
+            self._renew([s for s in subscriptions if s.remaining_subscription_seconds <= s.granted_expires / 2])
+        else:
+            self._renew(subscriptions)
+        for subscription in subscriptions:
+            self._logger.debug('{}', subscription)  # noqa: PLE1205
+
+    def _renew(self, subscriptions: list[ConsumerSubscription]):
+        for subscription in subscriptions:
+            subscription.renew()
+
     def mk_subscription(self, dpws_hosted: HostedServiceType, filter_type: FilterType) -> ConsumerSubscription:
         """Create a subscription instance."""
         sep = '' if self._notification_url.endswith('/') else '/'
@@ -547,6 +663,23 @@ class ConsumerSubscriptionManager(
                     ret = False
         return ret
 
+    async def async_unsubscribe_all(self, get_soap_client_func: Callable[[str], SoapClientAsync]) -> bool:
+        """Send Unsubscribe messages for all subscriptions concurrently with async soap clients.
+
+        :param get_soap_client_func: returns the async soap client for an address
+        """
+        with self._subscriptions_lock:
+            current_subscriptions = list(self.subscriptions.values())  # make a copy
+            self.subscriptions.clear()
+        results = await asyncio.gather(
+            *[subscription.async_unsubscribe(get_soap_client_func) for subscription in current_subscriptions],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self._logger.error('unsubscribe error: {}', result)  # noqa: PLE1205
+        return not any(isinstance(result, Exception) for result in results)
+
 
 class ClientSubscriptionManagerReferenceParams(ConsumerSubscriptionManager):
     """Factory for Subscription objects. It uses reference parameters for identification of a subscription."""
@@ -585,3 +718,53 @@ class ClientSubscriptionManagerReferenceParams(ConsumerSubscriptionManager):
             '{}}: have no subscription for identifier = {}', log_prefix, subscr_ident.text,
         )
         return None
+
+
+class ConsumerSubscriptionManagerAsync(ConsumerSubscriptionManager):
+    """A ConsumerSubscriptionManager that sends renew requests with async soap clients on an event loop.
+
+    The renewals are done by a job of a scheduler, the job only starts the requests and does not wait for the
+    responses. A provider that does not answer therefore does not delay the renewals of other subscriptions.
+    This is used by SdcConsumerHub, where the subscriptions of many consumers share one scheduler and one event loop.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        msg_reader: MessageReader,
+        msg_factory: MessageFactory,
+        data_model: AbstractDataModel,
+        get_soap_client_func: Callable[[str], SoapClientProtocol],
+        notification_url: str,
+        end_to_url: str | None = None,
+        fixed_renew_interval: int | None = None,
+        log_prefix: str = '',
+        scheduler: Scheduler | None = None,
+        async_loop: asyncio.AbstractEventLoop | None = None,
+        get_async_soap_client_func: Callable[[str], SoapClientAsync] | None = None,
+    ):
+        """Construct a ConsumerSubscriptionManagerAsync.
+
+        :param scheduler: runs the renew job
+        :param async_loop: the event loop that sends the renew requests
+        :param get_async_soap_client_func: returns the async soap client for an address
+        """
+        if scheduler is None or async_loop is None or get_async_soap_client_func is None:
+            raise ApiUsageError(f'{self.__class__.__name__} needs a scheduler, an event loop and async soap clients')
+        super().__init__(msg_reader, msg_factory, data_model, get_soap_client_func, notification_url, end_to_url,
+                         fixed_renew_interval, log_prefix, scheduler)
+        self._async_loop = async_loop
+        self._get_async_soap_client_func = get_async_soap_client_func
+        self._pending_renewals: set[ConsumerSubscription] = set()  # only used in event loop
+
+    def _renew(self, subscriptions: list[ConsumerSubscription]):
+        for subscription in subscriptions:
+            asyncio.run_coroutine_threadsafe(self._async_renew(subscription), self._async_loop)
+
+    async def _async_renew(self, subscription: ConsumerSubscription):
+        if subscription in self._pending_renewals:
+            return  # the previous renew request is still running
+        self._pending_renewals.add(subscription)
+        try:
+            await subscription.async_renew(self._get_async_soap_client_func)
+        finally:
+            self._pending_renewals.discard(subscription)
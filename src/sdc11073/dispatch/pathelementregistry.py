@@ -14,6 +14,10 @@ class PathElementRegistry:
             raise ApiUsageError(f'Path-element "{path_element}" already registered')
         self._instances[path_element] = instance
 
+    def unregister_instance(self, path_element: Union[str, None]):
+        """Remove the instance of path_element, KeyError if it is not registered."""
+        del self._instances[path_element]
+
     def get_instance(self, path_element: Union[str, None]) -> Any:
         instance = self._instances.get(path_element)
         if instance is None:
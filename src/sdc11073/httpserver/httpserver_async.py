@@ -0,0 +1,182 @@
+"""HTTP server implementation that handles all connections on an asyncio event loop.
+
+HttpServerThreadBase starts a thread for every connection. A consumer that is connected to many providers
+keeps one or more connections per provider open for notifications, which results in many threads.
+AsyncHttpServer handles all connections on one event loop. The handling of the requests (parsing, validation and
+dispatching to the handlers) is done by a bounded executor, so that the event loop never blocks.
+Requests for the same path element are handled one after the other in order of reception.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+from sdc11073.dispatch import PathElementRegistry
+from sdc11073.exceptions import InvalidPathError
+from sdc11073.loghelper import LoggerAdapter
+
+from .compression import CompressionHandler
+
+if TYPE_CHECKING:
+    import ssl
+    from collections.abc import Callable, Iterable
+    from concurrent.futures import Executor
+
+SHUTDOWN_TIMEOUT = 1.0  # seconds to wait for running requests when the server is stopped
+
+
+def _first_path_element(path: str) -> str:
+    path_elements = urlparse(path).path.split('/')
+    if len(path_elements[0]) > 0:
+        return path_elements[0]
+    return path_elements[1]
+
+
+class _PathElementRegistry(PathElementRegistry):
+    """A PathElementRegistry that reports unregistered path elements."""
+
+    def __init__(self, on_unregister: Callable[[str | None], Any]):
+        super().__init__()
+        self._on_unregister = on_unregister
+
+    def unregister_instance(self, path_element: str | None):
+        super().unregister_instance(path_element)
+        self._on_unregister(path_element)
+
+
+class AsyncHttpServer:
+    """A http server that runs on an asyncio event loop.
+
+    It has the same dispatcher and base_url interface as HttpServerThreadBase and can be used as a shared http
+    server of consumers.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        loop: asyncio.AbstractEventLoop,
+        my_ipaddress: str,
+        ssl_context: ssl.SSLContext | None,
+        supported_encodings: Iterable[str],
+        logger: logging.Logger | LoggerAdapter,
+        executor: Executor | None = None,
+    ):
+        """Construct an AsyncHttpServer.
+
+        :param loop: a running event loop, it must run in another thread than the one that calls start and stop
+        :param my_ipaddress: The ip address that the http server shall bind to (no port!)
+        :param ssl_context: a ssl.SSLContext instance or None
+        :param supported_encodings: a list of strings
+        :param logger: a python logger
+        :param executor: handles the requests, None means the default executor of the event loop
+        """
+        self._loop = loop
+        self._my_ipaddress = my_ipaddress
+        self._ssl_context = ssl_context
+        self.supported_encodings = list(supported_encodings)
+        if isinstance(logger, logging.Logger):
+            self.logger = LoggerAdapter(logger)
+        else:
+            self.logger = logger
+        self._executor = executor
+        self._dispatcher = _PathElementRegistry(self._drop_path_lock)
+        self._path_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)  # only used in event loop
+        self._runner: web.ServerRunner | None = None
+        self._server_port: int | None = None
+        self.base_url = None
+
+    @property
+    def server_port(self) -> int | None:
+        """Return the port that the http server was bind to."""
+        return self._server_port
+
+    @property
+    def dispatcher(self) -> PathElementRegistry:
+        """Return the dispatcher responsible for handling requests."""
+        if self._runner is None:
+            raise RuntimeError('http server not started yet, dispatcher not available')
+        return self._dispatcher
+
+    def start(self, timeout: float = 60.0):
+        """Start serving, the method returns when the server accepts connections."""
+        asyncio.run_coroutine_threadsafe(self._async_start(), self._loop).result(timeout)
+        scheme = 'https' if self._ssl_context else 'http'
+        self.base_url = f'{scheme}://{self._my_ipaddress}:{self._server_port}/'
+        self.logger.info('started async http server on {}', self.base_url)  # noqa: PLE1205
+
+    def stop(self):
+        """Stop the http server and close all connections."""
+        if self._runner is None:
+            self.logger.warning('http server was not started yet - cannot be stopped')
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._runner = None
+        self.logger.info('async http server stopped.')
+
+    def _drop_path_lock(self, path_element: str | None):
+        """Forget the lock of an unregistered path element, a request that still holds it is not affected."""
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._path_locks.pop, path_element, None)
+
+    async def _async_start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind((self._my_ipaddress, 0))  # port will be selected by the OS
+        self._server_port = sock.getsockname()[1]
+        # request bodies are decompressed by the handler, aiohttp does not know lz4
+        server = web.Server(self._handle_request, auto_decompress=False)
+        runner = web.ServerRunner(server, shutdown_timeout=SHUTDOWN_TIMEOUT)
+        await runner.setup()
+        site = web.SockSite(runner, sock, ssl_context=self._ssl_context)
+        await site.start()
+        self._runner = runner
+
+    async def _handle_request(self, request: web.BaseRequest) -> web.StreamResponse:
+        path_element = _first_path_element(request.raw_path)
+        try:
+            component = self._dispatcher.get_instance(path_element)
+        except InvalidPathError as ex:
+            self.logger.error(  # noqa: PLE1205
+                'invalid path {} (request from {}): {}', request.raw_path, request.remote, ex.reason,
+            )
+            return web.Response(status=ex.status, reason=ex.reason, content_type='text/plain', charset='utf-8')
+        peer_name = request.transport.get_extra_info('peername') if request.transport is not None else None
+        try:
+            if request.method == 'POST':
+                request_bytes = await request.read()
+                content_encoding = request.headers.get('Content-Encoding')
+                if content_encoding:
+                    if content_encoding not in self.supported_encodings:
+                        reason = f'content-encoding "{content_encoding}" is not supported'
+                        return web.Response(status=415, reason=reason, content_type='text/plain', charset='utf-8')
+                    request_bytes = CompressionHandler.decompress_payload(content_encoding, request_bytes)
+                async with self._path_locks[path_element]:
+                    http_status, http_reason, response_bytes = await self._loop.run_in_executor(
+                        self._executor, component.do_post, request.headers, request.raw_path, peer_name, request_bytes,
+                    )
+                content_type = 'application/soap+xml; charset=utf-8'
+            elif request.method == 'GET':
+                async with self._path_locks[path_element]:
+                    http_status, http_reason, response_bytes, content_type = await self._loop.run_in_executor(
+                        self._executor, component.do_get, request.headers, request.raw_path, peer_name,
+                    )
+            else:
+                return web.Response(status=405, reason='method not allowed')
+        except Exception:
+            self.logger.exception('exception (request from {})', request.remote)  # noqa: PLE1205
+            return web.Response(status=500, reason='exception', content_type='text/plain', charset='utf-8')
+        if isinstance(response_bytes, str):
+            response_bytes = response_bytes.encode('utf-8')
+        headers = {'Content-Type': content_type}
+        accepted_encodings = CompressionHandler.parse_header(request.headers.get('Accept-Encoding'))
+        for enc in accepted_encodings:
+            if enc in self.supported_encodings:
+                response_bytes = CompressionHandler.compress_payload(enc, response_bytes)
+                headers['Content-Encoding'] = enc
+                break
+        return web.Response(status=http_status, reason=http_reason, body=response_bytes, headers=headers)
@@ -93,8 +93,17 @@ class LoggerAdapter:
             print(traceback.format_exc())
             raise
 
+    @property
+    def is_debug(self) -> bool:
+        """Fast check if debug level is enabled.
+        Use it to guard debug calls on hot paths whose arguments are expensive to build.
+        The result is cached by the logging module per logger and invalidated when the configuration changes
+        (setLevel, logging.disable, ...)."""
+        return self.logger.isEnabledFor(logging.DEBUG)
+
     def debug(self, msg, *args, **kwargs):
-        self.log(logging.DEBUG, msg, *args, **kwargs)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.log(logging.DEBUG, self._process(msg, args, kwargs))
 
     def info(self, msg, *args, **kwargs):
         self.log(logging.INFO, msg, *args, **kwargs)
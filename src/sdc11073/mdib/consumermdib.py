@@ -5,7 +5,7 @@ from __future__ import annotations
 import enum
 import threading
 import time
-from collections import deque
+from collections import Counter, deque
 from dataclasses import dataclass
 from threading import Lock
 from typing import TYPE_CHECKING, Any
@@ -17,18 +17,20 @@ from sdc11073.mdib import mdibbase
 from sdc11073.mdib.consumermdibxtra import ConsumerMdibMethods
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
     from decimal import Decimal
     from enum import Enum
 
+    from sdc11073 import xml_utils
     from sdc11073.consumer.consumerimpl import SdcConsumer
+    from sdc11073.mdib.containerbase import ContainerBase
     from sdc11073.mdib.entityprotocol import EntityGetterProtocol
     from sdc11073.mdib.statecontainers import (
         AbstractContextStateContainer,
         AbstractStateContainer,
         RealTimeSampleArrayMetricStateContainer,
     )
-    from sdc11073.pysoap.msgreader import MdibVersionGroupReader
+    from sdc11073.pysoap.msgreader import MdibVersionGroupReader, ReceivedMessage
     from sdc11073.xml_types.msg_types import (
         AbstractReport,
         DescriptionModificationReport,
@@ -141,8 +143,18 @@ class ConsumerRtBuffer:
 @dataclass
 class _BufferedData:
     mdib_version_group: MdibVersionGroupReader
-    data: AbstractReport
+    data: AbstractReport | xml_utils.LxmlElement
     handler: callable
+    parse: Callable[[xml_utils.LxmlElement], Any] | None = None  # if not None, data is the unparsed report node
+
+
+@dataclass(frozen=True)
+class MdibVersionGap:
+    """Value of ConsumerMdib.mdib_version_gap_event: reports between the two mdib versions were not received."""
+
+    report_name: str  # the report that revealed the gap
+    mdib_version: int  # mdib version of the consumer mdib before the report
+    received_mdib_version: int  # mdib version of the report
 
 
 class ConsumerMdibState(enum.Enum):
@@ -167,13 +179,37 @@ class ConsumerMdib(mdibbase.MdibBase):
         default_value=False,
         fire_only_on_changed_value=False,
     )
+    # mdib_version_gap_event is set to a MdibVersionGap instance every time the mdib version of a report is more
+    # than one version newer than the mdib version of the mdib.
+    # Observers are called in the thread that processes the report while the mdib lock is acquired; they shall not
+    # call resync or reload_all directly. Use resync_on_gap or call resync in another thread.
+    mdib_version_gap_event: MdibVersionGap | None = properties.ObservableProperty(
+        fire_only_on_changed_value=False,
+    )
+    # names of the changed properties of updated states per report, key is the handle of the state
+    # (DescriptorHandle or Handle of a context state)
+    changed_state_fields_by_handle: dict[str, list[str]] = properties.ObservableProperty(
+        fire_only_on_changed_value=False,
+    )
 
-    def __init__(self, sdc_client: SdcConsumer, extras_cls: type | None = None, max_realtime_samples: int = 100):
+    def __init__(self,
+                 sdc_client: SdcConsumer,
+                 extras_cls: type | None = None,
+                 max_realtime_samples: int = 100,
+                 resync_on_gap: bool = False,
+                 keep_nodes: bool = True):
         """Construct a ConsumerMdib instance.
 
         :param sdc_client: a SdcConsumer instance
         :param  extras_cls: extended functionality
         :param max_realtime_samples: determines how many real time samples are stored per RealtimeSampleArray
+        :param resync_on_gap: if True, resync is called in a separate thread when a gap in the mdib versions of
+                              the received reports is detected. Use this only if the consumer subscribed to all
+                              reports that increment the mdib version (including waveforms), otherwise every
+                              report reveals a gap.
+        :param keep_nodes: if False, the containers in the mdib do not keep the xml nodes they were parsed from,
+                           the nodes are generated on first access instead. This avoids that the containers keep
+                           the received responses and reports alive.
         """
         super().__init__(
             sdc_client.sdc_definitions,
@@ -190,6 +226,27 @@ class ConsumerMdib(mdibbase.MdibBase):
         # a buffer for notifications that are received before initial get_mdib is done
         self._buffered_notifications = []
         self._buffered_notifications_lock = Lock()
+        # handlers for buffered report nodes, key is the report name that is used in pre_filter_report
+        self._buffered_report_handlers = {
+            'metric states': self._process_incoming_metric_states_report,
+            'alert states': self._process_incoming_alert_states_report,
+            'operational states': self._process_incoming_operational_states_report,
+            'context states': self._process_incoming_context_states_report,
+            'component states': self._process_incoming_component_states_report,
+            'waveform states': self._process_incoming_waveform_states,
+            'descriptors': self._process_incoming_description_modifications,
+        }
+        self._dropped_reports = Counter()  # key = reason, value = number of dropped reports
+        self._dropped_reports_lock = Lock()
+        self._resync_on_gap = resync_on_gap
+        self._resync_counts = Counter()  # keys are 'gap', 'incremental' and 'full reload'
+        self._resync_lock = Lock()
+        self._resync_thread: threading.Thread | None = None
+        self._resync_again = False  # a gap was detected while the resync thread was running
+        self._keep_nodes = keep_nodes
+        # MdibVersions that were overtaken by a newer report in the action dispatcher of the consumer,
+        # value is True if a report with this MdibVersion was applied
+        self._overtaken_mdib_versions: dict[int, bool] = {}
         self.entities: EntityGetterProtocol = mdibbase.EntityGetter(self)
 
     @property
@@ -202,6 +259,26 @@ class ConsumerMdib(mdibbase.MdibBase):
         """Give access to sdc client."""
         return self._sdc_client
 
+    @property
+    def dropped_reports(self) -> dict[str, int]:
+        """Return the number of reports that were dropped because of their mdib version group, key is the reason.
+
+        Reasons are 'invalid mdib' (mdib is not in sync with provider), 'too old' (mdib version is older than
+        the mdib version of the mdib) and 'buffered' (buffered report did not fit to the result of GetMdib).
+        """
+        with self._dropped_reports_lock:
+            return dict(self._dropped_reports)
+
+    def _count_dropped_report(self, reason: str):
+        with self._dropped_reports_lock:
+            self._dropped_reports[reason] += 1
+
+    @property
+    def resync_counts(self) -> dict[str, int]:
+        """Return the number of detected mdib version gaps ('gap') and of resyncs ('incremental', 'full reload')."""
+        with self._resync_lock:
+            return dict(self._resync_counts)
+
     @property
     def is_initialized(self) -> bool:
         """Returns True if everything has been set up completely."""
@@ -232,14 +309,17 @@ class ConsumerMdib(mdibbase.MdibBase):
             self.sequence_id = None
             self.instance_id = None
             self.mdib_version = None
+            self._overtaken_mdib_versions.clear()
 
             get_service = self._sdc_client.client('Get')
             self._logger.info('initializing mdib...')
             response = get_service.get_mdib()  # GetRequestResult
             self._logger.info('creating description containers...')
             descriptor_containers, state_containers = response.result
+            self._release_nodes(descriptor_containers)
             self.add_description_containers(descriptor_containers)
             self._logger.info('creating state containers...')
+            self._release_nodes(state_containers)
             self.add_state_containers(state_containers)
 
             mdib_version_group = response.mdib_version_group
@@ -257,28 +337,197 @@ class ConsumerMdib(mdibbase.MdibBase):
             else:
                 self._logger.info('found context states in GetMdib Result, will not call getContextStates')
 
-            # process buffered notifications
-            with self._buffered_notifications_lock:
-                self._logger.debug('got _buffered_notifications_lock')
-                for buffered_report in self._buffered_notifications:
-                    # buffered data might contain notifications that do not fit.
-                    if buffered_report.mdib_version_group.sequence_id != self.sequence_id:
-                        self.logger.debug(
-                            'wrong sequence id "%s"; ignore buffered report',
-                            buffered_report.mdib_version_group.sequence_id,
-                        )
-                        continue
-                    if buffered_report.mdib_version_group.mdib_version <= self.mdib_version:
-                        self.logger.debug(
-                            'older mdib version "%d"; ignore buffered report',
-                            buffered_report.mdib_version_group.mdib_version,
-                        )
-                        continue
-                    buffered_report.handler(buffered_report.mdib_version_group, buffered_report.data)
-                del self._buffered_notifications[:]
-                self._state = ConsumerMdibState.initialized
+            self._replay_buffered_notifications()
             self._logger.info('reload_all done')
 
+    def resync(self) -> bool:
+        """Bring the mdib in sync with the provider again after reports were missed.
+
+        Only states are requested with GetMdState; RealTimeSampleArrayMetric states are not requested, they are
+        updated by the next waveform report. Notifications are buffered during the request and replayed afterward,
+        like in reload_all.
+        reload_all is called instead if the mdib is invalid, if sequence id or instance id changed, or if the
+        descriptors of provider and consumer no longer match (a DescriptionModificationReport was missed).
+        :return: True if the mdib was updated incrementally, False if reload_all was called.
+        """
+        if self._state != ConsumerMdibState.initialized:
+            self._logger.info('resync: mdib is in state {}, reload all', self._state)  # noqa: PLE1205
+            self._full_reload()
+            return False
+        self._logger.info('resync called')
+        with self._buffered_notifications_lock:
+            self._state = ConsumerMdibState.initializing  # notifications are now buffered
+        with self.mdib_lock:
+            requested_handles = [state.DescriptorHandle for state in self.states.objects
+                                 if not state.is_realtime_sample_array_metric_state]
+            context_descriptor_handles = [descr.Handle for descr in self.descriptions.objects
+                                          if descr.is_context_descriptor]
+        requested_handles.extend(context_descriptor_handles)
+        # the mdib lock is not held while waiting for the responses
+        try:
+            response = self._sdc_client.client('Get').get_md_state(requested_handles)
+            states = response.result.MdState.State
+            context_states = [st for st in states if st.is_context_state]
+            if not context_states and context_descriptor_handles:
+                # provider does not include context states in GetMdState response
+                context_states = self._sdc_client.client('Context').get_context_states().result.ContextState
+        except Exception:
+            self._logger.exception('resync: GetMdState or GetContextStates failed, reload all')
+            self._full_reload()
+            return False
+        with self.mdib_lock:
+            mdib_version_group = response.mdib_version_group
+            if (mdib_version_group.sequence_id != self.sequence_id
+                    or mdib_version_group.instance_id != self.instance_id):
+                self._logger.info('resync: sequence id or instance id changed, reload all')
+                self._full_reload()
+                return False
+            if not self._descriptors_match(requested_handles, states):
+                self._full_reload()
+                return False
+            changed_fields = {}
+            states_by_handle = self._update_from_resync_states(
+                [st for st in states if not st.is_context_state], changed_fields)
+            context_by_handle = self._update_from_resync_context_states(context_states, changed_fields)
+            if mdib_version_group.mdib_version > self.mdib_version:
+                self.mdib_version = mdib_version_group.mdib_version
+            self._overtaken_mdib_versions.clear()
+            self._replay_buffered_notifications()
+            self._logger.info('resync done, {} states updated', len(changed_fields))  # noqa: PLE1205
+            with self._resync_lock:
+                self._resync_counts['incremental'] += 1
+            for name, is_category in (('metrics_by_handle', lambda st: st.is_metric_state),
+                                      ('alert_by_handle', lambda st: st.is_alert_state),
+                                      ('operation_by_handle', lambda st: st.is_operational_state),
+                                      ('component_by_handle', lambda st: st.is_component_state)):
+                category_states = {h: st for h, st in states_by_handle.items() if is_category(st)}
+                if category_states:
+                    setattr(self, name, category_states)  # update observable
+            if context_by_handle:
+                self.context_by_handle = context_by_handle
+            if changed_fields:
+                self.changed_state_fields_by_handle = changed_fields
+        return True
+
+    def _full_reload(self):
+        with self._resync_lock:
+            self._resync_counts['full reload'] += 1
+        self.reload_all()
+
+    def _descriptors_match(self, requested_handles: list[str], states: list[AbstractStateContainer]) -> bool:
+        """Check that the states of the GetMdState response fit to the descriptors of the mdib."""
+        returned_handles = set()
+        for state in states:
+            returned_handles.add(state.DescriptorHandle)
+            descriptor = self.descriptions.handle.get_one(state.DescriptorHandle, allow_none=True)
+            if descriptor is None or descriptor.DescriptorVersion != state.DescriptorVersion:
+                self._logger.info(  # noqa: PLE1205
+                    'resync: descriptor {} is unknown or has another version, reload all', state.DescriptorHandle)
+                return False
+        missing = [h for h in requested_handles
+                   if h not in returned_handles and not self.descriptions.handle.get_one(h).is_context_descriptor]
+        if missing:
+            self._logger.info('resync: no states for descriptors {}, reload all', missing)  # noqa: PLE1205
+            return False
+        return True
+
+    def _update_from_resync_states(
+        self,
+        states: list[AbstractStateContainer],
+        changed_fields: dict[str, list[str]],
+    ) -> dict[str, AbstractStateContainer]:
+        """Update the single states of the mdib that have a newer state version."""
+        states_by_handle = {}
+        for state_container in states:
+            old_state_container = self.states.descriptor_handle.get_one(state_container.DescriptorHandle)
+            if state_container.StateVersion > old_state_container.StateVersion:
+                changed_fields[old_state_container.DescriptorHandle] = self._update_state_container(
+                    self.states, old_state_container, state_container, self._keep_nodes)
+                states_by_handle[old_state_container.DescriptorHandle] = old_state_container
+        return states_by_handle
+
+    def _update_from_resync_context_states(
+        self,
+        context_states: list[AbstractContextStateContainer],
+        changed_fields: dict[str, list[str]],
+    ) -> dict[str, AbstractContextStateContainer]:
+        """Update, add and remove context states so that they are equal to context_states of the provider."""
+        states_by_handle = {}
+        src = self.context_states
+        for state_container in context_states:
+            old_state_container = src.handle.get_one(state_container.Handle, allow_none=True)
+            if old_state_container is None:
+                self._set_descriptor_container_reference(state_container)
+                self._release_nodes([state_container])
+                src.add_object(state_container)
+                states_by_handle[state_container.Handle] = state_container
+            elif state_container.StateVersion > old_state_container.StateVersion:
+                changed_fields[old_state_container.Handle] = self._update_state_container(
+                    src, old_state_container, state_container, self._keep_nodes)
+                states_by_handle[old_state_container.Handle] = old_state_container
+        provider_handles = {state_container.Handle for state_container in context_states}
+        removed = [st for st in src.objects if st.Handle not in provider_handles]
+        if removed:
+            self._logger.info('resync: removed context states {}', [st.Handle for st in removed])  # noqa: PLE1205
+            src.remove_objects(removed)
+        return states_by_handle
+
+    def _on_mdib_version_gap(self, gap: MdibVersionGap):
+        """Count the gap, update the observable and start resync if configured."""
+        with self._resync_lock:
+            self._resync_counts['gap'] += 1
+            start_resync = self._resync_on_gap and self._state == ConsumerMdibState.initialized
+            if start_resync and self._resync_thread is not None:
+                self._resync_again = True
+                start_resync = False
+            if start_resync:
+                self._resync_thread = threading.Thread(target=self._run_resync, name='ConsumerMdibResync',
+                                                       daemon=True)
+                self._resync_thread.start()
+        self.mdib_version_gap_event = gap
+
+    def _run_resync(self):
+        while True:
+            try:
+                self.resync()
+            except Exception:
+                self._logger.exception('resync failed')
+            with self._resync_lock:
+                if not self._resync_again:
+                    self._resync_thread = None
+                    return
+                self._resync_again = False
+
+    def _replay_buffered_notifications(self):
+        """Process the notifications that were buffered while initializing and set state to initialized.
+
+        Call this method only if mdib_lock is already acquired.
+        """
+        with self._buffered_notifications_lock:
+            self._logger.debug('got _buffered_notifications_lock')
+            for buffered_report in self._buffered_notifications:
+                # buffered data might contain notifications that do not fit.
+                if buffered_report.mdib_version_group.sequence_id != self.sequence_id:
+                    self.logger.debug(
+                        'wrong sequence id "%s"; ignore buffered report',
+                        buffered_report.mdib_version_group.sequence_id,
+                    )
+                    self._count_dropped_report('buffered')
+                    continue
+                if buffered_report.mdib_version_group.mdib_version <= self.mdib_version:
+                    self.logger.debug(
+                        'older mdib version "%d"; ignore buffered report',
+                        buffered_report.mdib_version_group.mdib_version,
+                    )
+                    self._count_dropped_report('buffered')
+                    continue
+                data = buffered_report.data
+                if buffered_report.parse is not None:
+                    data = buffered_report.parse(data)
+                buffered_report.handler(buffered_report.mdib_version_group, data)
+            del self._buffered_notifications[:]
+            self._state = ConsumerMdibState.initialized
+
     def _retrieve_context_states(self):
         """Only called when context states are not included in GetMdib result."""
         self._logger.info('requesting context states...')
@@ -286,6 +535,7 @@ class ConsumerMdib(mdibbase.MdibBase):
         context_state_containers = response.result.ContextState
 
         self._logger.debug('got {} context states', len(context_state_containers))  # noqa: PLE1205
+        self._release_nodes(context_state_containers)
         with self.context_states.lock:
             for state_container in context_state_containers:
                 old_state_containers = self.context_states.handle.get(state_container.Handle, [])
@@ -303,26 +553,51 @@ class ConsumerMdib(mdibbase.MdibBase):
     def _can_accept_mdib_version(self, new_mdib_version: int, log_prefix: str) -> bool:
         if self.MDIB_VERSION_CHECK_DISABLED:
             return True
+        if self._overtaken_mdib_versions and new_mdib_version >= self.mdib_version:
+            self._check_overtaken_mdib_versions(log_prefix)
         # log deviations from expected mdib version
         if new_mdib_version < self.mdib_version:
+            if new_mdib_version in self._overtaken_mdib_versions:
+                # the report was overtaken by a newer report in the action dispatcher, apply it anyway
+                self._overtaken_mdib_versions[new_mdib_version] = True
+                return True
             self._logger.warning(  # noqa: PLE1205
                 '{}: ignoring too old Mdib version, have {}, got {}',
                 log_prefix,
                 self.mdib_version,
                 new_mdib_version,
             )
+            self._count_dropped_report('too old')
         elif (new_mdib_version - self.mdib_version) > 1:
-            # This can happen if consumer did not subscribe to all notifications.
-            # Still log a warning, because mdib is no longer a correct mirror of provider mdib.
-            self._logger.warning(  # noqa: PLE1205
-                '{}: expect mdib_version {}, got {}',
-                log_prefix,
-                self.mdib_version + 1,
-                new_mdib_version,
-            )
+            skipped = range(self.mdib_version + 1, new_mdib_version)
+            overtaken = [version for version in self._sdc_client.pending_mdib_versions() if version in skipped]
+            self._overtaken_mdib_versions.update(dict.fromkeys(overtaken, False))
+            if len(overtaken) < len(skipped):
+                # This can happen if consumer did not subscribe to all notifications.
+                # Still log a warning, because mdib is no longer a correct mirror of provider mdib.
+                self._logger.warning(  # noqa: PLE1205
+                    '{}: expect mdib_version {}, got {}',
+                    log_prefix,
+                    self.mdib_version + 1,
+                    new_mdib_version,
+                )
+                self._on_mdib_version_gap(MdibVersionGap(log_prefix, self.mdib_version, new_mdib_version))
         # it is possible to receive multiple notifications with the same mdib version => compare ">="
         return new_mdib_version >= self.mdib_version
 
+    def _check_overtaken_mdib_versions(self, log_prefix: str):
+        """Forget overtaken mdib versions that are no longer pending, report a gap for those that were not applied."""
+        pending = self._sdc_client.pending_mdib_versions()
+        lost = []
+        for mdib_version, applied in list(self._overtaken_mdib_versions.items()):
+            if mdib_version not in pending:
+                del self._overtaken_mdib_versions[mdib_version]
+                if not applied:
+                    lost.append(mdib_version)
+        if lost:
+            self._logger.warning('{}: overtaken mdib versions {} were not received', log_prefix, lost)  # noqa: PLE1205
+            self._on_mdib_version_gap(MdibVersionGap(log_prefix, min(lost) - 1, max(lost) + 1))
+
     def _check_sequence_or_instance_id_changed(self, mdib_version_group: mdibbase.MdibVersionGroup):
         """Check if sequence id and instance id are still the same.
 
@@ -357,19 +632,50 @@ class ConsumerMdib(mdibbase.MdibBase):
             thr.start()
 
     def _update_from_mdib_version_group(self, mdib_version_group: MdibVersionGroupReader):
-        if mdib_version_group.mdib_version != self.mdib_version:
+        # an overtaken report has an older mdib version, it must not decrement the mdib version
+        if self.mdib_version is None or mdib_version_group.mdib_version > self.mdib_version:
             self.mdib_version = mdib_version_group.mdib_version
         if mdib_version_group.sequence_id != self.sequence_id:
             self.sequence_id = mdib_version_group.sequence_id
         if mdib_version_group.instance_id != self.instance_id:
             self.instance_id = mdib_version_group.instance_id
 
+    def _release_nodes(self, containers: Iterable[ContainerBase]):
+        """Let the containers drop the received xml nodes, unless the mdib keeps the nodes."""
+        if not self._keep_nodes:
+            for container in containers:
+                container.release_node()
+
+    @staticmethod
+    def _update_state_container(
+        src: mdibbase.StatesLookup | mdibbase.MultiStatesLookup,
+        old_state_container: AbstractStateContainer,
+        new_state_container: AbstractStateContainer,
+        keep_node: bool = True,
+    ) -> list[str]:
+        """Copy the changed properties of new_state_container to old_state_container.
+
+        Indices of src are only updated if an indexed property changed.
+        :param keep_node: if False, old_state_container does not keep the node of new_state_container
+        :return: names of the changed properties
+        """
+        changed = old_state_container.update_changed_from_other_container(new_state_container)
+        if not keep_node:
+            old_state_container.release_node()
+        if not src.indexed_properties.isdisjoint(changed):
+            src.update_object(old_state_container)
+        return changed
+
     def _update_from_states_report(
         self,
         report_type: str,
         report: EpisodicMetricReport | EpisodicAlertReport | OperationInvokedReport | EpisodicComponentReport,
+        changed_fields: dict[str, list[str]],
     ) -> dict[str, AbstractStateContainer]:
-        """Update mdib with incoming states."""
+        """Update mdib with incoming states.
+
+        :param changed_fields: names of the changed properties are added to this dictionary, key is DescriptorHandle
+        """
         states_by_handle = {}
         for report_part in report.ReportPart:
             for state_container in report_part.values_list:
@@ -377,8 +683,8 @@ class ConsumerMdib(mdibbase.MdibBase):
                 old_state_container = src.descriptor_handle.get_one(state_container.DescriptorHandle, allow_none=True)
                 if old_state_container is not None:
                     if self._has_new_state_usable_state_version(old_state_container, state_container, report_type):
-                        old_state_container.update_from_other_container(state_container)
-                        src.update_object(old_state_container)
+                        changed_fields[old_state_container.DescriptorHandle] = self._update_state_container(
+                            src, old_state_container, state_container, self._keep_nodes)
                         states_by_handle[old_state_container.DescriptorHandle] = old_state_container
                 else:
                     self._logger.error(  # noqa: PLE1205
@@ -387,6 +693,7 @@ class ConsumerMdib(mdibbase.MdibBase):
                         state_container.DescriptorHandle,
                     )
                     self._set_descriptor_container_reference(state_container)
+                    self._release_nodes([state_container])
                     src.add_object(state_container)
                     states_by_handle[state_container.DescriptorHandle] = state_container
         return states_by_handle
@@ -394,8 +701,12 @@ class ConsumerMdib(mdibbase.MdibBase):
     def _update_from_context_states_report(
         self,
         report: EpisodicContextReport,
+        changed_fields: dict[str, list[str]],
     ) -> dict[str, AbstractContextStateContainer]:
-        """Update mdib with incoming states."""
+        """Update mdib with incoming states.
+
+        :param changed_fields: names of the changed properties are added to this dictionary, key is Handle
+        """
         states_by_handle = {}
         for report_part in report.ReportPart:
             for state_container in report_part.values_list:
@@ -410,8 +721,8 @@ class ConsumerMdib(mdibbase.MdibBase):
                             state_container.ContextAssociation,
                             state_container.Validator,
                         )
-                        old_state_container.update_from_other_container(state_container)
-                        src.update_object(old_state_container)
+                        changed_fields[old_state_container.Handle] = self._update_state_container(
+                            src, old_state_container, state_container, self._keep_nodes)
                         states_by_handle[old_state_container.DescriptorHandle] = old_state_container
                 else:
                     self._logger.info(  # noqa: PLE1205
@@ -422,10 +733,57 @@ class ConsumerMdib(mdibbase.MdibBase):
                         state_container.Validator,
                     )
                     self._set_descriptor_container_reference(state_container)
+                    self._release_nodes([state_container])
                     src.add_object(state_container)
                     states_by_handle[state_container.Handle] = state_container
         return states_by_handle
 
+    def pre_filter_report(
+        self,
+        received_message_data: ReceivedMessage,
+        report_name: str,
+        parse: Callable[[xml_utils.LxmlElement], Any],
+    ) -> bool:
+        """Check the mdib version group of a received report before the report is parsed.
+
+        Reports are dropped if the mdib is invalid, if the sequence id or instance id changed
+        or if the mdib version is older than the mdib version of the mdib and was not overtaken.
+        While the mdib is initializing, the report node is buffered and parsed with 'parse' when it is replayed.
+        :param received_message_data: the received report
+        :param report_name: one of 'metric states', 'alert states', 'operational states', 'context states',
+                            'component states', 'waveform states', 'descriptors'
+        :param parse: callable that creates the data for the process_incoming... method from the report node
+        :return: True if the report shall be parsed and processed now.
+        """
+        mdib_version_group = received_message_data.mdib_version_group
+        if mdib_version_group is None:
+            return True  # nothing to check, let the process_incoming... methods handle it
+        self._check_sequence_or_instance_id_changed(mdib_version_group)  # this might change self._state
+        if self._state == ConsumerMdibState.invalid:
+            self._count_dropped_report('invalid mdib')
+            return False
+        if self._state == ConsumerMdibState.initializing:
+            with self._buffered_notifications_lock:
+                # check state again, it might have changed before lock was acquired
+                if self._state == ConsumerMdibState.initializing:
+                    self._buffered_notifications.append(
+                        _BufferedData(mdib_version_group,
+                                      received_message_data.p_msg.msg_node,
+                                      self._buffered_report_handlers[report_name],
+                                      parse))
+                    return False
+        if (not self.MDIB_VERSION_CHECK_DISABLED and mdib_version_group.mdib_version < self.mdib_version
+                and mdib_version_group.mdib_version not in self._overtaken_mdib_versions):
+            self._logger.warning(  # noqa: PLE1205
+                '{}: ignoring too old Mdib version, have {}, got {}',
+                report_name,
+                self.mdib_version,
+                mdib_version_group.mdib_version,
+            )
+            self._count_dropped_report('too old')
+            return False
+        return True
+
     def _pre_check_report_ok(
         self,
         mdib_version_group: MdibVersionGroupReader,
@@ -441,6 +799,7 @@ class ConsumerMdib(mdibbase.MdibBase):
         self._check_sequence_or_instance_id_changed(mdib_version_group)  # this might change self._state
         if self._state == ConsumerMdibState.invalid:
             # ignore report in these states
+            self._count_dropped_report('invalid mdib')
             return False
         if self._state == ConsumerMdibState.initializing:
             with self._buffered_notifications_lock:
@@ -474,12 +833,15 @@ class ConsumerMdib(mdibbase.MdibBase):
         Call this method only if mdib_lock is already acquired.
         """
         states_by_handle = {}
+        changed_fields = {}
         try:
             if self._can_accept_mdib_version(mdib_version_group.mdib_version, 'metric states'):
                 self._update_from_mdib_version_group(mdib_version_group)
-                states_by_handle = self._update_from_states_report('metric states', report)
+                states_by_handle = self._update_from_states_report('metric states', report, changed_fields)
         finally:
             self.metrics_by_handle = states_by_handle  # update observable
+            if changed_fields:
+                self.changed_state_fields_by_handle = changed_fields
 
     def process_incoming_alert_states_report(
         self,
@@ -505,12 +867,15 @@ class ConsumerMdib(mdibbase.MdibBase):
         Call this method only if mdib_lock is already acquired.
         """
         states_by_handle = {}
+        changed_fields = {}
         try:
             if self._can_accept_mdib_version(mdib_version_group.mdib_version, 'alert states'):
                 self._update_from_mdib_version_group(mdib_version_group)
-                states_by_handle = self._update_from_states_report('alert states', report)
+                states_by_handle = self._update_from_states_report('alert states', report, changed_fields)
         finally:
             self.alert_by_handle = states_by_handle  # update observable
+            if changed_fields:
+                self.changed_state_fields_by_handle = changed_fields
 
     def process_incoming_operational_states_report(
         self,
@@ -536,12 +901,15 @@ class ConsumerMdib(mdibbase.MdibBase):
         Call this method only if mdib_lock is already acquired.
         """
         states_by_handle = {}
+        changed_fields = {}
         try:
             if self._can_accept_mdib_version(mdib_version_group.mdib_version, 'operational states'):
                 self._update_from_mdib_version_group(mdib_version_group)
-                states_by_handle = self._update_from_states_report('operational states', report)
+                states_by_handle = self._update_from_states_report('operational states', report, changed_fields)
         finally:
             self.operation_by_handle = states_by_handle  # update observable
+            if changed_fields:
+                self.changed_state_fields_by_handle = changed_fields
 
     def process_incoming_context_states_report(
         self,
@@ -567,12 +935,15 @@ class ConsumerMdib(mdibbase.MdibBase):
         Call this method only if mdib_lock is already acquired.
         """
         states_by_handle = {}
+        changed_fields = {}
         try:
             if self._can_accept_mdib_version(mdib_version_group.mdib_version, 'context states'):
                 self._update_from_mdib_version_group(mdib_version_group)
-                states_by_handle = self._update_from_context_states_report(report)
+                states_by_handle = self._update_from_context_states_report(report, changed_fields)
         finally:
             self.context_by_handle = states_by_handle  # update observable
+            if changed_fields:
+                self.changed_state_fields_by_handle = changed_fields
 
     def process_incoming_component_states_report(
         self,
@@ -598,12 +969,15 @@ class ConsumerMdib(mdibbase.MdibBase):
         Call this method only if mdib_lock is already acquired.
         """
         states_by_handle = {}
+        changed_fields = {}
         try:
             if self._can_accept_mdib_version(mdib_version_group.mdib_version, 'component states'):
                 self._update_from_mdib_version_group(mdib_version_group)
-                states_by_handle = self._update_from_states_report('component states', report)
+                states_by_handle = self._update_from_states_report('component states', report, changed_fields)
         finally:
             self.component_by_handle = states_by_handle  # update observable
+            if changed_fields:
+                self.changed_state_fields_by_handle = changed_fields
 
     def process_incoming_waveform_states(
         self,
@@ -629,6 +1003,7 @@ class ConsumerMdib(mdibbase.MdibBase):
         Call this method only if mdib_lock is already acquired.
         """
         states_by_handle = {}
+        changed_fields = {}
         try:
             if self._can_accept_mdib_version(mdib_version_group.mdib_version, 'waveform states'):
                 self._update_from_mdib_version_group(mdib_version_group)
@@ -643,8 +1018,8 @@ class ConsumerMdib(mdibbase.MdibBase):
                             state_container,
                             'waveform states',
                         ):
-                            old_state_container.update_from_other_container(state_container)
-                            self.states.update_object(old_state_container)
+                            changed_fields[old_state_container.DescriptorHandle] = self._update_state_container(
+                                self.states, old_state_container, state_container, self._keep_nodes)
                             states_by_handle[old_state_container.DescriptorHandle] = old_state_container
                     else:
                         self._logger.error(  # noqa: PLE1205
@@ -652,6 +1027,7 @@ class ConsumerMdib(mdibbase.MdibBase):
                             state_container.DescriptorHandle,
                         )
                         self._set_descriptor_container_reference(state_container)
+                        self._release_nodes([state_container])
                         self.states.add_object(state_container)
                         states_by_handle[state_container.DescriptorHandle] = state_container
 
@@ -675,6 +1051,8 @@ class ConsumerMdib(mdibbase.MdibBase):
                     rt_buffer.add_rt_sample_containers(rt_sample_containers)
         finally:
             self.waveform_by_handle = states_by_handle  # update observable
+            if changed_fields:
+                self.changed_state_fields_by_handle = changed_fields
 
     def process_incoming_description_modifications(
         self,
@@ -713,6 +1091,8 @@ class ConsumerMdib(mdibbase.MdibBase):
                 for report_part in report.ReportPart:
                     modification_type = report_part.ModificationType
                     if modification_type == dmt.CREATE:
+                        self._release_nodes(report_part.Descriptor)
+                        self._release_nodes(report_part.State)
                         for descriptor_container in report_part.Descriptor:
                             self.descriptions.add_object(descriptor_container)
                             self._logger.debug(  # noqa: PLE1205
@@ -745,6 +1125,7 @@ class ConsumerMdib(mdibbase.MdibBase):
                                 )
                             else:
                                 old_container.update_from_other_container(descriptor_container)
+                                self._release_nodes([old_container])
                             updated_descriptor_by_handle[descriptor_container.Handle] = descriptor_container
                             # if this is a context descriptor, delete all associated states that are not in
                             # state_containers list
@@ -783,6 +1164,7 @@ class ConsumerMdib(mdibbase.MdibBase):
                                     )
                             if old_state_container is not None:
                                 old_state_container.update_from_other_container(state_container)
+                                self._release_nodes([old_state_container])
                                 my_multi_key.update_object(old_state_container)
 
                     elif modification_type == dmt.DELETE:
@@ -13,11 +13,16 @@ from sdc11073 import observableproperties as properties
 from sdc11073.exceptions import ApiUsageError
 
 if TYPE_CHECKING:
+    from sdc11073 import xml_utils
     from sdc11073.loghelper import LoggerAdapter
     from sdc11073.pysoap.msgreader import ReceivedMessage
 
     from .consumermdib import ConsumerMdib
-    from .statecontainers import AbstractMetricStateContainer, AbstractStateProtocol
+    from .statecontainers import (
+        AbstractMetricStateContainer,
+        AbstractStateProtocol,
+        RealTimeSampleArrayMetricStateContainer,
+    )
 
 
 
@@ -283,6 +288,8 @@ class ConsumerMdibMethods:
     def _on_episodic_metric_report(self, received_message_data: ReceivedMessage):
         model = self._mdib.data_model
         cls = model.msg_types.EpisodicMetricReport
+        if not self._mdib.pre_filter_report(received_message_data, 'metric states', cls.from_node):
+            return
         report = cls.from_node(received_message_data.p_msg.msg_node)
         self._mdib.process_incoming_metric_states_report(received_message_data.mdib_version_group, report)
 
@@ -316,11 +323,15 @@ class ConsumerMdibMethods:
 
     def _on_episodic_alert_report(self, received_message_data: ReceivedMessage):
         cls = self._mdib.data_model.msg_types.EpisodicAlertReport
+        if not self._mdib.pre_filter_report(received_message_data, 'alert states', cls.from_node):
+            return
         report = cls.from_node(received_message_data.p_msg.msg_node)
         self._mdib.process_incoming_alert_states_report(received_message_data.mdib_version_group, report)
 
     def _on_operational_state_report(self, received_message_data: ReceivedMessage):
         cls = self._mdib.data_model.msg_types.EpisodicOperationalStateReport
+        if not self._mdib.pre_filter_report(received_message_data, 'operational states', cls.from_node):
+            return
         report = cls.from_node(received_message_data.p_msg.msg_node)
         self._mdib.process_incoming_operational_states_report(received_message_data.mdib_version_group, report)
 
@@ -343,6 +354,8 @@ class ConsumerMdibMethods:
     def _on_waveform_report(self, received_message_data: ReceivedMessage):
         """Handle waveform report."""
         cls = self._mdib.data_model.msg_types.WaveformStream
+        if not self._mdib.pre_filter_report(received_message_data, 'waveform states', self._parse_waveform_states):
+            return
         report = cls.from_node(received_message_data.p_msg.msg_node)
         if self._calculate_wf_age_stats:
             self._process_wf_age_statistics(report.State)
@@ -389,9 +402,14 @@ class ConsumerMdibMethods:
                         age_data.min_age * 1000., age_data.max_age * 1000.)
                 self._last_wf_age_log = now
 
+    def _parse_waveform_states(self, node: xml_utils.LxmlElement) -> list[RealTimeSampleArrayMetricStateContainer]:
+        return self._mdib.data_model.msg_types.WaveformStream.from_node(node).State
+
     def _on_episodic_context_report(self, received_message_data: ReceivedMessage):
         """Handle episodic context report."""
         cls = self._mdib.data_model.msg_types.EpisodicContextReport
+        if not self._mdib.pre_filter_report(received_message_data, 'context states', cls.from_node):
+            return
         report = cls.from_node(received_message_data.p_msg.msg_node)
         self._mdib.process_incoming_context_states_report(received_message_data.mdib_version_group, report)
 
@@ -403,6 +421,8 @@ class ConsumerMdibMethods:
         Components are MDSs, VMDs, Channels. Not metrics and alarms.
         """
         cls = self._mdib.data_model.msg_types.EpisodicComponentReport
+        if not self._mdib.pre_filter_report(received_message_data, 'component states', cls.from_node):
+            return
         report = cls.from_node(received_message_data.p_msg.msg_node)
         self._mdib.process_incoming_component_states_report(received_message_data.mdib_version_group, report)
 
@@ -414,6 +434,8 @@ class ConsumerMdibMethods:
         Components are MDSs, VMDs, Channels. Not metrics and alarms.
         """
         cls = self._mdib.data_model.msg_types.DescriptionModificationReport
+        if not self._mdib.pre_filter_report(received_message_data, 'descriptors', cls.from_node):
+            return
         report = cls.from_node(received_message_data.p_msg.msg_node)
         self._mdib.process_incoming_description_modifications(received_message_data.mdib_version_group, report)
 
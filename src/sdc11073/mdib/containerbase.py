@@ -10,14 +10,47 @@ from lxml import etree
 
 from sdc11073 import observableproperties as properties
 from sdc11073 import xml_utils
-from sdc11073.namespaces import QN_TYPE, NamespaceHelper
+from sdc11073.namespaces import QN_TYPE, NamespaceHelper, default_ns_helper
+
+# key = container class, value = result of sorted_container_properties
+_sorted_container_properties: dict[type, list[tuple[str, Any]]] = {}
+
+
+def _is_equal(value: Any, other_value: Any) -> bool:
+    """Compare values of container properties, values of different types are never equal."""
+    try:
+        return type(value) is type(other_value) and value == other_value
+    except RuntimeError:  # e.g. pm:CodedValue can not be compared, handle it as not equal
+        return False
+
+
+class _NodeProperty(properties.ObservableProperty):
+    """The xml node of a container.
+
+    If the container did not keep the node it was created from, a node is generated from the container properties
+    on first access.
+    """
+
+    def __get__(self, obj: ContainerBase | None, objtype: type) -> Any:
+        if obj is None:
+            return self
+        data = self._get_instance_data(obj)
+        if data.value is None and obj._node_tag is not None:  # noqa: SLF001
+            data.value = obj.mk_node(obj._node_tag, default_ns_helper, set_xsi_type=True)  # noqa: SLF001
+        return data.value
+
+    def get_stored_value(self, obj: ContainerBase) -> xml_utils.LxmlElement | None:
+        """Return the node without generating it."""
+        return self._get_instance_data(obj).value
 
 
 class ContainerBase:
     """Common base class for descriptors and states."""
 
     NODETYPE: etree.QName = None  # overwrite in derived classes! This is the BICEPS Type.
-    node = properties.ObservableProperty()
+    node = _NodeProperty()
+    _node_tag: etree.QName | None = None  # tag of lazily generated node, set by release_node
+    _generated_node_tag: etree.QName | None = None  # tag for generated nodes, None means tag of the released node
     is_state_container = False
     is_descriptor_container = False
 
@@ -83,8 +116,24 @@ class ContainerBase:
         """Update members from node."""
         for _, cprop in self.sorted_container_properties():
             cprop.update_from_node(self, node)
+        self._node_tag = None
         self.node = node
 
+    def release_node(self):
+        """Drop the reference to the node, a node is generated from the container properties on next access.
+
+        This avoids that containers keep the complete received xml tree alive.
+        """
+        node = ContainerBase.node.get_stored_value(self)
+        if node is not None:
+            self._node_tag = self._generated_node_tag if self._generated_node_tag is not None else node.tag
+            self.node = None
+
+    def _update_node_from_other(self, other_container: ContainerBase):
+        """Take the node of other container without generating it."""
+        self._node_tag = other_container._node_tag
+        self.node = ContainerBase.node.get_stored_value(other_container)
+
     def _update_from_other(self, other_container: ContainerBase, skipped_properties: list[str] | None):
         """Update all ContainerProperties."""
         if skipped_properties is None:
@@ -94,6 +143,37 @@ class ContainerBase:
                 new_value = getattr(other_container, prop_name)
                 setattr(self, prop_name, copy.copy(new_value))
 
+    def _update_changed_from_other(
+        self,
+        other_container: ContainerBase,
+        skipped_properties: list[str] | None,
+    ) -> list[str]:
+        """Update only ContainerProperties whose value differs from the value in other_container.
+
+        :return: names of the updated properties
+        """
+        changed = []
+        # compare the locally stored values directly, this avoids the overhead of the property access
+        my_values = self.__dict__
+        other_values = other_container.__dict__
+        for prop_name, prop in self.sorted_container_properties():
+            if skipped_properties is not None and prop_name in skipped_properties:
+                continue
+            local_var_name = prop._local_var_name  # noqa: SLF001
+            new_value = other_values.get(local_var_name)
+            old_value = my_values.get(local_var_name)
+            if new_value is old_value:
+                continue
+            if new_value is None or old_value is None:
+                # not stored in one of the containers, compare the values including implied values
+                new_value = getattr(other_container, prop_name)
+                old_value = getattr(self, prop_name)
+            if _is_equal(new_value, old_value):
+                continue
+            setattr(self, prop_name, copy.copy(new_value))
+            changed.append(prop_name)
+        return changed
+
     def mk_copy(self, copy_node: bool = False) -> ContainerBase:
         """Make a copy of self."""
         copied = copy.copy(self)
@@ -105,7 +185,12 @@ class ContainerBase:
         """Return a list of (name, object) tuples of all GenericProperties (and subclasses).
 
         Base class properties are first.
+        The list is calculated once per class, do not modify it.
         """
+        try:
+            return _sorted_container_properties[self.__class__]
+        except KeyError:
+            pass
         ret = []
         all_classes = inspect.getmro(self.__class__)
         for cls in reversed(all_classes):
@@ -117,4 +202,5 @@ class ContainerBase:
                 obj = getattr(cls, name)
                 if obj is not None:
                     ret.append((name, obj))
+        _sorted_container_properties[self.__class__] = ret
         return ret
@@ -169,7 +169,7 @@ class AbstractDescriptorContainer(ContainerBase):
             )
             raise ValueError(error_msg)
         self._update_from_other(other, skipped_properties)
-        self.node = other.node
+        self._update_node_from_other(other)
 
     def get_actual_value(self, attr_name: str) -> Any:
         """Ignores default value and implied value, e.g. returns None if value is not present in xml."""
@@ -158,6 +158,9 @@ class StatesLookup(_MultikeyWithVersionLookup):
     descriptor_handle: multikey.UIndexDefinition[str, list[AbstractDescriptorContainer]]
     NODETYPE: multikey.IndexDefinition[etree.QName, list[AbstractDescriptorContainer]]
 
+    # container properties that are used as index keys
+    indexed_properties = frozenset(('DescriptorHandle',))
+
     def __init__(self):
         super().__init__()
         self.add_index('descriptor_handle', multikey.UIndexDefinition(lambda obj: obj.DescriptorHandle))
@@ -194,6 +197,9 @@ class MultiStatesLookup(_MultikeyWithVersionLookup):
     handle: multikey.UIndexDefinition[str, list[AbstractMultiStateContainer]]
     NODETYPE: multikey.IndexDefinition[etree.QName, list[AbstractMultiStateContainer]]
 
+    # container properties that are used as index keys
+    indexed_properties = frozenset(('DescriptorHandle', 'Handle'))
+
     def __init__(self):
         super().__init__()
         self.add_index('descriptor_handle', multikey.IndexDefinition(lambda obj: obj.DescriptorHandle))
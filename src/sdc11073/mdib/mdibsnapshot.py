@@ -0,0 +1,328 @@
+"""Binary snapshot of the descriptors and states of a ProviderMdib.
+
+Loading a snapshot does not need xml parsing and schema validation of the mdib, and the initialization steps
+(creating missing states, initial values, retrievability lists, source mds) are already contained in the snapshot.
+
+Format:
+  - header: magic bytes, format version, length of pm namespace, pm namespace (utf-8)
+  - zlib compressed json document of the mdib content
+
+The json document only contains basic data types. Values of other types are encoded as lists with a type tag.
+Classes are referenced by name and are only looked up in the pm_types module of the data model and in the
+statecontainers module, or as container classes of the data model.
+The only xml that is parsed is the content of extension elements.
+"""
+
+from __future__ import annotations
+
+import copy
+import enum
+import inspect
+import json
+import struct
+import zlib
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+from lxml import etree
+
+from sdc11073.xml_types import isoduration
+from sdc11073.xml_types.basetypes import XMLTypeBase
+from sdc11073.xml_types.xml_structure import ExtensionLocalValue
+
+from . import statecontainers
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import ModuleType
+
+    from sdc11073.definitions_base import AbstractDataModel
+
+    from .containerbase import ContainerBase
+    from .providermdib import ProviderMdib
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_MAGIC = b'SDCMDIB\x00'
+_HEADER = struct.Struct('>8sHH')  # magic, format version, length of pm namespace
+
+# type tags of encoded values
+_LIST = 0
+_DECIMAL = 1
+_ENUM = 2
+_OBJECT = 3
+_EXTENSION = 4
+_ELEMENT = 5
+_QNAME = 6
+_DATE = 7
+_ABSENT = []  # property has no instance data
+
+
+class SnapshotError(ValueError):
+    """Data is not a valid snapshot or it does not match the container definitions of this version."""
+
+
+def snapshot_pm_namespace(data: bytes) -> str:
+    """Return the participant model namespace of the snapshot."""
+    return _read_header(data)[0]
+
+
+def mk_snapshot(mdib: ProviderMdib) -> bytes:
+    """Serialize descriptors, states and retrievability lists of the mdib."""
+    encoder = _Encoder((mdib.data_model.pm_types, statecontainers))
+    with mdib.mdib_lock:
+        descriptors = [[d.NODETYPE.text, d.Handle, d.parent_handle, d.source_mds, encoder.encode_container(d)]
+                       for d in _tree_order(mdib)]
+        states = [[s.NODETYPE.text, encoder.encode_container(s)] for s in mdib.states.objects]
+        context_states = [[s.NODETYPE.text, encoder.encode_container(s)] for s in mdib.context_states.objects]
+        document = {
+            'classes': encoder.class_names,
+            'enums': encoder.enum_names,
+            'layouts': encoder.layouts,
+            'descriptors': descriptors,
+            'states': states,
+            'context_states': context_states,
+            'retrievability_episodic': list(mdib._retrievability_episodic),  # noqa: SLF001
+            'retrievability_periodic': {str(k): v for k, v in mdib.retrievability_periodic.items()},
+        }
+    body = zlib.compress(json.dumps(document, separators=(',', ':')).encode('utf-8'))
+    pm_namespace = mdib.data_model.ns_helper.PM.namespace.encode('utf-8')
+    return _HEADER.pack(_MAGIC, SNAPSHOT_FORMAT_VERSION, len(pm_namespace)) + pm_namespace + body
+
+
+def _tree_order(mdib: ProviderMdib) -> list:
+    """Return all descriptors, parents before children and siblings in the order of the parent_handle index."""
+    result = list(mdib.descriptions.parent_handle.get(None, []))
+    for descriptor in result:  # result grows while iterating
+        result.extend(mdib.descriptions.parent_handle.get(descriptor.Handle, []))
+    return result
+
+
+def load_snapshot(mdib: ProviderMdib, data: bytes):
+    """Add descriptors and states of the snapshot to an empty mdib."""
+    pm_namespace, offset = _read_header(data)
+    if pm_namespace != mdib.data_model.ns_helper.PM.namespace:
+        msg = f'snapshot has pm namespace {pm_namespace}, mdib uses {mdib.data_model.ns_helper.PM.namespace}'
+        raise SnapshotError(msg)
+    try:
+        document = json.loads(zlib.decompress(data[offset:]))
+    except (zlib.error, ValueError) as ex:
+        msg = 'snapshot data is corrupt'
+        raise SnapshotError(msg) from ex
+    decoder = _Decoder(mdib.data_model, document)
+    descriptors = []
+    descriptors_by_handle = {}
+    for node_type, handle, parent_handle, source_mds, values in document['descriptors']:
+        cls = decoder.container_class(node_type, mdib.data_model.get_descriptor_container_class)
+        descriptor = cls(handle, parent_handle)
+        descriptor.set_source_mds(source_mds)
+        decoder.decode_container(descriptor, values)
+        descriptors.append(descriptor)
+        descriptors_by_handle[handle] = descriptor
+    states = []
+    for node_type, values in document['states'] + document['context_states']:
+        cls = decoder.container_class(node_type, mdib.data_model.get_state_container_class)
+        state = cls(None)
+        decoder.decode_container(state, values)
+        state.descriptor_container = descriptors_by_handle[state.DescriptorHandle]
+        states.append(state)
+    mdib.add_description_containers(descriptors)
+    mdib.add_state_containers(states)
+    mdib._retrievability_episodic.extend(document['retrievability_episodic'])  # noqa: SLF001
+    for period_ms, handles in document['retrievability_periodic'].items():
+        mdib.retrievability_periodic[int(period_ms)].extend(handles)
+
+
+def _read_header(data: bytes) -> tuple[str, int]:
+    try:
+        magic, version, namespace_length = _HEADER.unpack_from(data)
+    except struct.error as ex:
+        msg = 'data is not a mdib snapshot'
+        raise SnapshotError(msg) from ex
+    if magic != _MAGIC:
+        msg = 'data is not a mdib snapshot'
+        raise SnapshotError(msg)
+    if version != SNAPSHOT_FORMAT_VERSION:
+        msg = f'unsupported snapshot format version {version}, expected {SNAPSHOT_FORMAT_VERSION}'
+        raise SnapshotError(msg)
+    offset = _HEADER.size + namespace_length
+    return data[_HEADER.size:offset].decode('utf-8'), offset
+
+
+def _construct(cls: type[XMLTypeBase]) -> XMLTypeBase:
+    """Call the constructor of cls, required arguments get placeholder values ('' for strings, else None)."""
+    args = ['' if param.annotation in ('str', str) else None
+            for param in inspect.signature(cls).parameters.values()
+            if param.default is param.empty and param.kind is param.POSITIONAL_OR_KEYWORD]
+    try:
+        return cls(*args)
+    except (TypeError, ValueError) as ex:
+        msg = f'class {cls.__name__} can not be created with placeholder constructor arguments'
+        raise SnapshotError(msg) from ex
+
+
+class _Encoder:
+    """Converts containers to json compatible data."""
+
+    def __init__(self, modules: tuple[ModuleType, ...]):
+        self._modules = modules
+        self.class_names: list[str] = []
+        self.enum_names: list[str] = []
+        self.layouts: dict[str, list[str]] = {}  # key = class name or container NODETYPE, value = property names
+        self._class_indices: dict[type, int] = {}
+        self._enum_indices: dict[type, int] = {}
+
+    def encode_container(self, container: ContainerBase) -> list:
+        key = container.NODETYPE.text
+        if key not in self.layouts:
+            self.layouts[key] = [name for name, _ in container.sorted_container_properties()]
+        return self._encode_properties(container)
+
+    def _encode_properties(self, obj: ContainerBase | XMLTypeBase) -> list:
+        instance_data = obj.__dict__
+        return [self._encode(instance_data[prop._local_var_name])  # noqa: SLF001
+                if prop._local_var_name in instance_data else _ABSENT  # noqa: SLF001
+                for _, prop in obj.sorted_container_properties()]
+
+    def _encode(self, value: Any) -> Any:  # noqa: PLR0911
+        value_type = type(value)
+        if value is None or value_type in (str, int, float, bool):
+            return value
+        if value_type is Decimal:
+            return [_DECIMAL, str(value)]
+        if isinstance(value, enum.Enum):
+            return [_ENUM, self._type_index(value_type, self._enum_indices, self.enum_names), value.value]
+        if isinstance(value, ExtensionLocalValue):
+            return [_EXTENSION, *[[etree.tostring(node, encoding='unicode', with_tail=False), node.tail]
+                                  for node in value]]
+        if isinstance(value, list):
+            return [_LIST, *[self._encode(v) for v in value]]
+        if isinstance(value, XMLTypeBase):
+            index = self._type_index(value_type, self._class_indices, self.class_names)
+            if value_type.__name__ not in self.layouts:
+                self.layouts[value_type.__name__] = [name for name, _ in value.sorted_container_properties()]
+            return [_OBJECT, index, *self._encode_properties(value)]
+        if isinstance(value, etree._Element):  # noqa: SLF001
+            return [_ELEMENT, etree.tostring(value, encoding='unicode')]
+        if value_type is etree.QName:
+            return [_QNAME, value.text]
+        if value_type is isoduration.XsdDateInformation:
+            return [_DATE, str(value)]
+        msg = f'value {value!r} of type {value_type} can not be stored in a snapshot'
+        raise TypeError(msg)
+
+    def _type_index(self, value_type: type, indices: dict[type, int], names: list[str]) -> int:
+        index = indices.get(value_type)
+        if index is None:
+            if all(getattr(module, value_type.__name__, None) is not value_type for module in self._modules):
+                msg = f'class {value_type} is not part of {[module.__name__ for module in self._modules]}'
+                raise TypeError(msg)
+            index = len(names)
+            names.append(value_type.__name__)
+            indices[value_type] = index
+        return index
+
+
+class _Decoder:
+    """Restores containers from json compatible data."""
+
+    def __init__(self, data_model: AbstractDataModel, document: dict):
+        modules = (data_model.pm_types, statecontainers)
+        self._layouts = document['layouts']
+        self._classes = [self._lookup(modules, name, XMLTypeBase) for name in document['classes']]
+        self._enums = [self._lookup(modules, name, enum.Enum) for name in document['enums']]
+        self._class_properties = [self._properties(cls.__new__(cls), cls.__name__) for cls in self._classes]
+        self._class_attributes = [self._extra_attributes(cls) for cls in self._classes]
+        self._checked_containers: dict[str, list[str]] = {}  # key = NODETYPE, value = instance data names
+        self._elements: dict[str, etree._Element] = {}  # key = xml text of an extension element
+
+    @staticmethod
+    def _lookup(modules: tuple[ModuleType, ...], name: str, base_class: type) -> type:
+        for module in modules:
+            cls = getattr(module, name, None)
+            if isinstance(cls, type) and issubclass(cls, base_class):
+                return cls
+        msg = f'unknown class {name} in snapshot'
+        raise SnapshotError(msg)
+
+    @staticmethod
+    def _extra_attributes(value_class: type[XMLTypeBase]) -> dict[str, Any]:
+        """Return the instance attributes that the constructor of value_class sets and that are no container properties.
+
+        These attributes are not part of a snapshot, every decoded object gets a copy of the constructor values.
+        """
+        obj = _construct(value_class)
+        property_names = {prop._local_var_name for _, prop in obj.sorted_container_properties()}  # noqa: SLF001
+        return {name: value for name, value in vars(obj).items() if name not in property_names}
+
+    def _properties(self, obj: ContainerBase | XMLTypeBase, key: str) -> list[str]:
+        """Return the instance data names of the properties of obj, if they match the layout of the snapshot."""
+        properties = obj.sorted_container_properties()
+        if self._layouts.get(key) != [name for name, _ in properties]:
+            msg = f'properties of {key} in snapshot do not match the current definition'
+            raise SnapshotError(msg)
+        return [prop._local_var_name for _, prop in properties]  # noqa: SLF001
+
+    @staticmethod
+    def container_class(node_type: str, lookup: Callable[[etree.QName], type]) -> type:
+        cls = lookup(etree.QName(node_type))
+        if cls is None:
+            msg = f'unknown container type {node_type} in snapshot'
+            raise SnapshotError(msg)
+        return cls
+
+    def decode_container(self, container: ContainerBase, values: list):
+        properties = self._checked_containers.get(container.NODETYPE.text)
+        if properties is None:
+            properties = self._properties(container, container.NODETYPE.text)
+            self._checked_containers[container.NODETYPE.text] = properties
+        self._set_properties(container, properties, values)
+
+    def _set_properties(self, obj: ContainerBase | XMLTypeBase, names: list[str], values: list):
+        instance_data = obj.__dict__
+        for name, value in zip(names, values, strict=True):
+            if type(value) is not list:
+                instance_data[name] = value
+            elif value:
+                instance_data[name] = self._decode(value)
+            else:  # _ABSENT
+                instance_data.pop(name, None)
+
+    def _decode(self, value: Any) -> Any:  # noqa: PLR0911
+        if type(value) is not list:
+            return value
+        tag = value[0]
+        if tag == _LIST:
+            return [self._decode(v) for v in value[1:]]
+        if tag == _DECIMAL:
+            return Decimal(value[1])
+        if tag == _ENUM:
+            return self._enums[value[1]](value[2])
+        if tag == _OBJECT:
+            index = value[1]
+            cls = self._classes[index]
+            obj = cls.__new__(cls)
+            extra_attributes = self._class_attributes[index]
+            if extra_attributes:
+                obj.__dict__.update(copy.deepcopy(extra_attributes))
+            self._set_properties(obj, self._class_properties[index], value[2:])
+            return obj
+        if tag == _EXTENSION:
+            return ExtensionLocalValue([self._element(text, tail) for text, tail in value[1:]])
+        if tag == _ELEMENT:
+            return etree.fromstring(value[1])
+        if tag == _QNAME:
+            return etree.QName(value[1])
+        if tag == _DATE:
+            return isoduration.parse_date_time(value[1])
+        msg = f'unknown type tag {tag} in snapshot'
+        raise SnapshotError(msg)
+
+    def _element(self, text: str, tail: str | None) -> etree._Element:
+        # many containers have identical extensions, copying a parsed element is faster than parsing it again
+        template = self._elements.get(text)
+        if template is None:
+            template = self._elements[text] = etree.fromstring(text)
+        node = copy.copy(template)
+        node.tail = tail
+        return node
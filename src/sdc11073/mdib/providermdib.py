@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import copy
 import uuid
 from collections import defaultdict
 from collections.abc import Callable
@@ -13,8 +14,9 @@ from typing import TYPE_CHECKING, Any
 from sdc11073 import loghelper
 from sdc11073.definitions_base import ProtocolsRegistry
 from sdc11073.loghelper import LoggerAdapter
-from sdc11073.mdib import mdibbase
+from sdc11073.mdib import mdibbase, mdibsnapshot
 from sdc11073.mdib.providermdibxtra import ProviderMdibMethods
+from sdc11073.mdib.shareddescriptors import SharedDescriptorsLookup
 from sdc11073.mdib.transactions import mk_transaction
 from sdc11073.mdib.transactionsprotocol import AnyTransactionManagerProtocol, TransactionType
 from sdc11073.observableproperties import ObservableProperty
@@ -25,6 +27,7 @@ if TYPE_CHECKING:
 
     from sdc11073.definitions_base import BaseDefinitions
     from sdc11073.mdib.entityprotocol import ProviderEntityGetterProtocol
+    from sdc11073.mdib.shareddescriptors import SharedDescriptorSet
     from sdc11073.mdib.transactionsprotocol import (
         ContextStateTransactionManagerProtocol,
         DescriptorTransactionManagerProtocol,
@@ -132,6 +135,8 @@ class ProviderMdib(mdibbase.MdibBase):
         """Start a transaction, return a new transaction manager."""
         with self._tr_lock, self.mdib_lock:
             try:
+                if transaction_type == TransactionType.descriptor:
+                    self.copy_shared_descriptors()
                 self.current_transaction = self._transaction_factory(self, transaction_type, self.logger)
                 yield self.current_transaction
 
@@ -174,6 +179,31 @@ class ProviderMdib(mdibbase.MdibBase):
             finally:
                 self.current_transaction = None
 
+    @property
+    def has_shared_descriptors(self) -> bool:
+        """Return True if the mdib uses the descriptors of a SharedDescriptorSet."""
+        return isinstance(self.descriptions, SharedDescriptorsLookup)
+
+    def copy_shared_descriptors(self):
+        """Replace shared descriptors by own copies.
+
+        This is done automatically before a descriptor transaction, because shared descriptors can not be modified.
+        Nothing happens if the mdib does not use shared descriptors.
+        """
+        if not self.has_shared_descriptors:
+            return
+        with self.mdib_lock:
+            # copy descriptors in tree order, this keeps the order of children
+            descriptors = []
+            for root in self.descriptions.parent_handle.get(None, []):
+                descriptors.extend(copy.deepcopy(d)
+                                   for d in self.get_all_descriptors_in_subtree(root, depth_first=False))
+            descriptions = mdibbase.DescriptorsLookup()
+            descriptions.add_objects_no_lock(descriptors)
+            for state in list(self.states.objects) + list(self.context_states.objects):
+                state.descriptor_container = descriptions.handle.get_one(state.DescriptorHandle)
+            self.descriptions = descriptions
+
     @contextmanager
     def context_state_transaction(self) -> AbstractContextManager[ContextStateTransactionManagerProtocol]:
         """Return a transaction for context state updates."""
@@ -285,3 +315,77 @@ class ProviderMdib(mdibbase.MdibBase):
         mdib.xtra.update_retrievability_lists()
         mdib.xtra.set_all_source_mds()
         return mdib
+
+    @classmethod
+    def from_snapshot_file(
+        cls,
+        path: str | Path,
+        protocol_definition: type[BaseDefinitions] | None = None,
+        log_prefix: str | None = None,
+    ) -> ProviderMdib:
+        """Construct mdib from a snapshot file that was written with to_snapshot.
+
+        :param path: the snapshot file path
+        :param protocol_definition: an optional object derived from BaseDefinitions, forces usage of this definition
+        :param log_prefix: a string or None
+        :return: instance.
+        """
+        with Path(path).open('rb') as the_file:
+            data = the_file.read()
+        return cls.from_snapshot(data, protocol_definition, log_prefix)
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        data: bytes,
+        protocol_definition: type[BaseDefinitions] | None = None,
+        log_prefix: str | None = None,
+    ) -> ProviderMdib:
+        """Construct mdib from a snapshot that was created with to_snapshot.
+
+        The snapshot contains the descriptors and states of a completely initialized mdib,
+        no xml parsing, validation or initialization of states is needed.
+
+        :param data: the snapshot
+        :param protocol_definition: an optional object derived from BaseDefinitions, forces usage of this definition
+        :param log_prefix: a string or None
+        :return: instance.
+        """
+        if protocol_definition is None:
+            pm_namespace = mdibsnapshot.snapshot_pm_namespace(data)
+            for definition_cls in ProtocolsRegistry.protocols:
+                if definition_cls.data_model.ns_helper.PM.namespace == pm_namespace:
+                    protocol_definition = definition_cls
+                    break
+        if protocol_definition is None:
+            raise ValueError('cannot create instance, no known BICEPS schema version identified')
+        mdib = cls(protocol_definition, log_prefix=log_prefix)
+        mdibsnapshot.load_snapshot(mdib, data)
+        return mdib
+
+    def to_snapshot(self) -> bytes:
+        """Return a binary snapshot of descriptors and states, see from_snapshot."""
+        return mdibsnapshot.mk_snapshot(self)
+
+    @classmethod
+    def from_shared_descriptors(
+        cls,
+        shared_descriptors: SharedDescriptorSet,
+        log_prefix: str | None = None,
+    ) -> ProviderMdib:
+        """Construct mdib that uses the descriptors of a SharedDescriptorSet.
+
+        The mdib has its own states, the descriptors are shared with all other mdibs that were created from
+        shared_descriptors. The first descriptor transaction replaces the shared descriptors by own copies.
+        :param shared_descriptors: the SharedDescriptorSet
+        :param log_prefix: a string or None
+        :return: instance.
+        """
+        mdib = cls(shared_descriptors.sdc_definitions, log_prefix=log_prefix)
+        mdib.descriptions = shared_descriptors.descriptions
+        states, context_states = shared_descriptors.mk_states()
+        mdib.add_state_containers(states + context_states)
+        mdib._retrievability_episodic.extend(shared_descriptors.retrievability_episodic)
+        for period_ms, handles in shared_descriptors.retrievability_periodic.items():
+            mdib.retrievability_periodic[period_ms].extend(handles)
+        return mdib
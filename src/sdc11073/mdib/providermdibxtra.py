@@ -46,6 +46,7 @@ class ProviderMdibMethods:
                 descr_cls = mdib.data_model.get_descriptor_container_class(pm.LocationContextDescriptor)
                 descr_container = descr_cls(handle=uuid.uuid4().hex, parent_handle=system_context_descriptor.Handle)
                 descr_container.SafetyClassification = mdib.data_model.pm_types.SafetyClassification.INF
+                mdib.copy_shared_descriptors()
                 mdib.descriptions.add_object(descr_container)
 
     def ensure_patient_context_descriptor(self):
@@ -63,6 +64,7 @@ class ProviderMdibMethods:
                 descr_cls = mdib.data_model.get_descriptor_container_class(pm.PatientContextDescriptor)
                 descr_container = descr_cls(handle=uuid.uuid4().hex, parent_handle=system_context_descriptor.Handle)
                 descr_container.SafetyClassification = mdib.data_model.pm_types.SafetyClassification.INF
+                mdib.copy_shared_descriptors()
                 mdib.descriptions.add_object(descr_container)
 
     def set_location(self, sdc_location: SdcLocation,
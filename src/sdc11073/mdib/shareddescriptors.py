@@ -0,0 +1,88 @@
+"""Descriptors that are shared by many ProviderMdib instances.
+
+Many providers that are started from the same mdib file have identical descriptors. A SharedDescriptorSet holds
+these descriptors once; every ProviderMdib that is created with ProviderMdib.from_shared_descriptors references
+the shared descriptors and only has its own states.
+The shared descriptors are immutable. The first descriptor transaction of a ProviderMdib replaces the shared
+descriptors of this mdib by own copies (copy on write), all other mdibs keep using the shared descriptors.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from sdc11073.exceptions import ApiUsageError
+from sdc11073.mdib.containerbase import ContainerBase
+from sdc11073.mdib.mdibbase import DescriptorsLookup
+
+if TYPE_CHECKING:
+    from sdc11073.definitions_base import BaseDefinitions
+    from sdc11073.mdib.descriptorcontainers import AbstractDescriptorContainer
+    from sdc11073.mdib.providermdib import ProviderMdib
+    from sdc11073.mdib.statecontainers import AbstractStateContainer
+
+
+class SharedDescriptorsLookup(DescriptorsLookup):
+    """DescriptorsLookup that can not be modified after it has been created."""
+
+    def __init__(self, descriptors: list[AbstractDescriptorContainer]):
+        super().__init__()
+        for descriptor in descriptors:
+            # bypass the overwritten methods of this class
+            DescriptorsLookup.add_object_no_lock(self, descriptor)
+
+    def _refuse_modification(self, *args: Any, **kwargs: Any) -> NoReturn:  # noqa: ARG002
+        msg = 'shared descriptors can not be modified, use a descriptor transaction of the mdib'
+        raise ApiUsageError(msg)
+
+    add_object = _refuse_modification
+    add_object_no_lock = _refuse_modification
+    add_objects = _refuse_modification
+    add_objects_no_lock = _refuse_modification
+    remove_object = _refuse_modification
+    remove_object_no_lock = _refuse_modification
+    remove_objects = _refuse_modification
+    remove_objects_no_lock = _refuse_modification
+    update_object = _refuse_modification
+    update_object_no_lock = _refuse_modification
+    update_objects = _refuse_modification
+    update_objects_no_lock = _refuse_modification
+    clear = _refuse_modification
+
+
+class SharedDescriptorSet:
+    """Immutable descriptors and initial states of a ProviderMdib.
+
+    Use ProviderMdib.from_shared_descriptors to create mdib instances from it.
+    """
+
+    def __init__(self, mdib: ProviderMdib):
+        """Copy descriptors, states and retrievability lists of an initialized mdib.
+
+        The mdib is not referenced afterwards, it can still be used and modified.
+        :param mdib: the ProviderMdib, e.g. created with ProviderMdib.from_mdib_file
+        """
+        self.sdc_definitions: type[BaseDefinitions] = mdib.sdc_definitions
+        with mdib.mdib_lock:
+            # copy descriptors in tree order, this keeps the order of children
+            memo = {}
+            descriptors = []
+            for root in mdib.descriptions.parent_handle.get(None, []):
+                descriptors.extend(copy.deepcopy(d, memo)
+                                   for d in mdib.get_all_descriptors_in_subtree(root, depth_first=False))
+            self.descriptions = SharedDescriptorsLookup(descriptors)
+            # states reference the copied descriptors
+            self._states = [copy.deepcopy(s, memo) for s in mdib.states.objects]
+            self._context_states = [copy.deepcopy(s, memo) for s in mdib.context_states.objects]
+            self.retrievability_episodic = tuple(mdib._retrievability_episodic)  # noqa: SLF001
+            self.retrievability_periodic = {k: tuple(v) for k, v in mdib.retrievability_periodic.items()}
+        # the shared descriptors (and the descriptor node property) must not be copied with the states
+        self._memo = {id(d): d for d in descriptors}
+        self._memo[id(ContainerBase.node)] = ContainerBase.node
+
+    def mk_states(self) -> tuple[list[AbstractStateContainer], list[AbstractStateContainer]]:
+        """Return new copies of the states and context states, they reference the shared descriptors."""
+        memo = dict(self._memo)
+        return ([copy.deepcopy(s, memo) for s in self._states],
+                [copy.deepcopy(s, memo) for s in self._context_states])
@@ -55,6 +55,13 @@ class AbstractStateProtocol(Protocol):
     def update_from_other_container(self, other: AbstractStateProtocol, skipped_properties: list[str] | None = None):
         """Copy all properties except the skipped ones to self."""
 
+    def update_changed_from_other_container(
+        self,
+        other: AbstractStateProtocol,
+        skipped_properties: list[str] | None = None,
+    ) -> list[str]:
+        """Copy all properties that differ, except the skipped ones, to self and return their names."""
+
     def update_from_node(self, node: xml_utils.LxmlElement):
         """Update members from node."""
 
@@ -74,6 +81,7 @@ class AbstractStateContainer(ContainerBase):
     is_alert_condition = False
     is_multi_state = False
     is_context_state = False
+    _generated_node_tag = pm.State  # MessageReader also renames state nodes to pm:State
 
     Extension: ExtensionLocalValue = x_struct.ExtensionNodeProperty(ext.Extension)
     DescriptorHandle: str = x_struct.HandleRefAttributeProperty('DescriptorHandle', is_optional=False)
@@ -101,14 +109,33 @@ class AbstractStateContainer(ContainerBase):
 
     def update_from_other_container(self, other: AbstractStateContainer, skipped_properties: list[str] | None = None):
         """Copy all properties except the skipped ones to self."""
+        self._check_other_container(other)
+        self._update_from_other(other, skipped_properties)
+        self._update_node_from_other(other)
+
+    def update_changed_from_other_container(
+        self,
+        other: AbstractStateContainer,
+        skipped_properties: list[str] | None = None,
+    ) -> list[str]:
+        """Copy all properties that differ, except the skipped ones, to self.
+
+        Unlike update_from_other_container, unchanged values are neither copied nor set.
+        :return: names of the changed properties
+        """
+        self._check_other_container(other)
+        changed = self._update_changed_from_other(other, skipped_properties)
+        self._update_node_from_other(other)
+        return changed
+
+    def _check_other_container(self, other: AbstractStateContainer):
+        """Raise ValueError if self can not be updated from other."""
         if other.DescriptorHandle != self.DescriptorHandle:
             msg = (
                 f'Update from a node with different descriptor handle is not possible! '
                 f'Have "{self.DescriptorHandle}", got "{other.DescriptorHandle}"'
             )
             raise ValueError(msg)
-        self._update_from_other(other, skipped_properties)
-        self.node = other.node
 
     def increment_state_version(self):
         """Add one."""
@@ -683,15 +710,8 @@ class AbstractMultiStateContainer(AbstractStateContainer):
         super().__init__(descriptor_container)
         self.Handle = handle  # pylint: disable=invalid-name
 
-    def update_from_other_container(
-        self,
-        other: AbstractMultiStateContainer,
-        skipped_properties: list[str] | None = None,
-    ):
-        """Copy all properties except the skipped ones to self.
-
-        Accept node only if DescriptorHandle and Handle match.
-        """
+    def _check_other_container(self, other: AbstractMultiStateContainer):
+        """Accept other only if DescriptorHandle and Handle match."""
         if self.Handle is not None and other.Handle != self.Handle:
             msg = (
                 f'Update from a node with different handle is not possible! Have "{self.Handle}", got "{other.Handle}"'
@@ -699,7 +719,7 @@ class AbstractMultiStateContainer(AbstractStateContainer):
             raise ValueError(
                 msg,
             )
-        super().update_from_other_container(other, skipped_properties)
+        super()._check_other_container(other)
 
     def mk_state_node(
         self,
@@ -83,6 +83,7 @@ class DescriptorTransaction(_TransactionBase):
                  device_mdib_container: ProviderMdib,
                  logger: LoggerAdapter):
         super().__init__(device_mdib_container, logger)
+        self._subtree_handles: set[str] = set()  # handles of descriptors added with add_descriptor_subtree
 
     def actual_descriptor(self, descriptor_handle: str) -> AbstractDescriptorProtocol:
         """Return the actual descriptor in open transaction or from mdib.
@@ -124,8 +125,68 @@ class DescriptorTransaction(_TransactionBase):
                 raise ValueError(msg)
             self.add_state(state_container)
 
+    def add_descriptor_subtree(self,
+                               descriptor_containers: list[AbstractDescriptorProtocol],
+                               state_containers: list[AbstractStateProtocol] | None = None,
+                               adjust_version_counter: bool = True):
+        """Add many new descriptors and their states to mdib, e.g. a complete vmd.
+
+        The list of descriptors must be ordered parents first: the parent of each descriptor must either be
+        in the list before the descriptor, or it must already exist in mdib or in this transaction.
+        All descriptors and states are checked before anything is added to the transaction.
+        When the transaction is processed, the descriptors are added to the mdib in one batch.
+
+        :param descriptor_containers: the new descriptors
+        :param state_containers: the states of the new descriptors
+        :param adjust_version_counter: if True, DescriptorVersion and StateVersion are set from saved versions
+        """
+        new_descriptors = {}
+        for descriptor_container in descriptor_containers:
+            descriptor_handle = descriptor_container.Handle
+            if descriptor_handle in new_descriptors or descriptor_handle in self.descriptor_updates:
+                msg = f'Descriptor {descriptor_handle} already in updated set!'
+                raise ValueError(msg)
+            if descriptor_handle in self._mdib.descriptions.handle:
+                msg = f'Cannot create descriptor {descriptor_handle}, it already exists in mdib!'
+                raise ValueError(msg)
+            parent_handle = descriptor_container.parent_handle
+            if parent_handle is not None and parent_handle not in new_descriptors:
+                tr_item = self.descriptor_updates.get(parent_handle)
+                if (tr_item is None and parent_handle not in self._mdib.descriptions.handle) \
+                        or (tr_item is not None and tr_item.new is None):
+                    msg = f'Parent {parent_handle} of descriptor {descriptor_handle} does not exist!'
+                    raise ValueError(msg)
+            new_descriptors[descriptor_handle] = descriptor_container
+        state_keys = set()
+        for state_container in state_containers or []:
+            if state_container.DescriptorHandle not in new_descriptors:
+                msg = f'State {state_container.DescriptorHandle} has no descriptor in subtree!'
+                raise ApiUsageError(msg)
+            key = state_container.Handle if state_container.is_context_state else state_container.DescriptorHandle
+            if key is not None and (key in state_keys or key in self._get_states_update(state_container)):
+                msg = f'State {key} already in updated set!'
+                raise ValueError(msg)
+            state_keys.add(key)
+
+        for descriptor_container in descriptor_containers:
+            if adjust_version_counter:
+                self._mdib.descriptions.set_version(descriptor_container)
+            if descriptor_container.source_mds is None:
+                parent = new_descriptors.get(descriptor_container.parent_handle)
+                if parent is None:
+                    self._mdib.xtra.set_source_mds(descriptor_container)
+                else:
+                    descriptor_container.set_source_mds(parent.source_mds)
+            self.descriptor_updates[descriptor_container.Handle] = TransactionItem(None, descriptor_container)
+        for state_container in state_containers or []:
+            self.add_state(state_container, adjust_version_counter)
+        self._subtree_handles.update(new_descriptors)
+
     def remove_descriptor(self, descriptor_handle: str):
-        """Remove existing descriptor from mdib."""
+        """Remove existing descriptor from mdib.
+
+        The complete subtree of the descriptor and all related states are removed.
+        """
         if not descriptor_handle:
             raise ValueError('No handle for descriptor specified')
         if descriptor_handle in self.descriptor_updates:
@@ -285,11 +346,12 @@ class DescriptorTransaction(_TransactionBase):
         proc = TransactionResult()
         if self.descriptor_updates:
             self._mdib.mdib_version = self.new_mdib_version
+            self._mdib.mddescription_version += 1
             # need to know all to be deleted and to be created descriptors
-            to_be_deleted_handles = [tr_item.old.Handle for tr_item in self.descriptor_updates.values()
-                                     if tr_item.new is None and tr_item.old is not None]
-            to_be_created_handles = [tr_item.new.Handle for tr_item in self.descriptor_updates.values()
-                                     if tr_item.old is None and tr_item.new is not None]
+            to_be_deleted_handles = {tr_item.old.Handle for tr_item in self.descriptor_updates.values()
+                                     if tr_item.new is None and tr_item.old is not None}
+            to_be_created_handles = {tr_item.new.Handle for tr_item in self.descriptor_updates.values()
+                                     if tr_item.old is None and tr_item.new is not None}
             # Remark 1:
             # handling only updated states here: If a descriptor is created, it can be assumed that the
             # application also creates the state in a transaction.
@@ -303,6 +365,10 @@ class DescriptorTransaction(_TransactionBase):
             #  additional check for states in self.context_states is not needed.
             #  If this assumption is wrong, that functionality must be added!)
 
+            subtree_descriptors = []
+            # DescriptorVersion of a parent is incremented once if children are added or deleted.
+            # dict is used as an ordered set.
+            parent_handles = {}
             for tr_item in self.descriptor_updates.values():
                 orig_descriptor, new_descriptor = tr_item.old, tr_item.new
                 if orig_descriptor is None:
@@ -310,14 +376,18 @@ class DescriptorTransaction(_TransactionBase):
                     self._logger.debug(  # noqa: PLE1205
                         'transaction_manager: new descriptor Handle={}, DescriptorVersion={}',
                         new_descriptor.Handle, new_descriptor.DescriptorVersion)
-                    proc.descr_created.append(new_descriptor.mk_copy())
-                    self._mdib.descriptions.add_object_no_lock(new_descriptor)
-                    # increment DescriptorVersion if a child descriptor is added or deleted.
+                    if new_descriptor.Handle in self._subtree_handles:
+                        # states were already handled in add_descriptor_subtree
+                        proc.descr_created.append(new_descriptor.mk_copy())
+                        subtree_descriptors.append(new_descriptor)
+                    else:
+                        proc.descr_created.append(new_descriptor.mk_copy())
+                        self._mdib.descriptions.add_object_no_lock(new_descriptor)
+                        self._update_corresponding_state(new_descriptor)
                     if new_descriptor.parent_handle is not None \
                             and new_descriptor.parent_handle not in to_be_created_handles:
                         # only update parent if it is not also created in this transaction
-                        self._increment_parent_descriptor_version(proc, new_descriptor)
-                    self._update_corresponding_state(new_descriptor)
+                        parent_handles[new_descriptor.parent_handle] = None
                 elif new_descriptor is None:
                     # this is a delete operation
                     self._logger.debug(  # noqa: PLE1205
@@ -326,11 +396,10 @@ class DescriptorTransaction(_TransactionBase):
                     all_descriptors = self._mdib.get_all_descriptors_in_subtree(orig_descriptor)
                     self._mdib.rm_descriptors_and_states(all_descriptors)
                     proc.descr_deleted.extend([d.mk_copy() for d in all_descriptors])
-                    # increment DescriptorVersion if a child descriptor is added or deleted.
                     if orig_descriptor.parent_handle is not None \
                             and orig_descriptor.parent_handle not in to_be_deleted_handles:
                         # only update parent if it is not also deleted in this transaction
-                        self._increment_parent_descriptor_version(proc, orig_descriptor)
+                        parent_handles[orig_descriptor.parent_handle] = None
                 else:
                     # this is an update operation
                     proc.descr_updated.append(new_descriptor)
@@ -340,6 +409,13 @@ class DescriptorTransaction(_TransactionBase):
                     orig_descriptor.update_from_other_container(new_descriptor)
                     self._update_corresponding_state(orig_descriptor)
                     self._mdib.descriptions.update_object_no_lock(orig_descriptor)
+            if subtree_descriptors:
+                self._mdib.descriptions.add_objects_no_lock(subtree_descriptors)
+            for parent_handle in parent_handles:
+                tr_item = self.descriptor_updates.get(parent_handle)
+                if tr_item is None or tr_item.old is None or tr_item.new is None:
+                    # an updated parent already has an incremented DescriptorVersion
+                    self._increment_parent_descriptor_version(proc, parent_handle)
             for updates_dict, dest_list in ((self.alert_state_updates, proc.alert_updates),
                                             (self.metric_state_updates, proc.metric_updates),
                                             (self.context_state_updates, proc.ctxt_updates),
@@ -389,10 +465,9 @@ class DescriptorTransaction(_TransactionBase):
                     new_state.increment_state_version()
                     updates_dict[descriptor_container.Handle] = TransactionItem(old_state, new_state)
 
-    def _increment_parent_descriptor_version(self, proc: TransactionResult,
-                                             descriptor_container: AbstractDescriptorProtocol):
-        parent_descriptor_container = self._mdib.descriptions.handle.get_one(
-            descriptor_container.parent_handle, allow_none=True)
+    def _increment_parent_descriptor_version(self, proc: TransactionResult, parent_handle: str):
+        # parent can already be deleted in this transaction
+        parent_descriptor_container = self._mdib.descriptions.handle.get_one(parent_handle, allow_none=True)
         if parent_descriptor_container is not None:
             parent_descriptor_container.increment_descriptor_version()
             proc.descr_updated.append(parent_descriptor_container.mk_copy())
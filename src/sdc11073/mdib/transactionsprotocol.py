@@ -204,8 +204,14 @@ class DescriptorTransactionManagerProtocol(EntityDescriptorTransactionManagerPro
                        state_container: AbstractStateProtocol | None = None):
         """Add a new descriptor to mdib."""
 
+    def add_descriptor_subtree(self,
+                               descriptor_containers: list[AbstractDescriptorProtocol],
+                               state_containers: list[AbstractStateProtocol] | None = None,
+                               adjust_version_counter: bool = True):
+        """Add many new descriptors (ordered parents first) and their states to mdib."""
+
     def remove_descriptor(self, descriptor_handle: str):
-        """Remove existing descriptor from mdib."""
+        """Remove existing descriptor and its subtree from mdib."""
 
     def get_descriptor(self, descriptor_handle: str) -> AbstractDescriptorProtocol:
         """Get a descriptor from mdib."""
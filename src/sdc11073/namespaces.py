@@ -4,12 +4,15 @@ from __future__ import annotations
 
 import pathlib
 from enum import Enum
-from typing import NamedTuple
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from lxml import etree
 
 from sdc11073 import xml_utils
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 class PrefixNamespace(NamedTuple):
     """Represents a namespace with an optional prefix and schema location."""
@@ -238,11 +241,14 @@ WSA_NONE = PrefixesEnum.WSA.namespace + '/none'
 
 def docname_from_qname(qname: etree.QName, ns_map: dict) -> str:
     """Get a prefix:name string, or only name (if default namespace is used)."""
-    prefixmap = {v: k for k, v in ns_map.items()}
-    prefix = prefixmap.get(qname.namespace)
-    if prefix is None:
-        return qname.localname
-    return f'{prefix}:{qname.localname}'
+    namespace = qname.namespace
+    # search from the end, if a namespace has more than one prefix, the last one is used
+    for prefix, prefix_namespace in reversed(ns_map.items()):
+        if prefix_namespace == namespace:
+            if prefix is None:
+                return qname.localname
+            return f'{prefix}:{qname.localname}'
+    return qname.localname
 
 
 def text_to_qname(text: str, doc_nsmap: dict[str, str]) -> xml_utils.QName:
@@ -256,6 +262,36 @@ def text_to_qname(text: str, doc_nsmap: dict[str, str]) -> xml_utils.QName:
         raise KeyError(f'Cannot make QName for {text}, prefix is not in nsmap: {doc_nsmap.keys()}') from ex  # noqa: EM102
 
 
+class QNameLookupCache:
+    """Maps xsi:type texts directly to the result of a lookup function, e.g. a container class.
+
+    The key is the text and the namespace that is bound to its prefix, therefore the same text with a different
+    namespace binding is looked up again. Only results that are not None are cached.
+    """
+
+    def __init__(self, lookup: Callable[[etree.QName], Any], max_size: int = 1000):
+        """Construct a QNameLookupCache.
+
+        :param lookup: function that is called with the QName if the text is not in cache
+        :param max_size: max. number of cached entries, protects against unlimited growth
+        """
+        self._lookup = lookup
+        self._max_size = max_size
+        self._cache: dict[tuple[str, str | None], Any] = {}
+
+    def get(self, text: str, doc_nsmap: dict[str, str]) -> Any:
+        """Return the lookup result for text."""
+        prefix, separator, _ = text.partition(':')
+        key = (text, doc_nsmap.get(prefix if separator else None))
+        try:
+            return self._cache[key]
+        except KeyError:
+            result = self._lookup(text_to_qname(text, doc_nsmap))
+            if result is not None and len(self._cache) < self._max_size:
+                self._cache[key] = result
+            return result
+
+
 QN_TYPE = etree.QName(PrefixesEnum.XSI.namespace, 'type')  # frequently used QName, central definition
 
 
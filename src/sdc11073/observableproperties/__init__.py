@@ -1,4 +1,4 @@
-from sdc11073.observableproperties.observables import ObservableProperty, bind, strongbind, unbind
+from sdc11073.observableproperties.observables import ObservableProperty, bind, set_executor, strongbind, unbind
 from sdc11073.observableproperties.valuecollector import (
     CancelledError,
     CollectTimeoutError,
@@ -10,6 +10,7 @@ __all__ = [
     'bind',
     'strongbind',
     'unbind',
+    'set_executor',
     'ObservableProperty',
     'SingleValueCollector',
     'ValuesCollector',
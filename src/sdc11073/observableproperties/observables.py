@@ -27,8 +27,8 @@ Example:
 < prop2= Hello World
 
 """
-import contextlib
 import inspect
+import threading
 import weakref
 from contextlib import contextmanager
 
@@ -65,21 +65,43 @@ class WeakRef:
             return False
 
 
+# protects modifications of observer tuples and async delivery state. Setting a value does not need it.
+_lock = threading.Lock()
+
+
 class _ObservableValue:
-    """ Implements the basic mechanism for an observable value. """
+    """ Implements the basic mechanism for an observable value.
+    Observers are kept in a tuple that is replaced on bind / unbind (copy on write),
+    therefore set_value iterates over it without locking and copying. """
+
+    __slots__ = ('value', '_fire_only_on_changed_value', '_observers', '_executor', '_delivery_pending',
+                 '_version')
 
     def __init__(self, value, fire_only_on_changed_value=True):
         self.value = value
         self._fire_only_on_changed_value = fire_only_on_changed_value
-        self._observers = []
+        self._observers = ()
+        self._executor = None
+        self._delivery_pending = False
+        self._version = 0
 
     def set_value(self, value):
+        observers = self._observers
+        if not observers:  # fast path, nobody needs to be informed
+            self.value = value
+            return
         if value == self.value and self._fire_only_on_changed_value:
             return
         self.value = value
+        if self._executor is None:
+            self._notify(observers, value)
+        else:
+            self._schedule_delivery()
+
+    def _notify(self, observers, value):
         obsolete_refs = []
         # now call all listeners. Keep track of obsolete weak references
-        for ref in self._observers[:]:  # make a copy of list, content might change during iteration
+        for ref in observers:
             try:
                 func = ref.get_ref()
             except AttributeError:  # no Weakref instance => strong reference, use ref directly
@@ -87,26 +109,60 @@ class _ObservableValue:
             if func is None:
                 obsolete_refs.append(ref)
             else:
-                func(self.value)  # call func
-        for ref in obsolete_refs:
-            with contextlib.suppress(ValueError):  # e.g. has been deleted by someone else in different thread
-                self._observers.remove(ref)
+                func(value)  # call func
+        if obsolete_refs:
+            with _lock:
+                self._observers = tuple(ref for ref in self._observers if ref not in obsolete_refs)
+
+    def _schedule_delivery(self):
+        """Deliver the value in executor. Values that are set before the delivery started are coalesced."""
+        with _lock:
+            self._version += 1
+            if self._delivery_pending:
+                return
+            self._delivery_pending = True
+        self._executor.submit(self._deliver)
+
+    def _deliver(self):
+        while True:
+            with _lock:
+                version = self._version
+                value = self.value
+            try:
+                self._notify(self._observers, value)
+            except BaseException:
+                with _lock:
+                    self._delivery_pending = False
+                raise
+            with _lock:
+                if version == self._version:  # no new value was set during notification
+                    self._delivery_pending = False
+                    return
+
+    def set_executor(self, executor):
+        self._executor = executor
 
     def bind(self, func):
-        self._observers.append(WeakRef(func))
+        with _lock:
+            self._observers = (*self._observers, WeakRef(func))
 
     def strongbind(self, func):
-        self._observers.append(func)
+        with _lock:
+            self._observers = (*self._observers, func)
 
     def unbind(self, func):
         func_ref = WeakRef(func)
-        for ref in self._observers:
-            if ref in (func, func_ref):
-                self._observers.remove(ref)
-                break
+        with _lock:
+            observers = list(self._observers)
+            for ref in observers:
+                if ref in (func, func_ref):
+                    observers.remove(ref)
+                    self._observers = tuple(observers)
+                    break
 
     def unbind_all(self):
-        del self._observers[:]
+        with _lock:
+            self._observers = ()
 
 
 class ObservableProperty:
@@ -159,6 +215,9 @@ class ObservableProperty:
     def unbind_all(self, obj):
         self._get_instance_data(obj).unbind_all()
 
+    def set_executor(self, obj, executor):
+        self._get_instance_data(obj).set_executor(executor)
+
     def __repr__(self):
         return f'ObservableProperty at 0x{id(self):X}, default value={self._default_value}'
 
@@ -218,6 +277,19 @@ def unbind_all(obj, *propertyNames):
         prop.unbind_all(obj)
 
 
+def set_executor(obj, executor, *propertyNames):
+    """ deliver values of the named properties asynchronously.
+    Observers are called in executor instead of the thread that sets the value. If values are set faster than
+    they are delivered, observers only get the latest value.
+    :param obj: an object with ObservableProperty member(s)
+    :param executor: a concurrent.futures.Executor, None switches back to synchronous delivery
+    :param propertyNames: list of strings, each string names an ObservableProperty.
+    """
+    for name in propertyNames:
+        prop = _find_property(obj, name)
+        prop.set_executor(obj, executor)
+
+
 @contextmanager
 def bound_context(obj, **kwargs):
     """ context manager for bind / unbind sequence."""
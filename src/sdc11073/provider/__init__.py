@@ -6,6 +6,7 @@ from sdc11073.provider.porttypes.localizationservice import LocalizationService
 from sdc11073.provider.porttypes.setserviceimpl import SetService
 from sdc11073.provider.porttypes.stateeventserviceimpl import StateEventService
 from sdc11073.provider.porttypes.waveformserviceimpl import WaveformService
+from sdc11073.provider.providerhost import SdcProviderHost
 from sdc11073.provider.providerimpl import (
     RoleProviderComponents,
     SdcProvider,
@@ -23,6 +24,7 @@ __all__ = [
     'RoleProviderComponents',
     'SdcProvider',
     'SdcProviderComponents',
+    'SdcProviderHost',
     'SetService',
     'StateEventService',
     'WaveformService',
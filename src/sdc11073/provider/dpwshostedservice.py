@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import copy
+import functools
 import typing
 from io import BytesIO
 
@@ -33,6 +35,30 @@ def etree_from_file(path: str | pathlib.Path) -> xml_utils.LxmlElement:
     return doc.getroot()
 
 
+def _remove_annotations(root_node: xml_utils.LxmlElement) -> xml_utils.LxmlElement:
+    remove_annotations_string = b"""<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform"
+                                  xmlns:xs="http://www.w3.org/2001/XMLSchema">
+      <xsl:output method="xml" indent="yes"/>
+
+      <xsl:template match="@* | node()">
+        <xsl:copy>
+          <xsl:apply-templates select="@* | node()"/>
+        </xsl:copy>
+      </xsl:template>
+
+      <xsl:template match="xs:annotation" />
+    </xsl:stylesheet>"""
+    remove_annotations_doc = etree.parse(BytesIO(remove_annotations_string))
+    remove_annotations_xslt = etree.XSLT(remove_annotations_doc)
+    return remove_annotations_xslt(root_node).getroot()
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_without_annotations(path: str | pathlib.Path) -> xml_utils.LxmlElement:
+    """Return the schema without annotations. The result is shared, append copies of it."""
+    return _remove_annotations(etree_from_file(path))
+
+
 class _EventService(RequestDispatcher):
     """A service that offers subscriptions."""
 
@@ -132,15 +158,8 @@ class DPWSHostedService(_EventService):
 
         types = etree.SubElement(wsdl_definitions, etree.QName(_wsdl_ns, 'types'))
         # remove annotations from schemas, this reduces wsdl size from 280kb to 100kb!
-        ext_schema_ = etree_from_file(ns_hlp.EXT.local_schema_file)
-        ext_schema = self._remove_annotations(ext_schema_)
-        pm_schema_ = etree_from_file(ns_hlp.PM.local_schema_file)
-        participant_schema = self._remove_annotations(pm_schema_)
-        mm_schema_ = etree_from_file(ns_hlp.MSG.local_schema_file)
-        message_schema = self._remove_annotations(mm_schema_)
-        types.append(ext_schema)
-        types.append(participant_schema)
-        types.append(message_schema)
+        for schema_file in (ns_hlp.EXT.local_schema_file, ns_hlp.PM.local_schema_file, ns_hlp.MSG.local_schema_file):
+            types.append(copy.deepcopy(_schema_without_annotations(schema_file)))
         # append all message nodes
         for _port_type_impl in self.port_type_impls:
             _port_type_impl.add_wsdl_messages(wsdl_definitions)
@@ -150,24 +169,6 @@ class DPWSHostedService(_EventService):
             _port_type_impl.add_wsdl_binding(wsdl_definitions, porttype_prefix)
         return etree.tostring(wsdl_definitions, encoding='UTF-8', xml_declaration=True)
 
-    @staticmethod
-    def _remove_annotations(root_node):
-        remove_annotations_string = b"""<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform"
-                                      xmlns:xs="http://www.w3.org/2001/XMLSchema">
-          <xsl:output method="xml" indent="yes"/>
-
-          <xsl:template match="@* | node()">
-            <xsl:copy>
-              <xsl:apply-templates select="@* | node()"/>
-            </xsl:copy>
-          </xsl:template>
-
-          <xsl:template match="xs:annotation" />
-        </xsl:stylesheet>"""
-        remove_annotations_doc = etree.parse(BytesIO(remove_annotations_string))
-        remove_annotations_xslt = etree.XSLT(remove_annotations_doc)
-        return remove_annotations_xslt(root_node).getroot()
-
     def _on_get_metadata(self, request_data):
         msg_factory = self._sdc_device.msg_factory
         consumed_path_elements = request_data.consumed_path_elements
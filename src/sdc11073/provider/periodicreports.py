@@ -1,7 +1,7 @@
 import threading
 import time
 from collections import namedtuple
-from functools import reduce
+from functools import partial, reduce
 
 from sdc11073 import intervaltimer
 from sdc11073.loghelper import get_logger_adapter
@@ -36,13 +36,23 @@ class PeriodicReportsNullHandler:
 
 
 class PeriodicReportsHandler:
-    def __init__(self, mdib, hosted_services, fixed_interval=None):
+    START_DELAY = 0.1
+
+    def __init__(self, mdib, hosted_services, fixed_interval=None, scheduler=None):
+        """Send periodic reports.
+
+        :param fixed_interval: if provided, all periodic reports are sent in this interval (in seconds),
+                               retrievability settings in the mdib are ignored.
+        :param scheduler: if provided, reports are sent by jobs of this scheduler instead of an own thread.
+        """
         self._periodic_reports_interval = fixed_interval
         self._mdib = mdib
         self._hosted_services = hosted_services
+        self._scheduler = scheduler
         self._logger = get_logger_adapter('sdc.device.pReports')
         self._periodic_reports_lock = threading.Lock()
         self._periodic_reports_thread = None
+        self._jobs = []
 
         self._periodic_metric_reports = []
         self._periodic_alert_reports = []
@@ -54,6 +64,9 @@ class PeriodicReportsHandler:
 
     def start(self):
         self._run_periodic_reports_thread = True
+        if self._scheduler is not None:
+            self._add_scheduler_jobs()
+            return
         if self._periodic_reports_interval:
             # This setting activates the simple periodic send loop, retrievability settings are ignored
             self._run_periodic_reports_thread = True
@@ -71,6 +84,22 @@ class PeriodicReportsHandler:
 
     def stop(self):
         self._run_periodic_reports_thread = False
+        for job in self._jobs:
+            job.cancel()
+        del self._jobs[:]
+
+    def _add_scheduler_jobs(self):
+        if self._periodic_reports_interval:
+            self._jobs.append(self._scheduler.add_job(self._send_simple_periodic_reports,
+                                                      self._periodic_reports_interval,
+                                                      start_delay=self.START_DELAY + self._periodic_reports_interval))
+        else:
+            for period_ms in self._mdib.retrievability_periodic:
+                period = period_ms / 1000
+                self._jobs.append(self._scheduler.add_job(partial(self._send_periodic_reports, period_ms),
+                                                          period,
+                                                          start_delay=self.START_DELAY + period,
+                                                          name=f'periodic reports {period_ms} ms'))
 
     def store_metric_states(self, mdib_version, state_updates):
         self._logger.debug('store %d metric states', len(state_updates))
@@ -102,29 +131,33 @@ class PeriodicReportsHandler:
         It does not care about retrievability settings in the mdib.
         """
         self._logger.debug('_simple_periodic_reports_send_loop start')
-        time.sleep(0.1)  # start delayed
+        time.sleep(self.START_DELAY)  # start delayed
         timer = intervaltimer.IntervalTimer(period_in_seconds=self._periodic_reports_interval)
         while self._run_periodic_reports_thread:
             timer.wait_next_interval_begin()
-            self._logger.debug('_simple_periodic_reports_send_loop')
-            ses = self._hosted_services.state_event_service
-            cs = self._hosted_services.context_service
-            for reports_list, send_func, msg in \
-                    [(self._periodic_metric_reports, ses.send_periodic_metric_report, 'metric'),
-                     (self._periodic_alert_reports, ses.send_periodic_alert_report, 'alert'),
-                     (self._periodic_component_state_reports, ses.send_periodic_component_state_report, 'component'),
-                     (self._periodic_context_state_reports, cs.send_periodic_context_report, 'context'),
-                     (self._periodic_operational_state_reports, ses.send_periodic_operational_state_report,
-                      'operational'),
-                     ]:
-                tmp = None
-                with self._periodic_reports_lock:
-                    if reports_list:
-                        tmp = reports_list[:]
-                        del reports_list[:]
-                if tmp:
-                    self._logger.debug('send periodic %s report', msg)
-                    send_func(tmp, self._mdib.mdib_version_group)
+            self._send_simple_periodic_reports()
+
+    def _send_simple_periodic_reports(self):
+        """Send all states that were stored since the last call."""
+        self._logger.debug('_send_simple_periodic_reports')
+        ses = self._hosted_services.state_event_service
+        cs = self._hosted_services.context_service
+        for reports_list, send_func, msg in \
+                [(self._periodic_metric_reports, ses.send_periodic_metric_report, 'metric'),
+                 (self._periodic_alert_reports, ses.send_periodic_alert_report, 'alert'),
+                 (self._periodic_component_state_reports, ses.send_periodic_component_state_report, 'component'),
+                 (self._periodic_context_state_reports, cs.send_periodic_context_report, 'context'),
+                 (self._periodic_operational_state_reports, ses.send_periodic_operational_state_report,
+                  'operational'),
+                 ]:
+            tmp = None
+            with self._periodic_reports_lock:
+                if reports_list:
+                    tmp = reports_list[:]
+                    del reports_list[:]
+            if tmp:
+                self._logger.debug('send periodic %s report', msg)
+                send_func(tmp, self._mdib.mdib_version_group)
 
     def _periodic_reports_send_loop(self):
         """This implementation of periodic reports send loop considers retrievability settings in the mdib.
@@ -135,7 +168,7 @@ class PeriodicReportsHandler:
             return x if x[1].remaining_time() < y[1].remaining_time() else y
 
         self._logger.debug('_periodic_reports_send_loop start')
-        time.sleep(0.1)  # start delayed
+        time.sleep(self.START_DELAY)  # start delayed
         # create an interval timer for each period
         timers = {}
         for period_ms in self._mdib.retrievability_periodic:
@@ -144,63 +177,65 @@ class PeriodicReportsHandler:
             # find timer with the shortest remaining time
             period_ms, timer = reduce(lambda x, y: _next(x, y), timers.items())  # pylint: disable=invalid-name
             timer.wait_next_interval_begin()
-            self._logger.debug('_periodic_reports_send_loop {} msec timer', period_ms)
-            all_handles = self._mdib.retrievability_periodic.get(period_ms, [])
-            # separate them by notification types
-            metrics = []
-            components = []
-            alerts = []
-            operationals = []
-            contexts = []
-            for handle in all_handles:
-                descr = self._mdib.descriptions.handle.get_one(handle)
-                if descr.is_metric_descriptor and not descr.is_realtime_sample_array_metric_descriptor:
-                    metrics.append(handle)
-                elif descr.is_system_context_descriptor or descr.is_component_descriptor:
-                    components.append(handle)
-                elif descr.is_alert_descriptor:
-                    alerts.append(handle)
-                elif descr.is_operational_descriptor:
-                    operationals.append(handle)
-                elif descr.is_context_descriptor:
-                    contexts.append(handle)
-
-            with self._mdib.mdib_lock:
-                mdib_version = self._mdib.mdib_version
-                metric_states = [self._mdib.states.descriptor_handle.get_one(h).mk_copy() for h in metrics]
-                component_states = [self._mdib.states.descriptor_handle.get_one(h).mk_copy() for h in components]
-                alert_states = [self._mdib.states.descriptor_handle.get_one(h).mk_copy() for h in alerts]
-                operational_states = [self._mdib.states.descriptor_handle.get_one(h).mk_copy() for h in operationals]
-                context_states = []
-                for context in contexts:
-                    print(
-                        f'context.Handle {context} = {len(self._mdib.context_states.descriptor_handle.get(context, []))} states')
-                    context_states.extend(
-                        [st.mk_copy() for st in self._mdib.context_states.descriptor_handle.get(context, [])])
-            self._logger.debug('   _periodic_reports_send_loop {} metric_states', len(metric_states))
-            self._logger.debug('   _periodic_reports_send_loop {} component_states', len(component_states))
-            self._logger.debug('   _periodic_reports_send_loop {} alert_states', len(alert_states))
-            self._logger.debug('   _periodic_reports_send_loop {} alert_states', len(alert_states))
-            self._logger.debug('   _periodic_reports_send_loop {} context_states', len(context_states))
-            srv = self._hosted_services.state_event_service
-            if metric_states:
-                periodic_states = PeriodicStates(mdib_version, metric_states)
-                srv.send_periodic_metric_report(
-                    [periodic_states], self._mdib.mdib_version_group)
-            if component_states:
-                periodic_states = PeriodicStates(mdib_version, component_states)
-                srv.send_periodic_component_state_report(
-                    [periodic_states], self._mdib.mdib_version_group)
-            if alert_states:
-                periodic_states = PeriodicStates(mdib_version, alert_states)
-                srv.send_periodic_alert_report(
-                    [periodic_states], self._mdib.mdib_version_group)
-            if operational_states:
-                periodic_states = PeriodicStates(mdib_version, operational_states)
-                srv.send_periodic_operational_state_report(
-                    [periodic_states], self._mdib.mdib_version_group)
-            if context_states:
-                ctx_srv = self._hosted_services.context_service
-                periodic_states = PeriodicStates(mdib_version, context_states)
-                ctx_srv.send_periodic_context_report(
-                    [periodic_states], self._mdib.mdib_version_group)
+            self._send_periodic_reports(period_ms)
+
+    def _send_periodic_reports(self, period_ms):
+        """Send the current states of all handles with periodic retrievability of period_ms."""
+        self._logger.debug('_send_periodic_reports {} msec', period_ms)
+        all_handles = self._mdib.retrievability_periodic.get(period_ms, [])
+        # separate them by notification types
+        metrics = []
+        components = []
+        alerts = []
+        operationals = []
+        contexts = []
+        for handle in all_handles:
+            descr = self._mdib.descriptions.handle.get_one(handle)
+            if descr.is_metric_descriptor and not descr.is_realtime_sample_array_metric_descriptor:
+                metrics.append(handle)
+            elif descr.is_system_context_descriptor or descr.is_component_descriptor:
+                components.append(handle)
+            elif descr.is_alert_descriptor:
+                alerts.append(handle)
+            elif descr.is_operational_descriptor:
+                operationals.append(handle)
+            elif descr.is_context_descriptor:
+                contexts.append(handle)
+
+        with self._mdib.mdib_lock:
+            mdib_version = self._mdib.mdib_version
+            metric_states = [self._mdib.states.descriptor_handle.get_one(h).mk_copy() for h in metrics]
+            component_states = [self._mdib.states.descriptor_handle.get_one(h).mk_copy() for h in components]
+            alert_states = [self._mdib.states.descriptor_handle.get_one(h).mk_copy() for h in alerts]
+            operational_states = [self._mdib.states.descriptor_handle.get_one(h).mk_copy() for h in operationals]
+            context_states = []
+            for context in contexts:
+                context_states.extend(
+                    [st.mk_copy() for st in self._mdib.context_states.descriptor_handle.get(context, [])])
+        self._logger.debug('   _send_periodic_reports {} metric_states', len(metric_states))
+        self._logger.debug('   _send_periodic_reports {} component_states', len(component_states))
+        self._logger.debug('   _send_periodic_reports {} alert_states', len(alert_states))
+        self._logger.debug('   _send_periodic_reports {} alert_states', len(alert_states))
+        self._logger.debug('   _send_periodic_reports {} context_states', len(context_states))
+        srv = self._hosted_services.state_event_service
+        if metric_states:
+            periodic_states = PeriodicStates(mdib_version, metric_states)
+            srv.send_periodic_metric_report(
+                [periodic_states], self._mdib.mdib_version_group)
+        if component_states:
+            periodic_states = PeriodicStates(mdib_version, component_states)
+            srv.send_periodic_component_state_report(
+                [periodic_states], self._mdib.mdib_version_group)
+        if alert_states:
+            periodic_states = PeriodicStates(mdib_version, alert_states)
+            srv.send_periodic_alert_report(
+                [periodic_states], self._mdib.mdib_version_group)
+        if operational_states:
+            periodic_states = PeriodicStates(mdib_version, operational_states)
+            srv.send_periodic_operational_state_report(
+                [periodic_states], self._mdib.mdib_version_group)
+        if context_states:
+            ctx_srv = self._hosted_services.context_service
+            periodic_states = PeriodicStates(mdib_version, context_states)
+            ctx_srv.send_periodic_context_report(
+                [periodic_states], self._mdib.mdib_version_group)
@@ -1,12 +1,29 @@
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING
+
 from .porttypebase import DPWSPortTypeBase, WSDLMessageDescription, WSDLOperationBinding, mk_wsdl_two_way_operation
 from .porttypebase import msg_prefix
 from sdc11073.dispatch import DispatchKey
-from sdc11073.exceptions import FunctionNotImplementedError
 from sdc11073.namespaces import PrefixesEnum
-from sdc11073.pysoap.soapenvelope import Fault, faultcodeEnum
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sdc11073 import xml_utils
+    from sdc11073.dispatch import RequestData
+    from sdc11073.mdib.descriptorcontainers import AbstractDescriptorContainer
+    from sdc11073.pysoap.msgfactory import CreatedMessage
 
 
 class ContainmentTreeService(DPWSPortTypeBase):
+    """Implementation of GetContainmentTree and GetDescriptor.
+
+    The serialized pm:Entry and msg:Descriptor nodes are cached per handle. The cache is cleared when the
+    DescriptionVersion of the mdib changes, i.e. after every descriptor transaction.
+    """
+
     port_type_name = PrefixesEnum.SDC.tag('ContainmentTreeService')
     WSDLMessageDescriptions = (WSDLMessageDescription('GetDescriptor',
                                                       (f'{msg_prefix}:GetDescriptor',)),
@@ -20,6 +37,12 @@ class ContainmentTreeService(DPWSPortTypeBase):
     WSDLOperationBindings = (WSDLOperationBinding('GetDescriptor', 'literal', 'literal'),
                              WSDLOperationBinding('GetContainmentTree', 'literal', 'literal'))
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_description_version = None
+        self._entry_nodes = {}  # key = handle, value = pm:Entry node
+        self._descriptor_nodes = {}  # key = handle, value = msg:Descriptor node
+
     def register_hosting_service(self, hosting_service):
         super().register_hosting_service(hosting_service)
         actions = self._mdib.sdc_definitions.Actions
@@ -29,20 +52,96 @@ class ContainmentTreeService(DPWSPortTypeBase):
         hosting_service.register_post_handler(DispatchKey(actions.GetDescriptor, msg_names.GetDescriptor),
                                               self._on_get_descriptor)
 
-    def _on_get_containment_tree(self, request_data):  # pylint: disable=no-self-use
-        # ToDo: implement, currently method only raises a soap fault
-        fault = Fault()
-        fault.Code.Value = faultcodeEnum.RECEIVER
-        fault.add_reason_text('not implemented')
+    def _on_get_containment_tree(self, request_data: RequestData) -> CreatedMessage:
+        data_model = self._sdc_definitions.data_model
+        self._logger.debug('_on_get_containment_tree')
+        request = data_model.msg_types.GetContainmentTree.from_node(request_data.message_data.p_msg.msg_node)
+        response = data_model.msg_types.GetContainmentTreeResponse()
+        tree = data_model.pm_types.ContainmentTree()
+        response.ContainmentTree.append(tree)
+        with self._mdib.mdib_lock:
+            self._check_cache()
+            descriptions = self._mdib.descriptions
+            if request.HandleRef:
+                # all requested handles share the same parent (R5030)
+                descriptors = [d for d in (descriptions.handle.get_one(h, allow_none=True) for h in request.HandleRef)
+                               if d is not None]
+                parent = None
+                if descriptors and descriptors[0].parent_handle is not None:
+                    parent = descriptions.handle.get_one(descriptors[0].parent_handle, allow_none=True)
+                if parent is not None:
+                    tree.HandleRef = parent.Handle
+                    tree.ParentHandleRef = parent.parent_handle
+                    tree.EntryType = parent.NODETYPE
+                    tree.ChildrenCount = len(descriptions.parent_handle.get(parent.Handle, []))
+            else:
+                # If no HANDLE reference is provided, all CONTAINMENT TREE ELEMENTs on MDS level SHALL be returned.
+                descriptors = descriptions.parent_handle.get(None, [])
+                tree.ChildrenCount = len(descriptors)
+            entry_nodes = self._get_entry_nodes(descriptors)
+            response.set_mdib_version_group(self._mdib.mdib_version_group)
+        response_envelope = self._sdc_device.msg_factory.mk_reply_soap_message(request_data, response)
+        tree_node = response_envelope.p_msg.payload_element[0]
+        tree_node.extend(copy.deepcopy(node) for node in entry_nodes)
+        return response_envelope
+
+    def _on_get_descriptor(self, request_data: RequestData) -> CreatedMessage:
+        data_model = self._sdc_definitions.data_model
+        self._logger.debug('_on_get_descriptor')
+        request = data_model.msg_types.GetDescriptor.from_node(request_data.message_data.p_msg.msg_node)
+        response = data_model.msg_types.GetDescriptorResponse()
+        with self._mdib.mdib_lock:
+            self._check_cache()
+            descriptions = self._mdib.descriptions
+            descriptors = [d for d in (descriptions.handle.get_one(h, allow_none=True) for h in request.HandleRef)
+                           if d is not None]
+            descriptor_nodes = self._get_descriptor_nodes(descriptors)
+            response.set_mdib_version_group(self._mdib.mdib_version_group)
+        response_envelope = self._sdc_device.msg_factory.mk_reply_soap_message(
+            request_data, response, [data_model.ns_helper.XSI])
+        response_envelope.p_msg.payload_element.extend(copy.deepcopy(node) for node in descriptor_nodes)
+        return response_envelope
+
+    def _check_cache(self):
+        """Clear cached nodes if the description has changed. Must be called with locked mdib."""
+        if self._mdib.mddescription_version != self._cached_description_version:
+            self._entry_nodes.clear()
+            self._descriptor_nodes.clear()
+            self._cached_description_version = self._mdib.mddescription_version
 
-        raise FunctionNotImplementedError(fault)
+    def _get_entry_nodes(self, descriptors: Iterable[AbstractDescriptorContainer]) -> list[xml_utils.LxmlElement]:
+        data_model = self._sdc_definitions.data_model
+        ns_map = data_model.ns_helper.partial_map(data_model.ns_helper.PM)
+        children_lookup = self._mdib.descriptions.parent_handle
+        result = []
+        for descriptor in descriptors:
+            node = self._entry_nodes.get(descriptor.Handle)
+            if node is None:
+                entry = data_model.pm_types.ContainmentTreeEntry()
+                entry.HandleRef = descriptor.Handle
+                entry.ParentHandleRef = descriptor.parent_handle
+                entry.EntryType = descriptor.NODETYPE
+                entry.ChildrenCount = len(children_lookup.get(descriptor.Handle, []))
+                entry.Type = descriptor.Type
+                node = entry.as_etree_node(data_model.pm_names.Entry, ns_map)
+                self._entry_nodes[descriptor.Handle] = node
+            result.append(node)
+        return result
 
-    def _on_get_descriptor(self, request_data):  # pylint: disable=no-self-use
-        # ToDo: implement, currently method only raises a soap fault
-        fault = Fault()
-        fault.Code.Value = faultcodeEnum.RECEIVER
-        fault.add_reason_text('not implemented')
-        raise FunctionNotImplementedError(fault)
+    def _get_descriptor_nodes(self, descriptors: Iterable[AbstractDescriptorContainer]) -> list[xml_utils.LxmlElement]:
+        data_model = self._sdc_definitions.data_model
+        nsh = data_model.ns_helper
+        ns_map = nsh.partial_map(nsh.MSG, nsh.PM, nsh.XSI)
+        result = []
+        for descriptor in descriptors:
+            node = self._descriptor_nodes.get(descriptor.Handle)
+            if node is None:
+                tmp = data_model.msg_types.GetDescriptorResponse()
+                tmp.Descriptor.append(descriptor)
+                node = tmp.as_etree_node(tmp.NODETYPE, ns_map)[0]
+                self._descriptor_nodes[descriptor.Handle] = node
+            result.append(node)
+        return result
 
     def add_wsdl_port_type(self, parent_node):
         port_type = self._mk_port_type_node(parent_node)
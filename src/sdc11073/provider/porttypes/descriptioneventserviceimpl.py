@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 from sdc11073.namespaces import PrefixesEnum
@@ -50,26 +51,28 @@ class DescriptionEventService(DPWSPortTypeBase):
                                                 created: list[AbstractDescriptorContainer],
                                                 deleted: list[AbstractDescriptorContainer],
                                                 updated_states: list[AbstractStateContainer]) -> xml_utils.LxmlElement:
-        # This method creates one ReportPart for every descriptor.
-        # An optimization is possible by grouping all descriptors with the same parent handle into one ReportPart.
-        # This is not implemented, and I think it is not needed.
+        # Consecutive descriptors with the same parent and source mds share one ReportPart.
         data_model = self._sdc_definitions.data_model
         report = data_model.msg_types.DescriptionModificationReport()
         report.set_mdib_version_group(mdib_version_group)
         DescriptionModificationType = data_model.msg_types.DescriptionModificationType
+        states_by_handle = defaultdict(list)
+        for state in updated_states:
+            states_by_handle[state.DescriptorHandle].append(state)
 
         for descriptors, modification_type in ((updated, DescriptionModificationType.UPDATE),
                                                (created, DescriptionModificationType.CREATE),
                                                (deleted, DescriptionModificationType.DELETE)):
+            report_part = None
             for descriptor in descriptors:
-                # one report part for every descriptor,
-                report_part = report.add_report_part()
-                report_part.ModificationType = modification_type
-                report_part.ParentDescriptor = descriptor.parent_handle
-                report_part.SourceMds = descriptor.source_mds
+                if (report_part is None or report_part.ParentDescriptor != descriptor.parent_handle
+                        or report_part.SourceMds != descriptor.source_mds):
+                    report_part = report.add_report_part()
+                    report_part.ModificationType = modification_type
+                    report_part.ParentDescriptor = descriptor.parent_handle
+                    report_part.SourceMds = descriptor.source_mds
                 report_part.Descriptor.append(descriptor)
-                states = [s for s in updated_states if s.DescriptorHandle == descriptor.Handle]
-                report_part.State.extend(states)
+                report_part.State.extend(states_by_handle.get(descriptor.Handle, []))
 
         nsh = data_model.ns_helper
         ns_map = nsh.partial_map(nsh.MSG, nsh.PM)
@@ -1,3 +1,8 @@
+import copy
+import weakref
+
+from lxml import etree
+
 from .porttypebase import DPWSPortTypeBase, WSDLMessageDescription, WSDLOperationBinding, mk_wsdl_two_way_operation
 from .porttypebase import msg_prefix
 from sdc11073.dispatch import DispatchKey
@@ -23,6 +28,14 @@ class GetService(DPWSPortTypeBase):
                              WSDLOperationBinding('GetMdib', 'literal', 'literal'),
                              WSDLOperationBinding('GetMdDescription', 'literal', 'literal'),)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # caches for GetMdDescription, they are valid for one DescriptionVersion of one mdib
+        self._description_cache_mdib = None  # weak reference, the cache shall not keep an mdib alive
+        self._description_cache_version = None
+        self._mds_handle_lookup = {}  # key = descriptor handle, value = handle of its mds
+        self._mds_nodes = {}  # key = mds handle, value = pm:Mds node with complete subtree
+
     def register_hosting_service(self, hosting_service):
         super().register_hosting_service(hosting_service)
         actions = self._sdc_device.mdib.sdc_definitions.Actions
@@ -39,10 +52,13 @@ class GetService(DPWSPortTypeBase):
         msg_node = request_data.message_data.p_msg.msg_node
         get_md_state = data_model.msg_types.GetMdState.from_node(msg_node)
         requested_handles = get_md_state.HandleRef
-        if len(requested_handles) > 0:
-            self._logger.debug('_on_get_md_state from {} req. handles:{}', request_data.peer_name, requested_handles)
-        else:
-            self._logger.debug('_on_get_md_state from {}', request_data.peer_name)
+        is_debug = self._logger.is_debug
+        if is_debug:
+            if len(requested_handles) > 0:
+                self._logger.debug('_on_get_md_state from {} req. handles:{}', request_data.peer_name,
+                                   requested_handles)
+            else:
+                self._logger.debug('_on_get_md_state from {}', request_data.peer_name)
 
         # get the requested state containers from mdib
         state_containers = []
@@ -66,16 +82,17 @@ class GetService(DPWSPortTypeBase):
                     for handle in requested_handles:
                         state_containers.extend(self._mdib.states.descriptor_handle.get(handle, []))
 
-                self._logger.debug('_on_get_md_state requested Handles:{} found {} states', requested_handles,
-                                   len(state_containers))
+                if is_debug:
+                    self._logger.debug('_on_get_md_state requested Handles:{} found {} states', requested_handles,
+                                       len(state_containers))
 
         factory = self._sdc_device.msg_factory
         response = data_model.msg_types.GetMdStateResponse()
         response.MdState.State.extend(state_containers)
         response.set_mdib_version_group(self._mdib.mdib_version_group)
         created_message = factory.mk_reply_soap_message(request_data, response)
-        self._logger.debug('_on_get_md_state returns {}',
-                           lambda: created_message.serialize())
+        if is_debug:
+            self._logger.debug('_on_get_md_state returns {}', created_message.serialize())
         return created_message
 
     def _on_get_mdib(self, request_data):
@@ -97,8 +114,6 @@ class GetService(DPWSPortTypeBase):
         - If a HANDLE reference does match an MDS descriptor, it SHALL be included in the result list.
         - If a HANDLE reference does not match an MDS descriptor (any other descriptor), the MDS descriptor that is in the parent tree of the HANDLE reference SHOULD be included in the result list.
         """
-        # currently this implementation only supports a single mds.
-        # => if at least one handle matches any descriptor, the one mds is returned, otherwise empty payload
         data_model = self._sdc_definitions.data_model
 
         self._logger.debug('_on_get_md_description')
@@ -109,29 +124,64 @@ class GetService(DPWSPortTypeBase):
             self._logger.info('_on_get_md_description requested Handles:{}', requested_handles)
         response = self.mk_get_mddescription_response_message(
             request_data, self._sdc_device.mdib, requested_handles)
-        self._logger.debug('_on_get_md_description returns {}',
-                           lambda: response.serialize())
+        if self._logger.is_debug:
+            self._logger.debug('_on_get_md_description returns {}', response.serialize())
         return response
 
     def mk_get_mddescription_response_message(self, request_data, mdib, requested_handles):
-        """For simplification reason this implementation returns either all descriptors or none."""
-        return_all = len(requested_handles) == 0  # if we have handles, we need to check them
+        """Return all mds if requested_handles is empty, otherwise the mds that contain the requested handles.
+
+        Handles that do not match any descriptor are ignored.
+        """
+        pm_names = self._sdc_definitions.data_model.pm_names
         dummy_response = self._sdc_definitions.data_model.msg_types.GetMdDescriptionResponse()
-        dummy_response.set_mdib_version_group(mdib.mdib_version_group)
+        with mdib.mdib_lock:
+            self._check_description_cache(mdib)
+            all_mds = mdib.descriptions.parent_handle.get(None, [])
+            if len(requested_handles) == 0:
+                mds_handles = [mds.Handle for mds in all_mds]
+            else:
+                wanted = {self._get_mds_handle(mdib, handle) for handle in requested_handles}
+                # keep the order of the mdib
+                mds_handles = [mds.Handle for mds in all_mds if mds.Handle in wanted]
+            mds_nodes = []
+            for mds_handle in mds_handles:
+                node = self._mds_nodes.get(mds_handle)
+                if node is None:
+                    mds = mdib.descriptions.handle.get_one(mds_handle)
+                    md_description_node = etree.Element(pm_names.MdDescription, nsmap=mdib.nsmapper.ns_map)
+                    node = mdib.make_descriptor_node(mds, md_description_node, tag=pm_names.Mds, set_xsi_type=False)
+                    self._mds_nodes[mds_handle] = node
+                mds_nodes.append(node)
+            dummy_response.set_mdib_version_group(mdib.mdib_version_group)
         response = self._sdc_device.msg_factory.mk_reply_soap_message(request_data, dummy_response)
-        # now add to payload_element
+        # now add copies of the mds nodes to msg_names.MdDescription node in response
         response_node = response.p_msg.payload_element
-        for handle in requested_handles:
-            # if at least one requested handle is valid, return all.
-            if mdib.descriptions.handle.get_one(handle, allow_none=True) is not None:
-                return_all = True
-                break
-        if return_all:
-            md_description_node, mdib_version_group = mdib.reconstruct_md_description()
-            # append all children of md_description_node to msg_names.MdDescription node in response
-            response_node[0].extend(md_description_node[:])
+        response_node[0].extend(copy.deepcopy(node) for node in mds_nodes)
         return response
 
+    def _check_description_cache(self, mdib):
+        """Clear cached mds nodes and lookup if the description has changed. Must be called with locked mdib."""
+        cached_mdib = None if self._description_cache_mdib is None else self._description_cache_mdib()
+        if cached_mdib is not mdib or mdib.mddescription_version != self._description_cache_version:
+            self._mds_handle_lookup.clear()
+            self._mds_nodes.clear()
+            self._description_cache_mdib = weakref.ref(mdib)
+            self._description_cache_version = mdib.mddescription_version
+
+    def _get_mds_handle(self, mdib, handle):
+        """Return the handle of the mds that is or contains the descriptor with the given handle, or None."""
+        try:
+            return self._mds_handle_lookup[handle]
+        except KeyError:
+            pass
+        descriptor = mdib.descriptions.handle.get_one(handle, allow_none=True)
+        mds_handle = None
+        if descriptor is not None:
+            mds_handle = mdib.xtra.get_mds_descriptor(descriptor).Handle
+            self._mds_handle_lookup[handle] = mds_handle
+        return mds_handle
+
     def add_wsdl_port_type(self, parent_node):
         """
         add wsdl:portType node to parent_node.
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import contextlib
-from collections import defaultdict
+import copy
+import threading
+from collections import OrderedDict, defaultdict
 from typing import TYPE_CHECKING, List, Optional, Union
 from .porttypebase import DPWSPortTypeBase
 from .porttypebase import WSDLMessageDescription, WSDLOperationBinding
@@ -12,6 +13,39 @@ from sdc11073.namespaces import PrefixesEnum
 if TYPE_CHECKING:
     from sdc11073.xml_types.pm_types import LocalizedText
 
+MAX_CACHED_REQUESTS = 32  # number of cached results of requests for all texts of some languages
+
+
+class _LruCache:
+    """A thread safe dict with a maximum size, the least recently used entry is dropped first."""
+
+    def __init__(self, max_size: int = MAX_CACHED_REQUESTS):
+        self._max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
 def _tw2i(text_width_string):
     """ text width to int"""
     lookup = {'xs': 0, 's': 1, 'm': 2, 'l': 3, 'xl': 4, 'xxl': 5, None: 999}
@@ -41,14 +75,54 @@ def _n_o_l_filter(localized_texts, n_o_l):
 
 
 class LocalizationStorage:
+    """Storage of localized texts.
+
+    The texts are indexed on add() by handle, language and version, so that a request only touches the texts it
+    returns. Results of requests for all texts of some languages are cached until the next add() call, the cache
+    is keyed by the requested languages that exist in the storage and holds at most MAX_CACHED_REQUESTS results.
+    """
+
     def __init__(self, localized_texts: Optional[List[LocalizedText]] = None):
         self._localized_texts = defaultdict(list)  # key = handle, value = list of LocalizedText objects
+        # key = handle, value = dict with key = lang, value = dict with key = version, value = list of LocalizedText
+        self._index = {}
+        self._languages = set()
+        self._versions = set()
+        self._max_version = None
+        self._all_texts_cache = _LruCache()  # key = see all_texts_key, value = list of LocalizedText objects
+        self.generation = 0  # incremented on every add() call, can be used to invalidate derived caches
         if localized_texts:
             self.add(*localized_texts)
 
     def add(self, *localized_texts: LocalizedText):
         for text in localized_texts:
             self._localized_texts[text.Ref].append(text)
+            versions = self._index.setdefault(text.Ref, {}).setdefault(text.Lang, {})
+            versions.setdefault(text.Version, []).append(text)
+            self._languages.add(str(text.Lang))
+            self._versions.add(text.Version)
+            if text.Version is not None and (self._max_version is None or text.Version > self._max_version):
+                self._max_version = text.Version
+            text.n_o_l = _calc_number_of_lines(text.text)
+        self._all_texts_cache.clear()
+        self.generation += 1
+
+    def all_texts_key(self, requested_version: Union[int, None],
+                      requested_langs: Union[List[str], None]) -> Optional[tuple]:
+        """Return the key of a request for all texts of some languages, None if the result is empty.
+
+        The key only contains the requested languages that exist in the storage, the order of the requested
+        languages does not matter.
+        """
+        version = self._max_version if requested_version is None else requested_version
+        if len(self._localized_texts) == 0 or version not in self._versions:
+            return None
+        if not requested_langs:
+            return None, version
+        languages = frozenset(lang for lang in requested_langs if lang in self._languages)
+        if not languages:
+            return None
+        return languages, version
 
     def filter_localized_texts(self, requested_handles: Union[List[str], None],
                                requested_version: Union[int, None],
@@ -76,48 +150,55 @@ class LocalizationStorage:
             requested_handles = []
         i_nls = [int(line) for line in number_of_lines]
 
+        effective_requested_version = requested_version
+        if requested_version is None:
+            if len(self._localized_texts) == 0:
+                return []  # there is nothing
+            # the highest available Version in the storage
+            effective_requested_version = self._max_version
+
+        is_all_texts_request = len(requested_handles) == 0 and len(i_text_widths) == 0 and len(i_nls) == 0
+        if is_all_texts_request:
+            cache_key = self.all_texts_key(requested_version, requested_langs)
+            if cache_key is None:
+                return []
+            texts = self._all_texts_cache.get(cache_key)
+            if texts is not None:
+                return list(texts)
+            languages = cache_key[0]
+        else:
+            languages = frozenset(requested_langs) if requested_langs else None
+
         if len(requested_handles) == 0:
             # If there is no Ref ELEMENT given in the request MESSAGE, then all texts are returned in
             # msg:GetLocalizedTextResponse/msg:Text
-            handles = list(self._localized_texts.keys())
+            handles = self._index.keys()
         else:
             # If there is at least one Ref ELEMENT given, then msg:GetLocalizedTextResponse/msg:Text contains all texts
             # that match the Ref elements of the msg:GetLocalizedText request MESSAGE.
             handles = requested_handles
 
-        # create a flat list of all localized texts with the requested handles
-        texts = []
-        for handle in handles:
-            with contextlib.suppress(KeyError):
-                texts.extend(self._localized_texts[handle])
-
-        # filter languages:
-        if requested_langs is not None and len(requested_langs) > 0:
-            texts = [t for t in texts if t.Lang in requested_langs]
-
-        # filter requested versions. We need to do it per language, therefore create a lookup with (ref,lang) as key
-        tmp_dict = defaultdict(list)
-        for text in texts:
-            tmp_dict[(text.Ref, text.Lang)].append(text)
-        texts = []
-
-        effective_requested_version = requested_version
-        if requested_version is None:
-            # determine the highest available Version in the storage
-            all_versions = []
-            for value in self._localized_texts.values():
-                all_versions.extend(value)
-            if len(all_versions) == 0:
-                # ToDo: why return here?
-                return []  # there is nothing
-            all_versions = [a.Version for a in all_versions if a.Version is not None]
-            if len(all_versions) > 0:
-                effective_requested_version = max(all_versions)
-
+        # collect the texts with requested version per (ref, lang).
         # If the referenced text is not available in the specific version, then
         # msg:GetLocalizedTextResponse/msg:Text is empty
-        for _, value_list in tmp_dict.items():
-            texts.extend([v for v in value_list if v.Version == effective_requested_version])
+        text_groups = []
+        for handle in handles:
+            languages_lookup = self._index.get(handle)
+            if languages_lookup is None:
+                continue
+            for lang, versions in languages_lookup.items():
+                if languages is not None and lang not in languages:
+                    continue
+                value_list = versions.get(effective_requested_version)
+                if value_list:
+                    text_groups.append(value_list)
+
+        if len(i_text_widths) == 0 and len(i_nls) == 0:
+            texts = [text for value_list in text_groups for text in value_list]
+            if is_all_texts_request:
+                self._all_texts_cache.put(cache_key, texts)
+                return list(texts)
+            return texts
 
         # - If there is no NumberOfLines ELEMENT given in the request MESSAGE, then all texts independent of the number
         #   of lines are returned in msg:GetLocalizedTextResponse/msg:Text.
@@ -125,74 +206,38 @@ class LocalizationStorage:
         #   that match the number of lines defined by the NumberOfLines elements of the msg:GetLocalizedText request
         #   MESSAGE. Matching in this case means that the number of lines in the text is less or equal to the
         #   NumberOfLines elements.
-
-        if len(i_text_widths) > 0 or len(number_of_lines) > 0:
-            if len(number_of_lines) > 0:
-                # calculate number of lines for every localized text and add is as member to the object
-                for text in texts:
-                    text.n_o_l = _calc_number_of_lines(text.text)
-
-            # create again dictionary by ref and language:
-            tmp_dict = defaultdict(list)
-            for text in texts:
-                tmp_dict[(text.Ref, text.Lang)].append(text)
-            tmp = []
-
-            if len(i_text_widths) > 0 and len(number_of_lines) > 0:
-                # now find for each combination of (width, lines) list the best match
-                for value_list in tmp_dict.values():
-                    # candidates = []
-                    for text_width in i_text_widths:
-                        candidates1 = _text_width_filter(value_list,
-                                                         text_width)  # returns sorted list of smaller elements
-                        for lines_cnt in i_nls:
-                            candidates2 = _n_o_l_filter(candidates1, lines_cnt)
-                            if len(candidates2) > 0:
-                                candidates2.sort(key=lambda obj: obj.TextWidth * obj.n_o_l)  # sort by area size
-                                tmp.append(candidates2[-1])  # use the largest one
-            elif len(i_text_widths) > 0:
-                # filter only text widths
-                for value_list in tmp_dict.values():
-                    for text_width in i_text_widths:
-                        candidates = _text_width_filter(value_list,
-                                                        text_width)  # returns sorted list of smaller elements
-                        if candidates:
-                            tmp.append(candidates[-1])  # use the largest one
-
-            elif len(number_of_lines) > 0:
-                # filter only number of lines
-                for value_list in tmp_dict.values():
+        # The number of lines of every text was calculated in add().
+        tmp = []
+        if len(i_text_widths) > 0 and len(i_nls) > 0:
+            # now find for each combination of (width, lines) list the best match
+            for value_list in text_groups:
+                for text_width in i_text_widths:
+                    candidates1 = _text_width_filter(value_list,
+                                                     text_width)  # returns sorted list of smaller elements
                     for lines_cnt in i_nls:
-                        candidates = _n_o_l_filter(value_list, lines_cnt)
-                        if candidates:
-                            tmp.append(candidates[-1])  # use the largest one
-            texts = list(tmp)
-        return texts
-
-    def get_supported_languages(self):
-        texts = self._flat_list()
-        result = set()
-        for text in texts:
-            result.add(str(text.Lang))
-        return list(result)
-
-    def _flat_list(self, ref_list=None):
-        if ref_list is None:
-            # If there is no Ref ELEMENT given in the request MESSAGE, then all texts are returned in
-            # msg:GetLocalizedTextResponse/msg:Text
-            handles = list(self._localized_texts.keys())
+                        candidates2 = _n_o_l_filter(candidates1, lines_cnt)
+                        if len(candidates2) > 0:
+                            candidates2.sort(key=lambda obj: obj.TextWidth * obj.n_o_l)  # sort by area size
+                            tmp.append(candidates2[-1])  # use the largest one
+        elif len(i_text_widths) > 0:
+            # filter only text widths
+            for value_list in text_groups:
+                for text_width in i_text_widths:
+                    candidates = _text_width_filter(value_list,
+                                                    text_width)  # returns sorted list of smaller elements
+                    if candidates:
+                        tmp.append(candidates[-1])  # use the largest one
         else:
-            # If there is at least one Ref ELEMENT given, then msg:GetLocalizedTextResponse/msg:Text contains all texts
-            # that match the Ref elements of the msg:GetLocalizedText request MESSAGE.
-            handles = ref_list
-
-        # create a flat list of all localized texts with the requested handles
-        texts = []
-        for handle in handles:
-            with contextlib.suppress(KeyError):
-                texts.extend(self._localized_texts[handle])
-        return texts
+            # filter only number of lines
+            for value_list in text_groups:
+                for lines_cnt in i_nls:
+                    candidates = _n_o_l_filter(value_list, lines_cnt)
+                    if candidates:
+                        tmp.append(candidates[-1])  # use the largest one
+        return tmp
 
+    def get_supported_languages(self):
+        return list(self._languages)
 
 class LocalizationService(DPWSPortTypeBase):
     port_type_name = PrefixesEnum.SDC.tag('LocalizationService')
@@ -211,6 +256,10 @@ class LocalizationService(DPWSPortTypeBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.localization_storage = LocalizationStorage()
+        # serialized msg:Text nodes of requests for all texts of some languages of one storage generation.
+        # key = LocalizationStorage.all_texts_key, value = (storage generation, list of nodes)
+        self._text_nodes_cache = _LruCache()
+        self._text_nodes_generation = None  # (storage, storage generation) of the cached nodes
 
     def register_hosting_service(self, hosting_service):
         super().register_hosting_service(hosting_service)
@@ -227,17 +276,43 @@ class LocalizationService(DPWSPortTypeBase):
         self._logger.debug('_on_get_localized_text')
         cls = data_model.msg_types.GetLocalizedText
         get_localized_text = cls.from_node(request_data.message_data.p_msg.msg_node)
-        texts = self.localization_storage.filter_localized_texts(get_localized_text.Ref,
-                                                                 get_localized_text.Version,
-                                                                 get_localized_text.Lang,
-                                                                 get_localized_text.TextWidth,
-                                                                 get_localized_text.NumberOfLines)
         response = data_model.msg_types.GetLocalizedTextResponse()
-        response.Text.extend(texts)
         response.set_mdib_version_group(self._mdib.mdib_version_group)
+        if get_localized_text.Ref or get_localized_text.TextWidth or get_localized_text.NumberOfLines:
+            texts = self.localization_storage.filter_localized_texts(get_localized_text.Ref,
+                                                                     get_localized_text.Version,
+                                                                     get_localized_text.Lang,
+                                                                     get_localized_text.TextWidth,
+                                                                     get_localized_text.NumberOfLines)
+            response.Text.extend(texts)
+            return self._sdc_device.msg_factory.mk_reply_soap_message(request_data, response)
+        # all texts of some languages: this is the common request of a consumer after connect.
+        # The msg:Text nodes are serialized only once, every response gets copies of them.
+        text_nodes = self._get_all_text_nodes(get_localized_text.Version, get_localized_text.Lang)
         response_envelope = self._sdc_device.msg_factory.mk_reply_soap_message(request_data, response)
+        response_envelope.p_msg.payload_element.extend(copy.deepcopy(node) for node in text_nodes)
         return response_envelope
 
+    def _get_all_text_nodes(self, version: Optional[int], languages: Optional[List[str]]) -> list:
+        storage = self.localization_storage
+        generation = (storage, storage.generation)
+        if self._text_nodes_generation != generation:
+            self._text_nodes_cache.clear()
+            self._text_nodes_generation = generation
+        key = storage.all_texts_key(version, languages)
+        if key is None:
+            return []
+        cached = self._text_nodes_cache.get(key)
+        if cached is not None and cached[0] == generation[1]:
+            return cached[1]
+        texts = storage.filter_localized_texts(None, version, languages, None, None)
+        tmp = self._sdc_definitions.data_model.msg_types.GetLocalizedTextResponse()
+        tmp.Text.extend(texts)
+        nsh = self._sdc_definitions.data_model.ns_helper
+        text_nodes = list(tmp.as_etree_node(tmp.NODETYPE, nsh.partial_map(nsh.MSG, nsh.PM)))
+        self._text_nodes_cache.put(key, (generation[1], text_nodes))
+        return text_nodes
+
     def _on_get_supported_languages(self, request_data):
         data_model = self._sdc_definitions.data_model
         self._logger.debug('_on_get_supported_languages')
@@ -4,6 +4,7 @@ from collections.abc import Callable, Iterable, Sequence
 from typing import Any, Protocol
 
 from sdc11073.definitions_base import AbstractDataModel
+from sdc11073.mdib.entityprotocol import EntityProtocol
 from sdc11073.mdib.providermdibprotocol import ProviderMdibProtocol
 from sdc11073.xml_types.pm_types import Annotation, ComponentActivation
 
@@ -112,6 +113,9 @@ class WaveformProviderProtocol(Protocol):
         """Set the activation state of waveform generator and of Metric state in mdib."""
         ...
 
-    def update_all_realtime_samples(self):
-        """Update all realtime sample states that have a waveform generator registered."""
+    def update_all_realtime_samples(self) -> Sequence[EntityProtocol]:
+        """Update all realtime sample states that have a waveform generator registered.
+
+        Return the entities of the updated states, the caller writes them in a realtime sample transaction.
+        """
         ...
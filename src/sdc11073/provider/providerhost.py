@@ -0,0 +1,225 @@
+"""The module implements a host that runs many SdcProvider instances on shared infrastructure.
+
+Each SdcProvider that runs alone has its own http server, soap client pool, asyncio event loop and threads for
+periodic reports, waveforms and subscription housekeeping. Simulating many devices in one process that way needs
+thousands of threads. All providers of a SdcProviderHost share
+- one WS-Discovery instance that answers for the EPRs of all providers,
+- one http server, every provider is served on its own path,
+- one soap client pool and asyncio event loop that sends the notifications of all subscription managers,
+- one scheduler thread for periodic reports, realtime samples and subscription housekeeping.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from sdc11073 import loghelper
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.exceptions import ApiUsageError
+from sdc11073.httpserver import compression
+from sdc11073.httpserver.httpserverimpl import HttpServerThreadBase
+from sdc11073.provider.providerimpl import SdcProvider, provider_components_async_factory
+from sdc11073.provider.scheduler import Scheduler
+from sdc11073.provider.subscriptionmgr_async import AsyncioEventLoopThread, BICEPSSubscriptionsManagerBaseAsync
+from sdc11073.pysoap.msgreader import MessageReader
+from sdc11073.pysoap.soapclient_async import SoapClientAsync
+from sdc11073.pysoap.soapclientpool import SoapClientPool
+
+if TYPE_CHECKING:
+    import uuid
+
+    from sdc11073.certloader import SSLContextContainer
+    from sdc11073.definitions_base import BaseDefinitions
+    from sdc11073.mdib.providermdibprotocol import ProviderMdibProtocol
+    from sdc11073.provider.providerimpl import RoleProviderComponents, SdcProviderComponents
+    from sdc11073.wsdiscovery.wsdiscoveryprotocols import WsDiscoveryProtocol
+    from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
+
+
+class SdcProviderHost:
+    """Run many SdcProvider instances with one http server, soap client pool, event loop and scheduler.
+
+    Jobs of the scheduler run sequentially in one thread, the host is therefore meant for many providers with
+    low data rates, e.g. simulated devices.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        ws_discovery: WsDiscoveryProtocol,
+        ssl_context_container: SSLContextContainer | None = None,
+        max_subscription_duration: int = 15,
+        socket_timeout: float | None = None,
+        chunk_size: int = 0,
+        sdc_definitions: type[BaseDefinitions] = SdcV1Definitions,
+        log_prefix: str = '',
+    ):
+        """Construct a SdcProviderHost.
+
+        :param ws_discovery: a WsDiscovery instance, it publishes all providers of this host
+        :param ssl_context_container: if not None, the contexts are used and an https url is used, otherwise http
+        :param max_subscription_duration: max. possible duration of a subscription
+        :param socket_timeout: timeout for tcp sockets that send notifications.
+                               If None, it is set to max_subscription_duration * 1.2
+        :param chunk_size: if value > 0, messages are split into chunks of this size.
+        :param sdc_definitions: definitions of the soap clients that send notifications
+        :param log_prefix: a string
+        """
+        self._wsdiscovery = ws_discovery
+        self._ssl_context_container = ssl_context_container
+        self._max_subscription_duration = max_subscription_duration
+        self._socket_timeout = socket_timeout or int(max_subscription_duration * 1.2)
+        self._chunk_size = chunk_size
+        self._sdc_definitions = sdc_definitions
+        self._log_prefix = log_prefix
+        self._logger = loghelper.get_logger_adapter('sdc.device.host', log_prefix)
+        self._compression_methods = compression.CompressionHandler.available_encodings[:]
+        self._msg_reader = MessageReader(
+            sdc_definitions,
+            None,
+            loghelper.get_logger_adapter('sdc.device.msgreader', log_prefix),
+        )
+        self._providers: list[SdcProvider] = []
+        self._lock = threading.Lock()
+        self._http_server: HttpServerThreadBase | None = None
+        self._soap_client_pool: SoapClientPool | None = None
+        self.scheduler = Scheduler(log_prefix=log_prefix)
+
+    @property
+    def providers(self) -> list[SdcProvider]:
+        """Return a list of the providers of this host."""
+        with self._lock:
+            return self._providers[:]
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if start_all was called and stop_all was not called yet."""
+        return self._http_server is not None
+
+    def _mk_soap_client(self, netloc: str, accepted_encodings: list[str]) -> SoapClientAsync:
+        return SoapClientAsync(
+            netloc,
+            self._socket_timeout,
+            loghelper.get_logger_adapter('sdc.device.soap', self._log_prefix),
+            ssl_context=self._ssl_context_container.client_context if self._ssl_context_container else None,
+            sdc_definitions=self._sdc_definitions,
+            msg_reader=self._msg_reader,
+            supported_encodings=self._compression_methods,
+            request_encodings=accepted_encodings,
+            chunk_size=self._chunk_size,
+        )
+
+    def start_all(self, http_server_start_timeout: float = 60.0):
+        """Start the shared http server, event loop and scheduler.
+
+        :param http_server_start_timeout: time to wait for http server to start
+        """
+        if self.is_running:
+            raise ApiUsageError('provider host is already running')
+        self._soap_client_pool = SoapClientPool(self._mk_soap_client, self._log_prefix)
+        async_loop = AsyncioEventLoopThread(
+            name='async_loop_provider_host',
+            logger=loghelper.get_logger_adapter('sdc.device.host.loop', self._log_prefix),
+        )
+        async_loop.start()
+        for _i in range(100):
+            if async_loop.running:
+                break
+            time.sleep(0.01)
+        else:
+            raise RuntimeError('could not start AsyncioEventLoopThread')
+        self._soap_client_pool.async_loop_subscr_mgr = async_loop
+        self.scheduler.start()
+        self._http_server = HttpServerThreadBase(
+            my_ipaddress=self._wsdiscovery.active_address,
+            ssl_context=self._ssl_context_container.server_context if self._ssl_context_container else None,
+            supported_encodings=self._compression_methods,
+            logger=loghelper.get_logger_adapter('sdc.device.httpsrv', self._log_prefix),
+            chunk_size=self._chunk_size,
+        )
+        self._http_server.start()
+        if not self._http_server.started_evt.wait(timeout=http_server_start_timeout):
+            msg = f'Http server could not be started within {http_server_start_timeout} seconds.'
+            raise RuntimeError(msg)
+        self._logger.info('provider host serving on port {}', self._http_server.server_port)  # noqa: PLE1205
+
+    def stop_all(self, send_subscription_end: bool = True):
+        """Stop all providers and the shared infrastructure."""
+        for provider in self.providers:
+            self.remove_provider(provider, send_subscription_end)
+        if not self.is_running:
+            return
+        self.scheduler.stop()
+        self._http_server.stop()
+        self._http_server = None
+        self._soap_client_pool.close_all()  # also stops the event loop
+        self._soap_client_pool = None
+
+    def add_provider(  # noqa: PLR0913
+        self,
+        this_model: ThisModelType,
+        this_device: ThisDeviceType,
+        device_mdib_container: ProviderMdibProtocol,
+        epr: str | uuid.UUID | None = None,
+        validate: bool = True,
+        log_prefix: str = '',
+        components: SdcProviderComponents | None = None,
+        role_provider_components: RoleProviderComponents | None = None,
+        start_rtsample_loop: bool = True,
+        periodic_reports_interval: float | None = None,
+    ) -> SdcProvider:
+        """Create a SdcProvider that uses the shared infrastructure and start it.
+
+        The provider is not published, call set_location or publish of the provider.
+        :param this_model: a ThisModelType instance
+        :param this_device: a ThisDeviceType instance
+        :param device_mdib_container: a ProviderMdibProtocol instance
+        :param epr: something that serves as a unique identifier of this device for discovery.
+        :param validate: bool
+        :param log_prefix: a string
+        :param components: a SdcProviderComponents instance, the subscription managers must be async
+        :param role_provider_components: a RoleProviderComponents instance
+        :param start_rtsample_loop: if True and the provider has a waveform provider, realtime samples are
+                                    generated by a job of the scheduler
+        :param periodic_reports_interval: if provided, a value in seconds
+        :return: the started provider
+        """
+        if not self.is_running:
+            raise ApiUsageError('provider host is not running, call start_all first')
+        components = components or provider_components_async_factory()
+        for name, cls in components.subscriptions_manager_class.items():
+            if not issubclass(cls, BICEPSSubscriptionsManagerBaseAsync):
+                msg = f'subscriptions manager "{name}" must be async to share the event loop, got {cls.__name__}'
+                raise ApiUsageError(msg)
+        provider = SdcProvider(
+            self._wsdiscovery,
+            this_model,
+            this_device,
+            device_mdib_container,
+            epr=epr,
+            validate=validate,
+            ssl_context_container=self._ssl_context_container,
+            max_subscription_duration=self._max_subscription_duration,
+            socket_timeout=self._socket_timeout,
+            log_prefix=log_prefix,
+            components=components,
+            role_provider_components=role_provider_components,
+            chunk_size=self._chunk_size,
+            soap_client_pool=self._soap_client_pool,
+            scheduler=self.scheduler,
+        )
+        provider.start_all(
+            start_rtsample_loop=start_rtsample_loop and provider.waveform_provider is not None,
+            periodic_reports_interval=periodic_reports_interval,
+            shared_http_server=self._http_server,
+        )
+        with self._lock:
+            self._providers.append(provider)
+        return provider
+
+    def remove_provider(self, provider: SdcProvider, send_subscription_end: bool = True):
+        """Stop the provider and remove it from the host."""
+        with self._lock:
+            self._providers.remove(provider)
+        provider.stop_all(send_subscription_end)
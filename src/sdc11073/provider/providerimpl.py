@@ -9,6 +9,7 @@ import copy
 import dataclasses
 import socket
 import threading
+import time
 import uuid
 from typing import TYPE_CHECKING, Any
 from urllib.parse import SplitResult
@@ -69,6 +70,7 @@ if TYPE_CHECKING:
     from sdc11073.provider.porttypes.porttypebase import DPWSPortTypeBase
     from sdc11073.provider.protocols.productprotocol import ProductProtocol
     from sdc11073.provider.protocols.waveformprotocol import WaveformProviderProtocol
+    from sdc11073.provider.scheduler import ScheduledJob, Scheduler
     from sdc11073.provider.sco import AbstractScoOperationsRegistry
     from sdc11073.provider.subscriptionmgr_base import SubscriptionManagerProtocol
     from sdc11073.pysoap.msgfactory import CreatedMessage
@@ -200,6 +202,8 @@ class SdcProvider:
         role_provider_components: RoleProviderComponents | None = None,
         chunk_size: int = 0,
         alternative_hostname: str | None = None,
+        soap_client_pool: SoapClientPool | None = None,
+        scheduler: Scheduler | None = None,
     ):
         """Construct an SdcProvider.
 
@@ -220,6 +224,10 @@ class SdcProvider:
         :param chunk_size: if value > 0, messages are split into chunks of this size.
         :param alternative_hostname: if supplied this hostname is used in xaddr, default is to use numerical
                                      ipv4 address (can be used to use full qualified hostname)
+        :param soap_client_pool: if provided, notifications are sent with the soap clients of this pool,
+                                 e.g. a pool that is shared by many providers. The provider does not close it.
+        :param scheduler: if provided, periodic reports, realtime samples and subscription housekeeping are jobs of
+                          this scheduler instead of own threads.
         """
         self._wsdiscovery = ws_discovery
         self.model = this_model
@@ -310,7 +318,10 @@ class SdcProvider:
 
         # these are initialized in _setup_components:
         self._subscriptions_managers = {}
-        self._soap_client_pool = SoapClientPool(self._mk_soap_client, log_prefix)
+        self._is_internal_soap_client_pool = soap_client_pool is None
+        self._soap_client_pool = soap_client_pool or SoapClientPool(self._mk_soap_client, log_prefix)
+        self._scheduler = scheduler
+        self._rt_sample_job: ScheduledJob | None = None
         self._sco_operations_registries = {}  # key is sco descriptor handle
         self._service_factory = None
         self.product_lookup: dict[str, ProductProtocol] = {}  # one product per sco,  key is a sco handle
@@ -344,6 +355,8 @@ class SdcProvider:
 
     def _setup_components(self):
         self._subscriptions_managers = {}
+        # only pass a scheduler if there is one, subscription manager classes are not required to support it
+        scheduler_kwargs = {} if self._scheduler is None else {'scheduler': self._scheduler}
         for name, cls in self._components.subscriptions_manager_class.items():
             mgr = cls(
                 self._mdib.sdc_definitions,
@@ -351,6 +364,7 @@ class SdcProvider:
                 self._soap_client_pool,
                 self._max_subscription_duration,
                 log_prefix=self._log_prefix,
+                **scheduler_kwargs,
             )
             self._subscriptions_managers[name] = mgr
 
@@ -545,6 +559,7 @@ class SdcProvider:
                 self._mdib,
                 self.hosted_services,
                 periodic_reports_interval,
+                scheduler=self._scheduler,
             )
             self._periodic_reports_handler.start()
         else:
@@ -627,23 +642,57 @@ class SdcProvider:
             self._logger.info('epr "%s" not known in self._wsdiscovery', self.epr_urn)
         for role in self.product_lookup.values():
             role.stop()
-        if self._is_internal_http_server and self._http_server is not None:
-            self._http_server.stop()
-        self._soap_client_pool.close_all()
+        if self._http_server is not None:
+            if self._is_internal_http_server:
+                self._http_server.stop()
+            else:
+                # a shared http server keeps running, the path can be used again
+                self._http_server.dispatcher.unregister_instance(self.path_prefix)
+        if self._is_internal_soap_client_pool:
+            self._soap_client_pool.close_all()
 
     def start_rt_sample_loop(self):
-        """Start generating waveform data."""
+        """Start generating waveform data.
+
+        With a scheduler the waveform provider is called by a job every collect_rt_samples_period seconds,
+        otherwise the waveform provider runs its own loop.
+        If the waveform provider has an interval_controller (see GenericWaveformProvider.enable_adaptive_interval),
+        the job uses the interval of the controller instead.
+        """
         if self.waveform_provider is None:
             raise ApiUsageError('no waveform provider configured.')
-        if self.waveform_provider.is_running:
+        if self.waveform_provider.is_running or self._rt_sample_job is not None:
             raise ApiUsageError('realtime send loop already started')
-        self.waveform_provider.start()
+        if self._scheduler is None:
+            self.waveform_provider.start()
+        else:
+            controller = getattr(self.waveform_provider, 'interval_controller', None)
+            self._rt_sample_job = self._scheduler.add_job(
+                self._update_rt_samples,
+                self.collect_rt_samples_period if controller is None else controller.interval,
+                name=f'{self._log_prefix}rt samples',
+            )
 
     def stop_realtime_sample_loop(self):
         """Stop generating waveform data."""
+        if self._rt_sample_job is not None:
+            self._rt_sample_job.cancel()
+            self._rt_sample_job = None
         if self.waveform_provider is not None and self.waveform_provider.is_running:
             self.waveform_provider.stop()
 
+    def _update_rt_samples(self):
+        start = time.perf_counter()
+        updated_entities = self.waveform_provider.update_all_realtime_samples()
+        with self._mdib.rt_sample_state_transaction() as transaction:
+            transaction.write_entities(updated_entities)
+        # the worker thread of the waveform provider is not used, the job applies the adaptive interval
+        controller = getattr(self.waveform_provider, 'interval_controller', None)
+        job = self._rt_sample_job
+        if controller is not None and job is not None:
+            job.period = controller.update(time.perf_counter() - start, job.delay)
+            self.waveform_provider.notifications_interval = job.period
+
     def get_xaddrs(self) -> list[str]:
         """Return the addresses of the provider."""
         addr = self._alternative_hostname or self._wsdiscovery.active_address
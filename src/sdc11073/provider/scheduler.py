@@ -0,0 +1,149 @@
+"""A scheduler that runs the periodic jobs of many providers in a single thread.
+
+A provider that runs alone has own threads for periodic reports, waveforms and subscription housekeeping.
+With many providers in one process (see SdcProviderHost) these threads are replaced by jobs of one Scheduler.
+All jobs run sequentially in the scheduler thread, a job must therefore not block for a long time.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from sdc11073 import loghelper
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class ScheduledJob:
+    """A periodic job of a Scheduler.
+
+    The period can be changed while the job is scheduled, the new period is used for the next run.
+    """
+
+    def __init__(self, func: Callable[[], None], period: float, name: str):
+        self.func = func
+        self.period = period
+        self.name = name
+        self.runs = 0
+        self.skipped_runs = 0  # runs that were skipped because the scheduler was behind schedule
+        self.delay = 0.0  # seconds the current or last run started after its due time
+        self.cancelled = False
+
+    def cancel(self):
+        """Do not run the job again. A currently running job is not interrupted."""
+        self.cancelled = True
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__} {self.name} period={self.period}'
+
+
+class Scheduler:
+    """Run periodic jobs in one thread.
+
+    If the scheduler is behind schedule, missed runs of a job are skipped and not executed later.
+    """
+
+    def __init__(self, name: str = 'sdc_scheduler', log_prefix: str = ''):
+        self._name = name
+        self._logger = loghelper.get_logger_adapter('sdc.device.scheduler', log_prefix)
+        self._heap: list[tuple[float, int, ScheduledJob]] = []  # (due time, sequence number, job)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._run = False
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if the scheduler thread is running."""
+        return self._thread is not None
+
+    def start(self):
+        """Start the scheduler thread."""
+        if self._thread is not None:
+            return
+        self._run = True
+        self._thread = threading.Thread(target=self._run_jobs, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread and forget all jobs."""
+        if self._thread is None:
+            return
+        with self._condition:
+            self._run = False
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        with self._condition:
+            del self._heap[:]
+
+    def add_job(
+        self,
+        func: Callable[[], None],
+        period: float,
+        start_delay: float | None = None,
+        name: str | None = None,
+    ) -> ScheduledJob:
+        """Call func every period seconds until the returned job is cancelled.
+
+        :param func: the callable, exceptions are logged and do not stop the job
+        :param period: the interval in seconds
+        :param start_delay: delay of the first run in seconds, default is one period
+        :param name: name of the job for logging, default is the name of func
+        """
+        if period <= 0:
+            msg = f'period must be positive, got {period}'
+            raise ValueError(msg)
+        job = ScheduledJob(func, period, name or getattr(func, '__qualname__', repr(func)))
+        due = time.monotonic() + (period if start_delay is None else start_delay)
+        self._push(due, job)
+        return job
+
+    def _push(self, due: float, job: ScheduledJob):
+        with self._condition:
+            entry = (due, next(self._sequence), job)
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                # the new entry is the next one that is due => wake up scheduler thread
+                self._condition.notify()
+
+    def _run_jobs(self):
+        self._logger.info('scheduler {} started', self._name)  # noqa: PLE1205
+        while True:
+            with self._condition:
+                if not self._run:
+                    break
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                due, _, job = self._heap[0]
+                timeout = due - time.monotonic()
+                if timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+                heapq.heappop(self._heap)
+            if job.cancelled:
+                continue
+            job.delay = time.monotonic() - due
+            try:
+                job.func()
+            except Exception:
+                self._logger.exception('scheduled job {} failed', job)  # noqa: PLE1205
+            job.runs += 1
+            if job.cancelled:
+                continue
+            next_due = due + job.period
+            now = time.monotonic()
+            if next_due <= now:
+                # behind schedule: skip the missed runs, keep the phase of the job
+                skipped = int((now - next_due) / job.period) + 1
+                job.skipped_runs += skipped
+                next_due += skipped * job.period
+            self._push(next_due, job)
+        self._logger.info('scheduler {} stopped', self._name)  # noqa: PLE1205
@@ -12,11 +12,14 @@ otherwise it would not get informed about progress.
 
 from __future__ import annotations
 
+import bisect
+import dataclasses
 import queue
 import threading
 import time
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from collections import deque
+from typing import TYPE_CHECKING, Any
 
 from sdc11073 import loghelper
 from sdc11073.exceptions import ApiUsageError
@@ -33,26 +36,169 @@ if TYPE_CHECKING:
     from .porttypes.setserviceimpl import SetServiceProtocol
 
 
-class _OperationsWorker(threading.Thread):
-    """Thread that enqueues and processes all operations.
+DEFAULT_LATENCY_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)  # seconds
+DEFAULT_QUEUE_DEPTH_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
 
-    Progress notifications are sent via subscription manager.
+
+@dataclasses.dataclass
+class Histogram:
+    """Counts values in buckets.
+
+    counts[i] is the number of values <= bounds[i] (and > bounds[i-1]), the last element of counts is the number
+    of values > bounds[-1].
     """
 
-    def __init__(
+    bounds: tuple[float, ...]
+    counts: list[int] = dataclasses.field(default_factory=list)
+    count: int = 0
+    sum: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def add(self, value: float):
+        """Add a value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    @property
+    def avg(self) -> float | None:
+        """Return the average of all values."""
+        if self.count == 0:
+            return None
+        return self.sum / self.count
+
+    def copy(self) -> Histogram:
+        """Return a copy that is not modified by later calls of add."""
+        return dataclasses.replace(self, counts=list(self.counts))
+
+
+@dataclasses.dataclass
+class OperationsStatistics:
+    """Statistics of the delayed operations of a ScoOperationsRegistry."""
+
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    processed: int = 0
+    failed: int = 0
+    queue_depth_histogram: Histogram = dataclasses.field(
+        default_factory=lambda: Histogram(DEFAULT_QUEUE_DEPTH_BOUNDS))  # queue depth seen by new operations
+    latency_histogram: Histogram = dataclasses.field(
+        default_factory=lambda: Histogram(DEFAULT_LATENCY_BOUNDS))  # time from enqueue until final invocation state
+
+    def copy(self) -> OperationsStatistics:
+        """Return a copy that is not modified by later operations."""
+        return dataclasses.replace(self,
+                                   queue_depth_histogram=self.queue_depth_histogram.copy(),
+                                   latency_histogram=self.latency_histogram.copy())
+
+
+@dataclasses.dataclass
+class _QueueEntry:
+    operation: OperationDefinitionBase
+    request: ReceivedSoapMessage
+    operation_request: AbstractSet
+    transaction_id: int
+    enqueued: float
+
+
+class _Lane:
+    """Operations with the same operation target, only one worker at a time processes entries of a lane."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.entries: deque[_QueueEntry] = deque()
+        self.busy = False  # a worker is processing an entry of this lane
+        self.scheduled = False  # lane is in the list of ready lanes
+
+
+class _NotificationSender(threading.Thread):
+    """Thread that sends OperationInvokedReports in the order they were requested."""
+
+    def __init__(self, set_service: SetServiceProtocol, log_prefix: str):
+        super().__init__(name='DeviceOperationsNotifier')
+        self.daemon = True
+        self._set_service = set_service
+        self._queue = queue.SimpleQueue()
+        self._logger = loghelper.get_logger_adapter('sdc.device.op_worker', log_prefix)
+
+    def notify_operation(self, *args: Any, **kwargs: Any):
+        """Enqueue a call of set_service.notify_operation and return immediately."""
+        self._queue.put((args, kwargs))
+
+    def run(self):
+        while True:
+            from_queue = self._queue.get()
+            if from_queue is None:
+                self._logger.info('stop request found. Terminating now.')
+                return
+            args, kwargs = from_queue
+            try:
+                self._set_service.notify_operation(*args, **kwargs)
+            except Exception:
+                self._logger.exception('%s: unexpected error while sending notification', self.__class__.__name__)
+
+    def stop(self):
+        self._queue.put(None)  # pending notifications are sent before the thread terminates
+        self.join(timeout=1)
+
+
+class _OperationsWorkerPool:
+    """Worker threads that process all delayed operations.
+
+    Operations are sorted into lanes by their operation target. Operations with the same target are executed one
+    after the other in the order they were enqueued, operations with different targets are executed in parallel if
+    worker_count > 1.
+    Progress notifications are sent via subscription manager, either directly by the worker thread or by a
+    separate notification thread if async_notifications is True.
+    """
+
+    def __init__(  # noqa: PLR0913
         self,
         operations_registry: AbstractScoOperationsRegistry,
         set_service: SetServiceProtocol,
         mdib: ProviderMdib,
         log_prefix: str,
+        worker_count: int = 1,
+        max_queue_size: int = 10,
+        enqueue_timeout: float = 1.0,
+        async_notifications: bool = False,
     ):
-        super().__init__(name='DeviceOperationsWorker')
-        self.daemon = True
         self._operations_registry = operations_registry
         self._set_service: SetServiceProtocol = set_service
         self._mdib = mdib
-        self._operations_queue = queue.Queue(10)  # spooled operations
+        self._max_queue_size = max_queue_size
+        self._enqueue_timeout = enqueue_timeout
         self._logger = loghelper.get_logger_adapter('sdc.device.op_worker', log_prefix)
+        self._lanes: dict[str, _Lane] = {}
+        self._ready_lanes: deque[_Lane] = deque()
+        self._queue_depth = 0
+        self._stopping = False
+        self._last_timeout_check = time.monotonic()
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._space_available = threading.Condition(self._lock)
+        self._statistics = OperationsStatistics()
+        self._notification_sender = _NotificationSender(set_service, log_prefix) if async_notifications else None
+        self._notify_operation = (self._notification_sender.notify_operation if async_notifications
+                                  else set_service.notify_operation)
+        self._workers = [threading.Thread(target=self._run, name=f'DeviceOperationsWorker_{i}', daemon=True)
+                         for i in range(worker_count)]
+
+    def start(self):
+        if self._notification_sender is not None:
+            self._notification_sender.start()
+        for worker in self._workers:
+            worker.start()
+
+    def get_statistics(self) -> OperationsStatistics:
+        """Return a copy of the statistics."""
+        with self._lock:
+            return self._statistics.copy()
 
     def enqueue_operation(
         self,
@@ -61,66 +207,140 @@ class _OperationsWorker(threading.Thread):
         operation_request: AbstractSet,
         transaction_id: int,
     ):
-        """Enqueue operation."""
-        self._operations_queue.put((transaction_id, operation, request, operation_request), timeout=1)
-
-    def run(self):
+        """Enqueue operation.
+
+        :raises queue.Full: if the queue is still full after enqueue_timeout seconds.
+        """
+        entry = _QueueEntry(operation, request, operation_request, transaction_id, time.monotonic())
+        with self._lock:
+            if not self._space_available.wait_for(lambda: self._queue_depth < self._max_queue_size,
+                                                  timeout=self._enqueue_timeout):
+                raise queue.Full
+            self._statistics.queue_depth_histogram.add(self._queue_depth)
+            key = operation.operation_target_handle
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = _Lane(key)
+                self._lanes[key] = lane
+            lane.entries.append(entry)
+            self._queue_depth += 1
+            self._statistics.queue_depth = self._queue_depth
+            self._statistics.max_queue_depth = max(self._statistics.max_queue_depth, self._queue_depth)
+            self._schedule_lane(lane)
+
+    def _schedule_lane(self, lane: _Lane):
+        """Add lane to ready lanes if it has entries and no worker is processing it. Call only with lock acquired."""
+        if lane.entries and not lane.busy and not lane.scheduled:
+            lane.scheduled = True
+            self._ready_lanes.append(lane)
+            self._work_available.notify()
+
+    def _next_entry(self) -> tuple[_Lane, _QueueEntry] | None:
+        """Wait for the next entry to process.
+
+        :return: None if the pool is stopping or invocation timeouts shall be checked.
+        """
+        with self._lock:
+            self._work_available.wait_for(lambda: self._ready_lanes or self._stopping, timeout=1.0)
+            if not self._ready_lanes:
+                return None
+            lane = self._ready_lanes.popleft()
+            lane.scheduled = False
+            lane.busy = True
+            entry = lane.entries.popleft()
+            self._queue_depth -= 1
+            self._statistics.queue_depth = self._queue_depth
+            self._space_available.notify()
+            return lane, entry
+
+    def _run(self):
         while True:
             try:
-                try:
-                    from_queue = self._operations_queue.get(timeout=1.0)
-                except queue.Empty:
-                    self._operations_registry.check_invocation_timeouts()
-                else:
-                    if from_queue == 'stop_sco':
-                        self._logger.info('stop request found. Terminating now.')
+                next_entry = self._next_entry()
+                self._check_invocation_timeouts()
+                if next_entry is None:
+                    if self._stopping:
                         return
-                    tr_id, operation, request, operation_request = from_queue  # unpack tuple
-                    time.sleep(0.001)
-                    self._logger.info(
-                        '%s: starting operation "%s" argument=%r',
-                        operation.__class__.__name__,
-                        operation.handle,
-                        operation_request.argument,
-                    )
-                    # duplicate the WAIT response to the operation request as notification. Standard requires this.
-                    self._set_service.notify_operation(
-                        operation, tr_id, InvocationState.WAIT, self._mdib.mdib_version_group
-                    )
-                    time.sleep(0.001)  # not really necessary, but in real world there might also be some delay.
-                    self._set_service.notify_operation(
-                        operation, tr_id, InvocationState.START, self._mdib.mdib_version_group
-                    )
-                    try:
-                        execute_result = operation.execute_operation(request, operation_request)
-                        self._logger.info(
-                            '%s: successfully finished operation "%s"', operation.__class__.__name__, operation.handle
-                        )
-                        self._set_service.notify_operation(
-                            operation,
-                            tr_id,
-                            execute_result.invocation_state,
-                            self._mdib.mdib_version_group,
-                            execute_result.operation_target_handle,
-                        )
-                    except Exception as ex:
-                        self._logger.exception(
-                            '%s: error executing operation "%s"', operation.__class__.__name__, operation.handle
-                        )
-                        self._set_service.notify_operation(
-                            operation,
-                            tr_id,
-                            InvocationState.FAILED,
-                            self._mdib.mdib_version_group,
-                            error=InvocationError.OTHER,
-                            error_message=repr(ex),
-                        )
-            except Exception:  # noqa: PERF203
+                    continue
+                self._process(*next_entry)
+            except Exception:
                 self._logger.exception('%s: unexpected error while handling operation', self.__class__.__name__)
 
+    def _check_invocation_timeouts(self):
+        """Check invocation timeouts, at most once per second over all workers."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_timeout_check < 1.0:
+                return
+            self._last_timeout_check = now
+        self._operations_registry.check_invocation_timeouts()
+
+    def _process(self, lane: _Lane, entry: _QueueEntry):
+        """Execute the entry and release the lane, also if sending a notification raises an exception."""
+        success = False
+        try:
+            success = self._execute(entry)
+        finally:
+            latency = time.monotonic() - entry.enqueued
+            with self._lock:
+                lane.busy = False
+                self._statistics.processed += 1
+                if not success:
+                    self._statistics.failed += 1
+                self._statistics.latency_histogram.add(latency)
+                if lane.entries:
+                    self._schedule_lane(lane)
+                else:
+                    del self._lanes[lane.key]
+
+    def _execute(self, entry: _QueueEntry) -> bool:
+        operation = entry.operation
+        tr_id = entry.transaction_id
+        self._logger.info(
+            '%s: starting operation "%s" argument=%r',
+            operation.__class__.__name__,
+            operation.handle,
+            entry.operation_request.argument,
+        )
+        # duplicate the WAIT response to the operation request as notification. Standard requires this.
+        self._notify_operation(operation, tr_id, InvocationState.WAIT, self._mdib.mdib_version_group)
+        self._notify_operation(operation, tr_id, InvocationState.START, self._mdib.mdib_version_group)
+        try:
+            execute_result = operation.execute_operation(entry.request, entry.operation_request)
+        except Exception as ex:
+            self._logger.exception(
+                '%s: error executing operation "%s"', operation.__class__.__name__, operation.handle
+            )
+            self._notify_operation(
+                operation,
+                tr_id,
+                InvocationState.FAILED,
+                self._mdib.mdib_version_group,
+                error=InvocationError.OTHER,
+                error_message=repr(ex),
+            )
+            return False
+        self._logger.info(
+            '%s: successfully finished operation "%s"', operation.__class__.__name__, operation.handle
+        )
+        self._notify_operation(
+            operation,
+            tr_id,
+            execute_result.invocation_state,
+            self._mdib.mdib_version_group,
+            execute_result.operation_target_handle,
+        )
+        return True
+
     def stop(self):
-        self._operations_queue.put('stop_sco')  # a dummy request to stop the thread
-        self.join(timeout=1)
+        """Stop the worker threads after all enqueued operations are processed."""
+        with self._lock:
+            self._stopping = True
+            self._work_available.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=1)
+        if self._notification_sender is not None:
+            self._notification_sender.stop()
 
 
 class AbstractScoOperationsRegistry(ABC):
@@ -188,8 +408,52 @@ class ScoOperationsRegistry(AbstractScoOperationsRegistry):
     NOTE - In modular systems, dynamically plugged-in modules would typically be modeled as VMDs.
     Such VMDs potentially have their own SCO.
     In every other case, SCO operations are modeled in pm:MdsDescriptor/pm:Sco.
+
+    Delayed operations are executed by worker_count worker threads. Operations with the same operation target are
+    executed in the order they were received, operations with different targets can run in parallel.
+    The provider instantiates the class with the arguments of AbstractScoOperationsRegistry only, use
+    functools.partial or a derived class as sco_operations_registry_class to configure the other parameters.
     """
 
+    def __init__(  # noqa: PLR0913
+        self,
+        set_service: SetServiceProtocol,
+        operation_cls_getter: OperationClassGetter,
+        mdib: ProviderMdib,
+        sco_descriptor_container: AbstractDescriptorProtocol,
+        log_prefix: str | None = None,
+        worker_count: int = 1,
+        max_queue_size: int = 10,
+        enqueue_timeout: float = 1.0,
+        async_notifications: bool = False,
+    ):
+        """Construct a ScoOperationsRegistry.
+
+        :param set_service: sends the OperationInvokedReports
+        :param operation_cls_getter: a function that returns the operation class for an operation descriptor
+        :param mdib: the provider mdib
+        :param sco_descriptor_container: the sco descriptor
+        :param log_prefix: prefix for logging
+        :param worker_count: number of worker threads for delayed operations
+        :param max_queue_size: max. number of enqueued delayed operations
+        :param enqueue_timeout: max. time in seconds to wait for space in the queue before an operation is rejected
+        :param async_notifications: if True, the OperationInvokedReports of delayed operations are sent by a separate
+                                    thread, workers do not wait until all subscribers received them
+        """
+        super().__init__(set_service, operation_cls_getter, mdib, sco_descriptor_container, log_prefix)
+        self._worker_count = worker_count
+        self._max_queue_size = max_queue_size
+        self._enqueue_timeout = enqueue_timeout
+        self._async_notifications = async_notifications
+        self._statistics = OperationsStatistics()
+
+    def get_statistics(self) -> OperationsStatistics:
+        """Return a copy of the statistics of delayed operations."""
+        worker = self._worker
+        if worker is not None:
+            return worker.get_statistics()
+        return self._statistics.copy()
+
     def register_operation(self, operation: OperationDefinitionBase):
         """Register the operation."""
         if operation.handle in self._registered_operations:
@@ -245,14 +509,19 @@ class ScoOperationsRegistry(AbstractScoOperationsRegistry):
         return InvocationState.FINISHED
 
     def start_worker(self):
-        """Start worker thread."""
+        """Start worker threads."""
         if self._worker is not None:
             raise ApiUsageError('SCO worker is already running')
-        self._worker = _OperationsWorker(self, self._set_service, self._mdib, self._log_prefix)
+        self._worker = _OperationsWorkerPool(self, self._set_service, self._mdib, self._log_prefix,
+                                             worker_count=self._worker_count,
+                                             max_queue_size=self._max_queue_size,
+                                             enqueue_timeout=self._enqueue_timeout,
+                                             async_notifications=self._async_notifications)
         self._worker.start()
 
     def stop_worker(self):
-        """Stop worker thread."""
+        """Stop worker threads."""
         if self._worker is not None:
             self._worker.stop()
+            self._statistics = self._worker.get_statistics()
             self._worker = None
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import time
 import traceback
 from collections import defaultdict
@@ -23,12 +24,14 @@ from .subscriptionmgr_base import ActionBasedSubscription, RoundTripData, Subscr
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Iterable
+    from concurrent.futures import Future
     from logging import LoggerAdapter
 
     from sdc11073 import xml_utils
     from sdc11073.definitions_base import BaseDefinitions
     from sdc11073.dispatch import RequestData
     from sdc11073.mdib.mdibbase import MdibVersionGroup
+    from sdc11073.provider.scheduler import Scheduler
     from sdc11073.pysoap.msgfactory import MessageFactory
     from sdc11073.pysoap.msgreader import ReceivedMessage
     from sdc11073.pysoap.soapclientpool import SoapClientPool
@@ -47,8 +50,18 @@ def _mk_dispatch_identifier(reference_parameters: list, path_suffix: str) -> tup
 class BicepsSubscriptionAsync(ActionBasedSubscription):
     """Async version of a single BICEPS subscription. It is used by BICEPSSubscriptionsManagerBaseAsync."""
 
+    def __init__(self, *args, **kwargs):  # noqa: ANN002, ANN003
+        super().__init__(*args, **kwargs)
+        # notifications are sent one after the other in the order they were handed to the event loop,
+        # also if the sender does not wait until a notification was sent.
+        self._send_lock = asyncio.Lock()
+
     async def async_send_notification_report(self, body_node: xml_utils.LxmlElement, action: str):
         """Send notification to subscriber."""
+        async with self._send_lock:
+            await self._async_send_notification_report(body_node, action)
+
+    async def _async_send_notification_report(self, body_node: xml_utils.LxmlElement, action: str):
         if not self.is_valid or self.unsubscribed_at is not None:
             return
         addr = HeaderInformationBlock(
@@ -142,10 +155,16 @@ class AsyncioEventLoopThread(Thread):
 
     def run_coro(self, coro: Awaitable) -> Any:
         """Run threadsafe."""
+        future = self.submit_coro(coro)
+        return None if future is None else future.result()
+
+    def submit_coro(self, coro: Awaitable) -> Future | None:
+        """Run threadsafe without waiting for the result."""
         if not self._running:
             self._logger.error('%s: async thread is not running', self.__class__.__name__)
+            coro.close()
             return None
-        return asyncio.run_coroutine_threadsafe(coro, loop=self.loop).result()
+        return asyncio.run_coroutine_threadsafe(coro, loop=self.loop)
 
     def stop(self):
         """Stop thread."""
@@ -163,6 +182,8 @@ class BICEPSSubscriptionsManagerBaseAsync(SubscriptionsManagerBase):
     First all notifications are sent, then all http responses are collected.
     This saves a lot of time compared to the synchronous version that sends the notification to the first subscriber,
     waits for the response, then sends the notification to the second subscriber, and so on.
+    With a scheduler (shared by many providers) send_to_subscribers does not wait for the responses, a slow or
+    unresponsive subscriber would otherwise block the scheduler thread and with it all providers.
     """
 
     def __init__(
@@ -172,8 +193,11 @@ class BICEPSSubscriptionsManagerBaseAsync(SubscriptionsManagerBase):
         soap_client_pool: SoapClientPool,
         max_subscription_duration: float | None = None,
         log_prefix: str | None = None,
+        scheduler: Scheduler | None = None,
     ):
-        super().__init__(sdc_definitions, msg_factory, soap_client_pool, max_subscription_duration, log_prefix)
+        super().__init__(
+            sdc_definitions, msg_factory, soap_client_pool, max_subscription_duration, log_prefix, scheduler=scheduler
+        )
         if soap_client_pool.async_loop_subscr_mgr is None:
             thr = AsyncioEventLoopThread(name='async_loop_subscr_mgr', logger=self._logger)
             soap_client_pool.async_loop_subscr_mgr = thr
@@ -186,6 +210,7 @@ class BICEPSSubscriptionsManagerBaseAsync(SubscriptionsManagerBase):
             if not thr.running:
                 raise RuntimeError('could not start AsyncioEventLoopThread')
         self._async_send_thread = soap_client_pool.async_loop_subscr_mgr
+        self._wait_for_sent_notifications = scheduler is None
 
     def _mk_subscription_instance(self, request_data: RequestData) -> BicepsSubscriptionAsync:
         subscribe_request = evt_types.Subscribe.from_node(request_data.message_data.p_msg.msg_node)
@@ -249,16 +274,29 @@ class BICEPSSubscriptionsManagerBaseAsync(SubscriptionsManagerBase):
             for subscriber in subscribers:
                 tasks.append(self._async_send_notification_report(subscriber, body_node, action))  # noqa: PERF401
 
-            self._logger.debug('sending report %s to %r', action, [s.notify_to_address for s in subscribers])
-            result = self._async_send_thread.run_coro(self._coro_send_to_subscribers(tasks))
-            if result is None:
+            if self._logger.is_debug:
+                self._logger.debug('sending report %s to %r', action, [s.notify_to_address for s in subscribers])
+            future = self._async_send_thread.submit_coro(self._coro_send_to_subscribers(tasks))
+            if future is None:
                 self._logger.info('could not send notifications, async send loop is not running.')
                 return
-            for counter, element in enumerate(result):
-                if isinstance(element, Exception):
-                    self._logger.warning(  # noqa: PLE1205
-                        '{}: _send_to_subscribers {} returned {}', action, subscribers[counter], element
-                    )
+        if self._wait_for_sent_notifications:
+            self._handle_send_results(action, subscribers, future)
+        else:
+            future.add_done_callback(functools.partial(self._handle_send_results, action, subscribers))
+
+    def _handle_send_results(self, action: str, subscribers: list[BicepsSubscriptionAsync], future: Future):
+        """Log failed notifications and let housekeeping check the subscriptions with delivery failures."""
+        if future.cancelled():  # event loop was stopped
+            return
+        for counter, element in enumerate(future.result()):
+            if isinstance(element, Exception):
+                self._logger.warning(  # noqa: PLE1205
+                    '{}: _send_to_subscribers {} returned {}', action, subscribers[counter], element
+                )
+        for subscriber in subscribers:
+            if subscriber.has_delivery_failure:
+                self._schedule_delivery_failure_eviction(subscriber)
 
     async def _async_send_notification_report(
         self, subscription: BicepsSubscriptionAsync, body_node: xml_utils.LxmlElement, action: str
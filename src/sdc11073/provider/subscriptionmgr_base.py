@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import dataclasses
+import heapq
 import http.client
+import itertools
 import time
 import uuid
 from collections import deque
-from threading import Thread
+from threading import Condition, Thread
 from typing import TYPE_CHECKING, Any, Protocol
 from urllib.parse import urlparse
 
@@ -29,6 +32,7 @@ if TYPE_CHECKING:
     from sdc11073.definitions_base import BaseDefinitions
     from sdc11073.dispatch import RequestData
     from sdc11073.mdib.mdibbase import MdibVersionGroup
+    from sdc11073.provider.scheduler import ScheduledJob, Scheduler
     from sdc11073.pysoap.msgfactory import CreatedMessage, MessageFactory
     from sdc11073.pysoap.soapclientpool import SoapClientPool
 
@@ -122,6 +126,7 @@ class SubscriptionBase:
         self._max_subscription_duration = max_subscription_duration
         self._started = None
         self._expire_seconds = None
+        self.generation = 0  # incremented on every renew, used by housekeeping to detect renewed subscriptions
         self.renew(subscribe_request.Expires)  # sets self._started and self._expire_seconds
         self._accepted_encodings = accepted_encodings
 
@@ -143,6 +148,7 @@ class SubscriptionBase:
     def renew(self, expires: float | None):
         """Renew a subscription."""
         self._started = time.monotonic()
+        self.generation += 1
         if expires:
             self._expire_seconds = min(expires, self._max_subscription_duration)
         else:
@@ -172,6 +178,11 @@ class SubscriptionBase:
         duration = round(self._expire_seconds - (time.monotonic() - self._started), 2)
         return max(duration, 0)
 
+    @property
+    def expires_at(self) -> float:
+        """Get the point in time (time.monotonic) when the subscription expires."""
+        return self._started + self._expire_seconds
+
     @property
     def expire_string(self) -> str:
         """Get a duration string until invalid subscription."""
@@ -306,6 +317,55 @@ class ActionBasedSubscription(SubscriptionBase):
         )
 
 
+class _SubscriptionsLookup(multikey.MultiKeyLookup):
+    """MultiKeyLookup for subscriptions that additionally maintains an action index.
+
+    The action index maps an action string to an immutable tuple of all subscriptions that match this action.
+    Tuples are calculated on first access and the whole index is discarded whenever a subscription is added or
+    removed, so that the send path only needs a single dictionary lookup without acquiring the lock.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._subscriptions_by_action: dict[str, tuple[SubscriptionBase, ...]] = {}
+
+    def _mk_indices(self, obj: SubscriptionBase):
+        super()._mk_indices(obj)
+        self._subscriptions_by_action = {}
+
+    def _rm_indices(self, obj: SubscriptionBase):
+        super()._rm_indices(obj)
+        self._subscriptions_by_action = {}
+
+    def clear(self):
+        """Remove all objects from table."""
+        with self._lock:
+            super().clear()
+            self._subscriptions_by_action = {}
+
+    def get_for_action(self, action: str) -> tuple[SubscriptionBase, ...]:
+        """Return a snapshot of all subscriptions that match action."""
+        subscriptions = self._subscriptions_by_action.get(action)
+        if subscriptions is not None:
+            return subscriptions
+        with self._lock:
+            subscriptions_by_action = self._subscriptions_by_action
+            subscriptions = subscriptions_by_action.get(action)
+            if subscriptions is None:
+                subscriptions = tuple(s for s in self._objects if s.matches(action))
+                subscriptions_by_action[action] = subscriptions
+            return subscriptions
+
+
+@dataclasses.dataclass
+class HousekeepingCounters:
+    """Counters of the subscription housekeeping."""
+
+    expirations: int = 0
+    renewals: int = 0
+    delivery_failure_evictions: int = 0
+
+
 class SubscriptionManagerProtocol(Protocol):
     """Methods of a subscription manager."""
 
@@ -338,6 +398,7 @@ class SubscriptionsManagerBase:
     """Base class for subscription manager."""
 
     DEFAULT_MAX_SUBSCR_DURATION = 7200  # max. possible duration of a subscription
+    HOUSEKEEPING_INTERVAL = 1.0  # period of the housekeeping job if a scheduler is used
     # observable has tuple(action, mdib_version_group, body_node)
     sent_to_subscribers = observableproperties.ObservableProperty(fire_only_on_changed_value=False)
 
@@ -348,13 +409,18 @@ class SubscriptionsManagerBase:
         soap_client_pool: SoapClientPool,
         max_subscription_duration: float | None = None,
         log_prefix: str | None = None,
+        scheduler: Scheduler | None = None,
     ):
+        """Construct a subscriptions manager.
+
+        :param scheduler: if provided, housekeeping is a job of the scheduler instead of an own thread.
+        """
         self.sdc_definitions = sdc_definitions
         self._msg_factory = msg_factory
         self._soap_client_pool: SoapClientPool = soap_client_pool
         self._logger = loghelper.get_logger_adapter('sdc.device.subscrMgr', log_prefix)
         self._max_subscription_duration = max_subscription_duration or self.DEFAULT_MAX_SUBSCR_DURATION
-        self._subscriptions = multikey.MultiKeyLookup()
+        self._subscriptions = _SubscriptionsLookup()
         self._subscriptions.add_index(
             'dispatch_identifier',
             multikey.UIndexDefinition(lambda obj: _mk_dispatch_identifier(obj.reference_parameters, obj.path_suffix)),
@@ -362,9 +428,23 @@ class SubscriptionsManagerBase:
         self._subscriptions.add_index('identifier', multikey.UIndexDefinition(lambda obj: obj.identifier_uuid.hex))
         self._subscriptions.add_index('netloc', multikey.IndexDefinition(lambda obj: obj.notify_to_url.netloc))
         self.base_urls: Sequence[urllib.parse.SplitResult] | None = None
-        self._housekeeping_thread = Thread(target=self._do_housekeeping, name='housekeeping', daemon=True)
-        self._run_housekeeping_thread = False
-        self._housekeeping_thread.start()
+        # heap of (due time, sequence number, subscription, generation) tuples.
+        # generation None means the subscription shall be checked for eviction at due time (unsubscribe, delivery
+        # failure), otherwise the entry is the expiry entry of the subscription.
+        self._expiry_heap: list[tuple[float, int, SubscriptionBase, int | None]] = []
+        self._expiry_heap_sequence = itertools.count()
+        # subscriptions with a delivery failure that have an entry in the expiry heap
+        self._delivery_failure_scheduled: set[SubscriptionBase] = set()
+        self._housekeeping_condition = Condition()
+        self._housekeeping_counters = HousekeepingCounters()
+        self._housekeeping_thread: Thread | None = None
+        self._housekeeping_job: ScheduledJob | None = None
+        self._run_housekeeping_thread = True
+        if scheduler is None:
+            self._housekeeping_thread = Thread(target=self._do_housekeeping, name='housekeeping', daemon=True)
+            self._housekeeping_thread.start()
+        else:
+            self._housekeeping_job = scheduler.add_job(self._housekeeping_step, self.HOUSEKEEPING_INTERVAL)
 
     def set_base_urls(self, base_urls: Sequence[urllib.parse.SplitResult]):
         """Set base url.
@@ -381,6 +461,7 @@ class SubscriptionsManagerBase:
         subscription = self._mk_subscription_instance(request_data)
         with self._subscriptions.lock:
             self._subscriptions.add_object(subscription)
+        self._schedule_housekeeping(subscription, subscription.expires_at, subscription.generation)
         self._logger.info('new {}', subscription)  # noqa: PLE1205
         return self._mk_subscribe_response_message(request_data, subscription, self.base_urls)
 
@@ -414,6 +495,7 @@ class SubscriptionsManagerBase:
             unsubscribe_response = evt_types.UnsubscribeResponse()
             response = self._msg_factory.mk_reply_soap_message(request_data, unsubscribe_response)
             subscription.unsubscribed_at = time.time()  # allow housekeeping to delete it delayed.
+            self._schedule_housekeeping(subscription, time.monotonic() + 1)
         return response
 
     def on_get_status_request(self, request_data: RequestData) -> CreatedMessage:
@@ -449,7 +531,9 @@ class SubscriptionsManagerBase:
             fault.add_reason_text('unknown Subscription identifier')
             response = self._msg_factory.mk_reply_soap_message(request_data, fault)
         else:
-            subscription.renew(expires)
+            subscription.renew(expires)  # housekeeping detects the renewal by the changed generation
+            with self._housekeeping_condition:
+                self._housekeeping_counters.renewals += 1
             renew_response = evt_types.RenewResponse()
             renew_response.Expires = subscription.remaining_seconds
             response = self._msg_factory.mk_reply_soap_message(request_data, renew_response)
@@ -460,11 +544,20 @@ class SubscriptionsManagerBase:
         self._logger.info('stop_all called')
         # stop housekeeping thread first to get it out of the way
         self._logger.debug('stop housekeeping thread')
-        self._run_housekeeping_thread = False
-        self._housekeeping_thread.join()
+        with self._housekeeping_condition:
+            self._run_housekeeping_thread = False
+            self._housekeeping_condition.notify()
+        if self._housekeeping_thread is not None:
+            self._housekeeping_thread.join()
+        if self._housekeeping_job is not None:
+            self._housekeeping_job.cancel()
         self._logger.debug('housekeeping thread stopped')
         self._logger.debug('end all subscriptions')
         self._end_all_subscriptions(send_subscription_end)
+        with self._housekeeping_condition:
+            # release the ended subscriptions
+            self._expiry_heap.clear()
+            self._delivery_failure_scheduled.clear()
 
     def _end_all_subscriptions(self, send_subscription_end: bool):
         # async variant has a different implementation!
@@ -512,6 +605,8 @@ class SubscriptionsManagerBase:
         for subscriber in subscribers:
             self._logger.debug('{}: sending report to {}', action, subscriber.notify_to_address)  # noqa: PLE1205
             self._send_notification_report(subscriber, body_node, action)
+            if subscriber.has_delivery_failure:
+                self._schedule_delivery_failure_eviction(subscriber)
 
     def _send_notification_report(self, subscription, body_node: xml_utils.LxmlElement, action: str):  # noqa: ANN001
         try:
@@ -541,25 +636,112 @@ class SubscriptionsManagerBase:
             self._logger.exception('could not send notification report for subscription: {}', subscription)  # noqa: PLE1205
             raise
 
-    def _get_subscriptions_for_action(self, action: str) -> list[Any]:
-        with self._subscriptions.lock:
-            return [s for s in self._subscriptions.objects if s.matches(action)]
+    def _get_subscriptions_for_action(self, action: str) -> tuple[Any, ...]:
+        return self._subscriptions.get_for_action(action)
+
+    @property
+    def housekeeping_counters(self) -> HousekeepingCounters:
+        """Return a copy of the current housekeeping counters."""
+        with self._housekeeping_condition:
+            return dataclasses.replace(self._housekeeping_counters)
+
+    def _schedule_housekeeping(self, subscription: SubscriptionBase, due: float, generation: int | None = None):
+        """Let housekeeping check subscription at due time (time.monotonic)."""
+        with self._housekeeping_condition:
+            entry = (due, next(self._expiry_heap_sequence), subscription, generation)
+            heapq.heappush(self._expiry_heap, entry)
+            if self._expiry_heap[0] is entry:
+                # the new entry is the next one that is due => wake up housekeeping thread
+                self._housekeeping_condition.notify()
+
+    def _schedule_delivery_failure_eviction(self, subscription: SubscriptionBase):
+        """Let housekeeping remove a subscription with delivery failure, only one heap entry per subscription."""
+        with self._housekeeping_condition:
+            if subscription in self._delivery_failure_scheduled:
+                return
+            self._delivery_failure_scheduled.add(subscription)
+            self._schedule_housekeeping(subscription, time.monotonic())
+
+    def _pop_obsolete_subscriptions(self) -> list[SubscriptionBase]:
+        """Pop all due entries from expiry heap and return the subscriptions that shall be removed.
+
+        Renewed subscriptions are detected by their generation and get re-scheduled.
+        Must be called with the housekeeping condition acquired.
+        """
+        obsolete_subscriptions = {}  # dict as ordered set, a subscription can have several due entries
+        now = time.monotonic()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, _, subscription, generation = heapq.heappop(self._expiry_heap)
+            if generation is None:
+                self._delivery_failure_scheduled.discard(subscription)
+            if subscription not in self._subscriptions.objects:
+                continue
+            if generation is None:
+                # unsubscribe or delivery failure
+                if subscription.unsubscribed_at is not None or not subscription.is_valid:
+                    obsolete_subscriptions[subscription] = None
+            elif generation != subscription.generation or subscription.expires_at > now:
+                # renewed in the meantime => this is the new expiry entry
+                heapq.heappush(
+                    self._expiry_heap,
+                    (subscription.expires_at, next(self._expiry_heap_sequence), subscription, subscription.generation),
+                )
+            else:
+                obsolete_subscriptions[subscription] = None
+        return list(obsolete_subscriptions)
 
     def _do_housekeeping(self):
-        """Remove expired or invalid subscriptions. Method is executed in a thread."""
-        self._run_housekeeping_thread = True
-        while self._run_housekeeping_thread:
-            time.sleep(1)
-            now = time.time()
-            with self._subscriptions.lock:
-                obsolete_subscriptions = [
-                    s
-                    for s in self._subscriptions.objects
-                    if not s.is_valid or (s.unsubscribed_at is not None and now > s.unsubscribed_at + 1)
-                ]
-
-                for obsolete_subscription in obsolete_subscriptions:
-                    if not obsolete_subscription.is_closed():
-                        obsolete_subscription.close_by_subscription_manager()
-
-                        self._subscriptions.remove_object(obsolete_subscription)
+        """Remove expired or invalid subscriptions. Method is executed in a thread.
+
+        The thread only wakes up when the next entry of the expiry heap is due or a new entry is scheduled.
+        """
+        while True:
+            with self._housekeeping_condition:
+                if not self._run_housekeeping_thread:
+                    return
+                obsolete_subscriptions = self._pop_obsolete_subscriptions()
+                if not obsolete_subscriptions:
+                    timeout = None
+                    if self._expiry_heap:
+                        timeout = max(self._expiry_heap[0][0] - time.monotonic(), 0)
+                    self._housekeeping_condition.wait(timeout)
+                    continue
+            self._remove_obsolete_subscriptions(obsolete_subscriptions)
+
+    def _housekeeping_step(self):
+        """Remove expired or invalid subscriptions. Method is executed periodically by a scheduler."""
+        with self._housekeeping_condition:
+            if not self._run_housekeeping_thread:
+                return
+            obsolete_subscriptions = self._pop_obsolete_subscriptions()
+        if obsolete_subscriptions:
+            self._remove_obsolete_subscriptions(obsolete_subscriptions)
+
+    def _remove_obsolete_subscriptions(self, obsolete_subscriptions: list[SubscriptionBase]):
+        with self._housekeeping_condition:
+            for obsolete_subscription in obsolete_subscriptions:
+                if obsolete_subscription.has_delivery_failure:
+                    self._housekeeping_counters.delivery_failure_evictions += 1
+                elif obsolete_subscription.unsubscribed_at is None:
+                    self._housekeeping_counters.expirations += 1
+        # do not hold the housekeeping condition while the subscriptions lock is acquired
+        with self._subscriptions.lock:
+            for obsolete_subscription in obsolete_subscriptions:
+                if not obsolete_subscription.is_closed():
+                    obsolete_subscription.close_by_subscription_manager()
+                self._subscriptions.remove_object(obsolete_subscription)
+        with self._housekeeping_condition:
+            self._compact_expiry_heap()
+
+    def _compact_expiry_heap(self):
+        """Drop the entries of removed subscriptions if they outnumber the live subscriptions.
+
+        Otherwise the expiry entry of an unsubscribed subscription would keep it alive until its expiry time.
+        Must be called with the housekeeping condition acquired.
+        """
+        live_subscriptions = self._subscriptions.objects
+        if len(self._expiry_heap) <= 2 * len(live_subscriptions):
+            return
+        self._expiry_heap[:] = [entry for entry in self._expiry_heap if entry[2] in live_subscriptions]
+        heapq.heapify(self._expiry_heap)
+        self._delivery_failure_scheduled.intersection_update(live_subscriptions)
@@ -11,7 +11,7 @@ from typing import TYPE_CHECKING
 from lxml import etree
 
 from sdc11073.exceptions import ValidationError
-from sdc11073.namespaces import QN_TYPE, default_ns_helper, text_to_qname
+from sdc11073.namespaces import QN_TYPE, QNameLookupCache, default_ns_helper
 from sdc11073.schema_resolver import mk_schema_validator
 from sdc11073.xml_types.addressing_types import HeaderInformationBlock
 
@@ -104,6 +104,9 @@ class MessageReader:
         self.ns_hlp = sdc_definitions.data_model.ns_helper
         self._validate = validate
         self._xml_schema: etree.XMLSchema = mk_schema_validator(self.schema_specs, self.ns_hlp)
+        # reports contain the same few types over and over, resolve xsi:type texts to classes with one dict lookup
+        self._descriptor_class_cache = QNameLookupCache(self.get_descriptor_container_class)
+        self._state_class_cache = QNameLookupCache(self.get_state_container_class)
 
     @property
     def msg_names(self) -> ModuleType:
@@ -226,8 +229,10 @@ class MessageReader:
     def _mk_descriptor_container_from_node(self, node: xml_utils.LxmlElement,
                                            parent_handle: str | None) -> AbstractDescriptorProtocol:
         node_type = node.get(QN_TYPE)
-        node_type = text_to_qname(node_type, node.nsmap) if node_type is not None else etree.QName(node.tag)
-        descr_cls = self.get_descriptor_container_class(node_type)
+        if node_type is not None:
+            descr_cls = self._descriptor_class_cache.get(node_type, node.nsmap)
+        else:
+            descr_cls = self.get_descriptor_container_class(etree.QName(node.tag))
         return descr_cls.from_node(node, parent_handle)
 
     def _mk_state_container_from_node(self, node: xml_utils.LxmlElement,
@@ -239,13 +244,12 @@ class MessageReader:
         """
         if forced_type is not None:
             node_type = forced_type
+            st_cls = self.get_state_container_class(node_type)
         else:
             node_type = node.get(QN_TYPE)
-            if node_type is not None:
-                node_type = text_to_qname(node_type, node.nsmap)
+            st_cls = None if node_type is None else self._state_class_cache.get(node_type, node.nsmap)
 
         descriptor_container = None
-        st_cls = self.get_state_container_class(node_type)
         if st_cls is None:
             msg = f'body type {node_type} is not known'
             raise ValueError(msg)
@@ -255,7 +259,6 @@ class MessageReader:
             node.tag = self.pm_names.State
         state = st_cls(descriptor_container)
         state.update_from_node(node)
-        state.node = node
         return state
 
     def _validate_node(self, node: xml_utils.LxmlElement):
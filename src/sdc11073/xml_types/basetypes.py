@@ -13,6 +13,9 @@ from .xml_structure import NodeStringProperty, NodeTextListProperty
 if TYPE_CHECKING:
     from sdc11073 import xml_utils
 
+# key = class, value = result of sorted_container_properties
+_sorted_container_properties = {}
+
 
 class StringEnum(str, enum.Enum):
 
@@ -59,8 +62,12 @@ class XMLTypeBase:
     def sorted_container_properties(self):
         """
         @return: a list of (name, object) tuples of all GenericProperties ( and subclasses)
-        list is created based on _props lists of classes
+        list is created based on _props lists of classes, once per class. Do not modify it.
         """
+        try:
+            return _sorted_container_properties[self.__class__]
+        except KeyError:
+            pass
         ret = []
         classes = inspect.getmro(self.__class__)
         for cls in reversed(classes):
@@ -72,6 +79,7 @@ class XMLTypeBase:
                 obj = getattr(cls, name)
                 if obj is not None:
                     ret.append((name, obj))
+        _sorted_container_properties[self.__class__] = ret
         return ret
 
     def __eq__(self, other):
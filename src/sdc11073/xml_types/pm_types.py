@@ -1454,18 +1454,30 @@ class ApprovedJurisdictions(PropertyBasedPMType):
     _props = ('ApprovedJurisdiction',)
 
 
-class ContainmentTreeEntry(PropertyBasedPMType):
+class _ContainmentTreeInfo(PropertyBasedPMType):
+    """Represents BICEPS ContainmentTreeInfo attribute group."""
+
+    HandleRef: str | None = cp.HandleRefAttributeProperty('HandleRef')
+    ParentHandleRef: str | None = cp.HandleRefAttributeProperty('ParentHandleRef')
+    EntryType: etree.QName | None = cp.QNameAttributeProperty('EntryType')
+    ChildrenCount: int | None = cp.IntegerAttributeProperty('ChildrenCount')
+    _props = ('HandleRef', 'ParentHandleRef', 'EntryType', 'ChildrenCount')
+
+
+class ContainmentTreeEntry(_ContainmentTreeInfo):
     """Represents BICEPS ContainmentTree/Entry."""
 
+    ExtExtension = cp.ExtensionNodeProperty(ext.Extension)
     Type: CodedValue | None = cp.SubElementProperty(pm.Type, value_class=CodedValue, is_optional=True)
-    _props = ('Type',)
+    _props = ('ExtExtension', 'Type')
 
 
-class ContainmentTree(PropertyBasedPMType):
+class ContainmentTree(_ContainmentTreeInfo):
     """Represents BICEPS ContainmentTree."""
 
+    ExtExtension = cp.ExtensionNodeProperty(ext.Extension)
     Entry: ContainmentTreeEntry = cp.SubElementListProperty(pm.Entry, value_class=ContainmentTreeEntry)
-    _props = ('Entry',)
+    _props = ('ExtExtension', 'Entry')
 
 
 # Technically, Retrievalibity belongs to msg_types, because it is defined in BICEPS message model.
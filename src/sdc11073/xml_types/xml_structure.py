@@ -18,7 +18,7 @@ from lxml import etree
 
 from sdc11073 import xml_utils
 from sdc11073.exceptions import ApiUsageError
-from sdc11073.namespaces import QN_TYPE, docname_from_qname, text_to_qname
+from sdc11073.namespaces import QN_TYPE, QNameLookupCache, docname_from_qname, text_to_qname
 from sdc11073.xml_types import isoduration
 from sdc11073.xml_types.dataconverters import (
     BooleanConverter,
@@ -1141,6 +1141,7 @@ class ContainerProperty(_ElementBase):
         self.value_class = value_class
         self._cls_getter = cls_getter
         self._ns_helper = ns_helper
+        self._cls_cache = QNameLookupCache(cls_getter)
 
     def get_py_value_from_node(self, instance: Any, node: xml_utils.LxmlElement) -> Any:  # noqa: ARG002
         """Read value from node."""
@@ -1149,8 +1150,7 @@ class ContainerProperty(_ElementBase):
             sub_node = self._get_element_by_child_name(node, self._sub_element_name, create_missing_nodes=False)
             node_type_str = sub_node.get(QN_TYPE)
             if node_type_str is not None:
-                node_type = text_to_qname(node_type_str, node.nsmap)
-                value_class = self._cls_getter(node_type)
+                value_class = self._cls_cache.get(node_type_str, node.nsmap)
             else:
                 value_class = self.value_class
             value = value_class.from_node(sub_node)
@@ -1281,6 +1281,7 @@ class ContainerListProperty(_ElementListProperty):
         self.value_class = value_class
         self._cls_getter = cls_getter
         self._ns_helper = ns_helper
+        self._cls_cache = QNameLookupCache(cls_getter)
 
     def get_py_value_from_node(self, instance: Any, node: xml_utils.LxmlElement) -> Any:  # noqa: ARG002
         """Read value from node."""
@@ -1290,8 +1291,7 @@ class ContainerListProperty(_ElementListProperty):
             for _node in nodes:
                 node_type_str = _node.get(QN_TYPE)
                 if node_type_str is not None:
-                    node_type = text_to_qname(node_type_str, _node.nsmap)
-                    value_class = self._cls_getter(node_type)
+                    value_class = self._cls_cache.get(node_type_str, _node.nsmap)
                 else:
                     value_class = self.value_class
                 value = value_class.from_node(_node)
@@ -9,6 +9,7 @@ from __future__ import annotations
 import logging
 import pathlib
 import threading
+from collections import Counter
 from decimal import Decimal
 from typing import TYPE_CHECKING
 from urllib.parse import SplitResult
@@ -16,7 +17,7 @@ from urllib.parse import SplitResult
 from lxml import etree
 from tutorial.productandroles.exampleproduct import EXAMPLE_ROLE_PROVIDER_COMPONENTS
 
-from sdc11073.mdib import ProviderMdib
+from sdc11073.mdib import ConsumerMdib, ProviderMdib
 from sdc11073.namespaces import default_ns_helper as ns_hlp
 from sdc11073.provider import SdcProvider
 from sdc11073.provider.subscriptionmgr import BicepsSubscription
@@ -33,6 +34,7 @@ if TYPE_CHECKING:
     import sdc11073.certloader
     from sdc11073.provider.providerimpl import RoleProviderComponents, SdcProviderComponents, WsDiscoveryProtocol
     from sdc11073.pysoap.msgfactory import MessageFactory
+    from sdc11073.pysoap.msgreader import ReceivedMessage
     from sdc11073.pysoap.soapclientpool import SoapClientPool
     from sdc11073.xml_utils import LxmlElement
 ports_lock = threading.Lock()
@@ -220,3 +222,55 @@ class SomeDevice(SdcProvider):
             chunk_size=chunk_size,
             alternative_hostname=alternative_hostname,
         )
+
+
+class ReportDroppingConsumerMdib(ConsumerMdib):
+    """ConsumerMdib that drops received reports before they reach the mdib, like a lossy network would do."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._drop_counts = Counter()  # key is report name, value is number of reports to drop
+        self._drop_lock = threading.Lock()
+        self.dropped_by_harness = Counter()  # key is report name, value is number of dropped reports
+
+    def drop_next_reports(self, report_name: str, count: int = 1):
+        """Drop the next count reports of report_name (see ConsumerMdib.pre_filter_report)."""
+        with self._drop_lock:
+            self._drop_counts[report_name] += count
+
+    def pre_filter_report(self, received_message_data: ReceivedMessage, report_name: str, parse) -> bool:  # noqa: ANN001
+        with self._drop_lock:
+            if self._drop_counts[report_name] > 0:
+                self._drop_counts[report_name] -= 1
+                self.dropped_by_harness[report_name] += 1
+                return False
+        return super().pre_filter_report(received_message_data, report_name, parse)
+
+
+class ResponseBytesCounter(logging.Handler):
+    """Counts the bytes of all soap responses received by consumers while it is active."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.bytes = 0
+        self.responses = 0
+        self._logger = logging.getLogger('sdc_comm.soap.response.in')  # commlog.SOAP_RESPONSE_IN
+        self._old_level = None
+        self._old_propagate = True
+
+    def emit(self, record: logging.LogRecord):
+        self.bytes += len(record.msg)
+        self.responses += 1
+
+    def __enter__(self) -> ResponseBytesCounter:
+        self._old_level = self._logger.level
+        self._old_propagate = self._logger.propagate
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        self._logger.addHandler(self)
+        return self
+
+    def __exit__(self, *args):  # noqa: ANN002
+        self._logger.removeHandler(self)
+        self._logger.setLevel(self._old_level)
+        self._logger.propagate = self._old_propagate
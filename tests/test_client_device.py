@@ -776,6 +776,25 @@ class TestClientSomeDevice(unittest.TestCase):
         node = message_data.p_msg.msg_node
         self.assertTrue(existing_handle.encode('utf-8') in message_data.p_msg.raw_data)
 
+        def _mds_handles(handles: list[str]) -> list[str]:
+            response = cl_get_service.get_md_description(handles).result
+            return [mds.container.Handle for mds in response.MdDescription.Mds]
+
+        # only the mds that contains the requested handle is returned
+        self.assertEqual(['3569'], _mds_handles([existing_handle]))
+        self.assertEqual(['mds_1'], _mds_handles(['alert_condition_0.vmd_0.mds_1', 'not_existing_handle']))
+        self.assertEqual(['mds_1'], _mds_handles(['mds_1']))
+        # no handles => all mds; mds are returned in mdib order and only once
+        self.assertEqual(['3569', 'mds_1'], _mds_handles([]))
+        self.assertEqual(['3569', 'mds_1'], _mds_handles(['vmd_0.mds_1', existing_handle, '3569']))
+        # a descriptor transaction invalidates the cached mds subtrees
+        with self.sdc_device.mdib.descriptor_transaction() as mgr:
+            descriptor = mgr.get_descriptor('alert_condition_0.vmd_0.mds_1')
+            descriptor.SafetyClassification = pm_types.SafetyClassification.MED_C
+        node = cl_get_service.get_md_description(['mds_1']).p_msg.msg_node
+        alert_condition_node = node.find(f".//{pm.AlertCondition}[@Handle='alert_condition_0.vmd_0.mds_1']")
+        self.assertEqual('MedC', alert_condition_node.get('SafetyClassification'))
+
     def test_instance_id(self):
         """Verify client receives correct Episodic/Periodic metric reports."""
         cl_mdib = ConsumerMdib(self.sdc_client)
@@ -984,18 +1003,54 @@ class TestClientSomeDevice(unittest.TestCase):
         self.assertEqual(patient_context_state_container.UnbindingMdibVersion, None)
 
     def test_get_containment_tree(self):
-        self.log_watcher.setPaused(True)  # this will create an error log, but that shall be ignored
-        self.assertRaises(
-            HTTPReturnCodeError,
-            self.sdc_client.containment_tree_service_client.get_containment_tree,
-            ['0x34F05500', '0x34F05501', '0x34F05506'],
-        )
-
-        self.assertRaises(
-            HTTPReturnCodeError,
-            self.sdc_client.containment_tree_service_client.get_descriptor,
-            ['0x34F05500', '0x34F05501', '0x34F05506'],
-        )
+        service_client = self.sdc_client.containment_tree_service_client
+        mdib = self.sdc_device.mdib
+        # no handles => all mds
+        response = service_client.get_containment_tree([]).result
+        self.assertEqual(len(response.ContainmentTree), 1)
+        tree = response.ContainmentTree[0]
+        self.assertIsNone(tree.HandleRef)
+        all_mds = mdib.descriptions.parent_handle.get(None)
+        self.assertEqual(tree.ChildrenCount, len(all_mds))
+        self.assertEqual([e.HandleRef for e in tree.Entry], [mds.Handle for mds in all_mds])
+        self.assertEqual(tree.Entry[0].EntryType, pm.MdsDescriptor)
+        self.assertEqual(tree.Entry[0].ChildrenCount, len(mdib.descriptions.parent_handle.get(all_mds[0].Handle)))
+
+        parent = mdib.descriptions.handle.get_one('2.1.5')  # a vmd
+        handles = [d.Handle for d in mdib.descriptions.parent_handle.get(parent.Handle)]
+        response = service_client.get_containment_tree([*handles, 'unknown_handle']).result
+        self.assertLessEqual(response.MdibVersion, mdib.mdib_version)
+        tree = response.ContainmentTree[0]
+        self.assertEqual(tree.HandleRef, parent.Handle)
+        self.assertEqual(tree.ParentHandleRef, parent.parent_handle)
+        self.assertEqual(tree.EntryType, parent.NODETYPE)
+        self.assertEqual(tree.ChildrenCount, len(mdib.descriptions.parent_handle.get(parent.Handle)))
+        self.assertEqual([e.HandleRef for e in tree.Entry], handles)
+        for entry in tree.Entry:
+            descriptor = mdib.descriptions.handle.get_one(entry.HandleRef)
+            self.assertEqual(entry.ParentHandleRef, '2.1.5')
+            self.assertEqual(entry.EntryType, descriptor.NODETYPE)
+            self.assertEqual(entry.ChildrenCount, len(mdib.descriptions.parent_handle.get(entry.HandleRef, [])))
+            self.assertEqual(entry.Type and entry.Type.Code, descriptor.Type and descriptor.Type.Code)
+
+        handles = ['0x34F05500', '0x34F05501', '0x34F05506']
+        response = service_client.get_descriptor(handles).result
+        self.assertLessEqual(response.MdibVersion, mdib.mdib_version)
+        self.assertEqual([d.Handle for d in response.Descriptor], handles)
+        for descriptor in response.Descriptor:
+            self.assertEqual(descriptor.NODETYPE, pm.RealTimeSampleArrayMetricDescriptor)
+            provider_descriptor = mdib.descriptions.handle.get_one(descriptor.Handle)
+            self.assertEqual(descriptor.DescriptorVersion, provider_descriptor.DescriptorVersion)
+            self.assertEqual(descriptor.SamplePeriod, provider_descriptor.SamplePeriod)
+
+        # a descriptor transaction invalidates the cached nodes
+        with mdib.descriptor_transaction() as mgr:
+            descriptor = mgr.get_descriptor(handles[0])
+            descriptor.Type = pm_types.CodedValue('4711')
+        response = service_client.get_descriptor(handles[:1]).result
+        self.assertEqual(response.Descriptor[0].Type.Code, '4711')
+        response = service_client.get_containment_tree(handles[:1]).result
+        self.assertEqual(response.ContainmentTree[0].Entry[0].Type.Code, '4711')
 
     def test_get_supported_languages(self):
         storage = self.sdc_device.localization_storage
@@ -1098,6 +1153,13 @@ class TestClientSomeDevice(unittest.TestCase):
         for t in report.Text:
             self.assertEqual(t.TextWidth, 'xs')
 
+        # the response for all texts is cached by the provider, adding a text invalidates the cache
+        storage.add(pm_types.LocalizedText('foo_c', lang='en-en', ref='c', version=1))
+        get_request_response = service_client.get_localized_texts(version=1)
+        report = get_request_response.result
+        self.assertEqual(len(report.Text), 5)
+        self.assertEqual(report.Text[-1].text, 'foo_c')
+
         get_request_response = service_client.get_localized_texts(refs=['a'], langs=['de-de'], version=1)
         report = get_request_response.result
         self.assertEqual(len(report.Text), 1)
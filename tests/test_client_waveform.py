@@ -3,17 +3,20 @@
 import logging
 import sys
 import unittest
+from unittest import mock
 
 from lxml import etree
 from tutorial.codedvaluecomparator import _coded_value_comparator
 
 from sdc11073 import definitions_sdc, loghelper
+from sdc11073 import observableproperties as properties
 from sdc11073.consumer.consumerimpl import SdcConsumer
 from sdc11073.mdib.consumermdib import ConsumerMdib, ConsumerMdibState
 from sdc11073.mdib.descriptorcontainers import RealTimeSampleArrayMetricDescriptorContainer
 from sdc11073.mdib.statecontainers import RealTimeSampleArrayMetricStateContainer
 from sdc11073.namespaces import default_ns_helper as ns_hlp
 from sdc11073.xml_types import pm_types
+from sdc11073.xml_types.msg_types import WaveformStream
 
 DEV_ADDRESS = 'http://127.0.0.1:10000'
 CLIENT_VALIDATE = True
@@ -221,3 +224,82 @@ class TestClientWaveform(unittest.TestCase):
         for handle in HANDLES:
             rt_buffer = client_mdib.rt_buffers[handle]
             self.assertEqual(rt_buffer._max_samples, len(rt_buffer.rt_data))
+
+    def test_pre_filter(self):
+        """Verify that too old reports are dropped and buffered reports are kept unparsed until they are replayed."""
+        cl = self.sdc_client
+        client_mdib = ConsumerMdib(cl)
+        client_mdib._xtra.bind_to_client_observables()
+        for handle in HANDLES:
+            descr = RealTimeSampleArrayMetricDescriptorContainer(handle, None)
+            client_mdib.descriptions.add_object(descr)
+            state = RealTimeSampleArrayMetricStateContainer(descr)
+            state.StateVersion = 41
+            client_mdib.states.add_object(state)
+        client_mdib.sequence_id = ''
+        client_mdib.mdib_version = 10
+        client_mdib._state = ConsumerMdibState.initialized  # fake it, because we do not call init_mdib()
+
+        with mock.patch.object(WaveformStream, 'from_node', wraps=WaveformStream.from_node) as from_node:
+            # too old report is not parsed
+            report = _mk_wf_report(1467596359152, 9, 42)
+            cl._on_notification(cl.msg_reader.read_received_message(report.encode('utf-8')))
+            self.assertEqual(0, from_node.call_count)
+            self.assertEqual({'too old': 1}, client_mdib.dropped_reports)
+            self.assertEqual(0, len(client_mdib.rt_buffers))
+
+            # while initializing the report is buffered as node
+            client_mdib._state = ConsumerMdibState.initializing
+            report = _mk_wf_report(1467596359152, 11, 42)
+            cl._on_notification(cl.msg_reader.read_received_message(report.encode('utf-8')))
+            self.assertEqual(0, from_node.call_count)
+            self.assertEqual(1, len(client_mdib._buffered_notifications))
+            buffered = client_mdib._buffered_notifications[0]
+            self.assertEqual(11, buffered.mdib_version_group.mdib_version)
+            self.assertIsInstance(buffered.data, etree._Element)
+
+            # replay parses the node
+            client_mdib._state = ConsumerMdibState.initialized
+            buffered.handler(buffered.mdib_version_group, buffered.parse(buffered.data))
+            self.assertEqual(1, from_node.call_count)
+            self.assertEqual(11, client_mdib.mdib_version)
+            for handle in HANDLES:
+                self.assertEqual(len(SAMPLES[handle]), len(client_mdib.rt_buffers[handle].rt_data))
+
+            # report of another sequence makes the mdib invalid, following reports are not parsed
+            report = _mk_wf_report(1467596359152, 12, 43).replace('SequenceId=""', 'SequenceId="urn:uuid:abc"')
+            cl._on_notification(cl.msg_reader.read_received_message(report.encode('utf-8')))
+            self.assertEqual(1, from_node.call_count)
+            self.assertEqual({'too old': 1, 'invalid mdib': 1}, client_mdib.dropped_reports)
+
+    def test_changed_state_fields(self):
+        """Verify that only changed fields are applied and reported in changed_state_fields_by_handle."""
+        cl = self.sdc_client
+        client_mdib = ConsumerMdib(cl)
+        client_mdib._xtra.bind_to_client_observables()
+        client_mdib._state = ConsumerMdibState.initialized  # fake it, because we do not call init_mdib()
+        client_mdib.MDIB_VERSION_CHECK_DISABLED = True
+        for handle in HANDLES:
+            descr = RealTimeSampleArrayMetricDescriptorContainer(handle, None)
+            client_mdib.descriptions.add_object(descr)
+            state = RealTimeSampleArrayMetricStateContainer(descr)
+            state.StateVersion = 41
+            state.DescriptorVersion = 2
+            client_mdib.states.add_object(state)
+        changes = []
+
+        def on_changed_fields(changed_fields: dict):
+            changes.append(changed_fields)
+
+        properties.bind(client_mdib, changed_state_fields_by_handle=on_changed_fields)
+        state = client_mdib.states.descriptor_handle.get_one(HANDLES[0])
+        with mock.patch.object(client_mdib.states, 'update_object') as update_object:
+            report = _mk_wf_report(1467596359152, 2, 42)
+            cl._on_notification(cl.msg_reader.read_received_message(report.encode('utf-8')))
+            update_object.assert_not_called()  # no indexed property changed
+        self.assertEqual(1, len(changes))
+        self.assertEqual(set(HANDLES), set(changes[0].keys()))
+        self.assertEqual(['StateVersion', 'MetricValue'], changes[0][HANDLES[0]])
+        self.assertIs(state, client_mdib.states.descriptor_handle.get_one(HANDLES[0]))
+        self.assertEqual(42, state.StateVersion)
+        self.assertEqual(len(SAMPLES[HANDLES[0]]), len(state.MetricValue.Samples))
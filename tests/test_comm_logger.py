@@ -145,3 +145,47 @@ class TestCommLogger(unittest.TestCase):
 
         for name in commlog.LOGGER_NAMES:
             self.assertEqual(0, len(logging.getLogger(name).handlers))
+
+    def test_async_directory_logger(self):
+        """Test that the async directory logger writes all messages until it is stopped."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = pathlib.Path(tmp_dir)
+            with commlog.AsyncDirectoryLogger(log_folder=tmp_dir, log_in=True, log_out=True, batch_size=3) as comm_logger:
+                for _ in range(10):
+                    logging.getLogger(commlog.SOAP_REQUEST_IN).debug(str(uuid.uuid4()),
+                                                                     extra={'ip_address': uuid.uuid4().hex})
+            self._verify_files_in_directory(directory, 10)
+            self.assertEqual(0, comm_logger.dropped_count)
+        for name in commlog.LOGGER_NAMES:
+            self.assertEqual(0, len(logging.getLogger(name).handlers))
+
+    def test_async_directory_logger_drops_on_full_queue(self):
+        """Test that messages are dropped and counted if the queue is full."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            comm_logger = commlog.AsyncDirectoryLogger(log_folder=tmp_dir, log_in=True, max_queue_size=2)
+            # writer thread is not started yet, nothing is taken from the queue
+            for _ in range(5):
+                comm_logger._write_log(comm_logger.T_HTTP_REQ, comm_logger.D_IN, b'<xml/>', uuid.uuid4().hex)
+            self.assertEqual(3, comm_logger.dropped_count)
+            comm_logger.start()
+            comm_logger.stop()
+            self._verify_files_in_directory(pathlib.Path(tmp_dir), 2)
+
+    def test_async_directory_logger_archive(self):
+        """Test that the archive contains all messages and the index points to them."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = pathlib.Path(tmp_dir)
+            messages = [str(uuid.uuid4()) for _ in range(10)]
+            with commlog.AsyncDirectoryLogger(log_folder=tmp_dir, log_in=True, archive=True, max_archive_size=150):
+                for message in messages:
+                    logging.getLogger(commlog.SOAP_REQUEST_IN).debug(message)
+            archives = sorted(directory.glob('archive-*.log'))
+            self.assertGreater(len(archives), 1)  # 36 bytes per message => rotated after 5 messages
+            found = []
+            for archive in archives:
+                data = archive.read_bytes()
+                for line in archive.with_suffix('.idx').read_text().splitlines():
+                    offset, length, file_name = line.split('\t')
+                    self.assertIn(commlog.DirectoryLogger.T_HTTP_REQ, file_name)
+                    found.append(data[int(offset):int(offset) + int(length)].decode())
+            self.assertEqual(messages, found)
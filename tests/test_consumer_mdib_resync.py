@@ -0,0 +1,161 @@
+"""Tests for the resynchronization of the consumer mdib after missed reports."""
+
+import threading
+import unittest
+from decimal import Decimal
+
+from sdc11073 import loghelper, observableproperties
+from sdc11073.consumer.consumerimpl import SdcConsumer, default_components_factory
+from sdc11073.consumer.request_handler_deferred import PriorityDispatchKeyRegistryDeferred
+from sdc11073.mdib.consumermdib import ConsumerMdib, MdibVersionGap
+from sdc11073.mdib.containerbase import ContainerBase
+from sdc11073.wsdiscovery import WSDiscovery
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types import pm_types
+from tests import utils
+from tests.mockstuff import ReportDroppingConsumerMdib, ResponseBytesCounter, SomeDevice
+
+
+class TestConsumerMdibResync(unittest.TestCase):
+    def setUp(self):
+        loghelper.basic_logging_setup()
+        self.wsd = WSDiscovery('127.0.0.1')
+        self.wsd.start()
+        self.sdc_provider = SomeDevice.from_mdib_file(self.wsd, None, '70041_MDIB_Final.xml')
+        self.sdc_provider.start_all(start_rtsample_loop=False)
+        self.sdc_provider.set_location(utils.random_location())
+        self.sdc_consumer = SdcConsumer(self.sdc_provider.get_xaddrs()[0],
+                                        sdc_definitions=self.sdc_provider.mdib.sdc_definitions,
+                                        ssl_context_container=None)
+        self.sdc_consumer.start_all()
+        provider_mdib = self.sdc_provider.mdib
+        self.metric_handles = [d.Handle for d in provider_mdib.descriptions.NODETYPE.get(pm.NumericMetricDescriptor)]
+        self.alert_handle = provider_mdib.descriptions.NODETYPE.get(pm.AlertConditionDescriptor)[0].Handle
+
+    def tearDown(self):
+        self.sdc_consumer.stop_all()
+        self.sdc_provider.stop_all()
+        self.wsd.stop()
+
+    def _set_metric_value(self, handle: str, value: int):
+        with self.sdc_provider.mdib.metric_state_transaction() as mgr:
+            state = mgr.get_state(handle)
+            if state.MetricValue is None:
+                state.mk_metric_value()
+            state.MetricValue.Value = Decimal(value)
+
+    def _consumer_value(self, consumer_mdib: ReportDroppingConsumerMdib, handle: str) -> Decimal | None:
+        state = consumer_mdib.states.descriptor_handle.get_one(handle)
+        return None if state.MetricValue is None else state.MetricValue.Value
+
+    def test_gap_event_and_incremental_resync(self):
+        consumer_mdib = ReportDroppingConsumerMdib(self.sdc_consumer)
+        consumer_mdib.init_mdib()
+        gaps = []
+        observableproperties.strongbind(consumer_mdib, mdib_version_gap_event=gaps.append)
+        missed_handle, received_handle = self.metric_handles[:2]
+        consumer_mdib.drop_next_reports('metric states')
+        self._set_metric_value(missed_handle, 42)
+        version_before_gap = consumer_mdib.mdib_version
+        self._set_metric_value(received_handle, 43)
+        self.assertTrue(utils.wait_for(lambda: self._consumer_value(consumer_mdib, received_handle) == 43))
+        self.assertEqual([MdibVersionGap('metric states', version_before_gap, version_before_gap + 2)], gaps)
+        self.assertNotEqual(42, self._consumer_value(consumer_mdib, missed_handle))
+
+        with ResponseBytesCounter() as resync_bytes:
+            self.assertTrue(consumer_mdib.resync())
+        self.assertEqual(42, self._consumer_value(consumer_mdib, missed_handle))
+        self.assertEqual(self.sdc_provider.mdib.mdib_version, consumer_mdib.mdib_version)
+        self.assertTrue(consumer_mdib.is_initialized)
+        self.assertEqual({'gap': 1, 'incremental': 1}, consumer_mdib.resync_counts)
+
+        with ResponseBytesCounter() as reload_bytes:
+            consumer_mdib.reload_all()
+        self.assertEqual(1, resync_bytes.responses)
+        self.assertLess(resync_bytes.bytes, reload_bytes.bytes)
+
+    def test_resync_on_gap(self):
+        consumer_mdib = ReportDroppingConsumerMdib(self.sdc_consumer, resync_on_gap=True)
+        consumer_mdib.init_mdib()
+        consumer_mdib.drop_next_reports('alert states')
+        with self.sdc_provider.mdib.alert_state_transaction() as mgr:
+            state = mgr.get_state(self.alert_handle)
+            state.ActivationState = pm_types.AlertActivation.PAUSED
+        self._set_metric_value(self.metric_handles[0], 1)
+        consumer_state = consumer_mdib.states.descriptor_handle.get_one(self.alert_handle)
+        self.assertTrue(utils.wait_for(lambda: consumer_state.ActivationState == pm_types.AlertActivation.PAUSED))
+        self.assertTrue(utils.wait_for(lambda: consumer_mdib.resync_counts.get('incremental') == 1))
+        self.assertEqual(1, consumer_mdib.dropped_by_harness['alert states'])
+        # reports after the resync are processed as usual
+        self._set_metric_value(self.metric_handles[0], 2)
+        self.assertTrue(utils.wait_for(lambda: self._consumer_value(consumer_mdib, self.metric_handles[0]) == 2))
+
+    def test_missed_description_modification_reloads_all(self):
+        consumer_mdib = ReportDroppingConsumerMdib(self.sdc_consumer)
+        consumer_mdib.init_mdib()
+        consumer_mdib.drop_next_reports('descriptors')
+        handle = self.metric_handles[0]
+        with self.sdc_provider.mdib.descriptor_transaction() as mgr:
+            descriptor = mgr.get_descriptor(handle)
+            descriptor.Type = pm_types.CodedValue('4711')
+        self.assertFalse(consumer_mdib.resync())
+        self.assertEqual('4711', consumer_mdib.descriptions.handle.get_one(handle).Type.Code)
+        self.assertEqual({'full reload': 1}, consumer_mdib.resync_counts)
+
+    def test_mdib_without_nodes(self):
+        consumer_mdib = ConsumerMdib(self.sdc_consumer, keep_nodes=False)
+        consumer_mdib.init_mdib()
+        handle = self.metric_handles[0]
+        self._set_metric_value(handle, 42)
+        self.assertTrue(utils.wait_for(lambda: self._consumer_value(consumer_mdib, handle) == 42))
+        self.assertTrue(consumer_mdib.resync())
+        for container in (*consumer_mdib.descriptions.objects, *consumer_mdib.states.objects,
+                          *consumer_mdib.context_states.objects):
+            self.assertIsNone(ContainerBase.node.get_stored_value(container))
+        node = consumer_mdib.states.descriptor_handle.get_one(handle).node
+        self.assertEqual(pm.State, node.tag)
+        self.assertEqual(handle, node.get('DescriptorHandle'))
+
+    def test_reports_overtaken_by_priority_dispatcher_are_applied(self):
+        components = default_components_factory()
+        components.action_dispatcher_class = PriorityDispatchKeyRegistryDeferred
+        sdc_consumer = SdcConsumer(self.sdc_provider.get_xaddrs()[0],
+                                   sdc_definitions=self.sdc_provider.mdib.sdc_definitions,
+                                   ssl_context_container=None,
+                                   components=components)
+        sdc_consumer.start_all()
+        try:
+            consumer_mdib = ReportDroppingConsumerMdib(sdc_consumer)
+            consumer_mdib.init_mdib()
+            release = threading.Event()
+            applied = []
+
+            def on_metrics(states_by_handle: dict):
+                if states_by_handle:
+                    applied.append('metric')
+                    release.wait(5)  # blocks the only worker of the dispatcher
+
+            def on_alerts(states_by_handle: dict):
+                if states_by_handle:
+                    applied.append('alert')
+
+            observableproperties.strongbind(consumer_mdib, metrics_by_handle=on_metrics, alert_by_handle=on_alerts)
+            handle = self.metric_handles[0]
+            self._set_metric_value(handle, 1)
+            self.assertTrue(utils.wait_for(lambda: applied == ['metric']))
+            for value in range(2, 5):
+                self._set_metric_value(handle, value)
+            with self.sdc_provider.mdib.alert_state_transaction() as mgr:
+                state = mgr.get_state(self.alert_handle)
+                state.ActivationState = pm_types.AlertActivation.PAUSED
+            self.assertTrue(utils.wait_for(lambda: len(sdc_consumer.pending_mdib_versions()) == 5))
+            release.set()
+            self.assertTrue(utils.wait_for(lambda: len(applied) == 5))
+            # the alert report overtook the metric reports, the metric reports were applied nevertheless
+            self.assertEqual(['metric', 'alert', 'metric', 'metric', 'metric'], applied)
+            self.assertEqual(4, self._consumer_value(consumer_mdib, handle))
+            self.assertEqual({}, consumer_mdib.dropped_reports)
+            self.assertEqual({}, consumer_mdib.resync_counts)
+            self.assertEqual(self.sdc_provider.mdib.mdib_version, consumer_mdib.mdib_version)
+        finally:
+            sdc_consumer.stop_all()
@@ -1,6 +1,9 @@
 """Tests for consumer subscription and consumer subscription manager."""
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
 from types import SimpleNamespace
 from unittest import mock
 
@@ -247,6 +250,60 @@ def test_subscribe_without_endto_and_error_paths():
         sub.unsubscribe()
 
 
+class LockCheckingSoapClient(FakeSoapClient):
+    """Records if the lock of the subscription is held while a request is sent."""
+
+    def __init__(self, msg_factory: MessageFactory, msg_reader: MessageReader):
+        super().__init__(msg_factory, msg_reader)
+        self.subscription: ConsumerSubscription | None = None
+        self.lock_held = []
+
+    def post_message_to(self, path: str, message: CreatedMessage, msg: str = ''):  # noqa: ANN201
+        self.lock_held.append(self.subscription._is_subscribed_lock.locked())
+        return super().post_message_to(path, message, msg)
+
+    async def async_post_message_to(self, path: str, message: CreatedMessage):  # noqa: ANN201
+        return self.post_message_to(path, message)
+
+
+def test_lock_is_not_held_during_requests():
+    sdc = SdcV1Definitions
+    mf = MessageFactory(sdc, None, logger=None, validate=False)
+    mr = MessageReader(sdc, None, logger=None, validate=False)
+    fake = LockCheckingSoapClient(mf, mr)
+    sub = ConsumerSubscription(
+        mf,
+        sdc.data_model,
+        _make_get_soap_client(fake),
+        _hosted(),
+        _filter_type('http://a/b/Action1'),
+        notification_url='http://localhost:8080/notify',
+        end_to_url='http://localhost:8080/end',
+        log_prefix='t',
+    )
+    fake.subscription = sub
+    sub.subscribe(expires=5)
+    assert sub.renew(30) == fake.renew_expires
+    sub.unsubscribe()
+    assert sub.is_subscribed is False
+    assert fake.lock_held == [False, False, False]
+
+    # the async methods do not wait for the lock, e.g. while another thread sends a request
+    sub.subscribe(expires=5)
+    sub._is_subscribed_lock.acquire()
+    release_timer = threading.Timer(5, sub._is_subscribed_lock.release)
+    release_timer.start()
+    try:
+        started = time.monotonic()
+        assert asyncio.run(sub.async_renew(_make_get_soap_client(fake), 30)) == fake.renew_expires
+        asyncio.run(sub.async_unsubscribe(_make_get_soap_client(fake)))
+        assert time.monotonic() - started < 1
+        assert sub.is_subscribed is False
+    finally:
+        release_timer.cancel()
+        sub._is_subscribed_lock.release()
+
+
 def test_client_subscription_manager_reference_params_find_and_unsubscribe_all():
     sdc = SdcV1Definitions
     mf = MessageFactory(sdc, None, logger=None, validate=False)
@@ -0,0 +1,268 @@
+"""Tests for many consumers that run in one SdcConsumerHub and for the async http server."""
+
+import asyncio
+import functools
+import gzip
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from decimal import Decimal
+from pathlib import Path
+
+from sdc11073 import wsdiscovery
+from sdc11073.consumer.consumerhub import SdcConsumerHub
+from sdc11073.consumer.consumerimpl import default_components_factory
+from sdc11073.exceptions import ApiUsageError
+from sdc11073.httpserver.httpserver_async import AsyncHttpServer
+from sdc11073.loghelper import basic_logging_setup, get_logger_adapter
+from sdc11073.mdib import ProviderMdib
+from sdc11073.observableproperties import ValuesCollector
+from sdc11073.provider import SdcProviderHost
+from sdc11073.provider.subscriptionmgr_async import AsyncioEventLoopThread
+from sdc11073.xml_types import msg_types
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
+from tests import utils
+from tests.mockstuff import EXAMPLE_ROLE_PROVIDER_COMPONENTS
+
+MDIB_PATH = Path(__file__).parent / '70041_MDIB_Final.xml'
+PROVIDER_COUNT = 3
+# threads of the provider host that handle the requests of the consumers
+PROVIDER_CONNECTION_THREAD_PREFIX = 'SubscrRecv'
+
+
+def _metric_handle(provider) -> str:  # noqa: ANN001
+    return provider.mdib.descriptions.NODETYPE.get(pm.NumericMetricDescriptor)[0].Handle
+
+
+def _consumer_side_thread_names() -> list[str]:
+    return sorted(t.name for t in threading.enumerate()
+                  if not t.name.startswith((PROVIDER_CONNECTION_THREAD_PREFIX, 'sdc_consumer_hub_worker')))
+
+
+class TestSdcConsumerHub(unittest.TestCase):
+    def setUp(self):
+        basic_logging_setup()
+        self.wsd = wsdiscovery.WSDiscovery('127.0.0.1')
+        self.wsd.start()
+        self.provider_host = SdcProviderHost(self.wsd)
+        self.provider_host.start_all()
+        model = ThisModelType(manufacturer='Example Manufacturer', model_name='HostedDevice', model_number='1.0')
+        self.providers = []
+        for i in range(PROVIDER_COUNT):
+            device = ThisDeviceType(friendly_name=f'hosted device {i}', serial_number=str(i))
+            mdib = ProviderMdib.from_mdib_file(str(MDIB_PATH))
+            self.providers.append(self.provider_host.add_provider(model, device, mdib, start_rtsample_loop=False))
+        self.hub = SdcConsumerHub('127.0.0.1')
+        self.hub.start_all()
+
+    def tearDown(self):
+        self.hub.stop_all()
+        self.provider_host.stop_all()
+        self.wsd.stop()
+
+    def test_consumers_share_infrastructure(self):
+        thread_names = _consumer_side_thread_names()
+        consumers = [self.hub.add_consumer(p.get_xaddrs()[0], log_prefix=f'consumer {i}: ')
+                     for i, p in enumerate(self.providers)]
+        # no http server, subscription manager or dispatcher threads per consumer
+        self.assertEqual(thread_names, _consumer_side_thread_names())
+        self.assertEqual({self.hub.base_url.rstrip('/')}, {c.base_url.split('/' + c.path_prefix)[0] for c in consumers})
+        collectors = [ValuesCollector(c, 'episodic_metric_report', 1) for c in consumers]
+        for i, provider in enumerate(self.providers):
+            utils.set_metric_value(provider, i)
+        for collector in collectors:
+            collector.result(timeout=5)
+        for i, (consumer, provider) in enumerate(zip(consumers, self.providers)):
+            state = consumer.mdib.states.descriptor_handle.get_one(_metric_handle(provider))
+            self.assertEqual(Decimal(i), state.MetricValue.Value)
+            self.assertTrue(consumer.is_connected)
+
+    def test_async_renew(self):
+        consumers = [self.hub.add_consumer(p.get_xaddrs()[0], fixed_renew_interval=1) for p in self.providers]
+        subscriptions = [s for c in consumers for s in c.subscription_mgr.subscriptions.values()]
+        expires = [s.expires_at for s in subscriptions]
+        time.sleep(2.5)
+        for subscription, expires_at in zip(subscriptions, expires):
+            self.assertTrue(subscription.is_subscribed)
+            self.assertGreater(subscription.expires_at, expires_at)
+
+    def test_remove_consumer(self):
+        consumers = [self.hub.add_consumer(p.get_xaddrs()[0]) for p in self.providers[:2]]
+        self.hub.remove_consumer(consumers[0])
+        self.assertNotIn(consumers[0], self.hub.consumers)
+        self.assertFalse(any(s.is_subscribed for s in consumers[0].subscription_mgr.subscriptions.values()))
+        # the remaining consumer still receives notifications, the path of the removed one can be used again
+        collector = ValuesCollector(consumers[1], 'episodic_metric_report', 1)
+        utils.set_metric_value(self.providers[1], 1)
+        collector.result(timeout=5)
+        again = self.hub.add_consumer(self.providers[0].get_xaddrs()[0], epr=consumers[0].path_prefix)
+        self.assertEqual(consumers[0].path_prefix, again.path_prefix)
+
+    def test_sync_subscription_manager_is_rejected(self):
+        self.assertRaises(ApiUsageError, self.hub.add_consumer, self.providers[0].get_xaddrs()[0],
+                          components=default_components_factory())
+        self.assertEqual([], self.hub.consumers)
+
+
+class TestAsyncServiceClients(unittest.TestCase):
+    """The async methods of the service clients, used in the event loop of the application."""
+
+    def setUp(self):
+        basic_logging_setup()
+        self.wsd = wsdiscovery.WSDiscovery('127.0.0.1')
+        self.wsd.start()
+        self.provider_host = SdcProviderHost(self.wsd)
+        self.provider_host.start_all()
+        model = ThisModelType(manufacturer='Example Manufacturer', model_name='HostedDevice', model_number='1.0')
+        self.providers = []
+        for i in range(PROVIDER_COUNT):
+            device = ThisDeviceType(friendly_name=f'hosted device {i}', serial_number=str(i))
+            mdib = ProviderMdib.from_mdib_file(str(MDIB_PATH))
+            self.providers.append(self.provider_host.add_provider(
+                model, device, mdib, start_rtsample_loop=False,
+                role_provider_components=EXAMPLE_ROLE_PROVIDER_COMPONENTS,
+            ))
+
+    def tearDown(self):
+        self.provider_host.stop_all()
+        self.wsd.stop()
+
+    async def _run_with_hub(self, test_coro_func):  # noqa: ANN001
+        loop = asyncio.get_running_loop()
+        hub = SdcConsumerHub('127.0.0.1', async_loop=loop, max_concurrent_requests=2)
+        # the blocking methods of the hub must not run in the thread of the loop
+        await loop.run_in_executor(None, hub.start_all)
+        try:
+            consumers = []
+            for provider in self.providers:
+                add_consumer = functools.partial(hub.add_consumer, provider.get_xaddrs()[0], init_mdib=False)
+                consumers.append(await loop.run_in_executor(None, add_consumer))
+            await test_coro_func(consumers)
+        finally:
+            await loop.run_in_executor(None, hub.stop_all)
+
+    def test_get_requests(self):
+        metric_handle = _metric_handle(self.providers[0])
+
+        async def _test(consumers):  # noqa: ANN001
+            results = await asyncio.gather(*[c.get_service_client.async_get_mdib() for c in consumers])
+            for result, provider in zip(results, self.providers):
+                self.assertEqual(provider.mdib.mdib_version, result.mdib_version_group.mdib_version)
+                self.assertEqual(provider.mdib.sequence_id, result.mdib_version_group.sequence_id)
+            results = await asyncio.gather(*[c.get_service_client.async_get_md_state([metric_handle])
+                                             for c in consumers])
+            for result in results:
+                self.assertEqual([metric_handle], [s.DescriptorHandle for s in result.result.MdState.State])
+            description = await consumers[0].get_service_client.async_get_md_description()
+            self.assertGreater(len(description.result.MdDescription.Mds), 0)
+            contexts = await consumers[0].context_service_client.async_get_context_states()
+            self.assertIsNotNone(contexts.result)
+
+        asyncio.run(self._run_with_hub(_test))
+
+    def test_operations_and_subscriptions(self):
+        operation = next(op for op in self.providers[0].mdib.descriptions.NODETYPE.get(pm.SetValueOperationDescriptor)
+                         if op.Type is not None and op.Type.Code == '0815-1')
+
+        async def _test(consumers):  # noqa: ANN001
+            results = await asyncio.gather(*[c.set_service_client.async_set_numeric_value(operation.Handle, i)
+                                             for i, c in enumerate(consumers)])
+            for i, (result, provider) in enumerate(zip(results, self.providers)):
+                self.assertEqual(msg_types.InvocationState.FINISHED, result.InvocationInfo.InvocationState)
+                state = provider.mdib.states.descriptor_handle.get_one(operation.OperationTarget)
+                self.assertEqual(Decimal(i), state.MetricValue.Value)
+
+            consumer = consumers[0]
+            self.assertTrue(all(s.is_subscribed for s in consumer.subscription_mgr.subscriptions.values()))
+            subscriptions = list(consumer.subscription_mgr.subscriptions.values())
+            self.assertTrue(await consumer.async_unsubscribe_all())
+            self.assertFalse(any(s.is_subscribed for s in subscriptions))
+            self.assertFalse(consumer.is_connected)
+            # subscribe again to the hosted service of the first subscription
+            subscription = subscriptions[0]
+            await subscription.async_subscribe(consumer.get_async_soap_client, expires=60)
+            self.assertTrue(subscription.is_subscribed)
+            self.assertGreater(await subscription.async_renew(consumer.get_async_soap_client, expires=60), 0)
+            await subscription.async_unsubscribe(consumer.get_async_soap_client)
+            self.assertFalse(subscription.is_subscribed)
+
+        asyncio.run(self._run_with_hub(_test))
+
+
+class _EchoComponent:
+    """Replaces a MessageConverterMiddleware, returns the request in upper case."""
+
+    def __init__(self):
+        self.paths = []
+
+    def do_post(self, headers, path, peer_name, request_bytes):  # noqa: ANN001, ARG002
+        self.paths.append(path)
+        return 200, 'Ok', request_bytes.upper()
+
+
+class TestAsyncHttpServer(unittest.TestCase):
+    def setUp(self):
+        logger = get_logger_adapter('sdc.test.httpsrv')
+        self.async_loop = AsyncioEventLoopThread(name='test_loop', logger=logger)
+        self.async_loop.start()
+        while not self.async_loop.running:
+            time.sleep(0.01)
+        self.server = AsyncHttpServer(self.async_loop.loop, '127.0.0.1', None, ['gzip'], logger)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.async_loop.stop()
+
+    def _post(self, path: str, data: bytes, headers: dict | None = None):  # noqa: ANN202
+        request = urllib.request.Request(f'{self.server.base_url}{path}', data=data, headers=headers or {})
+        return urllib.request.urlopen(request, timeout=5)  # noqa: S310
+
+    def test_dispatch_by_path(self):
+        components = {'a': _EchoComponent(), 'b': _EchoComponent()}
+        for path, component in components.items():
+            self.server.dispatcher.register_instance(path, component)
+        self.assertEqual(b'HELLO', self._post('a/x', b'hello').read())
+        compressed = gzip.compress(b'world')
+        response = self._post('b/y', compressed, {'Content-Encoding': 'gzip', 'Accept-Encoding': 'gzip'})
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+        self.assertEqual(b'WORLD', gzip.decompress(response.read()))
+        self.assertEqual(['/a/x'], components['a'].paths)
+        self.assertEqual(['/b/y'], components['b'].paths)
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self._post('unknown', b'hello')
+        self.assertEqual(404, context.exception.code)
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self._post('a', b'hello', {'Content-Encoding': 'br'})
+        self.assertEqual(415, context.exception.code)
+
+    def test_requests_of_a_path_are_serialized(self):
+        active = []
+        max_active = []
+
+        class _SlowComponent:
+            def do_post(self, headers, path, peer_name, request_bytes):  # noqa: ANN001, ANN202, ARG002
+                active.append(1)
+                max_active.append(len(active))
+                time.sleep(0.05)
+                active.pop()
+                return 200, 'Ok', b''
+
+        self.server.dispatcher.register_instance('slow', _SlowComponent())
+
+        async def _post_parallel():
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[loop.run_in_executor(None, self._post, 'slow', b'x') for _ in range(5)])
+
+        asyncio.run(_post_parallel())
+        self.assertEqual(5, len(max_active))
+        self.assertEqual(1, max(max_active))
+
+        # the lock of a path is dropped when the path is unregistered
+        self.assertIn('slow', self.server._path_locks)
+        self.server.dispatcher.unregister_instance('slow')
+        self.assertTrue(utils.wait_for(lambda: 'slow' not in self.server._path_locks, timeout=5))
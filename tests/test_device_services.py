@@ -1,12 +1,16 @@
 """Test device services."""
 
+import gc
 import unittest
+import weakref
+from pathlib import Path
 
 from lxml import etree
 
 from sdc11073.definitions_sdc import SdcV1Definitions
 from sdc11073.dispatch.request import RequestData
 from sdc11073.loghelper import basic_logging_setup
+from sdc11073.mdib import ProviderMdib
 from sdc11073.namespaces import default_ns_helper as ns_hlp
 from sdc11073.provider import SdcProvider
 from sdc11073.pysoap.msgfactory import CreatedMessage
@@ -133,6 +137,30 @@ class TestDeviceServices(unittest.TestCase):
         self.assertEqual(msg_node.attrib['MdibVersion'], str(self.sdc_device.mdib.mdib_version))
         self.assertEqual(msg_node.attrib['SequenceId'], str(self.sdc_device.mdib.sequence_id))
 
+    def test_get_md_description_cache_per_mdib(self):
+        get_service = self.sdc_device.hosted_services.get_service
+        request = RequestData({}, '123', 'foo')
+        request.message_data = self.msg_reader.read_received_message(self.sdc_device.msg_factory.serialize_message(
+            self._mk_get_request(self.sdc_device, get_service.port_type_name.localname, 'GetMdDescription', '123')))
+        other_mdib = ProviderMdib.from_mdib_file(str(Path(__file__).parent / '70041_MDIB_Final.xml'),
+                                                 SdcV1Definitions)
+        other_mdib.mddescription_version = self.sdc_device.mdib.mddescription_version
+        other_mds = other_mdib.descriptions.NODETYPE.get_one(pm.MdsDescriptor)
+        other_mds.DescriptorVersion = 42
+
+        response = get_service.mk_get_mddescription_response_message(request, self.sdc_device.mdib, [])
+        self.assertNotEqual('42', response.p_msg.payload_element[0][0].get('DescriptorVersion'))
+        # the cached mds of the other mdib with the same DescriptionVersion is not used
+        response = get_service.mk_get_mddescription_response_message(request, other_mdib, [])
+        self.assertEqual('42', response.p_msg.payload_element[0][0].get('DescriptorVersion'))
+        # the cache does not keep the other mdib alive
+        other_mdib_ref = weakref.ref(other_mdib)
+        del other_mdib, other_mds
+        gc.collect()
+        self.assertIsNone(other_mdib_ref())
+        response = get_service.mk_get_mddescription_response_message(request, self.sdc_device.mdib, [])
+        self.assertNotEqual('42', response.p_msg.payload_element[0][0].get('DescriptorVersion'))
+
     def test_change_alarm_prio(self):
         get_service = self.sdc_device.hosted_services.get_service
         path = '123'
@@ -6,6 +6,8 @@ import unittest.mock
 from decimal import Decimal
 
 from tutorial.productandroles.exampleproduct import EXAMPLE_ROLE_PROVIDER_COMPONENTS
+from tutorial.productandroles.waveformprovider.intervalcontroller import AdaptiveIntervalController
+from tutorial.productandroles.waveformprovider.realtimesamples import Annotator, RtSampleArray
 from tutorial.productandroles.waveformprovider.waveformgenerators import (
     SawtoothGenerator,
     SinusGenerator,
@@ -14,8 +16,10 @@ from tutorial.productandroles.waveformprovider.waveformgenerators import (
 from tutorial.productandroles.waveformprovider.waveformproviderimpl import GenericWaveformProvider
 
 import sdc11073
+from sdc11073 import observableproperties as properties
 from sdc11073.mdib import descriptorcontainers as dc
 from sdc11073.provider import SdcProvider
+from sdc11073.provider.subscriptionmgr_base import RoundTripData
 from sdc11073.pysoap.soapclientpool import SoapClientPool
 from sdc11073.xml_types import pm_types
 from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
@@ -87,6 +91,92 @@ class TestDeviceWaveform(unittest.TestCase):
         self.assertTrue(len(rt_sample_array.samples) > 0)
         self.assertTrue(abs(now - rt_sample_array.determination_time) <= 0.1)
 
+    def test_waveform_generator_slices(self):
+        generator = SawtoothGenerator(min_value=0, max_value=10, waveform_period=1.0, sample_period=0.1)
+        self.assertIsNone(generator.last_samples_as_decimal([]))
+        self.assertEqual(generator.next_samples(0), [])
+        samples = generator.next_samples(25)  # more than two periods
+        expected = [i * 1.0 for i in range(10)]
+        self.assertEqual(samples, expected + expected + expected[:5])
+        self.assertEqual(generator.last_samples_as_decimal(samples), [Decimal(int(v)) for v in samples])
+        samples = generator.next_samples(7)  # continues where the last call stopped
+        self.assertEqual(samples, expected[5:] + expected[:2])
+        self.assertEqual(len(generator.last_samples_as_decimal(samples)), 7)
+        # other values with the same length, e.g. modified by a derived class, are not converted from the cache
+        self.assertIsNone(generator.last_samples_as_decimal([v + 1 for v in samples]))
+
+        waveform_provider = GenericWaveformProvider(self.mdib, '')
+        waveform_provider.register_waveform_generator(HANDLES[0], generator)
+        sample_array_generator = waveform_provider._waveform_generators[HANDLES[0]]
+        sample_array_generator._last_timestamp = time.time() - 0.55
+        rt_sample_array = sample_array_generator.get_next_sample_array()
+        self.assertEqual(len(rt_sample_array.decimal_samples), len(rt_sample_array.samples))
+        state = self.mdib.entities.by_handle(HANDLES[0]).state
+        waveform_provider._update_rt_samples(state)
+        self.assertTrue(all(isinstance(s, Decimal) for s in state.MetricValue.Samples))
+
+    def test_annotator(self):
+        annotator = Annotator(pm_types.Annotation(pm_types.CodedValue('a')), HANDLES[0], [HANDLES[1]])
+        rt_sample_array = RtSampleArray(self.mdib.data_model, 100.0, 0.5, [1.0, -1.0, 0.0, 2.0, 3.0, -1.0],
+                                        pm_types.ComponentActivation.ON)
+        # first value is a trigger, because the initial last value is 0
+        self.assertEqual(annotator.get_annotation_timestamps(rt_sample_array), [100.0, 101.5])
+        rt_sample_array = RtSampleArray(self.mdib.data_model, 103.0, 0.5, [5.0, 6.0],
+                                        pm_types.ComponentActivation.ON)
+        self.assertEqual(annotator.get_annotation_timestamps(rt_sample_array), [103.0])
+        rt_sample_array = RtSampleArray(self.mdib.data_model, None, 0.5, [], pm_types.ComponentActivation.OFF)
+        self.assertEqual(annotator.get_annotation_timestamps(rt_sample_array), [])
+
+    def test_adaptive_interval_controller(self):
+        controller = AdaptiveIntervalController(min_interval=0.1, max_interval=0.4, target_load=0.5)
+        self.assertEqual(controller.interval, 0.1)
+        # sending takes longer than half of the interval => widen up to max_interval
+        for _ in range(10):
+            controller.update(0.3)
+        self.assertEqual(controller.interval, 0.4)
+        self.assertEqual(controller.widen_count, 4)
+        # fast sending => narrow down to min_interval
+        for _ in range(100):
+            controller.update(0.001)
+        self.assertEqual(controller.interval, 0.1)
+        self.assertGreater(controller.narrow_count, 0)
+        # being behind schedule widens the interval
+        controller.update(0.001, behind_schedule=0.05)
+        self.assertAlmostEqual(controller.interval, 0.15)
+        # a slow subscriber widens the interval
+        round_trip_times = {'a': RoundTripData([0.01, 0.02], 0.02), 'b': RoundTripData(None, None)}
+        controller = AdaptiveIntervalController(min_interval=0.01, max_interval=1.0,
+                                                round_trip_times=lambda: round_trip_times)
+        self.assertAlmostEqual(controller.update(0.0), 0.015)
+        self.assertAlmostEqual(controller.update(0.0), 0.015)  # narrowing would be below round trip time
+        round_trip_times['a'] = RoundTripData([0.001], 0.001)
+        self.assertAlmostEqual(controller.update(0.0), 0.0135)
+        self.assertAlmostEqual(controller.statistics['max_round_trip_time'], 0.001)
+        self.assertRaises(ValueError, AdaptiveIntervalController, min_interval=0.2, max_interval=0.1)
+
+    def test_adaptive_interval(self):
+        waveform_provider = GenericWaveformProvider(self.mdib, '')
+        waveform_provider.provide_waveforms()
+        intervals = []
+
+        def on_interval(interval: float):
+            intervals.append(interval)
+
+        waveform_provider.notifications_interval = 0.01
+        properties.bind(waveform_provider, notifications_interval=on_interval)
+        # a send duration of zero is not possible, the load is always above target_load
+        controller = waveform_provider.enable_adaptive_interval(min_interval=0.001, max_interval=0.05,
+                                                                target_load=1e-9)
+        waveform_provider.start()
+        try:
+            time.sleep(0.5)
+        finally:
+            waveform_provider.stop()
+        self.assertEqual(waveform_provider.notifications_interval, 0.05)
+        self.assertEqual(intervals[-1], 0.05)
+        self.assertGreater(len(intervals), 2)
+        self.assertIsNotNone(controller.statistics['avg_send_duration'])
+
     def test_waveform_subscription(self):
         self._mk_device()
 
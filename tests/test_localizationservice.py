@@ -198,3 +198,60 @@ class TestLocationService(unittest.TestCase):
             number_of_lines=lines,
         )
         self.assertEqual(len(texts), len(self.ref_list) * len(self.lang_list) * 4)
+
+    def test_supported_languages(self):
+        self.assertEqual(sorted(self.localization_storage.get_supported_languages()),
+                         sorted(str(lang) for lang in self.lang_list))
+
+    def test_cached_result_is_updated_on_add(self):
+        texts = self.localization_storage.filter_localized_texts(
+            requested_handles=None,
+            requested_version=None,
+            requested_langs=['en-en'],
+            text_widths=None,
+            number_of_lines=None,
+        )
+        count = len(texts)
+        texts.clear()  # the caller gets a copy of the cached result
+        generation = self.localization_storage.generation
+        self.localization_storage.add(LocalizedText('new', lang='en-en', ref='f', version=2))
+        self.assertGreater(self.localization_storage.generation, generation)
+        texts = self.localization_storage.filter_localized_texts(
+            requested_handles=None,
+            requested_version=None,
+            requested_langs=['en-en'],
+            text_widths=None,
+            number_of_lines=None,
+        )
+        self.assertEqual(len(texts), count + 1)
+        self.assertEqual(texts[-1].text, 'new')
+        # a higher version makes all other texts invisible
+        self.localization_storage.add(LocalizedText('newer', lang='en-en', ref='f', version=3))
+        texts = self.localization_storage.filter_localized_texts(
+            requested_handles=None,
+            requested_version=None,
+            requested_langs=['en-en'],
+            text_widths=None,
+            number_of_lines=None,
+        )
+        self.assertEqual([t.text for t in texts], ['newer'])
+
+    def test_cache_key_does_not_depend_on_request(self):
+        storage = self.localization_storage
+        key = storage.all_texts_key(None, ['en-en', 'de-de'])
+        self.assertEqual(key, storage.all_texts_key(2, ['de-de', 'unknown', 'en-en', 'de-de']))
+        self.assertIsNone(storage.all_texts_key(None, ['unknown']))
+        self.assertIsNone(storage.all_texts_key(17, None))
+        texts = storage.filter_localized_texts(None, None, ['de-de', 'unknown', 'en-en'], None, None)
+        self.assertEqual(len(texts), len(self.ref_list) * len(self.width_list) * len(self.lines_list) * 2)
+
+    def test_cache_is_bounded(self):
+        cache = localizationservice._LruCache(max_size=3)
+        for i in range(5):
+            cache.put(i, [i])
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.get(2), [2])  # 2 is now the most recently used entry
+        cache.put(5, [5])
+        self.assertIsNone(cache.get(3))
+        self.assertEqual(cache.get(2), [2])
@@ -63,3 +63,28 @@ class TestLogWatcher(unittest.TestCase):
         _test_prefix('1')
         _test_prefix(mock.MagicMock())
         _test_prefix(None)
+
+
+class TestLoggerAdapter(unittest.TestCase):
+    def test_is_debug(self):
+        logger = logging.getLogger(f'sdc.test_is_debug_{uuid.uuid4().hex}')
+        adapter = loghelper.get_logger_adapter(logger.name)
+        logger.setLevel(logging.INFO)
+        self.assertFalse(adapter.is_debug)
+        expensive_arg = mock.MagicMock()
+        adapter.debug('{}', expensive_arg)
+        expensive_arg.assert_not_called()
+
+        # configuration changes are considered
+        logger.setLevel(logging.DEBUG)
+        self.assertTrue(adapter.is_debug)
+        with mock.patch.object(logger, 'log') as log:
+            adapter.debug('{}', expensive_arg)
+            expensive_arg.assert_called_once()
+            log.assert_called_once()
+        logging.disable(logging.DEBUG)
+        try:
+            self.assertFalse(adapter.is_debug)
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertTrue(adapter.is_debug)
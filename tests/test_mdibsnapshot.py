@@ -0,0 +1,141 @@
+"""Tests for binary mdib snapshots."""
+
+import struct
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+from unittest import mock
+
+from lxml import etree
+
+from sdc11073 import definitions_sdc
+from sdc11073.mdib import ProviderMdib, mdibsnapshot, statecontainers
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types import pm_types
+from sdc11073.xml_types.basetypes import XMLTypeBase
+from tests import utils
+
+MDIB_FOLDER = Path(__file__).parent
+MDIB_PATHS = [MDIB_FOLDER / name for name in ('70041_MDIB_Final.xml',
+                                               '70041_MDIB_multi.xml',
+                                               'mdib_tns.xml',
+                                               'mdib_two_mds.xml',
+                                               'reference_mdib.xml')]
+
+
+def _mdib_content(mdib: ProviderMdib) -> tuple:
+    with mock.patch('time.time', return_value=1000.0):
+        node = mdib.reconstruct_mdib_with_context_states()[0]
+    md_description = node.find(pm.MdDescription)
+    md_state = node.find(pm.MdState)
+    # order of states is not defined
+    return utils.canonical_node(md_description), sorted(utils.canonical_node(state) for state in md_state)
+
+
+class TestMdibSnapshot(unittest.TestCase):
+    def test_round_trip(self):
+        """Verify that an mdib loaded from a snapshot is identical to the mdib loaded from xml."""
+        for path in MDIB_PATHS:
+            with self.subTest(path=path.name):
+                mdib = ProviderMdib.from_mdib_file(path, protocol_definition=definitions_sdc.SdcV1Definitions)
+                loaded_mdib = ProviderMdib.from_snapshot(mdib.to_snapshot())
+                loaded_mdib.sequence_id = mdib.sequence_id
+                self.assertEqual(_mdib_content(mdib), _mdib_content(loaded_mdib))
+                self.assertEqual(mdib._retrievability_episodic, loaded_mdib._retrievability_episodic)
+                self.assertEqual(dict(mdib.retrievability_periodic), dict(loaded_mdib.retrievability_periodic))
+                for descriptor in mdib.descriptions.objects:
+                    loaded_descriptor = loaded_mdib.descriptions.handle.get_one(descriptor.Handle)
+                    self.assertEqual(descriptor.source_mds, loaded_descriptor.source_mds)
+                    self.assertEqual(descriptor.parent_handle, loaded_descriptor.parent_handle)
+                for state in list(loaded_mdib.states.objects) + list(loaded_mdib.context_states.objects):
+                    self.assertIs(state.descriptor_container,
+                                  loaded_mdib.descriptions.handle.get_one(state.DescriptorHandle))
+
+    def test_instance_identifiers_have_default_node(self):
+        """Verify that decoded InstanceIdentifiers get the constructor default of their node attribute."""
+        mdib = ProviderMdib.from_mdib_file(MDIB_PATHS[0], protocol_definition=definitions_sdc.SdcV1Definitions)
+        descriptor = mdib.descriptions.NODETYPE.get_one(pm.PatientContextDescriptor)
+        with mdib.context_state_transaction() as mgr:
+            state = mgr.mk_context_state(descriptor.Handle)
+            state.Identification = [pm_types.InstanceIdentifier('abc', extension_string='1'),
+                                    pm_types.OperatingJurisdiction('def', extension_string='2')]
+        loaded_mdib = ProviderMdib.from_snapshot(mdib.to_snapshot())
+        identifiers = loaded_mdib.context_states.handle.get_one(state.Handle).Identification
+        self.assertEqual(2, len(identifiers))
+        for identifier in identifiers:
+            self.assertIsNone(identifier.node)
+        identifiers[0].node = etree.Element('test')
+        self.assertIsNone(identifiers[1].node)
+
+    def test_loaded_mdib_is_usable(self):
+        mdib = ProviderMdib.from_mdib_file(MDIB_PATHS[0], protocol_definition=definitions_sdc.SdcV1Definitions)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'mdib.snapshot'
+            path.write_bytes(mdib.to_snapshot())
+            loaded_mdib = ProviderMdib.from_snapshot_file(path)
+        state = loaded_mdib.states.NODETYPE.get(pm.NumericMetricState)[0]
+        with loaded_mdib.metric_state_transaction() as mgr:
+            new_state = mgr.get_state(state.DescriptorHandle)
+            new_state.mk_metric_value()
+        self.assertEqual(state.StateVersion + 1, loaded_mdib.states.descriptor_handle.get_one(
+            state.DescriptorHandle).StateVersion)
+        # the original mdib is not affected
+        self.assertEqual(state.StateVersion, mdib.states.descriptor_handle.get_one(
+            state.DescriptorHandle).StateVersion)
+
+    def test_invalid_snapshots(self):
+        mdib = ProviderMdib.from_mdib_file(MDIB_PATHS[0], protocol_definition=definitions_sdc.SdcV1Definitions)
+        data = mdib.to_snapshot()
+        header = struct.Struct('>8sHH')
+        magic, version, namespace_length = header.unpack_from(data)
+        body_offset = header.size + namespace_length
+
+        for invalid_data in (b'',
+                             b'<xml/>' * 10,
+                             header.pack(magic, version + 1, namespace_length) + data[header.size:],
+                             data[:body_offset] + b'no zlib data'):
+            with self.subTest(data=invalid_data[:20]):
+                self.assertRaises(mdibsnapshot.SnapshotError, ProviderMdib.from_snapshot, invalid_data)
+
+        # a snapshot with another participant model namespace can not be loaded into this mdib
+        empty_mdib = ProviderMdib(definitions_sdc.SdcV1Definitions)
+        other_namespace = b'urn:other'
+        other_data = header.pack(magic, version, len(other_namespace)) + other_namespace + data[body_offset:]
+        self.assertRaises(mdibsnapshot.SnapshotError, mdibsnapshot.load_snapshot, empty_mdib, other_data)
+
+    def test_changed_definition(self):
+        """Verify that a snapshot is rejected if it does not match the current container definitions."""
+        mdib = ProviderMdib.from_mdib_file(MDIB_PATHS[0], protocol_definition=definitions_sdc.SdcV1Definitions)
+        data = mdib.to_snapshot()
+        namespace_length = struct.unpack_from('>8sHH', data)[2]
+        body_offset = struct.calcsize('>8sHH') + namespace_length
+        document = zlib.decompress(data[body_offset:])
+        # rename a property in the layout of numeric metric states
+        changed_document = document.replace(b'"MetricValue"', b'"OtherValue"', 1)
+        self.assertNotEqual(document, changed_document)
+        changed_data = data[:body_offset] + zlib.compress(changed_document)
+        self.assertRaises(mdibsnapshot.SnapshotError, ProviderMdib.from_snapshot, changed_data)
+
+    def test_all_classes_are_initialized(self):
+        """Verify that decoded objects of every class have the instance attributes that the constructor sets."""
+        data_model = definitions_sdc.SdcV1Definitions.data_model
+        modules = (data_model.pm_types, statecontainers)
+        classes = {cls for module in modules for cls in vars(module).values()
+                   if isinstance(cls, type) and issubclass(cls, XMLTypeBase) and cls.__module__ == module.__name__}
+        self.assertGreater(len(classes), 50)
+        for cls in classes:
+            with self.subTest(cls=cls.__name__):
+                obj = mdibsnapshot._construct(cls)
+                encoder = mdibsnapshot._Encoder(modules)
+                value = encoder._encode(obj)
+                decoder = mdibsnapshot._Decoder(data_model, {'layouts': encoder.layouts,
+                                                             'classes': encoder.class_names,
+                                                             'enums': encoder.enum_names})
+                decoded = decoder._decode(value)
+                decoded_2 = decoder._decode(value)
+                self.assertIs(type(decoded), type(obj))
+                self.assertEqual(sorted(vars(obj)), sorted(vars(decoded)))
+                for name, attribute in vars(decoded).items():
+                    if isinstance(attribute, (list, dict, etree._Element)):  # every object has its own values
+                        self.assertIsNot(attribute, vars(decoded_2)[name])
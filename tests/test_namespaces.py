@@ -2,6 +2,8 @@
 
 import unittest
 
+from lxml import etree
+
 from sdc11073 import namespaces
 
 
@@ -28,3 +30,38 @@ class TestNamespaces(unittest.TestCase):
 
         bla_string = hlp.doc_name_from_qname(bla_tag)
         self.assertEqual('bla', bla_string)
+
+    def test_docname_from_qname(self):
+        pm_ns = namespaces.PrefixesEnum.PM.namespace
+        qname = namespaces.PrefixesEnum.PM.tag('State')
+        self.assertEqual('pm:State', namespaces.docname_from_qname(qname, {'pm': pm_ns}))
+        self.assertEqual('State', namespaces.docname_from_qname(qname, {None: pm_ns}))
+        self.assertEqual('State', namespaces.docname_from_qname(qname, {'msg': 'urn:other'}))
+        # if a namespace has two prefixes, the last one is used
+        self.assertEqual('p2:State', namespaces.docname_from_qname(qname, {'p1': pm_ns, 'p2': pm_ns}))
+
+    def test_qname_lookup_cache(self):
+        looked_up = []
+
+        def lookup(qname):  # noqa: ANN001, ANN202
+            looked_up.append(qname)
+            return None if qname.localname == 'Unknown' else qname
+
+        cache = namespaces.QNameLookupCache(lookup, max_size=3)
+        self.assertEqual(cache.get('a:Foo', {'a': 'urn:a'}), etree.QName('urn:a', 'Foo'))
+        self.assertEqual(cache.get('a:Foo', {'a': 'urn:a'}), etree.QName('urn:a', 'Foo'))
+        self.assertEqual(len(looked_up), 1)
+        # same text, different binding of prefix
+        self.assertEqual(cache.get('a:Foo', {'a': 'urn:b'}).namespace, 'urn:b')
+        self.assertEqual(cache.get('Foo', {None: 'urn:c'}).namespace, 'urn:c')
+        self.assertEqual(len(looked_up), 3)
+        # None results are not cached
+        self.assertIsNone(cache.get('a:Unknown', {'a': 'urn:a'}))
+        self.assertIsNone(cache.get('a:Unknown', {'a': 'urn:a'}))
+        self.assertEqual(len(looked_up), 5)
+        # cache is full, lookup is still correct
+        self.assertEqual(cache.get('a:Bar', {'a': 'urn:a'}).localname, 'Bar')
+        self.assertEqual(cache.get('a:Bar', {'a': 'urn:a'}).localname, 'Bar')
+        self.assertEqual(len(looked_up), 7)
+        with self.assertRaises(KeyError):
+            cache.get('x:Foo', {'a': 'urn:a'})
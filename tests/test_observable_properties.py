@@ -1,6 +1,8 @@
 """Unit tests for observable properties."""
 
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 from sdc11073.observableproperties import observables, valuecollector
@@ -27,3 +29,73 @@ class TestValueCollector(unittest.TestCase):
         self.assertEqual(collector.result(0.01), mocked.mock)
         collector.restart()
         self.assertRaises(RuntimeError, collector.restart)
+
+
+class TestObservableProperty(unittest.TestCase):
+    class _Observed:
+        prop = observables.ObservableProperty()
+
+    def test_bind_unbind(self):
+        observed = self._Observed()
+        observed.prop = 1  # no observers
+        self.assertEqual(observed.prop, 1)
+        received = []
+
+        class Observer:
+            def on_prop(self, value):
+                received.append(value)
+
+        observer = Observer()
+        observables.bind(observed, prop=observer.on_prop)
+        observables.strongbind(observed, prop=lambda value: received.append(-value))
+        observed.prop = 2
+        observed.prop = 2  # same value, no notification
+        self.assertEqual(received, [2, -2])
+
+        observables.unbind(observed, prop=observer.on_prop)
+        observed.prop = 3
+        self.assertEqual(received, [2, -2, -3])
+
+        # garbage collected observers are removed
+        observer = Observer()
+        observables.bind(observed, prop=observer.on_prop)
+        del observer
+        observed.prop = 4
+        self.assertEqual(received, [2, -2, -3, -4])
+        self.assertEqual(len(observed._property_instance_data[self._Observed.prop]._observers), 1)
+
+    def test_bind_during_notification(self):
+        observed = self._Observed()
+        received = []
+
+        def on_prop(value):
+            received.append(value)
+            observables.strongbind(observed, prop=received.append)
+
+        observables.strongbind(observed, prop=on_prop)
+        observed.prop = 1
+        self.assertEqual(received, [1])  # observer bound during notification is not called
+        observed.prop = 2
+        self.assertEqual(received, [1, 2, 2])
+
+    def test_async_delivery_coalesces(self):
+        observed = self._Observed()
+        received = []
+        first_call = threading.Event()
+        release = threading.Event()
+
+        def on_prop(value):
+            received.append(value)
+            first_call.set()
+            release.wait(5)
+
+        observables.strongbind(observed, prop=on_prop)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            observables.set_executor(observed, executor, 'prop')
+            observed.prop = 1  # returns immediately
+            self.assertTrue(first_call.wait(5))
+            for i in range(2, 10):
+                observed.prop = i
+            release.set()
+        self.assertEqual(received, [1, 9])
+        self.assertEqual(observed.prop, 9)
@@ -0,0 +1,175 @@
+"""Tests for the scheduler and for many providers that run in one SdcProviderHost."""
+
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from tutorial.productandroles.waveformprovider.waveformproviderimpl import GenericWaveformProvider
+
+from sdc11073 import observableproperties, wsdiscovery
+from sdc11073.consumer.consumerimpl import SdcConsumer, default_components_factory
+from sdc11073.dispatch import RequestDispatcher
+from sdc11073.exceptions import ApiUsageError
+from sdc11073.loghelper import basic_logging_setup
+from sdc11073.mdib import ProviderMdib
+from sdc11073.observableproperties import ValuesCollector
+from sdc11073.provider import RoleProviderComponents, SdcProviderHost, provider_components_sync_factory
+from sdc11073.provider.scheduler import Scheduler
+from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
+from tests import utils
+
+MDIB_PATH = Path(__file__).parent / '70041_MDIB_Final.xml'
+PROVIDER_COUNT = 3
+WAVEFORM_COMPONENTS = RoleProviderComponents(waveform_provider_class=GenericWaveformProvider)
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.scheduler.start()
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_periodic_jobs(self):
+        fast_calls = []
+        slow_calls = []
+        fast_job = self.scheduler.add_job(lambda: fast_calls.append(time.monotonic()), 0.02, start_delay=0)
+        self.scheduler.add_job(lambda: slow_calls.append(time.monotonic()), 0.1)
+        time.sleep(0.5)
+        fast_job.cancel()
+        count = len(fast_calls)
+        time.sleep(0.1)
+        self.assertEqual(count, len(fast_calls))
+        self.assertGreater(count, 15)
+        self.assertGreaterEqual(len(slow_calls), 3)
+        self.assertLess(len(slow_calls), 7)
+
+    def test_failing_job_keeps_running(self):
+        calls = []
+
+        def _fail():
+            calls.append(1)
+            raise RuntimeError('expected failure')
+
+        job = self.scheduler.add_job(_fail, 0.02, start_delay=0)
+        time.sleep(0.2)
+        job.cancel()
+        time.sleep(0.1)  # a run that is in progress is counted after the logged exception
+        self.assertGreater(len(calls), 3)
+        self.assertEqual(len(calls), job.runs)
+
+    def test_missed_runs_are_skipped(self):
+        job = self.scheduler.add_job(lambda: time.sleep(0.1), 0.02, start_delay=0)
+        time.sleep(0.5)
+        job.cancel()
+        self.assertLess(job.runs, 7)
+        self.assertGreater(job.skipped_runs, 10)
+        self.assertRaises(ValueError, self.scheduler.add_job, lambda: None, 0)
+
+
+class TestSdcProviderHost(unittest.TestCase):
+    def setUp(self):
+        basic_logging_setup()
+        self.wsd = wsdiscovery.WSDiscovery('127.0.0.1')
+        self.wsd.start()
+        self.host = SdcProviderHost(self.wsd)
+        self.host.start_all()
+        self.consumers = []
+
+    def tearDown(self):
+        for consumer in self.consumers:
+            consumer.stop_all()
+        self.host.stop_all()
+        self.wsd.stop()
+
+    def _add_provider(self, index: int, **kwargs):  # noqa: ANN003, ANN202
+        mdib = ProviderMdib.from_mdib_file(str(MDIB_PATH))
+        model = ThisModelType(manufacturer='Example Manufacturer', model_name='HostedDevice', model_number='1.0')
+        device = ThisDeviceType(friendly_name=f'hosted device {index}', serial_number=str(index))
+        provider = self.host.add_provider(model, device, mdib, log_prefix=f'provider {index}: ', **kwargs)
+        provider.set_location(utils.random_location())
+        return provider
+
+    def _connect(self, provider, **kwargs):  # noqa: ANN001, ANN003, ANN202
+        consumer = SdcConsumer(provider.get_xaddrs()[0], sdc_definitions=provider.mdib.sdc_definitions,
+                               ssl_context_container=None, **kwargs)
+        consumer.start_all()
+        self.consumers.append(consumer)
+        return consumer
+
+    def test_providers_share_infrastructure(self):
+        thread_count = threading.active_count()
+        providers = [self._add_provider(i, role_provider_components=WAVEFORM_COMPONENTS, start_rtsample_loop=False)
+                     for i in range(PROVIDER_COUNT)]
+        # no housekeeping, waveform, periodic reports or event loop threads per provider
+        self.assertEqual(thread_count, threading.active_count())
+        self.assertEqual(1, len({p.get_xaddrs()[0].rsplit('/', 1)[0] for p in providers}))  # one http server
+
+        for provider in providers:
+            provider.waveform_provider.provide_waveforms()
+            provider.start_rt_sample_loop()
+            self.assertRaises(ApiUsageError, provider.start_rt_sample_loop)
+        consumers = [self._connect(provider) for provider in providers]
+        waveform_collectors = [ValuesCollector(consumer, 'waveform_report', 3) for consumer in consumers]
+        metric_collectors = [ValuesCollector(consumer, 'episodic_metric_report', 1) for consumer in consumers]
+        for i, provider in enumerate(providers):
+            utils.set_metric_value(provider, i)
+        for waveform_collector, metric_collector in zip(waveform_collectors, metric_collectors):
+            waveform_collector.result(timeout=5)
+            metric_collector.result(timeout=5)
+
+        # a removed provider does not affect the others, its path can be used again
+        self.host.remove_provider(providers[0])
+        self.assertNotIn(providers[0], self.host.providers)
+        collector = ValuesCollector(consumers[1], 'waveform_report', 3)
+        collector.result(timeout=5)
+        again = self._add_provider(0, epr=providers[0].path_prefix)
+        self.assertEqual(providers[0].get_xaddrs(), again.get_xaddrs())
+
+    def test_periodic_reports(self):
+        provider = self._add_provider(0, periodic_reports_interval=0.2)
+        consumer = self._connect(provider)
+        collector = ValuesCollector(consumer, 'periodic_metric_report', 2)
+        for value in range(3):
+            utils.set_metric_value(provider, value)
+            time.sleep(0.3)
+        collector.result(timeout=5)
+
+    def test_unresponsive_consumer_does_not_block_scheduler(self):
+        provider = self._add_provider(0, role_provider_components=WAVEFORM_COMPONENTS, start_rtsample_loop=False)
+        provider.waveform_provider.provide_waveforms()
+        components = default_components_factory()
+        components.action_dispatcher_class = RequestDispatcher  # handles notifications in the http server thread
+        consumer = self._connect(provider, components=components)
+        release = threading.Event()
+        # the consumer does not respond to waveform notifications until release is set
+        observableproperties.strongbind(consumer, waveform_report=lambda _: release.wait(10))
+        provider.start_rt_sample_loop()
+        ticks = []
+        job = self.host.scheduler.add_job(lambda: ticks.append(time.monotonic()), 0.05)
+        try:
+            time.sleep(1)
+        finally:
+            job.cancel()
+            release.set()
+        # sending the waveforms did not block the scheduler thread
+        self.assertGreater(len(ticks), 15)
+
+    def test_adaptive_waveform_interval(self):
+        provider = self._add_provider(0, role_provider_components=WAVEFORM_COMPONENTS, start_rtsample_loop=False)
+        provider.waveform_provider.provide_waveforms()
+        # a subscriber with a round trip time of one second makes the controller widen the interval
+        controller = provider.waveform_provider.enable_adaptive_interval(
+            min_interval=0.05, max_interval=0.2, round_trip_times=lambda: {'subscriber': SimpleNamespace(avg=1.0)})
+        provider.start_rt_sample_loop()
+        job = provider._rt_sample_job
+        self.assertEqual(0.1, job.period)  # notifications_interval of the waveform provider
+        self.assertTrue(utils.wait_for(lambda: job.period == 0.2, timeout=5))
+        self.assertEqual(0.2, provider.waveform_provider.notifications_interval)
+        self.assertGreater(controller.widen_count, 0)
+
+    def test_sync_subscription_managers_are_rejected(self):
+        self.assertRaises(ApiUsageError, self._add_provider, 0, components=provider_components_sync_factory())
@@ -0,0 +1,149 @@
+"""Tests for the deferred request dispatcher of the consumer."""
+
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+from sdc11073.consumer.request_handler_deferred import (
+    DispatchKeyRegistryDeferred,
+    EmptyResponse,
+    NotificationPriority,
+    OverloadPolicy,
+    PriorityDispatchKeyRegistryDeferred,
+    lane_per_action,
+)
+from sdc11073.dispatch import DispatchKey
+from sdc11073.xml_types.actions import Actions
+from tests import utils
+
+ACTION_A = 'http://x/y/A'
+ACTION_B = 'http://x/y/B'
+ACTION_WF = 'http://x/y/Waveform'
+
+
+def _mk_request(action: str, number: int, mdib_version: int | None = None) -> SimpleNamespace:
+    mdib_version_group = None if mdib_version is None else SimpleNamespace(mdib_version=mdib_version)
+    message_data = SimpleNamespace(action=action, q_name=None, mdib_version_group=mdib_version_group)
+    return SimpleNamespace(message_data=message_data, number=number)
+
+
+def test_default_keeps_order_of_reception():
+    dispatcher = DispatchKeyRegistryDeferred('t', worker_count=3)
+    handled = []
+    for action in (ACTION_A, ACTION_B):
+        dispatcher.register_post_handler(DispatchKey(action, None), lambda request: handled.append(request.number))
+    for i in range(100):
+        response = dispatcher.on_post(_mk_request(ACTION_A if i % 2 else ACTION_B, i))
+        assert isinstance(response, EmptyResponse)
+    assert utils.wait_for(lambda: len(handled) == 100)
+    assert handled == list(range(100))
+    statistics = dispatcher.get_statistics()
+    assert statistics[None].processed == 100
+    assert statistics[None].latency_avg is not None
+
+
+def test_lane_per_action_runs_lanes_in_parallel():
+    dispatcher = DispatchKeyRegistryDeferred('t', worker_count=2, lane_key=lane_per_action)
+    release_a = threading.Event()
+    handled = {ACTION_A: [], ACTION_B: []}
+
+    def on_a(request):  # noqa: ANN001
+        release_a.wait(5)
+        handled[ACTION_A].append(request.number)
+
+    dispatcher.register_post_handler(DispatchKey(ACTION_A, None), on_a)
+    dispatcher.register_post_handler(DispatchKey(ACTION_B, None), lambda r: handled[ACTION_B].append(r.number))
+    for i in range(5):
+        dispatcher.on_post(_mk_request(ACTION_A, i))
+    for i in range(5):
+        dispatcher.on_post(_mk_request(ACTION_B, i))
+    # lane B is not blocked by the slow handler of lane A
+    assert utils.wait_for(lambda: len(handled[ACTION_B]) == 5)
+    assert handled[ACTION_A] == []
+    release_a.set()
+    assert utils.wait_for(lambda: len(handled[ACTION_A]) == 5)
+    assert handled[ACTION_A] == list(range(5))
+    assert handled[ACTION_B] == list(range(5))
+
+
+def test_drop_oldest_droppable_on_overload():
+    dispatcher = DispatchKeyRegistryDeferred(
+        't',
+        max_queue_size=3,
+        lane_key=lane_per_action,
+        overload_policy=OverloadPolicy.DROP_OLDEST_DROPPABLE,
+        droppable_actions=[ACTION_WF],
+    )
+    release = threading.Event()
+    handled = []
+
+    def handler(request):  # noqa: ANN001
+        release.wait(5)
+        handled.append((request.message_data.action, request.number))
+
+    for action in (ACTION_A, ACTION_WF):
+        dispatcher.register_post_handler(DispatchKey(action, None), handler)
+    dispatcher.on_post(_mk_request(ACTION_A, 0))  # blocks the worker
+    assert utils.wait_for(lambda: dispatcher.queue_depth == 0)
+    for i in range(1, 4):
+        dispatcher.on_post(_mk_request(ACTION_WF, i))
+    assert dispatcher.queue_depth == 3
+    dispatcher.on_post(_mk_request(ACTION_A, 4))  # queue is full => oldest waveform is dropped
+    assert dispatcher.queue_depth == 3
+    release.set()
+    assert utils.wait_for(lambda: len(handled) == 4)
+    assert (ACTION_WF, 1) not in handled
+    assert dispatcher.get_statistics()[ACTION_WF].dropped == 1
+
+
+def test_priority_lanes():
+    dispatcher = PriorityDispatchKeyRegistryDeferred('t')
+    release = threading.Event()
+    handled = []
+
+    def handler(request):  # noqa: ANN001
+        release.wait(5)
+        handled.append(request.message_data.action)
+
+    for action in (Actions.Waveform, Actions.EpisodicAlertReport, Actions.EpisodicMetricReport):
+        dispatcher.register_post_handler(DispatchKey(action, None), handler)
+    dispatcher.on_post(_mk_request(Actions.Waveform, 0))  # blocks the worker
+    assert utils.wait_for(lambda: dispatcher.queue_depth == 0)
+    for i in range(1, 5):
+        dispatcher.on_post(_mk_request(Actions.Waveform, i))
+    dispatcher.on_post(_mk_request(Actions.EpisodicMetricReport, 5))
+    dispatcher.on_post(_mk_request(Actions.EpisodicAlertReport, 6))
+    release.set()
+    assert utils.wait_for(lambda: len(handled) == 7)
+    assert handled == [Actions.Waveform, Actions.EpisodicAlertReport, Actions.EpisodicMetricReport] + [
+        Actions.Waveform
+    ] * 4
+    statistics = dispatcher.get_statistics()
+    assert statistics[NotificationPriority.LOW].processed == 5
+    assert statistics[NotificationPriority.HIGH].processed == 1
+
+
+def test_pending_mdib_versions():
+    dispatcher = PriorityDispatchKeyRegistryDeferred('t', max_queue_size=3)
+    release = threading.Event()
+    handled = []
+
+    def handler(request):  # noqa: ANN001
+        release.wait(5)
+        handled.append(request.number)
+
+    for action in (Actions.Waveform, Actions.EpisodicAlertReport, Actions.EpisodicMetricReport):
+        dispatcher.register_post_handler(DispatchKey(action, None), handler)
+    dispatcher.on_post(_mk_request(Actions.EpisodicMetricReport, 1, mdib_version=1))  # blocks the worker
+    assert utils.wait_for(lambda: dispatcher.queue_depth == 0)
+    dispatcher.on_post(_mk_request(Actions.Waveform, 2, mdib_version=2))
+    dispatcher.on_post(_mk_request(Actions.Waveform, 3, mdib_version=3))
+    dispatcher.on_post(_mk_request(Actions.EpisodicMetricReport, 4, mdib_version=4))
+    dispatcher.on_post(_mk_request(Actions.EpisodicAlertReport, 5, mdib_version=5))  # queue full => drops waveform 2
+    # the request in process and the queued requests are pending, the dropped waveform is not
+    assert dispatcher.pending_mdib_versions() == {1, 3, 4, 5}
+    release.set()
+    assert utils.wait_for(lambda: len(handled) == 4)
+    assert handled == [1, 5, 4, 3]
+    assert utils.wait_for(lambda: not dispatcher.pending_mdib_versions())
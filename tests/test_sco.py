@@ -0,0 +1,163 @@
+"""Tests for the execution of delayed operations in ScoOperationsRegistry."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from sdc11073.provider.operations import ExecuteResult
+from sdc11073.provider.sco import Histogram, ScoOperationsRegistry
+from sdc11073.xml_types.msg_types import InvocationState
+from tests import utils
+
+
+class _Operation:
+    def __init__(self, handle: str, target: str, block: threading.Event | None = None):
+        self.handle = handle
+        self.operation_target_handle = target
+        self.delayed_processing = True
+        self.executed = []
+        self._block = block
+
+    def execute_operation(self, request, operation_request) -> ExecuteResult:  # noqa: ANN001, ARG002
+        if self._block is not None:
+            self._block.wait(5)
+        if operation_request.argument == 'fail':
+            raise ValueError('failed')
+        self.executed.append(operation_request.argument)
+        return ExecuteResult(self.operation_target_handle, InvocationState.FINISHED)
+
+    def check_timeout(self):
+        pass
+
+
+class _SetService:
+    def __init__(self, delay: float = 0.0):
+        self.notifications = []
+        self.delay = delay
+
+    def notify_operation(self, operation, transaction_id, invocation_state, *args, **kwargs):  # noqa: ANN001, ANN002, ANN003, ARG002
+        time.sleep(self.delay)
+        self.notifications.append((operation.handle, transaction_id, invocation_state))
+
+
+def _mk_registry(set_service: _SetService, **kwargs) -> ScoOperationsRegistry:  # noqa: ANN003
+    mdib = SimpleNamespace(mdib_version_group=None)
+    registry = ScoOperationsRegistry(set_service, None, mdib, SimpleNamespace(Handle='sco'), 'test', **kwargs)
+    registry.start_worker()
+    return registry
+
+
+def _request(argument: str) -> SimpleNamespace:
+    return SimpleNamespace(argument=argument)
+
+
+def test_order_per_target_and_parallel_targets():
+    set_service = _SetService()
+    registry = _mk_registry(set_service, worker_count=2, max_queue_size=100)
+    try:
+        block = threading.Event()
+        blocked_op = _Operation('op_a', 'target_a', block)
+        op_a2 = _Operation('op_a2', 'target_a')
+        op_b = _Operation('op_b', 'target_b')
+        for i in range(5):
+            registry.handle_operation_request(blocked_op, None, _request(f'a{i}'), i)
+            registry.handle_operation_request(op_a2, None, _request(f'a2_{i}'), 10 + i)
+        for i in range(5):
+            assert registry.handle_operation_request(op_b, None, _request(f'b{i}'), 20 + i) == InvocationState.WAIT
+        # target_b is processed while the worker of target_a is blocked
+        assert utils.wait_for(lambda: len(op_b.executed) == 5)
+        assert op_b.executed == [f'b{i}' for i in range(5)]
+        assert op_a2.executed == []
+        block.set()
+        assert utils.wait_for(lambda: len(op_a2.executed) == 5)
+        assert blocked_op.executed == [f'a{i}' for i in range(5)]
+        assert op_a2.executed == [f'a2_{i}' for i in range(5)]
+        for tr_id in range(5):
+            states = [n[2] for n in set_service.notifications if n[1] == tr_id]
+            assert states == [InvocationState.WAIT, InvocationState.START, InvocationState.FINISHED]
+        statistics = registry.get_statistics()
+        assert statistics.processed == 15
+        assert statistics.queue_depth == 0
+        assert statistics.max_queue_depth > 1
+        assert statistics.latency_histogram.count == 15
+        assert statistics.queue_depth_histogram.count == 15
+    finally:
+        registry.stop_worker()
+
+
+def test_async_notifications_and_failed_operation():
+    set_service = _SetService(delay=0.05)
+    registry = _mk_registry(set_service, async_notifications=True, max_queue_size=100)
+    op = _Operation('op', 'target')
+    started = time.monotonic()
+    for i in range(3):
+        registry.handle_operation_request(op, None, _request('fail' if i == 1 else str(i)), i)
+    assert utils.wait_for(lambda: registry.get_statistics().processed == 3)
+    # the worker did not wait until the 9 notifications were sent
+    assert time.monotonic() - started < 9 * set_service.delay
+    registry.stop_worker()  # sends pending notifications
+    assert [n[2] for n in set_service.notifications if n[1] == 1] == [
+        InvocationState.WAIT, InvocationState.START, InvocationState.FAILED]
+    assert [n[1] for n in set_service.notifications] == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+    assert registry.get_statistics().failed == 1
+
+
+def test_failing_notification_releases_lane():
+    set_service = _SetService()
+    notify_operation = set_service.notify_operation
+
+    def failing_notify_operation(operation, transaction_id, *args, **kwargs):  # noqa: ANN001, ANN002, ANN003
+        if transaction_id == 0:
+            raise ConnectionError('notification failed')
+        notify_operation(operation, transaction_id, *args, **kwargs)
+
+    set_service.notify_operation = failing_notify_operation
+    registry = _mk_registry(set_service, max_queue_size=100)
+    op = _Operation('op', 'target')
+    try:
+        registry.handle_operation_request(op, None, _request('0'), 0)
+        registry.handle_operation_request(op, None, _request('1'), 1)
+        # the exception in the WAIT notification of the first operation does not block the target
+        assert utils.wait_for(lambda: registry.get_statistics().processed == 2)
+        assert op.executed == ['1']
+        statistics = registry.get_statistics()
+        assert statistics.failed == 1
+        assert statistics.queue_depth == 0
+        assert [n[2] for n in set_service.notifications] == [
+            InvocationState.WAIT, InvocationState.START, InvocationState.FINISHED]
+    finally:
+        registry.stop_worker()
+
+
+def test_full_queue():
+    set_service = _SetService()
+    registry = _mk_registry(set_service, max_queue_size=1, enqueue_timeout=0.1)
+    block = threading.Event()
+    op = _Operation('op', 'target', block)
+    try:
+        registry.handle_operation_request(op, None, _request('0'), 0)
+        assert utils.wait_for(lambda: registry.get_statistics().queue_depth == 0)  # worker waits in execute_operation
+        registry.handle_operation_request(op, None, _request('1'), 1)
+        with pytest.raises(queue.Full):
+            registry.handle_operation_request(op, None, _request('2'), 2)
+    finally:
+        block.set()
+        registry.stop_worker()
+    assert op.executed == ['0', '1']
+
+
+def test_histogram():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 5, 100):
+        histogram.add(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.max == 100
+    assert histogram.avg == pytest.approx(26.625)
+    copied = histogram.copy()
+    histogram.add(1)
+    assert copied.counts == [2, 1, 1]
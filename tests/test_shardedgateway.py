@@ -0,0 +1,138 @@
+"""Tests for the gateway that distributes consumers over worker processes."""
+
+import queue
+import time
+import unittest
+from decimal import Decimal
+from multiprocessing import active_children
+from pathlib import Path
+from unittest import mock
+
+from sdc11073 import wsdiscovery
+from sdc11073.consumer.shardedgateway import ShardedConsumerGateway
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.loghelper import basic_logging_setup
+from sdc11073.mdib import ProviderMdib
+from sdc11073.provider import SdcProviderHost
+from sdc11073.wsdiscovery.service import Service
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types import pm_types
+from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
+from tests import utils
+
+MDIB_PATH = Path(__file__).parent / '70041_MDIB_Final.xml'
+PROVIDER_COUNT = 3
+
+
+def _service(provider) -> Service:  # noqa: ANN001
+    return Service(list(SdcV1Definitions.MedicalDeviceTypesFilter), None, provider.get_xaddrs(), provider.epr_urn, '1')
+
+
+class TestShardedConsumerGateway(unittest.TestCase):
+    def setUp(self):
+        basic_logging_setup()
+        self.wsd = wsdiscovery.WSDiscovery('127.0.0.1')
+        self.wsd.start()
+        self.provider_host = SdcProviderHost(self.wsd)
+        self.provider_host.start_all()
+        model = ThisModelType(manufacturer='Example Manufacturer', model_name='HostedDevice', model_number='1.0')
+        self.providers = []
+        for i in range(PROVIDER_COUNT):
+            device = ThisDeviceType(friendly_name=f'hosted device {i}', serial_number=str(i))
+            mdib = ProviderMdib.from_mdib_file(str(MDIB_PATH))
+            self.providers.append(self.provider_host.add_provider(model, device, mdib, start_rtsample_loop=False))
+        self.gateway = ShardedConsumerGateway(self.wsd, shard_count=2, slot_count=200, waveform_buffer_count=20,
+                                              waveform_capacity=100)
+        self.gateway.start()
+
+    def tearDown(self):
+        self.gateway.stop()
+        self.provider_host.stop_all()
+        self.wsd.stop()
+
+    def test_values_in_shared_memory(self):
+        self.gateway.update_devices([_service(p) for p in self.providers])
+        self.assertTrue(self.gateway.wait_connected([p.epr_urn for p in self.providers]))
+        self.assertEqual([2, 1], self.gateway.shard_loads)
+        provider = self.providers[2]
+        metric_handle = provider.mdib.descriptions.NODETYPE.get(pm.NumericMetricDescriptor)[0].Handle
+        alert_handle = provider.mdib.descriptions.NODETYPE.get(pm.AlertConditionDescriptor)[0].Handle
+        waveform_handle = provider.mdib.descriptions.NODETYPE.get(pm.RealTimeSampleArrayMetricDescriptor)[0].Handle
+        self.assertIn(metric_handle, self.gateway.handles(provider.epr_urn))
+
+        with provider.mdib.metric_state_transaction() as mgr:
+            state = mgr.get_state(metric_handle)
+            if state.MetricValue is None:
+                state.mk_metric_value()
+            state.MetricValue.Value = Decimal('12.5')
+        with provider.mdib.alert_state_transaction() as mgr:
+            state = mgr.get_state(alert_handle)
+            state.ActivationState = pm_types.AlertActivation.ON
+            state.Presence = True
+        with provider.mdib.rt_sample_state_transaction() as mgr:
+            state = mgr.get_state(waveform_handle)
+            if state.MetricValue is None:
+                state.mk_metric_value()
+            state.MetricValue.Samples = [Decimal(i) for i in range(10)]
+            state.MetricValue.DeterminationTime = time.time()
+
+        waveform = utils.wait_for(lambda: self.gateway.read_waveform(provider.epr_urn, waveform_handle))
+        self.assertEqual([float(i) for i in range(10)], waveform.samples)
+        self.assertEqual(provider.mdib.mdib_version, waveform.mdib_version)
+        self.assertEqual(12.5, self.gateway.read_metric(provider.epr_urn, metric_handle).value)
+        alert = self.gateway.read_alert(provider.epr_urn, alert_handle)
+        self.assertIs(True, alert.presence)
+        self.assertEqual(pm_types.AlertActivation.ON, alert.activation_state)
+        self.assertIsNone(self.gateway.read_metric('urn:uuid:unknown', metric_handle))
+
+    def test_rebalance_on_leave(self):
+        self.gateway.update_devices([_service(p) for p in self.providers])
+        self.assertTrue(self.gateway.wait_connected([p.epr_urn for p in self.providers]))
+        devices = self.gateway.devices
+        shard_1_device = next(epr for epr, device in devices.items() if device.shard == 1)
+        # remove the only device of shard 1, one device of shard 0 is moved to shard 1
+        self.gateway.update_devices([_service(p) for p in self.providers if p.epr_urn != shard_1_device])
+        self.assertEqual([1, 1], self.gateway.shard_loads)
+        self.assertIsNone(self.gateway.read_metric(shard_1_device, 'any'))
+        remaining = list(self.gateway.devices)
+        self.assertTrue(self.gateway.wait_connected(remaining))
+        for epr in remaining:
+            self.assertGreater(len(self.gateway.handles(epr)), 0)
+
+
+class TestShardedConsumerGatewayStart(unittest.TestCase):
+    def setUp(self):
+        basic_logging_setup()
+        self.wsd = wsdiscovery.WSDiscovery('127.0.0.1')
+        self.wsd.start()
+
+    def tearDown(self):
+        self.wsd.stop()
+
+    def test_start_timeout_cleans_up(self):
+        shm_files = set(Path('/dev/shm').glob('psm_*'))  # SharedMemory segments
+        gateway = ShardedConsumerGateway(self.wsd, shard_count=2)
+        # the shard processes cannot report 'started' within the timeout
+        self.assertRaises(queue.Empty, gateway.start, timeout=0)
+        self.assertFalse(gateway.is_running)
+        self.assertEqual([], [p for p in active_children() if p.name.startswith('sdc_gateway_shard')])
+        self.assertEqual(shm_files, set(Path('/dev/shm').glob('psm_*')))
+
+    def test_discovery_callbacks_of_application_are_kept(self):
+        on_hello = mock.Mock()
+        on_bye = mock.Mock()
+        self.wsd.set_remote_service_hello_callback(on_hello)
+        self.wsd.set_remote_service_bye_callback(on_bye)
+        gateway = ShardedConsumerGateway(self.wsd, shard_count=1)
+        gateway.start()
+        gateway.stop()
+        self.assertIs(on_hello, self.wsd._remote_service_hello_callback)
+        self.assertIs(on_bye, self.wsd._remote_service_bye_callback)
+
+        gateway = ShardedConsumerGateway(self.wsd, shard_count=1, auto_discovery=True)
+        gateway.start()
+        try:
+            self.assertEqual(gateway._on_hello, self.wsd._remote_service_hello_callback)
+            self.assertEqual(gateway._on_bye, self.wsd._remote_service_bye_callback)
+        finally:
+            gateway.stop()
@@ -0,0 +1,109 @@
+"""Tests for descriptors that are shared by many ProviderMdib instances."""
+
+import unittest
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from sdc11073 import definitions_sdc
+from sdc11073.exceptions import ApiUsageError
+from sdc11073.mdib import ProviderMdib
+from sdc11073.mdib.shareddescriptors import SharedDescriptorSet
+from sdc11073.xml_types import pm_qnames as pm
+from tests import utils
+
+MDIB_FOLDER = Path(__file__).parent
+MDIB_PATHS = [MDIB_FOLDER / name for name in ('70041_MDIB_Final.xml',
+                                               'mdib_tns.xml',
+                                               'mdib_two_mds.xml')]
+
+
+class TestSharedDescriptors(unittest.TestCase):
+    def setUp(self):
+        self.xml_mdib = ProviderMdib.from_mdib_file(MDIB_PATHS[0],
+                                                    protocol_definition=definitions_sdc.SdcV1Definitions)
+        self.shared_descriptors = SharedDescriptorSet(self.xml_mdib)
+
+    def test_same_content(self):
+        """Verify that an mdib with shared descriptors has the same content as the mdib loaded from xml."""
+        for path in MDIB_PATHS:
+            with self.subTest(path=path.name):
+                xml_mdib = ProviderMdib.from_mdib_file(path, protocol_definition=definitions_sdc.SdcV1Definitions)
+                mdib = ProviderMdib.from_shared_descriptors(SharedDescriptorSet(xml_mdib))
+                mdib.sequence_id = xml_mdib.sequence_id
+                self.assertTrue(mdib.has_shared_descriptors)
+                self.assertFalse(xml_mdib.has_shared_descriptors)
+                with mock.patch('time.time', return_value=1000.0):
+                    xml_node = xml_mdib.reconstruct_md_description()[0]
+                    node = mdib.reconstruct_md_description()[0]
+                self.assertEqual(utils.canonical_node(xml_node), utils.canonical_node(node))
+                self.assertEqual(len(xml_mdib.states.objects), len(mdib.states.objects))
+                self.assertEqual(len(xml_mdib.context_states.objects), len(mdib.context_states.objects))
+                self.assertEqual(xml_mdib._retrievability_episodic, mdib._retrievability_episodic)
+                self.assertEqual(dict(xml_mdib.retrievability_periodic), dict(mdib.retrievability_periodic))
+
+    def test_own_states(self):
+        mdib1 = ProviderMdib.from_shared_descriptors(self.shared_descriptors)
+        mdib2 = ProviderMdib.from_shared_descriptors(self.shared_descriptors)
+        self.assertIs(mdib1.descriptions, mdib2.descriptions)
+        metric_state = mdib1.states.NODETYPE.get(pm.NumericMetricState)[0]
+        handle = metric_state.DescriptorHandle
+        self.assertIsNot(metric_state, mdib2.states.descriptor_handle.get_one(handle))
+        self.assertIs(metric_state.descriptor_container, mdib1.descriptions.handle.get_one(handle))
+
+        with mdib1.metric_state_transaction() as mgr:
+            state = mgr.get_state(handle)
+            state.mk_metric_value()
+            state.MetricValue.Value = Decimal(42)
+        self.assertEqual(Decimal(42), mdib1.states.descriptor_handle.get_one(handle).MetricValue.Value)
+        self.assertEqual(metric_state.StateVersion + 1, mdib1.states.descriptor_handle.get_one(handle).StateVersion)
+        self.assertEqual(metric_state.StateVersion, mdib2.states.descriptor_handle.get_one(handle).StateVersion)
+        self.assertTrue(mdib1.has_shared_descriptors)
+
+    def test_copy_on_write(self):
+        mdib1 = ProviderMdib.from_shared_descriptors(self.shared_descriptors)
+        mdib2 = ProviderMdib.from_shared_descriptors(self.shared_descriptors)
+        descriptor = mdib1.descriptions.NODETYPE.get(pm.NumericMetricDescriptor)[0]
+        handle = descriptor.Handle
+        mdib1.copy_shared_descriptors()
+        self.assertFalse(mdib1.has_shared_descriptors)
+        # order of children is kept
+        for parent in mdib2.descriptions.objects:
+            self.assertEqual([d.Handle for d in mdib2.descriptions.parent_handle.get(parent.Handle, [])],
+                             [d.Handle for d in mdib1.descriptions.parent_handle.get(parent.Handle, [])])
+
+        with mdib1.descriptor_transaction() as mgr:
+            new_descriptor = mgr.get_descriptor(handle)
+            new_descriptor.DeterminationPeriod = 42.0
+        self.assertFalse(mdib1.has_shared_descriptors)
+        self.assertTrue(mdib2.has_shared_descriptors)
+        own_descriptor = mdib1.descriptions.handle.get_one(handle)
+        self.assertIsNot(descriptor, own_descriptor)
+        self.assertEqual(42.0, own_descriptor.DeterminationPeriod)
+        self.assertEqual(descriptor.DescriptorVersion + 1, own_descriptor.DescriptorVersion)
+        # all states of mdib1 reference the own descriptors
+        for state in list(mdib1.states.objects) + list(mdib1.context_states.objects):
+            self.assertIs(state.descriptor_container, mdib1.descriptions.handle.get_one(state.DescriptorHandle))
+        self.assertEqual(own_descriptor.DescriptorVersion,
+                         mdib1.states.descriptor_handle.get_one(handle).DescriptorVersion)
+        # shared descriptors and states of mdib2 are not changed
+        self.assertIs(descriptor, mdib2.descriptions.handle.get_one(handle))
+        self.assertNotEqual(42.0, descriptor.DeterminationPeriod)
+        self.assertIs(descriptor, mdib2.states.descriptor_handle.get_one(handle).descriptor_container)
+        self.assertEqual(descriptor.DescriptorVersion, mdib2.states.descriptor_handle.get_one(handle).DescriptorVersion)
+
+    def test_descriptor_transaction_copies_descriptors(self):
+        mdib = ProviderMdib.from_shared_descriptors(self.shared_descriptors)
+        shared_descriptions = mdib.descriptions
+        with mdib.descriptor_transaction():
+            self.assertFalse(mdib.has_shared_descriptors)
+        self.assertIsNot(shared_descriptions, mdib.descriptions)
+
+    def test_shared_descriptors_are_immutable(self):
+        mdib = ProviderMdib.from_shared_descriptors(self.shared_descriptors)
+        descriptor = mdib.descriptions.NODETYPE.get(pm.NumericMetricDescriptor)[0]
+        self.assertRaises(ApiUsageError, mdib.descriptions.add_object, descriptor.mk_copy())
+        self.assertRaises(ApiUsageError, mdib.descriptions.remove_object, descriptor)
+        self.assertRaises(ApiUsageError, mdib.descriptions.update_object, descriptor)
+        # the mdib the set was created from is independent of the shared descriptors
+        self.assertIsNot(descriptor, self.xml_mdib.descriptions.handle.get_one(descriptor.Handle))
@@ -0,0 +1,99 @@
+"""Tests for the export of mdib values into shared memory."""
+
+import math
+import unittest
+from multiprocessing import shared_memory
+
+from sdc11073.consumer.sharedstate import SharedStateReader, SharedStateWriter, shared_state_size
+from sdc11073.xml_types.pm_types import AlertActivation, AlertSignalPresence
+
+SLOT_COUNT = 5
+WAVEFORM_BUFFER_COUNT = 1
+WAVEFORM_CAPACITY = 4
+
+
+class TestSharedState(unittest.TestCase):
+    def setUp(self):
+        size = shared_state_size(SLOT_COUNT, WAVEFORM_BUFFER_COUNT, WAVEFORM_CAPACITY)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.reader = SharedStateReader(self.shm.buf)
+        self.writer = SharedStateWriter(self.shm.buf, SLOT_COUNT, WAVEFORM_BUFFER_COUNT, WAVEFORM_CAPACITY)
+
+    def tearDown(self):
+        self.reader.release()
+        self.writer.release()
+        self.shm.close()
+        self.shm.unlink()
+
+    def test_uninitialized_buffer(self):
+        shm = shared_memory.SharedMemory(create=True, size=shared_state_size(1, 0, 0))
+        try:
+            reader = SharedStateReader(shm.buf)
+            self.assertIsNone(reader.read_metric('dev', 'm'))
+            self.assertEqual([], reader.handles('dev'))
+            reader.release()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_metrics_and_alerts(self):
+        self.assertIsNone(self.reader.read_metric('dev', 'm'))
+        self.writer.write_metric('dev', 'm', 1.5, 10)
+        self.writer.write_metric('dev', 'no_value', None, 10)
+        self.writer.write_alert_condition('dev', 'ac', True, AlertActivation.ON, 11)
+        self.writer.write_alert_signal('dev', 'as', AlertSignalPresence.LATCH, AlertActivation.PAUSED, 12)
+        metric = self.reader.read_metric('dev', 'm')
+        self.assertEqual(1.5, metric.value)
+        self.assertEqual(10, metric.mdib_version)
+        self.assertTrue(math.isnan(self.reader.read_metric('dev', 'no_value').value))
+        condition = self.reader.read_alert('dev', 'ac')
+        self.assertIs(True, condition.presence)
+        self.assertEqual(AlertActivation.ON, condition.activation_state)
+        signal = self.reader.read_alert('dev', 'as')
+        self.assertEqual(AlertSignalPresence.LATCH, signal.presence)
+        self.assertEqual(AlertActivation.PAUSED, signal.activation_state)
+        self.assertEqual(12, signal.mdib_version)
+        # a metric is not an alert and vice versa
+        self.assertIsNone(self.reader.read_alert('dev', 'm'))
+        self.assertIsNone(self.reader.read_metric('dev', 'ac'))
+
+        self.writer.write_metric('dev', 'm', 2.5, 13)
+        self.assertEqual(2.5, self.reader.read_metric('dev', 'm').value)
+        self.assertEqual(['ac', 'as', 'm', 'no_value'], self.reader.handles('dev'))
+
+    def test_waveform_ring_buffer(self):
+        self.writer.append_waveform('dev', 'w', [1, 2, 3], 1)
+        self.assertEqual([1, 2, 3], self.reader.read_waveform('dev', 'w').samples)
+        self.writer.append_waveform('dev', 'w', [4, 5, 6], 2)
+        waveform = self.reader.read_waveform('dev', 'w')
+        self.assertEqual([3, 4, 5, 6], waveform.samples)
+        self.assertEqual(6, waveform.write_count)
+        self.assertEqual([5, 6], self.reader.read_waveform('dev', 'w', max_samples=2).samples)
+        # only one waveform buffer
+        self.assertFalse(self.writer.append_waveform('dev', 'w2', [1], 3))
+        self.assertEqual(1, self.writer.dropped_values)
+
+    def test_waveform_longer_than_capacity(self):
+        self.writer.append_waveform('dev', 'w', [1], 1)
+        self.writer.append_waveform('dev', 'w', [2, 3, 4, 5, 6], 2)
+        waveform = self.reader.read_waveform('dev', 'w')
+        self.assertEqual([3, 4, 5, 6], waveform.samples)
+        self.assertEqual(6, waveform.write_count)
+        self.writer.append_waveform('dev', 'w', [7], 3)
+        self.assertEqual([4, 5, 6, 7], self.reader.read_waveform('dev', 'w').samples)
+
+    def test_remove_device_and_full_store(self):
+        for i in range(SLOT_COUNT):
+            self.assertTrue(self.writer.write_metric('dev1', f'm{i}', i, 1))
+        self.assertFalse(self.writer.write_metric('dev2', 'm', 1, 1))
+        self.assertEqual({'dev1'}, self.reader.device_keys())
+        self.writer.remove_device('dev1')
+        self.assertIsNone(self.reader.read_metric('dev1', 'm0'))
+        # the slots are reused, the reader detects the changed slot even with an outdated index
+        self.assertTrue(self.writer.write_metric('dev2', 'm', 42, 1))
+        self.assertEqual(42, self.reader.read_metric('dev2', 'm').value)
+        self.assertEqual(['m'], self.reader.handles('dev2'))
+        self.assertEqual([], self.reader.handles('dev1'))
+
+    def test_too_long_key(self):
+        self.assertRaises(ValueError, self.writer.write_metric, 'dev', 'x' * 200, 1, 1)
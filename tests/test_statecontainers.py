@@ -1,5 +1,6 @@
 """Unit tests for state containers."""
 
+import copy
 import unittest
 from decimal import Decimal
 from math import isclose
@@ -12,6 +13,7 @@ import sdc11073.xml_types.xml_structure as cp
 from sdc11073.location import SdcLocation
 from sdc11073.namespaces import default_ns_helper as ns_hlp
 from sdc11073.xml_types import isoduration, pm_types
+from sdc11073.xml_types import msg_qnames as msg
 from sdc11073.xml_types import pm_qnames as pm
 from tests.mockstuff import dec_list
 
@@ -161,6 +163,83 @@ class TestStateContainers(unittest.TestCase):
         self.assertEqual(state.PhysiologicalRange, state2.PhysiologicalRange)
         self._verify_abstract_state_container_data_equal(state, state2)
 
+    def test_release_node(self):
+        descr = dc.NumericMetricDescriptorContainer(handle='123', parent_handle='456')
+        state = sc.NumericMetricStateContainer(descriptor_container=descr)
+        state.mk_metric_value()
+        state.MetricValue.Value = Decimal('42.21')
+        state.StateVersion = 5
+        report_node = state.mk_state_node(msg.MetricState, self.ns_mapper)
+
+        state2 = sc.NumericMetricStateContainer(descriptor_container=descr)
+        state2.update_from_node(report_node)
+        self.assertIs(state2.node, report_node)  # default is to keep the node
+        state2.release_node()
+        self.assertEqual(state2.StateVersion, 5)
+        self.assertIsNone(sc.NumericMetricStateContainer.node.get_stored_value(state2))
+
+        # update from other container does not generate the node of the other container
+        state3 = sc.NumericMetricStateContainer(descriptor_container=descr)
+        state3.update_from_other_container(state2)
+        self.assertIsNone(sc.NumericMetricStateContainer.node.get_stored_value(state2))
+        self.assertIsNone(sc.NumericMetricStateContainer.node.get_stored_value(state3))
+
+        # node is generated on first access, with the same tag as states of a GetMdib response
+        node = state3.node
+        self.assertIsNot(node, report_node)
+        self.assertEqual(node.tag, pm.State)
+        self.assertEqual(node.get('StateVersion'), '5')
+        self.assertIs(state3.node, node)
+        state4 = sc.NumericMetricStateContainer(descriptor_container=descr)
+        state4.update_from_node(node)
+        self.assertTrue(isclose(state4.MetricValue.Value, state.MetricValue.Value))
+
+        # a new node is kept again
+        state3.update_from_node(report_node)
+        self.assertIs(state3.node, report_node)
+
+    def test_update_changed_from_other_container(self):
+        descr = dc.NumericMetricDescriptorContainer(handle='123', parent_handle='456')
+        state = sc.NumericMetricStateContainer(descriptor_container=descr)
+        state.mk_metric_value()
+        state.MetricValue.Value = Decimal('42.21')
+        state.PhysiologicalRange = [pm_types.Range(*dec_list(1, 2, 3, 4, 5))]
+        state2 = sc.NumericMetricStateContainer(descriptor_container=descr)
+        state2.update_from_other_container(state)
+        physiological_range = state2.PhysiologicalRange
+
+        # nothing changed
+        self.assertEqual([], state2.update_changed_from_other_container(state))
+
+        # only changed properties are copied
+        state.MetricValue = copy.copy(state.MetricValue)
+        state.MetricValue.Value = Decimal('43')
+        state.increment_state_version()
+        changed = state2.update_changed_from_other_container(state)
+        self.assertEqual(['StateVersion', 'MetricValue'], changed)
+        self.assertEqual(Decimal('43'), state2.MetricValue.Value)
+        self.assertIsNot(state.MetricValue, state2.MetricValue)
+        self.assertIs(physiological_range, state2.PhysiologicalRange)
+        self.assertEqual(state.StateVersion, state2.StateVersion)
+
+        # properties with coded values can not be compared, they are handled as changed
+        state.BodySite = [pm_types.CodedValue('abc')]
+        self.assertEqual(['BodySite'], state2.update_changed_from_other_container(state))
+        self.assertEqual('abc', state2.BodySite[0].Code)
+
+        # skipped properties
+        state.increment_state_version()
+        self.assertNotIn('StateVersion', state2.update_changed_from_other_container(state, ['StateVersion']))
+
+        # checks of handles are the same as in update_from_other_container
+        descr_other = dc.NumericMetricDescriptorContainer(handle='other', parent_handle='456')
+        state3 = sc.NumericMetricStateContainer(descriptor_container=descr_other)
+        self.assertRaises(ValueError, state2.update_changed_from_other_container, state3)
+        context_descr = dc.PatientContextDescriptorContainer(handle='ctx', parent_handle='456')
+        context_state = sc.PatientContextStateContainer(descriptor_container=context_descr, handle='a')
+        context_state2 = sc.PatientContextStateContainer(descriptor_container=context_descr, handle='b')
+        self.assertRaises(ValueError, context_state2.update_changed_from_other_container, context_state)
+
     def test_StringMetricStateContainer(self):  # noqa: N802
         descr = dc.StringMetricDescriptorContainer(handle='123', parent_handle='456')
         state = sc.StringMetricStateContainer(descriptor_container=descr)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import http.client
 import socket
+import time
 from types import SimpleNamespace
 from unittest import mock
 
@@ -291,3 +292,114 @@ def test_end_to_url_is_none_when_end_to_address_is_none(soap_client_pool: mock.M
     soap_client_pool.get_soap_client.return_value.post_message_to.assert_called_once_with(
         '/notify', mock.ANY, msg='send_notification_end_message'
     )
+
+
+def test_subscriptions_for_action_index():
+    sdc = SdcV1Definitions
+    msg_factory = MessageFactory(sdc, None, logger=None, validate=False)
+    mgr = TestSubscriptionsManager(sdc, msg_factory, DummySoapClientPool())
+
+    def mk_subscription(filter_text: str) -> ActionBasedSubscription:
+        subscribe = evt.Subscribe()
+        subscribe.set_filter(filter_text)
+        subscribe.Delivery.NotifyTo.Address = 'http://localhost:8000/notify'
+        subscription = ActionBasedSubscription(
+            mgr=mgr,
+            subscribe_request=subscribe,
+            accepted_encodings=[],
+            base_urls=[],
+            max_subscription_duration=60,
+            soap_client_pool=DummySoapClientPool(),
+            msg_factory=msg_factory,
+            log_prefix='t',
+        )
+        subscription.set_reference_parameter()
+        return subscription
+
+    sub1 = mk_subscription('http://x/y/Act1 http://x/y/Act2')
+    sub2 = mk_subscription('http://x/y/Act2')
+    assert mgr._get_subscriptions_for_action('http://x/y/Act1') == ()
+    mgr._subscriptions.add_object(sub1)
+    assert mgr._get_subscriptions_for_action('http://x/y/Act1') == (sub1,)
+    assert mgr._get_subscriptions_for_action('http://x/y/Act2') == (sub1,)
+    mgr._subscriptions.add_object(sub2)
+    assert mgr._get_subscriptions_for_action('http://x/y/Act1') == (sub1,)
+    assert set(mgr._get_subscriptions_for_action('http://x/y/Act2')) == {sub1, sub2}
+    # same snapshot is returned as long as subscriptions do not change
+    snapshot = mgr._get_subscriptions_for_action('http://x/y/Act2')
+    assert mgr._get_subscriptions_for_action('http://x/y/Act2') is snapshot
+    mgr._subscriptions.remove_object(sub1)
+    assert mgr._get_subscriptions_for_action('http://x/y/Act1') == ()
+    assert mgr._get_subscriptions_for_action('http://x/y/Act2') == (sub2,)
+    mgr._subscriptions.clear()
+    assert mgr._get_subscriptions_for_action('http://x/y/Act2') == ()
+    mgr.stop_all(send_subscription_end=False)
+
+
+def test_housekeeping_expiry_renewal_and_delivery_failure():
+    sdc = SdcV1Definitions
+    msg_factory = MessageFactory(sdc, None, logger=None, validate=False)
+    msg_reader = MessageReader(sdc, None, logger=None, validate=False)
+    mgr = TestSubscriptionsManager(sdc, msg_factory, DummySoapClientPool())
+    mgr.set_base_urls([SimpleNamespace(scheme='http', netloc='127.0.0.1:9000')])
+
+    def subscribe(expires: float) -> ActionBasedSubscription:
+        subscribe_request = evt.Subscribe()
+        subscribe_request.set_filter('http://x/y/Act')
+        subscribe_request.Delivery.NotifyTo.Address = 'http://127.0.0.1:9999/notify'
+        subscribe_request.Expires = expires
+        created = msg_factory.mk_soap_message(
+            HeaderInformationBlock(action=subscribe_request.action, addr_to='n/a'), subscribe_request
+        )
+        known_subscriptions = set(mgr._subscriptions.objects)
+        mgr.on_subscribe_request(_mk_received(created.serialize(validate=False), msg_reader))
+        return (mgr._subscriptions.objects - known_subscriptions).pop()
+
+    expiring = subscribe(0.5)
+    renewed = subscribe(0.5)
+    failing = subscribe(20)
+
+    # renew before expiry
+    rn = evt.Renew()
+    rn.Expires = 20
+    hib = HeaderInformationBlock(action=rn.action, addr_to='n/a', reference_parameters=renewed.reference_parameters)
+    mgr.on_renew_request(_mk_received(msg_factory.mk_soap_message(hib, rn).serialize(validate=False), msg_reader))
+
+    # simulate a delivery failure
+    failing.notify_errors = failing.MAX_NOTIFY_ERRORS
+    mgr.send_to_subscribers(etree.Element('n'), 'http://x/y/Other', None)  # does not match, nothing scheduled
+    assert failing in mgr._subscriptions.objects
+    with mgr._housekeeping_condition:
+        for _ in range(3):
+            mgr._schedule_delivery_failure_eviction(failing)
+        assert sum(1 for entry in mgr._expiry_heap if entry[2] is failing and entry[3] is None) == 1
+        mgr._schedule_housekeeping(failing, time.monotonic())  # a second due entry, counted only once
+
+    for _ in range(30):
+        if expiring not in mgr._subscriptions.objects and failing not in mgr._subscriptions.objects:
+            break
+        time.sleep(0.1)
+    assert expiring not in mgr._subscriptions.objects
+    assert expiring.is_closed()
+    assert failing not in mgr._subscriptions.objects
+    assert renewed in mgr._subscriptions.objects
+    counters = mgr.housekeeping_counters
+    assert counters.expirations == 1
+    assert counters.renewals == 1
+    assert counters.delivery_failure_evictions == 1
+
+    # the expiry entries of removed subscriptions are dropped, they do not keep the subscriptions alive
+    un_msg = msg_factory.mk_soap_message(hib, evt.Unsubscribe())
+    mgr.on_unsubscribe_request(_mk_received(un_msg.serialize(validate=False), msg_reader))
+    for _ in range(30):
+        if renewed not in mgr._subscriptions.objects:
+            break
+        time.sleep(0.1)
+    assert renewed not in mgr._subscriptions.objects
+    assert mgr._expiry_heap == []
+
+    # stop_all releases all subscriptions
+    subscribe(20)
+    assert len(mgr._expiry_heap) == 1
+    mgr.stop_all(send_subscription_end=False)
+    assert mgr._expiry_heap == []
@@ -266,6 +266,92 @@ class TestTransactions(unittest.TestCase):
         for state in transaction_result.all_states():
             self.assertEqual(state.DescriptorVersion, current_descriptors[state.DescriptorHandle].DescriptorVersion)
 
+    def test_descriptor_subtree(self):
+        """Verify that add_descriptor_subtree adds a complete vmd and increments the parent version once."""
+        vmd = self._mdib.descriptions.NODETYPE.get(pm_qnames.VmdDescriptor)[0]
+        mds_handle = vmd.parent_handle
+        # parents first
+        subtree = [vmd]
+        for descriptor in subtree:
+            subtree.extend(self._mdib.descriptions.parent_handle.get(descriptor.Handle, []))
+        descriptors = [descr.mk_copy() for descr in subtree]
+        states = [state.mk_copy() for descr in subtree
+                  for state in self._mdib.states.descriptor_handle.get(descr.Handle, [])]
+        channels = self._mdib.descriptions.parent_handle.get(vmd.Handle)
+        self.assertGreater(len(channels), 1)
+
+        # removing all children of a descriptor increments its version once
+        vmd_version = vmd.DescriptorVersion
+        with self._mdib.descriptor_transaction() as mgr:
+            for channel in channels:
+                mgr.remove_descriptor(channel.Handle)
+        self.assertEqual(vmd_version + 1, vmd.DescriptorVersion)
+        self.assertEqual([vmd.Handle], [d.Handle for d in self._mdib.transaction.descr_updated])
+
+        with self._mdib.descriptor_transaction() as mgr:
+            mgr.remove_descriptor(vmd.Handle)
+        self.assertIsNone(self._mdib.descriptions.handle.get_one(vmd.Handle, allow_none=True))
+        mds_version = self._mdib.descriptions.handle.get_one(mds_handle).DescriptorVersion
+
+        # nothing is added if validation fails
+        with self._mdib.descriptor_transaction() as mgr:
+            self.assertRaises(ValueError, mgr.add_descriptor_subtree, descriptors[::-1])
+            self.assertRaises(ValueError, mgr.add_descriptor_subtree, [*descriptors, descriptors[-1]])
+            mds_state = self._mdib.states.descriptor_handle.get_one(mds_handle).mk_copy()
+            self.assertRaises(ApiUsageError, mgr.add_descriptor_subtree, descriptors, [*states, mds_state])
+            self.assertEqual(0, len(mgr.descriptor_updates))
+
+        with self._mdib.descriptor_transaction() as mgr:
+            mgr.add_descriptor_subtree(descriptors, states)
+        transaction_result = self._mdib.transaction
+        self.assertEqual(len(descriptors), len(transaction_result.descr_created))
+        for descriptor in transaction_result.descr_created:
+            mdib_descriptor = self._mdib.descriptions.handle.get_one(descriptor.Handle)
+            self.assertIsNot(descriptor, mdib_descriptor)  # the transaction result does not share containers
+            self.assertEqual(mdib_descriptor.DescriptorVersion, descriptor.DescriptorVersion)
+            self.assertEqual(mds_handle, descriptor.source_mds)
+        subtree_states = [s for s in transaction_result.all_states() if s.DescriptorHandle != mds_handle]
+        self.assertEqual(len(states), len(subtree_states))
+        for state in subtree_states:
+            mdib_state = self._mdib.states.descriptor_handle.get_one(state.DescriptorHandle)
+            self.assertIsNot(state, mdib_state)
+            self.assertEqual(mdib_state.StateVersion, state.StateVersion)
+            self.assertEqual(state.DescriptorVersion, state.descriptor_container.DescriptorVersion)
+        self.assertEqual([mds_handle], [d.Handle for d in transaction_result.descr_updated])
+        self.assertEqual(mds_version + 1, self._mdib.descriptions.handle.get_one(mds_handle).DescriptorVersion)
+
+        # later transactions do not modify the containers of the transaction result
+        created_versions = {d.Handle: d.DescriptorVersion for d in transaction_result.descr_created}
+        with self._mdib.descriptor_transaction() as mgr:
+            for descriptor in descriptors[1:]:
+                mgr.get_descriptor(descriptor.Handle)
+        self.assertEqual(created_versions,
+                         {d.Handle: d.DescriptorVersion for d in transaction_result.descr_created})
+        self.assertEqual(vmd.Handle, self._mdib.descriptions.handle.get_one(descriptors[1].Handle).parent_handle)
+        self.assertEqual(created_versions[descriptors[1].Handle] + 1,
+                         self._mdib.descriptions.handle.get_one(descriptors[1].Handle).DescriptorVersion)
+
+        with self._mdib.descriptor_transaction() as mgr:
+            self.assertRaises(ValueError, mgr.add_descriptor_subtree, [descriptors[0].mk_copy()])
+
+    def test_descriptor_subtree_state_conflict(self):
+        """Verify that nothing is added if a state of the subtree is already part of the transaction."""
+        patient_descriptor = self._mdib.descriptions.NODETYPE.get_one(pm_qnames.PatientContextDescriptor)
+        location_descriptor = self._mdib.descriptions.NODETYPE.get_one(pm_qnames.LocationContextDescriptor)
+        with self._mdib.descriptor_transaction() as mgr:
+            mgr.remove_descriptor(location_descriptor.Handle)
+        descriptor = location_descriptor.mk_copy()
+        location_state = self._mdib.data_model.mk_state_container(descriptor)
+        location_state.Handle = 'context_state'
+        with self._mdib.descriptor_transaction() as mgr:
+            mgr.get_descriptor(patient_descriptor.Handle)
+            patient_state = self._mdib.data_model.mk_state_container(patient_descriptor)
+            patient_state.Handle = 'context_state'
+            mgr.add_state(patient_state)
+            self.assertRaises(ValueError, mgr.add_descriptor_subtree, [descriptor], [location_state])
+            self.assertEqual([patient_descriptor.Handle], list(mgr.descriptor_updates))
+            self.assertEqual(['context_state'], list(mgr.context_state_updates))
+        self.assertIsNone(self._mdib.descriptions.handle.get_one(location_descriptor.Handle, allow_none=True))
 
 
 class TestEntityTransactions(unittest.TestCase):
@@ -5,18 +5,21 @@ from __future__ import annotations
 import math
 import random
 import string
+import time
 import uuid
-from typing import TYPE_CHECKING
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
 
 from lxml import etree
 
 from sdc11073 import location
-from sdc11073.xml_types import wsd_types
+from sdc11073.xml_types import pm_qnames, wsd_types
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Sequence
 
     from sdc11073.mdib.containerbase import ContainerBase
+    from sdc11073.provider import SdcProvider
 
 RFC3986 = string.ascii_letters + string.digits + '-_.~'
 
@@ -47,6 +50,23 @@ def random_location() -> location.SdcLocation:
     )
 
 
+def wait_for(func: Callable[[], Any], timeout: float = 10.0, interval: float = 0.01) -> Any:
+    """Call func until it returns a true value or until the timeout expired.
+
+    :param func: the polled function
+    :param timeout: max. time in seconds
+    :param interval: time in seconds between two calls
+    :return: the last result of func
+    """
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        result = func()
+        if result:
+            return result
+        time.sleep(interval)
+    return func()
+
+
 def random_qname_part() -> str:
     """Create random qname part."""
     return f'{"".join(random.choices(list(string.ascii_letters), k=1))}{uuid.uuid4().hex}'
@@ -62,6 +82,22 @@ def random_scope() -> wsd_types.ScopesType:
     return wsd_types.ScopesType(random_location().scope_string)
 
 
+def canonical_node(node: etree._Element) -> tuple:
+    """Return a comparable form of a node that does not depend on the order of namespace declarations and whitespace."""
+    return (node.tag, sorted(node.attrib.items()), (node.text or '').strip(), (node.tail or '').strip(),
+            [canonical_node(child) for child in node])
+
+
+def set_metric_value(provider: SdcProvider, value: int):
+    """Set the value of the first numeric metric of the provider in a metric state transaction."""
+    handle = provider.mdib.descriptions.NODETYPE.get(pm_qnames.NumericMetricDescriptor)[0].Handle
+    with provider.mdib.metric_state_transaction() as mgr:
+        state = mgr.get_state(handle)
+        if state.MetricValue is None:
+            state.mk_metric_value()
+        state.MetricValue.Value = Decimal(value)
+
+
 def container_diff(
     first: ContainerBase,
     second: ContainerBase,
@@ -0,0 +1,88 @@
+"""Concurrent requests to many providers from one event loop: async service clients versus run_in_executor.
+
+PROVIDERS simulated providers run in a SdcProviderHost on localhost. The consumers run in a SdcConsumerHub that uses
+the event loop of the benchmark. ROUNDS times a GetMdState request and a SetValue operation are sent to all
+providers concurrently, once with the blocking methods wrapped in run_in_executor (default executor) and once with
+the async methods of the service clients, limited to MAX_CONCURRENT_REQUESTS concurrent requests.
+For both variants the duration per round and the number of threads are printed.
+
+usage: python tools/benchmark_async_requests.py [providers]
+"""
+
+import asyncio
+import functools
+import pathlib
+import sys
+import threading
+import time
+
+from sdc11073 import wsdiscovery
+from sdc11073.consumer.consumerhub import SdcConsumerHub
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.mdib.shareddescriptors import SharedDescriptorSet
+from sdc11073.provider import SdcProviderHost
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
+from tests.mockstuff import EXAMPLE_ROLE_PROVIDER_COMPONENTS
+
+PROVIDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+ROUNDS = 5
+MAX_CONCURRENT_REQUESTS = 50
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+MODEL = ThisModelType(manufacturer='Example Manufacturer', model_name='SimulatedDevice', model_number='1.0')
+
+
+async def _executor_round(consumers: list, metric_handle: str, operation_handle: str, value: int):
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[loop.run_in_executor(None, c.get_service_client.get_md_state, [metric_handle])
+                           for c in consumers])
+
+    def _set_value(consumer) -> None:  # noqa: ANN001
+        consumer.set_service_client.set_numeric_value(operation_handle, value).result(timeout=10)
+
+    await asyncio.gather(*[loop.run_in_executor(None, _set_value, c) for c in consumers])
+
+
+async def _async_round(consumers: list, metric_handle: str, operation_handle: str, value: int):
+    await asyncio.gather(*[c.get_service_client.async_get_md_state([metric_handle]) for c in consumers])
+    await asyncio.gather(*[c.set_service_client.async_set_numeric_value(operation_handle, value) for c in consumers])
+
+
+async def _main(xaddrs: list[str], metric_handle: str, operation_handle: str):
+    loop = asyncio.get_running_loop()
+    hub = SdcConsumerHub('127.0.0.1', async_loop=loop, max_concurrent_requests=MAX_CONCURRENT_REQUESTS)
+    await loop.run_in_executor(None, hub.start_all)
+    try:
+        consumers = []
+        for xaddr in xaddrs:
+            add_consumer = functools.partial(hub.add_consumer, xaddr, validate=False, init_mdib=False)
+            consumers.append(await loop.run_in_executor(None, add_consumer))
+        for name, round_func in (('executor', _executor_round), ('async', _async_round)):
+            threads = threading.active_count()
+            started = time.perf_counter()
+            for i in range(ROUNDS):
+                await round_func(consumers, metric_handle, operation_handle, i)
+            duration = (time.perf_counter() - started) / ROUNDS
+            print(f'{name:8s}: {len(consumers)} providers, {1000 * duration:.0f} ms per round, '
+                  f'{max(threading.active_count() - threads, 0)} additional threads')
+    finally:
+        await loop.run_in_executor(None, hub.stop_all)
+
+
+if __name__ == '__main__':
+    shared_descriptors = SharedDescriptorSet(ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions))
+    operation = next(op for op in shared_descriptors.descriptions.NODETYPE.get(pm.SetValueOperationDescriptor)
+                     if op.Type is not None and op.Type.Code == '0815-1')
+    with wsdiscovery.WSDiscovery('127.0.0.1') as ws_discovery:
+        provider_host = SdcProviderHost(ws_discovery)
+        provider_host.start_all()
+        provider_xaddrs = []
+        for n in range(PROVIDERS):
+            device = ThisDeviceType(friendly_name=f'device {n}', serial_number=str(n))
+            provider = provider_host.add_provider(MODEL, device, ProviderMdib.from_shared_descriptors(shared_descriptors),
+                                                  validate=False, start_rtsample_loop=False,
+                                                  role_provider_components=EXAMPLE_ROLE_PROVIDER_COMPONENTS)
+            provider_xaddrs.append(provider.get_xaddrs()[0])
+        asyncio.run(_main(provider_xaddrs, operation.OperationTarget, operation.Handle))
+        provider_host.stop_all()
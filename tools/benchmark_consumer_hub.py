@@ -0,0 +1,154 @@
+"""Soak test of many consumers in one SdcConsumerHub compared with standalone consumers.
+
+PROVIDERS simulated providers run in a SdcProviderHost on localhost, each of them updates one metric every
+UPDATE_PERIOD seconds. The value of the metric is the time of the update, so that the consumer can calculate the
+latency from the transaction in the provider until its mdib is updated.
+The consumers connect once via a SdcConsumerHub and once as standalone SdcConsumer instances with own http server
+and threads. Subscriptions expire after MAX_SUBSCRIPTION_DURATION seconds, so they are renewed several times while
+the consumers run for DURATION seconds.
+For both variants the number of threads, the connect time, the cpu time per consumer and second, the number of
+received updates and the latency are printed.
+
+usage: python tools/benchmark_consumer_hub.py [providers]
+"""
+
+import gc
+import pathlib
+import statistics
+import sys
+import threading
+import time
+from decimal import Decimal
+
+from sdc11073 import observableproperties, wsdiscovery
+from sdc11073.consumer.consumerhub import SdcConsumerHub
+from sdc11073.consumer.consumerimpl import SdcConsumer
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.consumermdib import ConsumerMdib
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.mdib.shareddescriptors import SharedDescriptorSet
+from sdc11073.provider import SdcProviderHost
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
+
+PROVIDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+UPDATE_PERIOD = 0.5
+DURATION = 30.0
+MAX_SUBSCRIPTION_DURATION = 10
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+PROVIDER_CONNECTION_THREAD_PREFIX = 'SubscrRecv'
+MODEL = ThisModelType(manufacturer='Example Manufacturer', model_name='SimulatedDevice', model_number='1.0')
+
+
+class _LatencyRecorder:
+    """Records the latency of the updates of one metric in a consumer mdib."""
+
+    def __init__(self, handle: str):
+        self._handle = handle
+        self.latencies = []
+        self._last_value = None
+        self._lock = threading.Lock()
+
+    def on_metrics_by_handle(self, metrics_by_handle: dict):
+        state = metrics_by_handle.get(self._handle)
+        if state is None or state.MetricValue is None:
+            return
+        with self._lock:
+            if state.MetricValue.Value != self._last_value:  # periodic reports repeat the value
+                self._last_value = state.MetricValue.Value
+                self.latencies.append(time.time() - float(self._last_value))
+
+    def bind(self, mdib: ConsumerMdib):
+        observableproperties.bind(mdib, metrics_by_handle=self.on_metrics_by_handle)
+
+
+def _metric_updater(mdib: ProviderMdib, handle: str):
+    def _update():
+        with mdib.metric_state_transaction() as mgr:
+            state = mgr.get_state(handle)
+            if state.MetricValue is None:
+                state.mk_metric_value()
+            state.MetricValue.Value = Decimal(repr(time.time()))
+
+    return _update
+
+
+def _consumer_side_thread_count() -> int:
+    # the threads of the provider host that handle the requests of the consumers are not counted
+    return sum(1 for thread in threading.enumerate() if not thread.name.startswith(PROVIDER_CONNECTION_THREAD_PREFIX))
+
+
+def _run(name: str, xaddrs: list[str], connect, disconnect, handle: str) -> None:  # noqa: ANN001
+    gc.collect()
+    start_threads = _consumer_side_thread_count()
+    started = time.perf_counter()
+    mdibs = connect(xaddrs)
+    connect_time = time.perf_counter() - started
+    threads = _consumer_side_thread_count() - start_threads
+    recorders = []
+    for mdib in mdibs:
+        recorder = _LatencyRecorder(handle)
+        recorder.bind(mdib)
+        recorders.append(recorder)
+    start_cpu = time.process_time()
+    time.sleep(DURATION)
+    cpu = time.process_time() - start_cpu
+    connected = sum(1 for mdib in mdibs if mdib.sdc_client.is_connected)
+    latencies = sorted(latency for recorder in recorders for latency in recorder.latencies[:])
+    disconnect()
+    expected = len(xaddrs) * DURATION / UPDATE_PERIOD
+    print(f'{name:10s}: {len(xaddrs)} consumers, {threads} threads, connect {connect_time:.1f} s, '
+          f'cpu {1000 * cpu / DURATION / len(xaddrs):.2f} ms/s per consumer, '
+          f'{len(latencies) / expected:.1%} of updates received, {connected} still connected, '
+          f'latency median {1000 * statistics.median(latencies):.1f} ms, '
+          f'p99 {1000 * latencies[int(len(latencies) * 0.99)]:.1f} ms')
+
+
+def _benchmark_hub(xaddrs: list[str], handle: str):
+    hub = SdcConsumerHub('127.0.0.1')
+
+    def _connect(addresses: list[str]) -> list[ConsumerMdib]:
+        hub.start_all()
+        return [hub.add_consumer(address, validate=False).mdib for address in addresses]
+
+    _run('hub', xaddrs, _connect, hub.stop_all, handle)
+
+
+def _benchmark_standalone(xaddrs: list[str], handle: str):
+    consumers = []
+
+    def _connect(addresses: list[str]) -> list[ConsumerMdib]:
+        mdibs = []
+        for address in addresses:
+            consumer = SdcConsumer(address, SdcV1Definitions, None, validate=False)
+            consumer.start_all()
+            consumers.append(consumer)
+            mdib = ConsumerMdib(consumer)
+            mdib.init_mdib()
+            mdibs.append(mdib)
+        return mdibs
+
+    def _disconnect():
+        for consumer in consumers:
+            consumer.stop_all()
+
+    _run('standalone', xaddrs, _connect, _disconnect, handle)
+
+
+if __name__ == '__main__':
+    shared_descriptors = SharedDescriptorSet(ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions))
+    metric_handle = shared_descriptors.descriptions.NODETYPE.get(pm.NumericMetricDescriptor)[0].Handle
+    with wsdiscovery.WSDiscovery('127.0.0.1') as ws_discovery:
+        provider_host = SdcProviderHost(ws_discovery, max_subscription_duration=MAX_SUBSCRIPTION_DURATION)
+        provider_host.start_all()
+        provider_xaddrs = []
+        for i in range(PROVIDERS):
+            provider_mdib = ProviderMdib.from_shared_descriptors(shared_descriptors)
+            device = ThisDeviceType(friendly_name=f'device {i}', serial_number=str(i))
+            provider = provider_host.add_provider(MODEL, device, provider_mdib, validate=False)
+            provider_xaddrs.append(provider.get_xaddrs()[0])
+            provider_host.scheduler.add_job(_metric_updater(provider_mdib, metric_handle), UPDATE_PERIOD,
+                                            start_delay=UPDATE_PERIOD * i / PROVIDERS)
+        _benchmark_hub(provider_xaddrs, metric_handle)
+        _benchmark_standalone(provider_xaddrs, metric_handle)
+        provider_host.stop_all()
@@ -0,0 +1,86 @@
+"""Duration of adding and removing a large vmd in a descriptor transaction of a ProviderMdib.
+
+A vmd with CHANNELS channels and METRICS numeric metrics per channel is added to the mds of
+tests/70041_MDIB_Final.xml, once with add_descriptor / add_state per descriptor and once with
+add_descriptor_subtree. Afterwards the vmd is removed again. The body of the DescriptionModificationReport
+is created from the transaction result of every transaction.
+
+usage: python tools/benchmark_descriptor_subtree.py
+"""
+
+import pathlib
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.descriptorcontainers import (
+    ChannelDescriptorContainer,
+    NumericMetricDescriptorContainer,
+    VmdDescriptorContainer,
+)
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.provider.porttypes.descriptioneventserviceimpl import DescriptionEventService
+from sdc11073.xml_types import pm_types
+
+CHANNELS = 30
+METRICS = 100
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+
+
+def _mk_vmd(mdib: ProviderMdib) -> tuple[list, list]:
+    mds = mdib.descriptions.NODETYPE.get(mdib.data_model.pm_names.MdsDescriptor)[0]
+    descriptors = [VmdDescriptorContainer('bench_vmd', mds.Handle)]
+    for i in range(CHANNELS):
+        channel = ChannelDescriptorContainer(f'bench_ch{i}', 'bench_vmd')
+        descriptors.append(channel)
+        for j in range(METRICS):
+            metric = NumericMetricDescriptorContainer(f'bench_metric{i}_{j}', channel.Handle)
+            metric.Unit = pm_types.CodedValue('262688')
+            metric.Resolution = Decimal('0.1')
+            descriptors.append(metric)
+    states = [mdib.data_model.get_state_class_for_descriptor(d)(d) for d in descriptors]
+    return descriptors, states
+
+
+def _report_duration(mdib: ProviderMdib) -> float:
+    service = SimpleNamespace(_sdc_definitions=SdcV1Definitions)
+    result = mdib.transaction
+    start = time.perf_counter()
+    DescriptionEventService.mk_description_modification_report_body(
+        service, mdib.mdib_version_group, result.descr_updated, result.descr_created, result.descr_deleted,
+        result.all_states())
+    return time.perf_counter() - start
+
+
+def add_single(mdib: ProviderMdib, descriptors: list, states: list):
+    with mdib.descriptor_transaction() as mgr:
+        for descriptor in descriptors:
+            mgr.add_descriptor(descriptor)
+        for state in states:
+            mgr.add_state(state)
+
+
+def add_subtree(mdib: ProviderMdib, descriptors: list, states: list):
+    with mdib.descriptor_transaction() as mgr:
+        mgr.add_descriptor_subtree(descriptors, states)
+
+
+def remove(mdib: ProviderMdib):
+    with mdib.descriptor_transaction() as mgr:
+        mgr.remove_descriptor('bench_vmd')
+
+
+if __name__ == '__main__':
+    print(f'vmd with {CHANNELS} channels and {CHANNELS * METRICS} numeric metrics')
+    for name, func in (('add_descriptor', add_single), ('add_descriptor_subtree', add_subtree)):
+        provider_mdib = ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions)
+        vmd_descriptors, vmd_states = _mk_vmd(provider_mdib)
+        start = time.perf_counter()
+        func(provider_mdib, vmd_descriptors, vmd_states)
+        duration = time.perf_counter() - start
+        print(f'{name:25s}: transaction {duration:.3f} s, report {_report_duration(provider_mdib):.3f} s')
+        start = time.perf_counter()
+        remove(provider_mdib)
+        duration = time.perf_counter() - start
+        print(f'{"remove_descriptor":25s}: transaction {duration:.3f} s, report {_report_duration(provider_mdib):.3f} s')
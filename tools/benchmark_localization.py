@@ -0,0 +1,59 @@
+"""Duration of GetLocalizedText requests of a large localization storage.
+
+The storage holds REFS texts in each of LANGUAGES languages and two versions. The script measures the
+filter_localized_texts call for all texts of one language, for some handles and with a text width filter,
+and the creation of the text nodes of a response, serialized per request and copied from the cached nodes.
+
+usage: python tools/benchmark_localization.py
+"""
+
+import copy
+import timeit
+
+from sdc11073.namespaces import default_ns_helper as nsh
+from sdc11073.provider.porttypes.localizationservice import LocalizationStorage
+from sdc11073.xml_types import msg_types
+from sdc11073.xml_types.pm_types import LocalizedText, LocalizedTextWidth
+
+REFS = 2500
+LANGUAGES = 20
+LOOPS = 20
+
+
+if __name__ == '__main__':
+    langs = [f'lang{i}' for i in range(LANGUAGES)]
+    storage = LocalizationStorage()
+    for version in (1, 2):
+        storage.add(*[LocalizedText(f'text {ref} {lang} v{version}', lang=lang, ref=f'ref{ref}', version=version,
+                                    text_width=LocalizedTextWidth.M)
+                      for ref in range(REFS) for lang in langs])
+    print(f'{len(langs) * REFS * 2} texts in storage')
+    some_handles = [f'ref{ref}' for ref in range(0, REFS, 100)]
+    requests = (
+        ('all texts of one language', (None, None, ['lang3'], None, None)),
+        (f'{len(some_handles)} handles, all languages', (some_handles, None, None, None, None)),
+        ('all texts of one language, text width', (None, None, ['lang3'], ['l'], None)),
+    )
+    for name, args in requests:
+        duration = timeit.timeit(lambda args=args: storage.filter_localized_texts(*args), number=LOOPS) / LOOPS
+        print(f'filter {name}: {duration * 1000:.2f} ms')
+
+    ns_map = nsh.partial_map(nsh.MSG, nsh.PM)
+    texts = storage.filter_localized_texts(None, None, ['lang3'], None, None)
+
+    def serialize():
+        response = msg_types.GetLocalizedTextResponse()
+        response.Text.extend(texts)
+        return response.as_etree_node(response.NODETYPE, ns_map)
+
+    cached_nodes = list(serialize())
+
+    def copy_cached():
+        response = msg_types.GetLocalizedTextResponse()
+        node = response.as_etree_node(response.NODETYPE, ns_map)
+        node.extend(copy.deepcopy(n) for n in cached_nodes)
+        return node
+
+    for name, func in (('serialized per request', serialize), ('copied from cache', copy_cached)):
+        duration = timeit.timeit(func, number=LOOPS) / LOOPS
+        print(f'response nodes {name}: {duration * 1000:.2f} ms')
@@ -0,0 +1,44 @@
+"""Overhead of disabled debug logging on hot paths.
+
+Compares an unguarded LoggerAdapter.debug call with arguments that must be built
+(like the per subscriber calls in the notification path) with the same call guarded by LoggerAdapter.is_debug.
+DEBUG is disabled for the logger.
+
+usage: python tools/benchmark_logging.py
+"""
+
+import logging
+import timeit
+from types import SimpleNamespace
+
+from sdc11073 import loghelper
+
+LOOPS = 500000
+
+
+if __name__ == '__main__':
+    logging.getLogger('sdc.bench').setLevel(logging.INFO)
+    logger = loghelper.get_logger_adapter('sdc.bench', 'prefix ')
+    subscribers = [SimpleNamespace(notify_to_address=f'https://127.0.0.1:{i}') for i in range(3)]
+    action = 'http://standards.ieee.org/downloads/11073/11073-20701-2018/WaveformService/WaveformStream'
+
+    def unguarded():
+        logger.debug('sending report %s to %r', action, [s.notify_to_address for s in subscribers])
+
+    def guarded():
+        if logger.is_debug:
+            logger.debug('sending report %s to %r', action, [s.notify_to_address for s in subscribers])
+
+    def unguarded_simple():
+        logger.debug('send notification report {} to {}', action, subscribers[0])  # noqa: PLE1205
+
+    def guarded_simple():
+        if logger.is_debug:
+            logger.debug('send notification report {} to {}', action, subscribers[0])  # noqa: PLE1205
+
+    for name, func in (('list argument, unguarded', unguarded),
+                       ('list argument, is_debug guard', guarded),
+                       ('plain arguments, unguarded', unguarded_simple),
+                       ('plain arguments, is_debug guard', guarded_simple)):
+        duration = timeit.timeit(func, number=LOOPS) / LOOPS
+        print(f'{name}: {duration * 1e9:.0f} ns per call')
@@ -0,0 +1,68 @@
+"""Recovery of a consumer mdib after dropped reports: resync versus reload_all.
+
+A provider with the test mdib runs on localhost, a consumer mirrors it with a ReportDroppingConsumerMdib.
+ROUNDS times the consumer drops the next DROPPED_REPORTS metric reports while the provider updates metrics, then the
+next received report reveals the gap. The mdib is brought back in sync once with resync and once with reload_all.
+For both variants the average recovery time and the number of response bytes are printed.
+
+usage: python tools/benchmark_mdib_resync.py [rounds]
+"""
+
+import sys
+import time
+from decimal import Decimal
+
+from sdc11073 import observableproperties
+from sdc11073.consumer.consumerimpl import SdcConsumer
+from sdc11073.wsdiscovery import WSDiscovery
+from sdc11073.xml_types import pm_qnames as pm
+from tests import utils
+from tests.mockstuff import ReportDroppingConsumerMdib, ResponseBytesCounter, SomeDevice
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+DROPPED_REPORTS = 3
+
+
+def _drop_reports(provider: SomeDevice, consumer_mdib: ReportDroppingConsumerMdib, handles: list[str], value: int):
+    gaps = []
+    observableproperties.strongbind(consumer_mdib, mdib_version_gap_event=gaps.append)
+    consumer_mdib.drop_next_reports('metric states', DROPPED_REPORTS)
+    for i in range(DROPPED_REPORTS + 1):
+        with provider.mdib.metric_state_transaction() as mgr:
+            state = mgr.get_state(handles[i % len(handles)])
+            if state.MetricValue is None:
+                state.mk_metric_value()
+            state.MetricValue.Value = Decimal(value)
+    end = time.monotonic() + 10
+    while not gaps and time.monotonic() < end:
+        time.sleep(0.005)
+    observableproperties.unbind(consumer_mdib, mdib_version_gap_event=gaps.append)
+
+
+def _benchmark(name: str, provider: SomeDevice, consumer_mdib: ReportDroppingConsumerMdib, recover):  # noqa: ANN001
+    handles = [d.Handle for d in provider.mdib.descriptions.NODETYPE.get(pm.NumericMetricDescriptor)]
+    duration = 0.0
+    with ResponseBytesCounter() as counter:
+        for i in range(ROUNDS):
+            _drop_reports(provider, consumer_mdib, handles, i)
+            started = time.perf_counter()
+            recover()
+            duration += time.perf_counter() - started
+    print(f'{name:10s}: {1000 * duration / ROUNDS:.1f} ms, {counter.bytes / ROUNDS:,.0f} response bytes per recovery')
+
+
+if __name__ == '__main__':
+    with WSDiscovery('127.0.0.1') as wsd:
+        sdc_provider = SomeDevice.from_mdib_file(wsd, None, '70041_MDIB_Final.xml')
+        sdc_provider.start_all(start_rtsample_loop=False)
+        sdc_provider.set_location(utils.random_location())
+        sdc_consumer = SdcConsumer(sdc_provider.get_xaddrs()[0], sdc_definitions=sdc_provider.mdib.sdc_definitions,
+                                   ssl_context_container=None, validate=False)
+        sdc_consumer.start_all()
+        mdib = ReportDroppingConsumerMdib(sdc_consumer)
+        mdib.init_mdib()
+        _benchmark('resync', sdc_provider, mdib, mdib.resync)
+        _benchmark('reload_all', sdc_provider, mdib, mdib.reload_all)
+        print(f'resync counts: {mdib.resync_counts}')
+        sdc_consumer.stop_all()
+        sdc_provider.stop_all()
@@ -0,0 +1,41 @@
+"""Startup duration of ProviderMdib instances from xml and from a binary snapshot.
+
+For 1 and for 200 instances the mdib tests/70041_MDIB_Final.xml is loaded with ProviderMdib.from_mdib_file and
+with ProviderMdib.from_snapshot_file. The snapshot file is written once before the measurement.
+
+usage: python tools/benchmark_mdib_snapshot.py
+"""
+
+import pathlib
+import tempfile
+import time
+
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.providermdib import ProviderMdib
+
+INSTANCES = (1, 200)
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+
+
+def load_xml(count: int) -> list[ProviderMdib]:
+    return [ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions) for _ in range(count)]
+
+
+def load_snapshot(count: int, snapshot_path: pathlib.Path) -> list[ProviderMdib]:
+    return [ProviderMdib.from_snapshot_file(snapshot_path) for _ in range(count)]
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = pathlib.Path(tmp_dir) / 'mdib.snapshot'
+        path.write_bytes(ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions).to_snapshot())
+        print(f'xml file {MDIB_PATH.stat().st_size} bytes, snapshot {path.stat().st_size} bytes')
+        for count in INSTANCES:
+            start = time.perf_counter()
+            load_xml(count)
+            xml_duration = time.perf_counter() - start
+            start = time.perf_counter()
+            load_snapshot(count, path)
+            snapshot_duration = time.perf_counter() - start
+            print(f'{count:4d} instances: from_mdib_file {xml_duration:.3f} s, '
+                  f'from_snapshot_file {snapshot_duration:.3f} s')
@@ -0,0 +1,85 @@
+"""Latency of alert reports on the consumer under a saturating waveform load.
+
+Waveform notifications are posted faster than the worker can process them, every 50 ms an alert report is posted.
+The script prints the latency (reception until handler start) of the alert reports for the default
+DispatchKeyRegistryDeferred and for PriorityDispatchKeyRegistryDeferred.
+
+usage: python tools/benchmark_notification_priority.py
+"""
+
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+from sdc11073.consumer.request_handler_deferred import (
+    DispatchKeyRegistryDeferred,
+    PriorityDispatchKeyRegistryDeferred,
+)
+from sdc11073.dispatch import DispatchKey
+from sdc11073.xml_types.actions import Actions
+
+WAVEFORM_PROCESSING_TIME = 0.002  # simulated cpu time to parse a waveform report and update the mdib
+WAVEFORM_BURST = 8  # waveforms posted every WAVEFORM_INTERVAL
+WAVEFORM_INTERVAL = 0.005  # up to 1600 waveforms per second, faster than processing => queue saturates
+ALERT_INTERVAL = 0.05
+DURATION = 5.0
+
+
+def _busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def run(dispatcher_cls: type) -> dict:
+    dispatcher = dispatcher_cls('bench', max_queue_size=500)
+    alert_latencies = []
+    waveform_count = [0]
+
+    def on_waveform(_request):
+        waveform_count[0] += 1
+        _busy(WAVEFORM_PROCESSING_TIME)
+
+    def on_alert(request):
+        alert_latencies.append(time.perf_counter() - request.sent)
+
+    dispatcher.register_post_handler(DispatchKey(Actions.Waveform, None), on_waveform)
+    dispatcher.register_post_handler(DispatchKey(Actions.EpisodicAlertReport, None), on_alert)
+
+    def mk_request(action: str) -> SimpleNamespace:
+        return SimpleNamespace(message_data=SimpleNamespace(action=action, q_name=None), sent=time.perf_counter())
+
+    stop = threading.Event()
+
+    def post_waveforms():
+        while not stop.is_set():
+            for _ in range(WAVEFORM_BURST):
+                dispatcher.on_post(mk_request(Actions.Waveform))
+            time.sleep(WAVEFORM_INTERVAL)
+
+    thread = threading.Thread(target=post_waveforms, daemon=True)
+    thread.start()
+    end = time.perf_counter() + DURATION
+    while time.perf_counter() < end:
+        time.sleep(ALERT_INTERVAL)
+        dispatcher.on_post(mk_request(Actions.EpisodicAlertReport))
+    stop.set()
+    thread.join()
+    time.sleep(0.5)
+    dropped = sum(s.dropped for s in dispatcher.get_statistics().values())
+    return {
+        'alerts': len(alert_latencies),
+        'alert latency median ms': 1000 * statistics.median(alert_latencies) if alert_latencies else None,
+        'alert latency max ms': 1000 * max(alert_latencies) if alert_latencies else None,
+        'waveforms processed': waveform_count[0],
+        'waveforms dropped': dropped,
+    }
+
+
+if __name__ == '__main__':
+    for cls in (DispatchKeyRegistryDeferred, PriorityDispatchKeyRegistryDeferred):
+        result = run(cls)
+        print(cls.__name__)
+        for key, value in result.items():
+            print(f'    {key}: {value}')
@@ -0,0 +1,38 @@
+"""Micro benchmark of setting an ObservableProperty with 0, 1 and 10 observers.
+
+usage: python tools/benchmark_observables.py
+"""
+
+import timeit
+
+from sdc11073.observableproperties import observables
+
+LOOPS = 200000
+
+
+class Observed:
+    prop = observables.ObservableProperty()
+
+
+class Observer:
+    def on_prop(self, value):
+        pass
+
+
+def run(observer_count: int) -> float:
+    observed = Observed()
+    observers = [Observer() for _ in range(observer_count)]
+    for observer in observers:
+        observables.bind(observed, prop=observer.on_prop)
+    values = list(range(LOOPS))
+
+    def set_values():
+        for value in values:
+            observed.prop = value
+
+    return timeit.timeit(set_values, number=1) / LOOPS
+
+
+if __name__ == '__main__':
+    for count in (0, 1, 10):
+        print(f'{count:2d} observers: {run(count) * 1e9:.0f} ns per set')
@@ -0,0 +1,112 @@
+"""Threads, memory and cpu load of many providers in one SdcProviderHost compared with standalone providers.
+
+PROVIDERS providers are created from tests/70041_MDIB_Final.xml with shared descriptors, each of them updates one
+metric every UPDATE_PERIOD seconds (a low rate device). The providers run once in a SdcProviderHost and once as
+standalone SdcProvider instances with own http server, soap client pool, event loop and threads.
+For both variants the number of threads, the memory per provider (tracemalloc) and the cpu time per provider
+and second while the providers are running for DURATION seconds are printed. There are no consumers.
+
+usage: python tools/benchmark_provider_host.py [providers]
+"""
+
+import gc
+import pathlib
+import sys
+import threading
+import time
+import tracemalloc
+from decimal import Decimal
+
+from sdc11073 import wsdiscovery
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.mdib.shareddescriptors import SharedDescriptorSet
+from sdc11073.provider import SdcProvider, SdcProviderHost
+from sdc11073.provider.scheduler import Scheduler
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
+
+PROVIDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+UPDATE_PERIOD = 1.0
+DURATION = 10.0
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+MODEL = ThisModelType(manufacturer='Example Manufacturer', model_name='BenchmarkDevice', model_number='1.0')
+
+
+def _metric_updater(mdib: ProviderMdib):
+    handle = mdib.descriptions.NODETYPE.get(pm.NumericMetricDescriptor)[0].Handle
+    values = iter(range(10**9))
+
+    def _update():
+        with mdib.metric_state_transaction() as mgr:
+            state = mgr.get_state(handle)
+            if state.MetricValue is None:
+                state.mk_metric_value()
+            state.MetricValue.Value = Decimal(next(values))
+
+    return _update
+
+
+def _run(name: str, start_providers, stop_providers) -> None:  # noqa: ANN001
+    gc.collect()
+    start_threads = threading.active_count()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start_providers()
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - start_memory
+    threads = threading.active_count() - start_threads
+    tracemalloc.stop()  # tracing distorts the cpu load
+    start_cpu = time.process_time()
+    time.sleep(DURATION)
+    cpu = time.process_time() - start_cpu
+    stop_providers()
+    tracemalloc.start()
+    print(f'{name:10s}: {PROVIDERS} providers, {threads} threads, {memory / PROVIDERS / 1024:.0f} kB per provider, '
+          f'cpu {1000 * cpu / DURATION / PROVIDERS:.2f} ms/s per provider, '
+          f'{PROVIDERS * DURATION / UPDATE_PERIOD / max(cpu, 1e-9) :.0f} updates per cpu second')
+
+
+def _benchmark_host(wsd: wsdiscovery.WSDiscovery, shared: SharedDescriptorSet):
+    host = SdcProviderHost(wsd)
+
+    def _start():
+        host.start_all()
+        for i in range(PROVIDERS):
+            mdib = ProviderMdib.from_shared_descriptors(shared)
+            device = ThisDeviceType(friendly_name=f'device {i}', serial_number=str(i))
+            host.add_provider(MODEL, device, mdib, validate=False)
+            host.scheduler.add_job(_metric_updater(mdib), UPDATE_PERIOD, start_delay=UPDATE_PERIOD * i / PROVIDERS)
+
+    _run('host', _start, lambda: host.stop_all(send_subscription_end=False))
+
+
+def _benchmark_standalone(wsd: wsdiscovery.WSDiscovery, shared: SharedDescriptorSet):
+    providers = []
+    # the metric updates of standalone providers also need a thread, use one scheduler for all
+    scheduler = Scheduler()
+
+    def _start():
+        scheduler.start()
+        for i in range(PROVIDERS):
+            mdib = ProviderMdib.from_shared_descriptors(shared)
+            device = ThisDeviceType(friendly_name=f'device {i}', serial_number=str(i))
+            provider = SdcProvider(wsd, MODEL, device, mdib, validate=False)
+            provider.start_all(start_rtsample_loop=False)
+            providers.append(provider)
+            scheduler.add_job(_metric_updater(mdib), UPDATE_PERIOD, start_delay=UPDATE_PERIOD * i / PROVIDERS)
+
+    def _stop():
+        scheduler.stop()
+        for provider in providers:
+            provider.stop_all(send_subscription_end=False)
+
+    _run('standalone', _start, _stop)
+
+
+if __name__ == '__main__':
+    shared_descriptors = SharedDescriptorSet(ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions))
+    with wsdiscovery.WSDiscovery('127.0.0.1') as ws_discovery:
+        tracemalloc.start()
+        _benchmark_host(ws_discovery, shared_descriptors)
+        _benchmark_standalone(ws_discovery, shared_descriptors)
+        tracemalloc.stop()
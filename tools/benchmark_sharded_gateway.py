@@ -0,0 +1,137 @@
+"""Throughput of a ShardedConsumerGateway with an increasing number of shards.
+
+PROVIDERS simulated providers run in PROVIDER_PROCESSES separate processes (each with a SdcProviderHost), every
+provider appends SAMPLES_PER_UPDATE samples to each of its waveforms every UPDATE_PERIOD seconds. The offered load is
+chosen so that one shard cannot keep up with it.
+The gateway connects to all providers once with 1 shard, then with 2, 4, ... up to the number of cpus. For every
+shard count the number of waveform samples per second that arrive in shared memory is printed. The providers need
+cpu time, too; for meaningful results the machine needs more cores than shards, or the providers run elsewhere.
+
+usage: python tools/benchmark_sharded_gateway.py [providers] [max_shards]
+"""
+
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from decimal import Decimal
+
+from sdc11073 import wsdiscovery
+from sdc11073.consumer.shardedgateway import ShardedConsumerGateway
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.mdib.shareddescriptors import SharedDescriptorSet
+from sdc11073.provider import SdcProviderHost
+from sdc11073.wsdiscovery.service import Service
+from sdc11073.xml_types import pm_qnames as pm
+from sdc11073.xml_types.dpws_types import ThisDeviceType, ThisModelType
+
+PROVIDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+MAX_SHARDS = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+PROVIDER_PROCESSES = 4
+UPDATE_PERIOD = 0.1
+SAMPLES_PER_UPDATE = 50
+WARMUP = 3.0
+DURATION = 10.0
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+MODEL = ThisModelType(manufacturer='Example Manufacturer', model_name='SimulatedDevice', model_number='1.0')
+
+
+def _waveform_updater(mdib: ProviderMdib, handles: list[str]):
+    samples = [Decimal(i) for i in range(SAMPLES_PER_UPDATE)]
+
+    def _update():
+        with mdib.rt_sample_state_transaction() as mgr:
+            for handle in handles:
+                state = mgr.get_state(handle)
+                if state.MetricValue is None:
+                    state.mk_metric_value()
+                state.MetricValue.Samples = samples
+                state.MetricValue.DeterminationTime = time.time()
+
+    return _update
+
+
+def _run_providers(first: int, count: int, ready: multiprocessing.Queue, stop: multiprocessing.Event):
+    shared_descriptors = SharedDescriptorSet(ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions))
+    handles = [d.Handle for d in shared_descriptors.descriptions.NODETYPE.get(pm.RealTimeSampleArrayMetricDescriptor)]
+    with wsdiscovery.WSDiscovery('127.0.0.1') as ws_discovery:
+        provider_host = SdcProviderHost(ws_discovery)
+        provider_host.start_all()
+        providers = []
+        for i in range(first, first + count):
+            mdib = ProviderMdib.from_shared_descriptors(shared_descriptors)
+            device = ThisDeviceType(friendly_name=f'device {i}', serial_number=str(i))
+            provider = provider_host.add_provider(MODEL, device, mdib, validate=False, start_rtsample_loop=False)
+            provider_host.scheduler.add_job(_waveform_updater(mdib, handles), UPDATE_PERIOD,
+                                            start_delay=UPDATE_PERIOD * i / PROVIDERS)
+            providers.append((provider.epr_urn, provider.get_xaddrs()))
+        ready.put((providers, handles))
+        stop.wait()
+        provider_host.stop_all()
+
+
+def _sample_count(gateway: ShardedConsumerGateway, handles_by_epr: dict[str, list[str]]) -> int:
+    count = 0
+    for epr, handles in handles_by_epr.items():
+        for handle in handles:
+            waveform = gateway.read_waveform(epr, handle, max_samples=0)
+            count += waveform.write_count if waveform is not None else 0
+    return count
+
+
+def _benchmark(ws_discovery: wsdiscovery.WSDiscovery, shard_count: int, services: list[Service],
+               handles_by_epr: dict[str, list[str]]) -> float:
+    gateway = ShardedConsumerGateway(ws_discovery, shard_count=shard_count, validate=False)
+    gateway.start()
+    try:
+        started = time.perf_counter()
+        gateway.update_devices(services)
+        if not gateway.wait_connected(handles_by_epr, timeout=120):
+            print(f'{shard_count} shards: not all devices connected')
+        connect_time = time.perf_counter() - started
+        time.sleep(WARMUP)
+        start_count = _sample_count(gateway, handles_by_epr)
+        time.sleep(DURATION)
+        rate = (_sample_count(gateway, handles_by_epr) - start_count) / DURATION
+        print(f'{shard_count:2d} shards: connect {connect_time:.1f} s, {rate:,.0f} samples/s, '
+              f'loads {gateway.shard_loads}')
+        return rate
+    finally:
+        gateway.stop()
+
+
+if __name__ == '__main__':
+    mp_context = multiprocessing.get_context('spawn')
+    ready_queue = mp_context.Queue()
+    stop_event = mp_context.Event()
+    per_process = -(-PROVIDERS // PROVIDER_PROCESSES)
+    processes = []
+    for first_index in range(0, PROVIDERS, per_process):
+        process = mp_context.Process(target=_run_providers, daemon=True,
+                                     args=(first_index, min(per_process, PROVIDERS - first_index), ready_queue,
+                                           stop_event))
+        process.start()
+        processes.append(process)
+    all_services = []
+    all_handles = {}
+    for _ in processes:
+        provider_data, rt_handles = ready_queue.get(timeout=300)
+        for epr, xaddrs in provider_data:
+            all_services.append(Service(list(SdcV1Definitions.MedicalDeviceTypesFilter), None, xaddrs, epr, '1'))
+            all_handles[epr] = rt_handles
+    offered = PROVIDERS * len(rt_handles) * SAMPLES_PER_UPDATE / UPDATE_PERIOD
+    print(f'{PROVIDERS} providers, {os.cpu_count()} cpus, offered {offered:,.0f} samples/s')
+    shard_counts = []
+    shards = 1
+    while shards <= MAX_SHARDS:
+        shard_counts.append(shards)
+        shards *= 2
+    with wsdiscovery.WSDiscovery('127.0.0.1') as gateway_discovery:
+        rates = [_benchmark(gateway_discovery, n, all_services, all_handles) for n in shard_counts]
+    for n, rate in zip(shard_counts, rates):
+        print(f'{n:2d} shards: speedup {rate / rates[0]:.2f}, {rate / offered:.1%} of offered samples')
+    stop_event.set()
+    for process in processes:
+        process.join()
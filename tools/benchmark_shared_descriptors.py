@@ -0,0 +1,57 @@
+"""Memory per ProviderMdib instance with own descriptors and with shared descriptors.
+
+INSTANCES mdibs are created from tests/70041_MDIB_Final.xml, once with ProviderMdib.from_mdib_file and once with
+ProviderMdib.from_shared_descriptors from one SharedDescriptorSet. The memory that is allocated per instance is
+measured with tracemalloc. An instance with shared descriptors has no own descriptors, the difference of the memory
+per instance is the memory of the descriptors (containers, nodes and indices) of an instance without shared descriptors.
+
+usage: python tools/benchmark_shared_descriptors.py
+"""
+
+import gc
+import pathlib
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.mdib.shareddescriptors import SharedDescriptorSet
+
+INSTANCES = 500
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+
+
+def _measure(factory: Callable[[], Any], count: int) -> tuple[float, float, list]:
+    """Return duration and allocated memory per object and the objects."""
+    gc.collect()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    objects = [factory() for _ in range(count)]
+    duration = time.perf_counter() - start
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - start_memory
+    return duration / count, memory / count, objects
+
+
+def _load_xml() -> ProviderMdib:
+    return ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions)
+
+
+if __name__ == '__main__':
+    tracemalloc.start()
+    _, empty_memory, _ = _measure(lambda: ProviderMdib(SdcV1Definitions), INSTANCES)
+    _, shared_memory, shared_sets = _measure(lambda: SharedDescriptorSet(_load_xml()), 1)
+    shared = shared_sets[0]
+    print(f'empty mdib {empty_memory / 1024:.0f} kB, SharedDescriptorSet {shared_memory / 1024:.0f} kB')
+    results = {}
+    for name, func in (('from_mdib_file', _load_xml),
+                       ('from_shared_descriptors', lambda: ProviderMdib.from_shared_descriptors(shared))):
+        instance_duration, instance_memory, instances = _measure(func, INSTANCES)
+        results[name] = instance_memory
+        print(f'{INSTANCES} x {name:25s}: {1000 * instance_duration:.1f} ms, {instance_memory / 1024:.0f} kB '
+              f'per instance')
+        del instances
+    descriptor_memory = results['from_mdib_file'] - results['from_shared_descriptors']
+    print(f'own descriptors of an instance without shared descriptors: {descriptor_memory / 1024:.0f} kB')
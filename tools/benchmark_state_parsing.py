@@ -0,0 +1,79 @@
+"""Throughput and memory of consumer side state parsing with and without keeping the xml node.
+
+Episodic metric reports with the metric states of tests/70041_MDIB_Final.xml are replayed REPORTS times.
+Every report is parsed and applied to a mirror of the states the same way ConsumerMdib does it
+(update_from_other_container). The script prints reports per second and the RSS after the replay
+for keeping the nodes (default) and for releasing them (ConsumerMdib with keep_nodes=False).
+Each mode runs in its own process, so that the RSS values are independent.
+
+usage: python tools/benchmark_state_parsing.py [reports]
+"""
+
+import multiprocessing
+import pathlib
+import sys
+import time
+
+from lxml import etree
+
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.namespaces import default_ns_helper
+from sdc11073.xml_types import msg_types
+
+REPORTS = 20000  # one report every 4 seconds for 24 hours would be 21600
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+
+
+def _rss_mb() -> float:
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * 4096 / 1024 / 1024
+
+
+def _mk_reports_bytes() -> list[bytes]:
+    """Return one report per metric state, like a provider that sends every change immediately."""
+    mdib = ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions)
+    ns_map = default_ns_helper.partial_map(default_ns_helper.MSG, default_ns_helper.PM, default_ns_helper.XSI)
+    result = []
+    for state in mdib.states.objects:
+        if not state.is_metric_state or state.is_realtime_sample_array_metric_state:
+            continue
+        report = msg_types.EpisodicMetricReport()
+        report.MdibVersion = 1
+        report.SequenceId = 'urn:uuid:bench'
+        report.add_report_part().MetricState.append(state)
+        result.append(etree.tostring(report.as_etree_node(report.NODETYPE, ns_map)))
+    return result
+
+
+def run(keep_node: bool, reports_bytes: list[bytes], reports: int, result_queue: multiprocessing.Queue):
+    mirror = {}
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+    for i in range(reports):
+        node = etree.fromstring(reports_bytes[i % len(reports_bytes)])
+        report = msg_types.EpisodicMetricReport.from_node(node)
+        for state in report.ReportPart[0].MetricState:
+            old_state = mirror.get(state.DescriptorHandle)
+            if old_state is None:
+                old_state = mirror[state.DescriptorHandle] = state
+            else:
+                old_state.update_from_other_container(state)
+            if not keep_node:
+                old_state.release_node()
+    duration = time.perf_counter() - start
+    result_queue.put((keep_node, reports / duration, _rss_mb() - rss_start, len(mirror)))
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else REPORTS
+    report_data = _mk_reports_bytes()
+    print(f'{count} reports, {len(report_data)} different metric states')
+    queue = multiprocessing.Queue()
+    for keep in (True, False):
+        proc = multiprocessing.Process(target=run, args=(keep, report_data, count, queue))
+        proc.start()
+        keep, rate, rss, states = queue.get()
+        proc.join()
+        print(f'keep_node={keep}: {rate:.0f} reports/s, RSS growth {rss:.1f} MB, {states} states in mirror')
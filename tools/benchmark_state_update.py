@@ -0,0 +1,70 @@
+"""Duration of applying incoming metric states to the states of a consumer mdib.
+
+The numeric metric states of tests/70041_MDIB_Final.xml get VERSIONS new versions each, in every version only the
+MetricValue and the StateVersion change. The new states are applied to a StatesLookup the way ConsumerMdib did it
+before (update_from_other_container and update_object) and the way it does it now (only changed properties,
+indices only if an indexed property changed). Parsing of the states is not part of the measurement.
+
+usage: python tools/benchmark_state_update.py
+"""
+
+import copy
+import pathlib
+import time
+from decimal import Decimal
+
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.consumermdib import ConsumerMdib
+from sdc11073.mdib.mdibbase import StatesLookup
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.xml_types import pm_types
+
+VERSIONS = 200
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+
+
+def _mk_states() -> tuple[list, list]:
+    mdib = ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions)
+    numeric_metric_state = mdib.data_model.pm_names.NumericMetricState
+    states = [s for s in mdib.states.objects if s.NODETYPE == numeric_metric_state]
+    updates = []
+    for version in range(1, VERSIONS + 1):
+        for state in states:
+            new_state = state.mk_copy()
+            new_state.StateVersion = state.StateVersion + version
+            new_state.MetricValue = copy.copy(state.MetricValue) or pm_types.NumericMetricValue()
+            new_state.MetricValue.DeterminationTime = 1000.0 + version
+            new_state.MetricValue.Value = Decimal(version)
+            updates.append(new_state)
+    return states, updates
+
+
+def _mk_lookup(states: list) -> StatesLookup:
+    lookup = StatesLookup()
+    for state in states:
+        lookup.add_object(state.mk_copy())
+    return lookup
+
+
+def apply_full(lookup: StatesLookup, updates: list):
+    for new_state in updates:
+        old_state = lookup.descriptor_handle.get_one(new_state.DescriptorHandle)
+        old_state.update_from_other_container(new_state)
+        lookup.update_object(old_state)
+
+
+def apply_changed(lookup: StatesLookup, updates: list):
+    for new_state in updates:
+        old_state = lookup.descriptor_handle.get_one(new_state.DescriptorHandle)
+        ConsumerMdib._update_state_container(lookup, old_state, new_state)  # noqa: SLF001
+
+
+if __name__ == '__main__':
+    metric_states, state_updates = _mk_states()
+    print(f'{len(metric_states)} numeric metric states, {len(state_updates)} updates')
+    for name, func in (('all properties + index update', apply_full), ('changed properties', apply_changed)):
+        states_lookup = _mk_lookup(metric_states)
+        start = time.perf_counter()
+        func(states_lookup, state_updates)
+        duration = time.perf_counter() - start
+        print(f'{name:30s}: {1e6 * duration / len(state_updates):.1f} µs per state')
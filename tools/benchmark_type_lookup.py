@@ -0,0 +1,59 @@
+"""Share of xsi:type resolution in the parse time of an episodic metric report.
+
+The report contains all metric states of tests/70041_MDIB_Final.xml.
+The script prints the parse time of the report and the time needed to resolve the xsi:type attributes of its states
+to container classes, once uncached (text_to_qname and class lookup) and once with QNameLookupCache.
+
+usage: python tools/benchmark_type_lookup.py
+"""
+
+import pathlib
+import timeit
+
+from lxml import etree
+
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.mdib.statecontainers import get_container_class
+from sdc11073.namespaces import QN_TYPE, QNameLookupCache, default_ns_helper, text_to_qname
+from sdc11073.xml_types import msg_types
+
+LOOPS = 2000
+MDIB_PATH = pathlib.Path(__file__).parent.parent / 'tests' / '70041_MDIB_Final.xml'
+
+
+def _mk_report_node() -> etree._Element:
+    mdib = ProviderMdib.from_mdib_file(str(MDIB_PATH), SdcV1Definitions)
+    report = msg_types.EpisodicMetricReport()
+    report.MdibVersion = 1
+    report.SequenceId = 'urn:uuid:bench'
+    report.add_report_part().MetricState.extend(
+        s for s in mdib.states.objects if s.is_metric_state and not s.is_realtime_sample_array_metric_state
+    )
+    ns_map = default_ns_helper.partial_map(default_ns_helper.MSG, default_ns_helper.PM, default_ns_helper.XSI)
+    return etree.fromstring(etree.tostring(report.as_etree_node(report.NODETYPE, ns_map)))
+
+
+if __name__ == '__main__':
+    report_node = _mk_report_node()
+    state_nodes = [n for n in report_node.iter() if n.get(QN_TYPE) is not None and n.tag.endswith('MetricState')]
+    cache = QNameLookupCache(get_container_class)
+
+    def parse():
+        msg_types.EpisodicMetricReport.from_node(report_node)
+
+    def resolve_uncached():
+        for node in state_nodes:
+            get_container_class(text_to_qname(node.get(QN_TYPE), node.nsmap))
+
+    def resolve_cached():
+        for node in state_nodes:
+            cache.get(node.get(QN_TYPE), node.nsmap)
+
+    t_parse = timeit.timeit(parse, number=LOOPS) / LOOPS
+    t_uncached = timeit.timeit(resolve_uncached, number=LOOPS) / LOOPS
+    t_cached = timeit.timeit(resolve_cached, number=LOOPS) / LOOPS
+    print(f'{len(state_nodes)} states per report')
+    print(f'report parse time: {t_parse * 1e6:.0f} us')
+    print(f'type resolution uncached: {t_uncached * 1e6:.1f} us ({100 * t_uncached / t_parse:.1f}% of parse time)')
+    print(f'type resolution cached: {t_cached * 1e6:.1f} us ({100 * t_cached / t_parse:.1f}% of parse time)')
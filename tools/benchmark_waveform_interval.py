@@ -0,0 +1,103 @@
+"""Throughput and latency of waveform notifications with fixed and adaptive intervals.
+
+A GenericWaveformProvider runs WAVEFORMS waveforms at 500 Hz. Every waveform transaction is serialized to a
+WaveformStream message and "sent" to SUBSCRIBERS subscribers, each send costs a fixed PER_MESSAGE_COST
+(network round trip) like the synchronous send of the subscriptions manager does.
+For each configuration the script prints messages per second, the cpu load of the process,
+the mean latency of a sample (half the time between two sends plus the send duration) and the interval that was used.
+
+usage: python tools/benchmark_waveform_interval.py [waveforms] [seconds]
+"""
+
+import sys
+import time
+from decimal import Decimal
+
+from lxml import etree
+from tutorial.productandroles.waveformprovider.waveformproviderimpl import GenericWaveformProvider
+
+from sdc11073 import observableproperties as properties
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib import descriptorcontainers as dc
+from sdc11073.mdib.providermdib import ProviderMdib
+from sdc11073.namespaces import default_ns_helper
+from sdc11073.xml_types import msg_types, pm_types
+
+WAVEFORMS = 100
+DURATION = 5.0
+SUBSCRIBERS = 3
+PER_MESSAGE_COST = 0.004  # seconds
+
+
+class Sender:
+    """Serialize and 'send' every waveform transaction."""
+
+    def __init__(self, mdib: ProviderMdib):
+        self.messages = 0
+        self.send_durations = []
+        self.send_end_times = []
+        self._ns_map = default_ns_helper.partial_map(default_ns_helper.MSG, default_ns_helper.PM)
+        properties.bind(mdib, transaction=self.on_transaction)
+
+    def on_transaction(self, transaction_result):  # noqa: ANN001
+        start = time.perf_counter()
+        report = msg_types.WaveformStream()
+        report.State.extend(transaction_result.rt_updates)
+        etree.tostring(report.as_etree_node(report.NODETYPE, self._ns_map))
+        for _ in range(SUBSCRIBERS):
+            time.sleep(PER_MESSAGE_COST)
+            self.messages += 1
+        end = time.perf_counter()
+        self.send_durations.append(end - start)
+        self.send_end_times.append(end)
+
+
+def _mk_mdib(waveforms: int) -> ProviderMdib:
+    mdib = ProviderMdib(SdcV1Definitions)
+    mdib.descriptions.add_object(dc.MdsDescriptorContainer(handle='mds', parent_handle=None))
+    for i in range(waveforms):
+        desc = dc.RealTimeSampleArrayMetricDescriptorContainer(handle=f'rtsa{i}', parent_handle='mds')
+        desc.SamplePeriod = 0.002
+        desc.Unit = pm_types.CodedValue('abc')
+        desc.TechnicalRange.append(pm_types.Range(Decimal(0), Decimal(10)))
+        desc.MetricAvailability = pm_types.MetricAvailability.CONTINUOUS
+        desc.MetricCategory = pm_types.MetricCategory.MEASUREMENT
+        desc.Resolution = Decimal('0.01')
+        mdib.descriptions.add_object(desc)
+    mdib.xtra.mk_state_containers_for_all_descriptors()
+    return mdib
+
+
+def run(waveforms: int, duration: float, interval: float | None) -> str:
+    mdib = _mk_mdib(waveforms)
+    sender = Sender(mdib)
+    provider = GenericWaveformProvider(mdib)
+    provider.provide_waveforms()
+    if interval is None:
+        provider.notifications_interval = 0.02
+        controller = provider.enable_adaptive_interval(min_interval=0.02, max_interval=0.5)
+    else:
+        provider.notifications_interval = interval
+    cpu_start = time.process_time()
+    provider.start()
+    time.sleep(duration)
+    provider.stop()
+    cpu_load = (time.process_time() - cpu_start) / duration
+    avg_send = sum(sender.send_durations) / len(sender.send_durations)
+    used_interval = provider.notifications_interval
+    # a sample waits on average half the time between two sends, then the send itself
+    end_times = sender.send_end_times
+    avg_gap = (end_times[-1] - end_times[0]) / (len(end_times) - 1)
+    latency = avg_gap / 2 + avg_send
+    name = f'fixed {interval:.3f} s' if interval is not None else f'adaptive (widened {controller.widen_count} times)'
+    return (f'{name:32s}: {sender.messages / duration:6.1f} messages/s, cpu {100 * cpu_load:5.1f}%, '
+            f'send {1000 * avg_send:6.1f} ms, latency {1000 * latency:6.1f} ms, interval {used_interval:.3f} s')
+
+
+if __name__ == '__main__':
+    waveform_count = int(sys.argv[1]) if len(sys.argv) > 1 else WAVEFORMS
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION  # noqa: PLR2004
+    print(f'{waveform_count} waveforms at 500 Hz, {SUBSCRIBERS} subscribers, '
+          f'{1000 * PER_MESSAGE_COST:.0f} ms per message')
+    for fixed_interval in (0.02, 0.05, 0.1, 0.2, None):
+        print(run(waveform_count, seconds, fixed_interval))
@@ -0,0 +1,64 @@
+"""Number of waveforms that one core can update at 500 Hz.
+
+Every waveform gets its samples for a 100 ms tick (50 samples at 500 Hz) from a SinusGenerator and
+sets them as Decimal values in the MetricValue of its state, like GenericWaveformProvider._update_rt_samples does.
+The legacy path converts every sample with Context.create_decimal, the current path uses the Decimal values
+that the generator precomputed for one period. The annotation detection of the Annotator is part of the tick.
+
+usage: python tools/benchmark_waveform_provider.py
+"""
+
+import time
+from decimal import Context
+
+from tutorial.productandroles.waveformprovider.realtimesamples import Annotator, RtSampleArray
+from tutorial.productandroles.waveformprovider.waveformgenerators import SinusGenerator
+
+from sdc11073.definitions_sdc import SdcV1Definitions
+from sdc11073.mdib.descriptorcontainers import RealTimeSampleArrayMetricDescriptorContainer
+from sdc11073.mdib.statecontainers import RealTimeSampleArrayMetricStateContainer
+from sdc11073.xml_types import pm_types
+
+WAVEFORMS = 200
+TICKS = 100
+SAMPLE_PERIOD = 0.002  # 500 Hz
+TICK_DURATION = 0.1
+
+
+def _mk_waveforms() -> list:
+    result = []
+    for i in range(WAVEFORMS):
+        descriptor = RealTimeSampleArrayMetricDescriptorContainer(handle=f'rtsa{i}', parent_handle='chan')
+        state = RealTimeSampleArrayMetricStateContainer(descriptor)
+        state.mk_metric_value()
+        generator = SinusGenerator(min_value=-8.0, max_value=10.0, waveform_period=1.0, sample_period=SAMPLE_PERIOD)
+        annotator = Annotator(pm_types.Annotation(pm_types.CodedValue('a')), f'rtsa{i}', [])
+        result.append((generator, state, annotator))
+    return result
+
+
+def run(use_precomputed: bool) -> float:
+    """Return the cpu time per tick for all waveforms."""
+    waveforms = _mk_waveforms()
+    samples_per_tick = int(TICK_DURATION / SAMPLE_PERIOD)
+    context = Context(prec=10)
+    start = time.process_time()
+    for tick in range(TICKS):
+        for generator, state, annotator in waveforms:
+            samples = generator.next_samples(samples_per_tick)
+            rt_sample_array = RtSampleArray(SdcV1Definitions.data_model, tick * TICK_DURATION, SAMPLE_PERIOD,
+                                            samples, pm_types.ComponentActivation.ON)
+            annotator.get_annotation_timestamps(rt_sample_array)
+            if use_precomputed:
+                state.MetricValue.Samples = generator.last_samples_as_decimal()
+            else:
+                state.MetricValue.Samples = [context.create_decimal(s) for s in samples]
+    return (time.process_time() - start) / TICKS
+
+
+if __name__ == '__main__':
+    for name, precomputed in (('per sample create_decimal', False), ('precomputed Decimal values', True)):
+        tick_time = run(precomputed)
+        per_waveform = tick_time / WAVEFORMS
+        print(f'{name}: {per_waveform * 1e6:.1f} us per waveform and tick, '
+              f'{TICK_DURATION / per_waveform:.0f} waveforms at 500 Hz per core')
@@ -0,0 +1,109 @@
+"""Adaptive interval for waveform notifications."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sdc11073.provider.subscriptionmgr_base import RoundTripData
+
+
+class AdaptiveIntervalController:
+    """Calculate the interval between two waveform notifications.
+
+    The interval is widened if sending takes too long compared to the interval, if the worker is behind schedule
+    or if the average round trip time of a subscriber exceeds the interval.
+    It is narrowed again if sending is fast and the round trip times allow it.
+    The interval always stays between min_interval and max_interval (the latency limit).
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        min_interval: float = 0.05,
+        max_interval: float = 0.5,
+        initial_interval: float | None = None,
+        target_load: float = 0.5,
+        widen_factor: float = 1.5,
+        narrow_factor: float = 0.9,
+        round_trip_times: Callable[[], dict[object, RoundTripData]] | None = None,
+    ):
+        """Construct an AdaptiveIntervalController.
+
+        :param min_interval: lower limit of the interval in seconds
+        :param max_interval: upper limit of the interval in seconds
+        :param initial_interval: start value, defaults to min_interval
+        :param target_load: max. share of the interval that sending may take before the interval is widened.
+                            The interval is narrowed if sending takes less than half of this share.
+        :param widen_factor: the interval is multiplied with this factor when widening
+        :param narrow_factor: the interval is multiplied with this factor when narrowing
+        :param round_trip_times: optional callable that returns round trip statistics of subscribers,
+                                 e.g. get_subscription_round_trip_times of a subscriptions manager
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(f'invalid interval limits {min_interval}, {max_interval}')
+        if not 0 < target_load < 1:
+            raise ValueError(f'target_load must be between 0 and 1, got {target_load}')
+        if widen_factor <= 1 or not 0 < narrow_factor < 1:
+            raise ValueError('widen_factor must be > 1 and narrow_factor between 0 and 1')
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_load = target_load
+        self.widen_factor = widen_factor
+        self.narrow_factor = narrow_factor
+        self._round_trip_times = round_trip_times
+        start = min_interval if initial_interval is None else initial_interval
+        self.interval = min(max(start, min_interval), max_interval)
+        self.avg_send_duration: float | None = None  # exponential moving average
+        self.max_round_trip_time: float | None = None
+        self.widen_count = 0
+        self.narrow_count = 0
+
+    def _get_max_round_trip_time(self) -> float | None:
+        if self._round_trip_times is None:
+            return None
+        averages = [data.avg for data in self._round_trip_times().values() if data.avg is not None]
+        return max(averages) if averages else None
+
+    def update(self, send_duration: float, behind_schedule: float = 0.0) -> float:
+        """Calculate the next interval.
+
+        :param send_duration: seconds needed to create and send the last notification
+        :param behind_schedule: seconds the worker was behind schedule at the begin of the last notification
+        :return: the new interval in seconds
+        """
+        if self.avg_send_duration is None:
+            self.avg_send_duration = send_duration
+        else:
+            self.avg_send_duration = 0.8 * self.avg_send_duration + 0.2 * send_duration
+        self.max_round_trip_time = self._get_max_round_trip_time()
+        load = self.avg_send_duration / self.interval
+        slow_subscriber = self.max_round_trip_time is not None and self.max_round_trip_time > self.interval
+        # timer jitter is not relevant, only a delay of more than a tenth of the interval
+        behind = behind_schedule > self.interval / 10
+        if load > self.target_load or behind or slow_subscriber:
+            new_interval = min(self.interval * self.widen_factor, self.max_interval)
+            if new_interval != self.interval:
+                self.widen_count += 1
+        elif load < self.target_load / 2:
+            new_interval = max(self.interval * self.narrow_factor, self.min_interval)
+            if self.max_round_trip_time is not None and self.max_round_trip_time > new_interval:
+                new_interval = self.interval  # narrowing would make the subscriber too slow again
+            if new_interval != self.interval:
+                self.narrow_count += 1
+        else:
+            new_interval = self.interval
+        self.interval = new_interval
+        return new_interval
+
+    @property
+    def statistics(self) -> dict[str, float | int | None]:
+        """Return the current interval and the values it is based on."""
+        return {
+            'interval': self.interval,
+            'avg_send_duration': self.avg_send_duration,
+            'max_round_trip_time': self.max_round_trip_time,
+            'widen_count': self.widen_count,
+            'narrow_count': self.narrow_count,
+        }
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import itertools
 from typing import TYPE_CHECKING
 
 from sdc11073.provider.protocols.waveformprotocol import AnnotatorProtocol, RtSampleArrayProtocol
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
+    from decimal import Decimal
 
     from sdc11073.definitions_base import AbstractDataModel
     from sdc11073.xml_types.pm_types import Annotation, ComponentActivation
@@ -26,6 +28,7 @@ class RtSampleArray(RtSampleArrayProtocol):
         sample_period: float,
         samples: Sequence[float],
         activation_state: ComponentActivation,
+        decimal_samples: list[Decimal] | None = None,
     ):
         """Construct a RtSampleArray.
 
@@ -33,12 +36,14 @@ class RtSampleArray(RtSampleArrayProtocol):
         :param sample_period: the time difference between two samples
         :param samples: a sequence of 2-tuples (value (float or int), flag annotation_trigger)
         :param activation_state: one of pmtypes.ComponentActivation values
+        :param decimal_samples: optional, the samples as Decimal values. If given, they are used for the state.
         """
         self._model = model
         self.determination_time = determination_time
         self.sample_period = sample_period
         self.samples = samples
         self.activation_state = activation_state
+        self.decimal_samples = decimal_samples
         self.annotations = []
         self.apply_annotations = []
 
@@ -92,9 +97,14 @@ class Annotator(AnnotatorProtocol):
 
     def get_annotation_timestamps(self, rt_sample_array: RtSampleArrayProtocol) -> Sequence[float]:
         """Analyze the rt_sample_array and return timestamps for annotations."""
-        ret = []
-        for i, rt_sample in enumerate(rt_sample_array.samples):
-            if self._last_value <= 0 < rt_sample:
-                ret.append(rt_sample_array.determination_time + i * rt_sample_array.sample_period)
-            self._last_value = rt_sample
-        return ret
+        samples = rt_sample_array.samples
+        if len(samples) == 0:
+            return []
+        # compare every sample with its predecessor at once, the first one with the last sample of previous array
+        previous_samples = itertools.chain((self._last_value,), itertools.islice(samples, len(samples) - 1))
+        trigger_indices = [i for i, (previous, sample) in enumerate(zip(previous_samples, samples))
+                           if previous <= 0 < sample]
+        self._last_value = samples[-1]
+        start = rt_sample_array.determination_time
+        period = rt_sample_array.sample_period
+        return [start + i * period for i in trigger_indices]
@@ -1,8 +1,10 @@
 """Example waveform generator implementation."""
 
-import itertools
+from __future__ import annotations
+
 import math
 from collections.abc import Sequence
+from decimal import Context, Decimal
 
 from sdc11073.provider.protocols.waveformprotocol import CurveGeneratorCallable, WaveformGeneratorProtocol
 
@@ -30,7 +32,11 @@ def triangle(min_value: float, max_value: float, samples: int) -> Sequence[float
 
 
 class WaveformGeneratorBase(WaveformGeneratorProtocol):
-    """Generator of infinite curve, data is provided by a curve generator."""
+    """Generator of infinite curve, data is provided by a curve generator.
+
+    The values of one period are calculated once, also as Decimal values. next_samples returns slices of the period,
+    last_samples_as_decimal returns the same samples as Decimal without converting them again.
+    """
 
     def __init__(
         self,
@@ -47,12 +53,41 @@ class WaveformGeneratorBase(WaveformGeneratorProtocol):
             raise ValueError('no values <= 0 allowed for sample_period and waveform_period')
         self.sample_period = sample_period
         samples = int(waveform_period / sample_period)
-        self._values = values_generator(min_value, max_value, samples)
-        self._generator = itertools.cycle(self._values)
+        self._values = list(values_generator(min_value, max_value, samples))
+        context = Context(prec=10)
+        self._decimal_values = [context.create_decimal(v) for v in self._values]
+        self._position = 0
+        self._last_position = 0
+        self._last_samples: list[float] | None = None  # the list returned by the last next_samples call
+
+    def _slice(self, values: list, start: int, count: int) -> list:
+        """Return count values beginning at start, continue at the beginning of values if needed."""
+        values_count = len(values)
+        end = start + count
+        if end <= values_count:
+            return values[start:end]
+        result = values[start:]
+        count -= values_count - start
+        full_periods, rest = divmod(count, values_count)
+        result.extend(values * full_periods)
+        result.extend(values[:rest])
+        return result
 
     def next_samples(self, count: int) -> Sequence[float]:
         """Get next values from generator."""
-        return [next(self._generator) for _ in range(count)]
+        self._last_position = self._position
+        self._position = (self._position + count) % len(self._values)
+        self._last_samples = self._slice(self._values, self._last_position, count)
+        return self._last_samples
+
+    def last_samples_as_decimal(self, samples: Sequence[float]) -> list[Decimal] | None:
+        """Return samples as Decimal if samples is the list that the last next_samples call returned.
+
+        Returns None for any other sequence, e.g. if a derived class overrides next_samples and returns other values.
+        """
+        if self._last_samples is None or samples is not self._last_samples:
+            return None
+        return self._slice(self._decimal_values, self._last_position, len(samples))
 
 
 class TriangleGenerator(WaveformGeneratorBase):
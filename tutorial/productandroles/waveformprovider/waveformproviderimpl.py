@@ -9,20 +9,25 @@ from threading import Event, Thread
 from typing import TYPE_CHECKING, Any
 
 from sdc11073 import loghelper
+from sdc11073 import observableproperties as properties
 from sdc11073.intervaltimer import IntervalTimer
+from tutorial.productandroles.waveformprovider.intervalcontroller import AdaptiveIntervalController
 from tutorial.productandroles.waveformprovider.realtimesamples import Annotator, RtSampleArray
 from tutorial.productandroles.waveformprovider.waveformgenerators import TriangleGenerator
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Callable, Iterable, Sequence
 
     from sdc11073.definitions_base import AbstractDataModel
     from sdc11073.mdib.entityprotocol import EntityProtocol
     from sdc11073.mdib.providermdibprotocol import ProviderMdibProtocol
     from sdc11073.mdib.statecontainers import RealTimeSampleArrayMetricStateContainer
     from sdc11073.provider.protocols.waveformprotocol import AnnotatorProtocol, WaveformGeneratorProtocol
+    from sdc11073.provider.subscriptionmgr_base import RoundTripData
     from sdc11073.xml_types.pm_types import ComponentActivation
 
+_DECIMAL_CONTEXT = Context(prec=10)
+
 
 class _SampleArrayGenerator:
     """Wraps a waveform generator and makes RtSampleArray objects."""
@@ -63,6 +68,9 @@ class _SampleArrayGenerator:
             observation_time = self._last_timestamp or now
             samples_count = int((now - observation_time) / self._generator.sample_period)
             samples = self._generator.next_samples(samples_count)
+            # generators derived from WaveformGeneratorBase provide the samples also as Decimal
+            last_samples_as_decimal = getattr(self._generator, 'last_samples_as_decimal', None)
+            decimal_samples = None if last_samples_as_decimal is None else last_samples_as_decimal(samples)
             self._last_timestamp = observation_time + self._generator.sample_period * samples_count
             self.current_rt_sample_array = RtSampleArray(
                 self._model,
@@ -70,6 +78,7 @@ class _SampleArrayGenerator:
                 self._generator.sample_period,
                 samples,
                 self._activation_state,
+                decimal_samples,
             )
         return self.current_rt_sample_array
 
@@ -85,10 +94,14 @@ class GenericWaveformProvider:
     """Provide waveform data.
 
     - runs periodic job to send waveform data
+    - optionally adapts the interval of the job to the send duration and subscriber round trip times,
+      see enable_adaptive_interval. notifications_interval is observable and always holds the current interval.
     """
 
     DEFAULT_WORKER_THREAD_INTERVAL = 0.1  # seconds
 
+    notifications_interval: float = properties.ObservableProperty(DEFAULT_WORKER_THREAD_INTERVAL)
+
     WARN_LIMIT_REALTIMESAMPLES_BEHIND_SCHEDULE = 0.2  # warn limit when real time samples cannot be sent in time
     WARN_RATE_REALTIMESAMPLES_BEHIND_SCHEDULE = 5  # max. every x seconds a message
 
@@ -98,7 +111,7 @@ class GenericWaveformProvider:
 
         self._stop_worker = Event()
         self._worker_thread: Thread | None = None
-        self.notifications_interval = self.DEFAULT_WORKER_THREAD_INTERVAL
+        self.interval_controller: AdaptiveIntervalController | None = None
         self._waveform_generators: dict[str, _SampleArrayGenerator] = {}
         self._annotators: dict[str, AnnotatorProtocol] = {}
         self._last_log_time = 0
@@ -139,6 +152,36 @@ class GenericWaveformProvider:
         self._annotators[annotator.trigger_handle] = annotator
         return annotator
 
+    def enable_adaptive_interval(
+        self,
+        min_interval: float = 0.05,
+        max_interval: float = 0.5,
+        round_trip_times: Callable[[], dict[object, RoundTripData]] | None = None,
+        **kwargs: Any,
+    ) -> AdaptiveIntervalController:
+        """Let the worker thread adapt notifications_interval between min_interval and max_interval.
+
+        :param min_interval: lower limit of the interval in seconds
+        :param max_interval: upper limit of the interval in seconds (the latency limit)
+        :param round_trip_times: optional callable that returns round trip statistics of subscribers,
+                                 e.g. get_subscription_round_trip_times of the subscriptions manager
+        :param kwargs: further arguments of AdaptiveIntervalController
+        :return: the controller, its statistics property shows the values the interval is based on
+        """
+        self.interval_controller = AdaptiveIntervalController(
+            min_interval=min_interval,
+            max_interval=max_interval,
+            initial_interval=self.notifications_interval,
+            round_trip_times=round_trip_times,
+            **kwargs,
+        )
+        self.notifications_interval = self.interval_controller.interval
+        return self.interval_controller
+
+    def disable_adaptive_interval(self):
+        """Keep the current notifications_interval fixed."""
+        self.interval_controller = None
+
     def start(self):
         """Start worker thread."""
         self._worker_thread = Thread(target=self._worker_thread_loop)
@@ -227,7 +270,8 @@ class GenericWaveformProvider:
         return [ent.handle for ent in all_waveform_entities]
 
     def _worker_thread_loop(self):
-        timer = IntervalTimer(period_in_seconds=self.notifications_interval)
+        timer_period = self.notifications_interval
+        timer = IntervalTimer(period_in_seconds=timer_period)
         try:
             while True:
                 shall_stop = self._stop_worker.is_set()
@@ -236,10 +280,19 @@ class GenericWaveformProvider:
                 behind_schedule_seconds = timer.wait_next_interval_begin()
                 self._log_waveform_timing(behind_schedule_seconds)
                 try:
+                    start = time.perf_counter()
                     updated_entities = self.update_all_realtime_samples()
                     with self._mdib.rt_sample_state_transaction() as transaction:
                         transaction.write_entities(updated_entities)
+                    send_duration = time.perf_counter() - start
                     self._log_waveform_timing(behind_schedule_seconds)
+                    controller = self.interval_controller
+                    if controller is not None:
+                        self.notifications_interval = controller.update(send_duration, behind_schedule_seconds)
+                    if self.notifications_interval != timer_period:
+                        timer_period = self.notifications_interval
+                        timer.set_period(timer_period)
+                        timer.reset()
                 except Exception:  # noqa: BLE001
                     # catch all to keep loop running
                     self._logger.warning('could not update real time samples: %s', traceback.format_exc())
@@ -250,9 +303,10 @@ class GenericWaveformProvider:
         """Update waveforms state from waveform generator (if available)."""
         wf_generator = self._waveform_generators.get(state.DescriptorHandle)
         if wf_generator:
-            ctxt = Context(prec=10)
             rt_sample_array = wf_generator.get_next_sample_array()
-            samples = [ctxt.create_decimal(s) for s in rt_sample_array.samples]
+            samples = rt_sample_array.decimal_samples
+            if samples is None:
+                samples = [_DECIMAL_CONTEXT.create_decimal(s) for s in rt_sample_array.samples]
             if state.MetricValue is None:
                 state.mk_metric_value()
             state.MetricValue.Samples = samples